@@ -8,12 +8,13 @@ later wired).
 
 Inputs:
   - site/data/prediction_accuracy.json   (records + tertile aggregations)
-  - site/data/calibration_history.json   (previous run, optional, for EMA)
+  - site/data/calibration_history.jsonl  (previous run, optional, for EMA)
   - site/data/paper_trading_history.json (completed trades, optional, for stop-loss diagnostics)
 
 Outputs:
   - site/data/pillar_weights.json   (latest snapshot — single object)
-  - site/data/calibration_history.json (append-only log of all runs)
+  - site/data/calibration_history.jsonl (append-only log of all runs)
+  - site/data/calibration_history.json  (newest HISTORY_WINDOW runs, for the page)
 
 Recommendation logic:
   Per pillar:
@@ -33,16 +34,24 @@ from __future__ import annotations
 
 import json
 import math
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
+
 DATA_DIR = ROOT / "site" / "data"
 ACCURACY_FILE = DATA_DIR / "prediction_accuracy.json"
 GAP_FILE = DATA_DIR / "gap_analysis.json"
 PAPER_FILE = DATA_DIR / "paper_trading_history.json"
 WEIGHTS_FILE = DATA_DIR / "pillar_weights.json"
 HISTORY_FILE = DATA_DIR / "calibration_history.json"
+HISTORY_LOG = DATA_DIR / "calibration_history.jsonl"
+HISTORY_WINDOW = 120  # runs kept in the dashboard-facing calibration_history.json
 
 # Pillar score keys we calibrate over (must match prediction_tracker output)
 PILLAR_KEYS = (
@@ -90,14 +99,14 @@ def _clamp(x: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, x))
 
 
+def _history_log() -> HistoryLog:
+    return HistoryLog(HISTORY_LOG, legacy=HISTORY_FILE, legacy_key="runs")
+
+
 def _load_prev_calibration() -> dict | None:
-    if not HISTORY_FILE.exists():
-        return None
     try:
-        log = json.loads(HISTORY_FILE.read_text())
-        runs = log.get("runs") or []
-        return runs[-1] if runs else None
-    except (json.JSONDecodeError, KeyError):
+        return _history_log().last()
+    except json.JSONDecodeError:
         return None
 
 
@@ -254,7 +263,7 @@ def _recommend_threshold(sweep: list[dict], prev_threshold: float) -> dict:
 def _stop_loss_diagnostics() -> dict:
     if not PAPER_FILE.exists():
         return {"available": False, "reason": "no_paper_trading_history"}
-    paper = json.loads(PAPER_FILE.read_text())
+    paper = load_json(PAPER_FILE)
     completed = []
     for st in paper.get("strategies", {}).values():
         for t in st.get("trades", []):
@@ -284,11 +293,12 @@ def _stop_loss_diagnostics() -> dict:
 
 
 # ── main ────────────────────────────────────────────────────────────────
+@instrument("adaptive_calibration")
 def run() -> None:
     if not ACCURACY_FILE.exists():
         raise SystemExit(f"Missing {ACCURACY_FILE} — run prediction_tracker.py first")
-    accuracy = json.loads(ACCURACY_FILE.read_text())
-    gap = json.loads(GAP_FILE.read_text()) if GAP_FILE.exists() else {}
+    accuracy = load_json(ACCURACY_FILE)
+    gap = load_json(GAP_FILE) if GAP_FILE.exists() else {}
     gap_gradients = (gap.get("gradients") or {}) if gap else {}
     prev = _load_prev_calibration()
 
@@ -409,23 +419,17 @@ def run() -> None:
     }
 
     # Latest snapshot file (single object)
-    WEIGHTS_FILE.write_text(json.dumps(payload, indent=2, default=str))
+    dump_json(WEIGHTS_FILE, payload, indent=2, default=str)
 
     # Append to history
-    log: dict
-    if HISTORY_FILE.exists():
-        log = json.loads(HISTORY_FILE.read_text())
-        if "runs" not in log:
-            log = {"runs": []}
-    else:
-        log = {"runs": []}
-    log["runs"].append(payload)
-    log["updated"] = payload["updated"]
-    HISTORY_FILE.write_text(json.dumps(log, indent=2, default=str))
+    log = _history_log()
+    log.append(payload)
+    window = log.write_window(HISTORY_FILE, HISTORY_WINDOW, "runs",
+                              extra={"updated": payload["updated"]})
 
     # ── stdout summary ──────────────────────────────────────────────────
     print(f"Wrote {WEIGHTS_FILE}  (mode={mode})")
-    print(f"  history runs: {len(log['runs'])}")
+    print(f"  history runs: {window['total']}")
     print()
     print("pillar weights (global):")
     for pkey, info in pillars.items():
@@ -12,11 +12,12 @@ Usage:
 """
 import argparse
 import glob
-import json
 import re
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 CONF_THRESHOLD = 0.6
 MIN_ARTICLES = 5  # filtered_score is null when daily total < this
@@ -30,7 +31,7 @@ def aggregate(per_day_files):
         lambda: {"bullish": 0, "bearish": 0, "neutral": 0, "total": 0}
     ))
     for fp in sorted(per_day_files):
-        data = json.loads(Path(fp).read_text())
+        data = load_json(fp)
         # Derive date from file name (sentiment_YYYY-MM-DD.json or news_YYYY-MM-DD)
         m = re.search(r"(\d{4}-\d{2}-\d{2})", Path(fp).stem)
         if not m:
@@ -93,6 +94,7 @@ def to_output(agg, min_articles, complete_through=None):
     }
 
 
+@instrument("aggregate_ticker_sentiment")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--inputs", nargs="+", required=True,
@@ -126,7 +128,7 @@ def main():
     out = to_output(agg, args.min_articles, complete_through)
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out, indent=2))
+    dump_json(out_path, out, indent=2)
     print(f"\ntickers={len(out['tickers'])}  dates={len(out['dates'])}")
     print(f"output: {out_path}")
 
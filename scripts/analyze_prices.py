@@ -49,12 +49,13 @@ analyze_prices.py  v1
 
 import argparse
 import csv
-import json
 import math
 import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -639,7 +640,7 @@ def load_news_zscores(trends_path: str) -> dict:
     → 각 날짜의 전체 뉴스 신호 강도를 하나의 숫자로 요약.
     """
     try:
-        T = json.loads(Path(trends_path).read_text())
+        T = load_json(trends_path)
     except Exception:
         return {}
 
@@ -674,6 +675,7 @@ def load_news_zscores(trends_path: str) -> dict:
 # 4. Entry point
 # ══════════════════════════════════════════════════════════════════════════════
 
+@instrument("analyze_prices")
 def main():
     ap = argparse.ArgumentParser(description="Precise technical analysis engine")
     ap.add_argument("--prices",   default="site/data/prices.json",
@@ -694,7 +696,7 @@ def main():
 
     # ── Load prices ────────────────────────────────────────────────────────────
     try:
-        P = json.loads(Path(args.prices).read_text())
+        P = load_json(args.prices)
     except Exception as e:
         sys.exit(f"prices.json 로드 실패: {e}")
 
@@ -798,21 +800,17 @@ def main():
         "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "tickers": columnar,
     }
-    out_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",",":")),
-                        encoding="utf-8")
+    dump_json(out_path, payload)
 
     # gzip 버전도 생성 (대시보드가 fetch 시 사용 가능)
-    import gzip
-    gz_path = out_path.with_suffix(".json.gz")
-    with gzip.open(gz_path, "wt", encoding="utf-8", compresslevel=6) as gz:
-        json.dump(payload, gz, ensure_ascii=False, separators=(",",":"))
+    dump_json(out_path.with_suffix(".json.gz"), payload)
 
     sum_path = Path(args.out_summary)
     summary.sort(key=lambda x: x.get("recent_signals", 0), reverse=True)
-    sum_path.write_text(json.dumps({
+    dump_json(sum_path, {
         "updated":  datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
         "snapshot": summary,
-    }, ensure_ascii=False), encoding="utf-8")
+    })
 
     print(f"\n→ {out_path}  ({len(results)} tickers)")
     print(f"→ {sum_path}  (summary)")
@@ -41,11 +41,13 @@ analyze_ticker.py — Per-ticker news-price deep analysis
 """
 
 import argparse
-import json
 import math
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from inference import binom_pvalue
+from jsonio import dump_json, load_json
+from perf import count, instrument
 
 
 # ── 통계 헬퍼 ──────────────────────────────────────────────────────────────────
@@ -65,43 +67,6 @@ def pearson(xs, ys):
 
 
 
-
-def binomial_pvalue(hits: int, n: int, p_null: float = 0.5) -> float:
-    """이항분포 양측검정 p-value.
-
-    H0: 단어가 random (hit rate = 0.5)
-    H1: 단어가 신호 (hit rate ≠ 0.5)
-
-    p < 0.05면 통계적으로 유의미한 신호.
-    """
-    if n == 0:
-        return 1.0
-
-    # 정규근사: n이 크면 정확
-    mean = n * p_null
-    std = math.sqrt(n * p_null * (1 - p_null))
-    if std < 1e-9:
-        return 1.0
-
-    # 양측 p-value
-    z = abs(hits - mean) / std
-    # 표준정규분포 cdf 근사
-    # 1 - erf(z/sqrt(2)) 의 양측 = 2 * (1 - phi(z))
-    # erf 근사 (Abramowitz & Stegun)
-    def erf_approx(x):
-        a1, a2, a3 = 0.254829592, -0.284496736, 1.421413741
-        a4, a5 = -1.453152027, 1.061405429
-        p = 0.3275911
-        sign = 1 if x >= 0 else -1
-        x = abs(x)
-        t = 1.0 / (1.0 + p * x)
-        y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * math.exp(-x * x)
-        return sign * y
-
-    p_one_tail = 0.5 * (1 - erf_approx(z / math.sqrt(2)))
-    return min(1.0, 2 * p_one_tail)
-
-
 def zscore_series(counts, window=28):
     out = []
     for i, c in enumerate(counts):
@@ -290,12 +255,8 @@ def analyze(ticker: str, T: dict, P_data: dict,
 
             # ── 4단계: 통계적 유의성 검정 (Binomial test) ───────────────────
             full_hits = sum(1 for e in full_stats["events"] if e["ret_1d"] > 0)
-            p_value = binomial_pvalue(full_hits, full_stats["n_events"])
-
-            # bearish는 hit rate가 낮아야 의미있음 → flip 후 검정
-            if full_stats["corr"] < 0:
-                bear_hits = full_stats["n_events"] - full_hits
-                p_value = binomial_pvalue(bear_hits, full_stats["n_events"])
+            # 정확 이항검정(양측). p0=0.5에서는 대칭이라 bearish flip과 값이 같다
+            p_value = float(binom_pvalue(full_hits, full_stats["n_events"]))
 
             # p > 0.05 → 통계적으로 random과 구별 안 됨 → 노이즈 → 탈락
             if p_value > 0.05:
@@ -398,6 +359,7 @@ def analyze(ticker: str, T: dict, P_data: dict,
 
 # ── Entry ─────────────────────────────────────────────────────────────────────
 
+@instrument("analyze_ticker")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends",      default="site/data/trends.json")
@@ -411,8 +373,8 @@ def main():
                     help="0=당일, 1=전날, 2=이틀전 분석")
     args = ap.parse_args()
 
-    T      = json.loads(Path(args.trends).read_text())
-    P_data = json.loads(Path(args.prices).read_text())
+    T      = load_json(args.trends)
+    P_data = load_json(args.prices)
 
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -429,13 +391,14 @@ def main():
     }
 
     for ticker in tickers:
+        count()
         print(f"\nAnalyzing {ticker}...")
         result = analyze(ticker, T, P_data,
                          args.min_events, args.z_thresh, args.lag_range)
         result["input_watermark"] = wm
 
         out_path = out_dir / f"{ticker}.json"
-        out_path.write_text(json.dumps(result, ensure_ascii=False, separators=(",",":")))
+        dump_json(out_path, result)
 
         if "error" in result:
             print(f"  ERROR: {result['error']}")
@@ -16,14 +16,16 @@ timestamp is older than --max-age-hours. The archive filename comes from the
 `updated` timestamp's UTC date, never from wall-clock "today".
 """
 import argparse
-import json
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 MAX_AGE_HOURS = 6
 
 
+@instrument("archive_predictions")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--pred", default="site/data/predictions.json")
@@ -37,7 +39,7 @@ def main():
         print(f"REFUSED: {p} does not exist (predict.py did not run?)", file=sys.stderr)
         return 1
     try:
-        data = json.loads(p.read_text())
+        data = load_json(p)
     except Exception as e:
         print(f"REFUSED: {p} unreadable ({e})", file=sys.stderr)
         return 1
@@ -60,7 +62,7 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
     day = updated.strftime("%Y-%m-%d")
     out_path = out_dir / f"{day}.json"
-    out_path.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    dump_json(out_path, data)
     print(f"Archived {p} (updated={ts}, {age_h:.1f}h old) → {out_path}")
     return 0
 
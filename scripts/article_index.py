@@ -0,0 +1,25 @@
+"""
+article_index.py — scripts/ entry point for src/news_trend/article_index.py.
+
+Re-exports the SQLite FTS5 article index for scripts (same shim pattern as
+jsonio.py / warehouse.py) and doubles as its CLI:
+
+    from article_index import ArticleIndex, ticker_query
+
+    python scripts/article_index.py                       # index new warehouse days
+    python scripts/article_index.py --search "nvidia" --since 2026-08-01
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.article_index import *  # noqa: E402,F401,F403
+from news_trend.article_index import __all__, main  # noqa: E402,F401
+
+if __name__ == "__main__":
+    from perf import instrument
+    raise SystemExit(instrument("article_index")(main)())
@@ -14,11 +14,13 @@ backtest.py — 시스템 신호 풀 백테스트
 - 시스템 BUY only (active)
 """
 import argparse
-import json
 import math
 from collections import defaultdict
 from datetime import datetime
-from pathlib import Path
+from backtest_batch import WordEventBatch
+from inference import binom_pvalue
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 # ── 포트폴리오 회계 / 위험 지표 ──────────────────────────────────────────────
@@ -76,19 +78,6 @@ def zscore_at(counts, i, window=28):
     return (counts[i] - mean) / std if std >= 0.5 else 0
 
 
-def binomial_pvalue(hits, n, p_null=0.5):
-    if n == 0: return 1.0
-    mean, std = n * p_null, math.sqrt(n * p_null * (1 - p_null))
-    if std < 1e-9: return 1.0
-    z = abs(hits - mean) / std
-    def erf(x):
-        a1, a2, a3, a4, a5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
-        p, sign, x = 0.3275911, (1 if x >= 0 else -1), abs(x)
-        t = 1.0 / (1.0 + p * x)
-        return sign * (1 - (((((a5*t+a4)*t+a3)*t+a2)*t+a1)*t * math.exp(-x*x)))
-    return min(1.0, 2 * 0.5 * (1 - erf(z / math.sqrt(2))))
-
-
 def rsi_at(closes, i, period=14):
     """간단한 RSI (Wilder)."""
     if i < period or i >= len(closes):
@@ -146,11 +135,8 @@ def learn_word_patterns(ticker, T, P_data, min_events=8, z_thresh=1.0, max_lag=2
             hits = sum(1 for r in events if r > 0)
             hr = hits / len(events)
 
-            # 통계 검정
-            if hr > 0.5:
-                p = binomial_pvalue(hits, len(events))
-            else:
-                p = binomial_pvalue(len(events) - hits, len(events))
+            # 통계 검정 (정확 이항, 양측 — p0=0.5에서 hits/n-hits 대칭)
+            p = float(binom_pvalue(hits, len(events)))
 
             if p > 0.05: continue
 
@@ -165,9 +151,29 @@ def learn_word_patterns(ticker, T, P_data, min_events=8, z_thresh=1.0, max_lag=2
     return bull, bear
 
 
+def learn_word_patterns_batched(ticker, batch, min_events=8):
+    """learn_word_patterns와 같은 (bull, bear) — WordEventBatch 행렬 집계 사용.
+
+    hit≥0.6 / hit≤0.4 후보만 사건 수익률을 꺼내 기존 산식으로 p/평균 계산."""
+    bull, bear = [], []
+    cands = list(batch.candidates(ticker, min_events, hit_hi=0.6, hit_lo=0.4))
+    pvals = binom_pvalue([c[3] for c in cands], [c[2] for c in cands]).tolist()
+    for (word, lag, n, hits), p in zip(cands, pvals):
+        hr = hits / n
+        if p > 0.05: continue
+        events = batch.events(ticker, word, lag)
+        avg = sum(events) / len(events)
+        entry = {"word": word, "lag": lag, "hit": hr, "avg": avg, "n": n, "p": p}
+        if hr >= 0.6 and avg > 0.2:
+            bull.append(entry)
+        elif hr <= 0.4 and avg < -0.2:
+            bear.append(entry)
+    return bull, bear
+
+
 # ── 전략: 매일 BUY 신호 생성 ──────────────────────────────────────────────────
-def get_signal(ticker, date_idx, T, P_data, bull_words, bear_words, t_idx, p_dates, p_closes):
-    """특정 날짜의 매수 신호 (활성 단어 + RSI 조합)."""
+def get_signal(ticker, date_idx, T, P_data, bull_words, bear_words, t_idx, p_dates, p_closes, zs=None):
+    """특정 날짜의 매수 신호 (활성 단어 + RSI 조합). zs: 단어→z 리스트 (미리 계산된 경우)."""
     t_dates = T["dates"]
     t_series = T.get("series", {})
 
@@ -186,7 +192,7 @@ def get_signal(ticker, date_idx, T, P_data, bull_words, bear_words, t_idx, p_dat
         word, lag = w["word"], w["lag"]
         if word not in t_series: continue
         if date_idx - lag < 0: continue
-        z = zscore_at(t_series[word], date_idx - lag)
+        z = zs[word][date_idx - lag] if zs is not None else zscore_at(t_series[word], date_idx - lag)
         if z >= z_thresh:
             bull_score += w["hit"] * abs(w["avg"])
             active_bull.append(word)
@@ -212,8 +218,8 @@ def get_signal(ticker, date_idx, T, P_data, bull_words, bear_words, t_idx, p_dat
 # ── 백테스트 메인 ─────────────────────────────────────────────────────────────
 z_thresh = 1.0  # 글로벌
 
-def backtest_ticker(ticker, T, P_data, hold_days=5):
-    """종목별 백테스트."""
+def backtest_ticker(ticker, T, P_data, hold_days=5, batch=None):
+    """종목별 백테스트. batch(WordEventBatch)가 있으면 종목 간 공유 계산 재사용."""
     pdata = P_data["tickers"].get(ticker)
     if not pdata: return None
 
@@ -223,12 +229,15 @@ def backtest_ticker(ticker, T, P_data, hold_days=5):
 
     # 단어 패턴 학습 (앞 70%만 사용 = 과적합 방지)
     split = int(len(t_dates) * 0.7)
-    train_T = {"dates": t_dates[:split], "series": {w: c[:split] for w, c in T.get("series", {}).items()}}
-    train_P = {"tickers": {ticker: {
-        "dates": [d for d in p_dates if d in set(t_dates[:split])],
-        "closes": [p_closes[p_dates.index(d)] for d in p_dates if d in set(t_dates[:split])],
-    }}}
-    bull, bear = learn_word_patterns(ticker, train_T, train_P)
+    if batch is not None:
+        bull, bear = learn_word_patterns_batched(ticker, batch)
+    else:
+        train_T = {"dates": t_dates[:split], "series": {w: c[:split] for w, c in T.get("series", {}).items()}}
+        train_P = {"tickers": {ticker: {
+            "dates": [d for d in p_dates if d in set(t_dates[:split])],
+            "closes": [p_closes[p_dates.index(d)] for d in p_dates if d in set(t_dates[:split])],
+        }}}
+        bull, bear = learn_word_patterns(ticker, train_T, train_P)
 
     if not bull:
         return {"ticker": ticker, "trades": 0, "skip": "no_bull_signals"}
@@ -238,7 +247,8 @@ def backtest_ticker(ticker, T, P_data, hold_days=5):
     trades = []
 
     for i in range(test_start, len(t_dates) - hold_days):
-        sig = get_signal(ticker, i, T, P_data, bull, bear, t_idx, p_dates, p_closes)
+        sig = get_signal(ticker, i, T, P_data, bull, bear, t_idx, p_dates, p_closes,
+                         zs=batch.z if batch is not None else None)
         if not sig: continue
 
         d = t_dates[i]
@@ -292,6 +302,7 @@ def backtest_ticker(ticker, T, P_data, hold_days=5):
     }
 
 
+@instrument("backtest")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends", default="site/data/trends.json")
@@ -299,10 +310,12 @@ def main():
     ap.add_argument("--out",    default="site/data/backtest.json")
     ap.add_argument("--hold-days", type=int, default=5)
     ap.add_argument("--tickers", default=None)
+    ap.add_argument("--per-ticker", action="store_true",
+                    help="종목마다 단어 z/사건을 새로 계산 (기존 경로; 결과 동일, 느림)")
     args = ap.parse_args()
 
-    T = json.loads(Path(args.trends).read_text())
-    P = json.loads(Path(args.prices).read_text())
+    T = load_json(args.trends)
+    P = load_json(args.prices)
 
     if args.tickers:
         tickers = [t.strip().upper() for t in args.tickers.split(",")]
@@ -313,9 +326,12 @@ def main():
     print(f"News data: {T['dates'][0]} ~ {T['dates'][-1]} ({len(T['dates'])} days)")
     print(f"Train: 70% / Test: 30% (out-of-sample)\n")
 
+    # 단어 z 행렬·종목 수익률 행렬은 종목과 무관 → 한 번만 계산
+    batch = None if args.per_ticker else WordEventBatch(T, P, sorted(tickers), zscore_at)
+
     results = {}
     for ticker in sorted(tickers):
-        res = backtest_ticker(ticker, T, P, args.hold_days)
+        res = backtest_ticker(ticker, T, P, args.hold_days, batch=batch)
         if not res or res.get("skip"):
             continue
         results[ticker] = res
@@ -358,7 +374,7 @@ def main():
               f"{r['mdd']:>6.2f}% {sh}")
 
     # Save
-    Path(args.out).write_text(json.dumps({
+    dump_json(args.out, {
         "updated": datetime.now().strftime("%Y-%m-%d"),
         "summary": {
             "total_trades": len(all_trades),
@@ -369,7 +385,7 @@ def main():
         "by_ticker": {k: {x: v[x] for x in v if x != "trade_log"}
                       for k, v in results.items()},
         "all_trades": all_trades,
-    }, indent=2))
+    }, indent=2)
 
     print(f"\n→ {args.out}")
 
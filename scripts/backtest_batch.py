@@ -0,0 +1,132 @@
+"""
+backtest_batch.py — shared word-event statistics for backtest.py / backtest_v2.py.
+
+learn_word_patterns() runs per ticker, and every ticker recomputed the same
+top-200 word z-series (zscore_at at every date) before walking
+(word, lag, date) in Python — 84 times over. WordEventBatch does the
+ticker-independent work once per run:
+
+  - z:  word × date z-scores (the caller's own zscore_at, once per word)
+  - R:  ticker × train-date next-day return matrix (NaN: not an event date)
+  - per lag, event counts and up-day hits for every (word, ticker) from two
+    matrix products: (z >= thresh, shifted by lag) @ valid / up masks
+
+Only (word, ticker, lag) combinations that clear the count and hit-rate
+gates get their event returns materialized, in date order, so averages and
+p-values come out of the per-ticker code's arithmetic unchanged.
+
+    batch = WordEventBatch(T, P, tickers, zscore_at)
+    for word, lag, n, hits in batch.candidates("NVDA", min_events=8, hit_hi=0.6):
+        events = batch.events("NVDA", word, lag)
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterator
+
+import numpy as np
+
+
+class WordEventBatch:
+    """Train-window word events for many tickers (see module docstring).
+
+    Mirrors learn_word_patterns' inputs: the first `train_frac` of T's
+    dates, the top `top_n` single words (len >= 4) by train-window count,
+    lags 0..max_lag, and per ticker the price dates inside the train window
+    (a ticker with < 30 of them gets no patterns).
+    """
+
+    def __init__(self, T: dict, P_data: dict, tickers, zscore: Callable,
+                 z_thresh: float = 1.0, max_lag: int = 2, top_n: int = 200,
+                 train_frac: float = 0.7):
+        t_dates = T["dates"]
+        t_series = T.get("series", {})
+        self.split = split = int(len(t_dates) * train_frac)
+        train_dates = t_dates[:split]
+        train_set = set(train_dates)
+        t_idx = {d: i for i, d in enumerate(train_dates)}
+        self.max_lag = max_lag
+
+        series = {w: c for w, c in t_series.items() if " " not in w and len(w) >= 4}
+        totals = sorted(series.items(), key=lambda x: -sum(x[1][:split]))[:top_n]
+        self.words = [w for w, _ in totals]
+        self.word_ix = {w: i for i, w in enumerate(self.words)}
+        # z over the full series: zscore_at only looks back, so the train
+        # prefix equals z of the truncated series, and get_signal can reuse it.
+        self.z = {w: [zscore(c, i) for i in range(len(c))] for w, c in totals}
+        Z = np.array([self.z[w][:split] for w in self.words], dtype=float).reshape(len(self.words), split)
+
+        self.tickers = list(tickers)
+        self.ticker_ix = {t: k for k, t in enumerate(self.tickers)}
+        R = np.full((len(self.tickers), split), np.nan)
+        for k, tk in enumerate(self.tickers):
+            pdata = P_data["tickers"].get(tk)
+            if not pdata:
+                continue
+            p_dates, p_closes = pdata["dates"], pdata["closes"]
+            first: dict[str, int] = {}
+            for i, d in enumerate(p_dates):
+                first.setdefault(d, i)
+            tr_dates = [d for d in p_dates if d in train_set]
+            tr_closes = [p_closes[first[d]] for d in tr_dates]
+            common = train_set & set(tr_dates)
+            if len(common) < 30:
+                continue
+            rets = {}
+            for i in range(len(tr_dates) - 1):
+                if tr_closes[i] and tr_closes[i + 1]:
+                    rets[tr_dates[i]] = (tr_closes[i + 1] / tr_closes[i] - 1) * 100
+            for d in common:
+                if d in rets:
+                    R[k, t_idx[d]] = rets[d]
+        self.R = R
+        self._order = np.array(sorted(range(split), key=lambda i: train_dates[i]), dtype=np.int64)
+
+        valid = ~np.isnan(R)
+        up = np.zeros_like(valid)
+        np.greater(R, 0, out=up, where=valid)
+        E = Z >= z_thresh
+        self._E = E
+        self._valid = valid
+        # n[lag, word, ticker] / hits[lag, word, ticker]
+        L = max_lag + 1
+        self.n = np.zeros((L, len(self.words), len(self.tickers)), dtype=np.int64)
+        self.hits = np.zeros_like(self.n)
+        Vf, Uf = valid.T.astype(float), up.T.astype(float)
+        for lag in range(L):
+            El = self._shifted(lag).astype(float)
+            self.n[lag] = np.rint(El @ Vf).astype(np.int64)
+            self.hits[lag] = np.rint(El @ Uf).astype(np.int64)
+
+    def _shifted(self, lag: int) -> np.ndarray:
+        """Event mask at date ti = z[ti - lag] >= thresh (False where ti < lag)."""
+        El = np.zeros_like(self._E)
+        El[:, lag:] = self._E[:, :self._E.shape[1] - lag]
+        return El
+
+    def candidates(self, ticker: str, min_events: int, hit_hi: float = 0.0,
+                   hit_lo: float | None = None) -> Iterator[tuple[str, int, int, int]]:
+        """(word, lag, n, hits) with n >= min_events and hit rate >= hit_hi
+        (or <= hit_lo), in learn_word_patterns' (word, lag) order."""
+        k = self.ticker_ix.get(ticker)
+        if k is None:
+            return
+        n = self.n[:, :, k].T          # word × lag
+        hits = self.hits[:, :, k].T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hr = hits / n
+        keep = (n >= min_events) & (hr >= hit_hi)
+        if hit_lo is not None:
+            keep |= (n >= min_events) & (hr <= hit_lo)
+        for w, lag in zip(*np.nonzero(keep)):
+            yield self.words[w], int(lag), int(n[w, lag]), int(hits[w, lag])
+
+    def events(self, ticker: str, word: str, lag: int) -> list[float]:
+        """Next-day returns on the word's event dates, in date order."""
+        k = self.ticker_ix[ticker]
+        w = self.word_ix[word]
+        mask = np.zeros(self.split, dtype=bool)
+        mask[lag:] = self._E[w, :self.split - lag]
+        mask &= self._valid[k]
+        order = self._order[mask[self._order]]
+        return self.R[k, order].tolist()
@@ -8,10 +8,13 @@ backtest_v2.py — 안전한 시스템 백테스트
 4. 신호 강도 필터 (bull_score > 1.5만)
 5. 시장 regime 필터 (avg RSI > 60 = 과열 시 매수 금지)
 """
-import argparse, json, math
+import argparse, math
 from collections import defaultdict
 from datetime import datetime
-from pathlib import Path
+from backtest_batch import WordEventBatch
+from inference import binom_pvalue
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 # ── 포트폴리오 회계 / 위험 지표 ──
@@ -69,21 +72,6 @@ def zscore_at(counts, i, window=28):
     return (counts[i] - mean) / std if std >= 0.5 else 0
 
 
-def binomial_pvalue(hits, n, p_null=0.5):
-    if n == 0: return 1.0
-    mean, std = n * p_null, math.sqrt(n * p_null * (1 - p_null))
-    if std < 1e-9: return 1.0
-    z = abs(hits - mean) / std
-
-    def erf(x):
-        a1, a2, a3, a4, a5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
-        p, sign, x = 0.3275911, (1 if x >= 0 else -1), abs(x)
-        t = 1.0 / (1.0 + p * x)
-        return sign * (1 - (((((a5 * t + a4) * t + a3) * t + a2) * t + a1) * t * math.exp(-x * x)))
-
-    return min(1.0, 2 * 0.5 * (1 - erf(z / math.sqrt(2))))
-
-
 def rsi_at(closes, i, period=14):
     if i < period or i >= len(closes): return 50.0
     gains, losses = 0, 0
@@ -134,7 +122,7 @@ def learn_word_patterns(ticker, T, P_data, min_events=8, z_thresh=1.0):
             hr = hits / len(events)
 
             if hr > 0.5:
-                p = binomial_pvalue(hits, len(events))
+                p = float(binom_pvalue(hits, len(events)))
             else:
                 continue  # bear은 안 씀
 
@@ -146,8 +134,26 @@ def learn_word_patterns(ticker, T, P_data, min_events=8, z_thresh=1.0):
     return bull
 
 
+def learn_word_patterns_batched(ticker, batch, min_events=8):
+    """learn_word_patterns와 동일한 결과 — WordEventBatch의 행렬 집계 사용.
+
+    (단어, lag)별 사건 수/적중 수는 batch가 전 종목 한 번에 계산하고,
+    hit≥0.6 후보만 사건 수익률을 꺼내 p-value/평균을 기존 산식으로 낸다."""
+    bull = []
+    cands = list(batch.candidates(ticker, min_events, hit_hi=0.6))
+    pvals = binom_pvalue([c[3] for c in cands], [c[2] for c in cands]).tolist()
+    for (word, lag, n, hits), p in zip(cands, pvals):
+        hr = hits / n
+        if p > 0.05: continue
+        events = batch.events(ticker, word, lag)
+        avg = sum(events) / len(events)
+        if avg > 0.2:
+            bull.append({"word": word, "lag": lag, "hit": hr, "avg": avg, "n": n})
+    return bull
+
+
 # ── 신호 생성 (강화 버전) ──
-def get_signal(date_idx, T, p_dates, p_closes, bull_words, market_avg_rsi):
+def get_signal(date_idx, T, p_dates, p_closes, bull_words, market_avg_rsi, zs=None):
     """
     Rule 4: bull_score > 1.5만 통과
     Rule 5: market_avg_rsi > 60 (과열) → 매수 금지
@@ -172,7 +178,7 @@ def get_signal(date_idx, T, p_dates, p_closes, bull_words, market_avg_rsi):
         word, lag = w["word"], w["lag"]
         if word not in t_series: continue
         if date_idx - lag < 0: continue
-        z = zscore_at(t_series[word], date_idx - lag)
+        z = zs[word][date_idx - lag] if zs is not None else zscore_at(t_series[word], date_idx - lag)
         if z >= 1.0:
             bull_score += w["hit"] * abs(w["avg"])
             active_bull.append(word)
@@ -265,7 +271,20 @@ def simulate_trade(p_closes, entry_idx, max_hold=5, stop_pct=-3.0, take_pct=5.0)
 
 
 # ── 종목별 백테스트 ──
-def backtest_ticker(ticker, T, P_data, blacklist):
+def market_avg_rsi_at(P_data, d):
+    """SPY/QQQ/IWM 평균 RSI (Rule 5) — 날짜 d 기준."""
+    market_rsis = []
+    for tk in ["SPY", "QQQ", "IWM"]:
+        tp = P_data["tickers"].get(tk, {})
+        tdates, tcloses = tp.get("dates", []), tp.get("closes", [])
+        if d in tdates:
+            idx = tdates.index(d)
+            market_rsis.append(rsi_at(tcloses, idx))
+    return sum(market_rsis) / len(market_rsis) if market_rsis else 50.0
+
+
+def backtest_ticker(ticker, T, P_data, blacklist, batch=None, market_rsi=None):
+    """batch(WordEventBatch)/market_rsi(날짜→평균 RSI)가 있으면 종목 간 공유 계산을 재사용."""
     if ticker in blacklist:
         return {"ticker": ticker, "skipped": "blacklist"}
 
@@ -278,33 +297,31 @@ def backtest_ticker(ticker, T, P_data, blacklist):
 
     # Train 70% / Test 30%
     split = int(len(t_dates) * 0.7)
-    train_T = {"dates": t_dates[:split], "series": {w: c[:split] for w, c in T.get("series", {}).items()}}
-    train_set = set(t_dates[:split])
-    train_dates = [d for d in p_dates if d in train_set]
-    train_idx_map = {d: p_dates.index(d) for d in train_dates}
-    train_P = {"tickers": {ticker: {
-        "dates": train_dates,
-        "closes": [p_closes[train_idx_map[d]] for d in train_dates],
-    }}}
-
-    bull = learn_word_patterns(ticker, train_T, train_P)
+    if batch is not None:
+        bull = learn_word_patterns_batched(ticker, batch)
+    else:
+        train_T = {"dates": t_dates[:split], "series": {w: c[:split] for w, c in T.get("series", {}).items()}}
+        train_set = set(t_dates[:split])
+        train_dates = [d for d in p_dates if d in train_set]
+        train_idx_map = {d: p_dates.index(d) for d in train_dates}
+        train_P = {"tickers": {ticker: {
+            "dates": train_dates,
+            "closes": [p_closes[train_idx_map[d]] for d in train_dates],
+        }}}
+        bull = learn_word_patterns(ticker, train_T, train_P)
     if not bull:
         return {"ticker": ticker, "trades": 0, "skipped": "no_signals"}
 
     trades = []
     for i in range(split, len(t_dates) - 5):
         # 시장 평균 RSI (Rule 5)
-        market_rsis = []
-        for tk in ["SPY", "QQQ", "IWM"]:
-            tp = P_data["tickers"].get(tk, {})
-            tdates, tcloses = tp.get("dates", []), tp.get("closes", [])
-            d = t_dates[i]
-            if d in tdates:
-                idx = tdates.index(d)
-                market_rsis.append(rsi_at(tcloses, idx))
-        market_avg_rsi = sum(market_rsis) / len(market_rsis) if market_rsis else 50.0
-
-        sig = get_signal(i, T, p_dates, p_closes, bull, market_avg_rsi)
+        if market_rsi is not None:
+            market_avg_rsi = market_rsi[t_dates[i]]
+        else:
+            market_avg_rsi = market_avg_rsi_at(P_data, t_dates[i])
+
+        sig = get_signal(i, T, p_dates, p_closes, bull, market_avg_rsi,
+                         zs=batch.z if batch is not None else None)
         if not sig: continue
 
         d = t_dates[i]
@@ -353,6 +370,7 @@ def backtest_ticker(ticker, T, P_data, blacklist):
     }
 
 
+@instrument("backtest_v2")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends", default="site/data/trends.json")
@@ -360,15 +378,17 @@ def main():
     ap.add_argument("--out", default="site/data/backtest_v2.json")
     ap.add_argument("--prev", default="site/data/backtest.json",
                     help="이전 백테스트 (블랙리스트 산출용)")
+    ap.add_argument("--per-ticker", action="store_true",
+                    help="종목마다 단어 z/사건을 새로 계산 (기존 경로; 결과 동일, 느림)")
     args = ap.parse_args()
 
-    T = json.loads(Path(args.trends).read_text())
-    P = json.loads(Path(args.prices).read_text())
+    T = load_json(args.trends)
+    P = load_json(args.prices)
 
     # Rule 3: 블랙리스트 = 이전 백테스트에서 수익 < 0% 인 종목
     blacklist = set()
     try:
-        prev = json.loads(Path(args.prev).read_text())
+        prev = load_json(args.prev)
         for tk, data in prev.get("by_ticker", {}).items():
             if data.get("total_ret", 0) < 0 and data.get("trades", 0) >= 5:
                 blacklist.add(tk)
@@ -380,9 +400,15 @@ def main():
     print(f"\nBacktesting {len(tickers)} tickers (V2: 5 safety rules)")
     print(f"Rules: stop -3% / take +5% / blacklist / score>1.5 / RSI<60 market\n")
 
+    # 단어 z 행렬·종목 수익률 행렬·시장 RSI는 종목과 무관 → 한 번만 계산
+    batch = market_rsi = None
+    if not args.per_ticker:
+        batch = WordEventBatch(T, P, sorted(tickers), zscore_at)
+        market_rsi = {d: market_avg_rsi_at(P, d) for d in T["dates"]}
+
     results = {}
     for ticker in sorted(tickers):
-        res = backtest_ticker(ticker, T, P, blacklist)
+        res = backtest_ticker(ticker, T, P, blacklist, batch=batch, market_rsi=market_rsi)
         if not res or res.get("skipped"): continue
         results[ticker] = res
 
@@ -433,7 +459,7 @@ def main():
               f"{r['avg_ret']:>+7.2f}% {r['total_ret']:>+7.2f}% "
               f"{r['mdd']:>6.2f}% {r['stop_count']:>4} {r['take_count']:>4}")
 
-    Path(args.out).write_text(json.dumps({
+    dump_json(args.out, {
         "updated": datetime.now().strftime("%Y-%m-%d"),
         "rules": {"stop_pct": -3, "take_pct": 5, "blacklist": sorted(blacklist),
                   "min_score": 1.5, "max_market_rsi": 60},
@@ -450,7 +476,7 @@ def main():
         "by_ticker": {k: {x: v[x] for x in v if x != "trade_log"}
                       for k, v in results.items()},
         "all_trades": all_trades,
-    }, indent=2))
+    }, indent=2)
     print(f"\n→ {args.out}")
 
 
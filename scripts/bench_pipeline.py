@@ -0,0 +1,664 @@
+"""
+bench_pipeline.py — offline scaling benchmark for the news→signal pipeline.
+
+perf.py tells us how long each stage took on yesterday's data. It cannot
+tell us how update_corpus or build_signal_corr will behave at 10× articles,
+5× tickers or 3× history. This script answers that question before CI hits
+the problem. It generates a deterministic synthetic tree at each requested
+scale, runs the heavy stages against it in a sandbox, and records wall
+time, CPU and peak RSS per (revision, scale, stage).
+
+Synthetic inputs (same seed + scale → byte-identical files):
+  data/live_newsapi/<date>.jsonl                 raw NewsAPI-shaped articles
+  data/warehouse/daily/<date>_tokens.tkc         per-day token counts
+                        (+ _tokens.csv mirror for older --rev revisions)
+  data/prices/<TICKER>.csv, site/data/prices.json  OHLCV random walks
+  site/data/trends.json, site/data/tickers.json
+  site/data/predictions_history/<date>.json      prediction snapshots
+
+Stages run (CI arguments, see config/pipeline.yaml):
+  update_corpus → aggregate_from_warehouse → make_trends_json →
+  analyze_prices → build_signal_corr → prediction_tracker → experiment_engine
+
+Scale specs: a bare number multiplies every axis ("10"). A comma list of
+axis=factor multiplies single axes ("articles=10", "tickers=5,days=3").
+The axes are articles (per day), tickers, days (news history; snapshots and
+price history follow) and terms (vocabulary).
+
+Output: data/bench/results.json
+  {generated_at, seed, repeat, base, scales[], revisions[], results[],
+   curves{rev: {stage: {axis: {factors, wall_s, peak_rss_mb, exponent}}}},
+   comparison[]}
+
+`exponent` is the log-log growth of wall time along an axis: ≈1 is linear
+and ≥1.5 is flagged as a complexity cliff. With --rev, the code of each
+revision is taken from `git archive` and compared stage by stage against
+the first one.
+
+Usage:
+    python3 scripts/bench_pipeline.py                              # default scales, working tree
+    python3 scripts/bench_pipeline.py --scales 1 2 4 --stages build_signal_corr
+    python3 scripts/bench_pipeline.py --rev origin/main            # origin/main vs working tree
+    python3 scripts/bench_pipeline.py --rev v1 --rev v2 --repeat 3
+    python3 scripts/bench_pipeline.py --generate-only /tmp/synth --scales 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from tokcounts import SUFFIX as TKC_SUFFIX, write_counts
+
+ROOT = Path(__file__).resolve().parents[1]
+OUT_FILE = ROOT / "data" / "bench" / "results.json"
+
+WORKTREE = "WORKTREE"
+CODE_PATHS = ("scripts", "config", "src")
+
+BASE = {"articles": 150, "tickers": 20, "days": 60, "terms": 2000}
+AXES = tuple(BASE)
+DEFAULT_SCALES = ["1", "articles=10", "tickers=5", "days=3"]
+
+END_DATE = date(2026, 6, 30)   # fixed so every run sees the same calendar
+PRICE_WARMUP_DAYS = 220        # SMA200 needs this much price history before news starts
+CLIFF_EXPONENT = 1.5
+
+STAGES: list[tuple[str, list[str]]] = [
+    ("update_corpus", ["scripts/update_corpus.py"]),
+    ("aggregate_from_warehouse", [
+        "scripts/aggregate_from_warehouse.py", "--warehouse", "data/warehouse/daily",
+        "--out", "run", "--last-days", "7", "--min-len", "4",
+        "--extra-stop", "config/extra_noise.txt"]),
+    ("make_trends_json", [
+        "scripts/make_trends_json.py", "--tokens-dir", "data/warehouse/daily",
+        "--out", "site/data/trends.json", "--last-days", "180", "--topk", "200",
+        "--min-len", "4"]),
+    ("analyze_prices", [
+        "scripts/analyze_prices.py", "--prices", "site/data/prices.json",
+        "--trends", "site/data/trends.json",
+        "--out-json", "site/data/technical_analysis.json",
+        "--out-summary", "site/data/ta_summary.json", "--out-csv-dir", "run"]),
+    ("build_signal_corr", [
+        "scripts/build_signal_corr.py", "--trends", "site/data/trends.json",
+        "--prices", "site/data/prices.json", "--out", "site/data/signal_corr.json",
+        "--top-terms", "200", "--min-corr", "0.25", "--min-events", "3"]),
+    ("prediction_tracker", ["scripts/prediction_tracker.py"]),
+    ("experiment_engine", ["scripts/experiment_engine.py"]),
+]
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+# ── scales ──────────────────────────────────────────────────────────────
+def parse_scale(spec: str) -> dict:
+    """'10' → every axis ×10; 'tickers=5,days=3' → those axes only."""
+    spec = spec.strip()
+    factors = dict.fromkeys(AXES, 1.0)
+    try:
+        f = float(spec)
+        return {"name": spec, "factors": dict.fromkeys(AXES, f)}
+    except ValueError:
+        pass
+    for part in spec.split(","):
+        axis, _, val = part.partition("=")
+        axis = axis.strip()
+        if axis not in factors or not val:
+            raise SystemExit(f"bad scale '{spec}' (axes: {', '.join(AXES)})")
+        factors[axis] = float(val)
+    return {"name": spec, "factors": factors}
+
+
+def scale_dims(scale: dict) -> dict:
+    return {a: max(1, round(BASE[a] * scale["factors"][a])) for a in AXES}
+
+
+def scale_axis(scale: dict) -> tuple[str, float] | None:
+    """The curve a scale belongs to: ('all', f), (axis, f), or None if mixed."""
+    moved = {a: f for a, f in scale["factors"].items() if f != 1.0}
+    if not moved:
+        return ("base", 1.0)
+    vals = set(moved.values())
+    if len(moved) == len(AXES) and len(vals) == 1:
+        return ("all", vals.pop())
+    if len(moved) == 1:
+        return next(iter(moved.items()))
+    return None
+
+
+# ── synthetic data ──────────────────────────────────────────────────────
+SYLLABLES = ["ar", "ban", "cor", "del", "ex", "fin", "gal", "hor", "in", "jet",
+             "kal", "lum", "mar", "nor", "op", "pra", "quo", "ros", "sen", "tar",
+             "un", "ver", "wex", "yan", "zor", "tri", "mon", "lex"]
+PUBLISHERS = ["Reuters", "Bloomberg", "CNBC", "MarketWatch", "Yahoo Finance",
+              "Financial Times", "WSJ", "Barron's", "Seeking Alpha", "AP"]
+SECTORS = ["Technology", "Financials", "Energy", "Healthcare", "Industrials",
+           "Consumer", "Utilities", "Materials"]
+ACTIONS = ["BUY", "WATCH", "HOLD", "SELL", "REDUCE"]
+
+
+class SyntheticCorpus:
+    """Deterministic generator for one scale; write() lays out a repo-shaped tree."""
+
+    def __init__(self, dims: dict, seed: int = 0):
+        self.dims = dims
+        self.seed = seed
+        self.rng = self._rng("vocab")
+        self.vocab = self._vocab(dims["terms"])
+        # Zipf-ish term frequencies, like real headlines
+        self.cum_weights = list(_accumulate(1.0 / (i + 1) ** 1.05 for i in range(len(self.vocab))))
+        self.rng = self._rng("tickers")
+        self.tickers = ["SPY", "QQQ"] + self._tickers(dims["tickers"] - 2)
+        self.news_dates = _calendar_days(END_DATE, dims["days"])
+        self.trading_days = _weekdays(END_DATE, dims["days"] + PRICE_WARMUP_DAYS)
+
+    def _rng(self, section: str) -> random.Random:
+        # one stream per artifact, so scaling one axis leaves the others' data unchanged
+        return random.Random(f"{self.seed}:{section}")
+
+    def _vocab(self, n: int) -> list[str]:
+        out, seen = [], set()
+        while len(out) < n:
+            w = "".join(self.rng.choice(SYLLABLES) for _ in range(self.rng.randint(2, 4)))
+            if len(w) >= 4 and w not in seen:
+                seen.add(w)
+                out.append(w)
+        return out
+
+    def _tickers(self, n: int) -> list[str]:
+        out, seen = [], {"SPY", "QQQ"}
+        while len(out) < n:
+            t = "".join(self.rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+                        for _ in range(self.rng.randint(2, 4)))
+            if t not in seen:
+                seen.add(t)
+                out.append(t)
+        return out
+
+    def _words(self, k: int) -> list[str]:
+        return self.rng.choices(self.vocab, cum_weights=self.cum_weights, k=k)
+
+    def write(self, root: Path) -> dict:
+        token_counts = self.write_articles(root)
+        self.write_tokens(root, token_counts)
+        self.write_trends(root, token_counts)
+        closes = self.write_prices(root)
+        self.write_tickers(root)
+        self.write_snapshots(root, closes)
+        return {"dims": self.dims, "tickers": len(self.tickers),
+                "news_days": len(self.news_dates), "trading_days": len(self.trading_days)}
+
+    def write_articles(self, root: Path) -> dict[str, Counter]:
+        """Raw articles (~5% re-syndicated duplicates); returns per-day token counts."""
+        out_dir = root / "data" / "live_newsapi"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.rng = self._rng("articles")
+        counts: dict[str, Counter] = {}
+        for d in self.news_dates:
+            day = d.isoformat()
+            c = counts[day] = Counter()
+            with (out_dir / f"{day}.jsonl").open("w", encoding="utf-8") as f:
+                for i in range(self.dims["articles"]):
+                    title, desc, body = self._words(8), self._words(20), self._words(40)
+                    c.update(title)
+                    c.update(desc)
+                    c.update(body)
+                    n = i if self.rng.random() > 0.05 else self.rng.randrange(max(1, i))
+                    ts = f"{day}T{self.rng.randrange(24):02d}:{self.rng.randrange(60):02d}:00Z"
+                    f.write(json.dumps({
+                        "source": {"id": None, "name": self.rng.choice(PUBLISHERS)},
+                        "title": " ".join(title).capitalize(),
+                        "description": " ".join(desc),
+                        "content": " ".join(body),
+                        "url": f"https://news.example.com/{day}/{n}?utm_source=feed",
+                        "publishedAt": ts,
+                    }) + "\n")
+        return counts
+
+    def write_tokens(self, root: Path, counts: dict[str, Counter]) -> None:
+        out_dir = root / "data" / "warehouse" / "daily"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for day, c in counts.items():
+            write_counts(out_dir / f"{day}{TKC_SUFFIX}", c.most_common())
+            # legacy mirror: --rev runs of revisions predating .tkc read this
+            with (out_dir / f"{day}_tokens.csv").open("w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["entity", "count"])
+                w.writerows(c.most_common())
+
+    def write_trends(self, root: Path, counts: dict[str, Counter], topk: int = 200) -> None:
+        dates = sorted(counts)
+        totals = Counter()
+        for c in counts.values():
+            totals.update(c)
+        terms = [t for t, _ in totals.most_common(topk)]
+        series = {t: [counts[d].get(t, 0) for d in dates] for t in terms}
+        zscores, slopes, bursts = {}, {}, {}
+        for t, s in series.items():
+            hist = s[-29:-1] or [0]
+            mean = sum(hist) / len(hist)
+            std = math.sqrt(sum((x - mean) ** 2 for x in hist) / len(hist)) or 1.0
+            zscores[t] = round((s[-1] - mean) / std, 3)
+            w = s[-14:]
+            slopes[t] = round((w[-1] - w[0]) / (len(w) * (mean or 1.0)), 4)
+            bursts[t] = round((sum(s[-3:]) / 3 - mean) / std, 3)
+        doc = {
+            "dates": dates,
+            "terms": terms,
+            "top": sorted(terms, key=lambda t: -zscores[t]),
+            "series": series,
+            "zscores": zscores,
+            "slopes": slopes,
+            "bursts": bursts,
+            "today": {t: s[-1] for t, s in series.items()},
+            "avg7": {t: round(sum(s[-7:]) / 7, 1) for t, s in series.items()},
+        }
+        out = root / "site" / "data" / "trends.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(doc, separators=(",", ":")), encoding="utf-8")
+
+    def write_prices(self, root: Path) -> dict[str, list[float]]:
+        """Geometric random walks → data/prices/<T>.csv ledgers + site/data/prices.json."""
+        csv_dir = root / "data" / "prices"
+        csv_dir.mkdir(parents=True, exist_ok=True)
+        self.rng = self._rng("prices")
+        dates = [d.isoformat() for d in self.trading_days]
+        market = [self.rng.gauss(0.0004, 0.01) for _ in dates]
+        tickers, all_closes = {}, {}
+        for tk in self.tickers:
+            beta, vol = self.rng.uniform(0.6, 1.6), self.rng.uniform(0.008, 0.03)
+            px = self.rng.uniform(20, 600)
+            closes, highs, lows, vols, rets = [], [], [], [], [None]
+            for i, m in enumerate(market):
+                r = beta * m + self.rng.gauss(0, vol)
+                if i:
+                    px *= 1 + r
+                    rets.append(round(r, 6))
+                closes.append(round(px, 2))
+                highs.append(round(px * (1 + abs(self.rng.gauss(0, vol / 2))), 2))
+                lows.append(round(px * (1 - abs(self.rng.gauss(0, vol / 2))), 2))
+                vols.append(int(self.rng.lognormvariate(15, 0.6)))
+            with (csv_dir / f"{tk}.csv").open("w", encoding="utf-8", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(["date", "open", "high", "low", "close", "volume", "adj_close"])
+                for row in zip(dates, closes, highs, lows, closes, vols, closes):
+                    w.writerow(row)
+            tickers[tk] = {"dates": dates, "closes": closes, "highs": highs, "lows": lows,
+                           "volumes": vols, "adj_closes": closes, "returns": rets}
+            all_closes[tk] = closes
+        out = root / "site" / "data" / "prices.json"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps({"updated": f"{END_DATE}T23:00:00Z", "tickers": tickers},
+                                  separators=(",", ":")), encoding="utf-8")
+        return all_closes
+
+    def write_tickers(self, root: Path) -> None:
+        by_sector: dict[str, list[str]] = {s: [] for s in SECTORS}
+        for i, tk in enumerate(self.tickers[2:]):
+            by_sector[SECTORS[i % len(SECTORS)]].append(tk)
+        (root / "site" / "data" / "tickers.json").write_text(json.dumps(by_sector, indent=2))
+
+    def write_snapshots(self, root: Path, closes: dict[str, list[float]]) -> None:
+        out_dir = root / "site" / "data" / "predictions_history"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        first_news = self.news_dates[0]
+        self.rng = self._rng("snapshots")
+        for i, d in enumerate(self.trading_days):
+            if d < first_news:
+                continue
+            preds = [self._prediction(tk, d, closes[tk][i]) for tk in self.tickers]
+            n_by = Counter(p["action"] for p in preds)
+            snap = {
+                "updated": f"{d}T22:00:00Z",
+                "data_quality": {"price_days": i + 1, "news_days": self.dims["days"],
+                                 "regime": "mature", "ta_reliable": True, "news_reliable": True,
+                                 "sma200_available": i >= 200},
+                "market_regime": {"regime": self.rng.choice(["RISK-ON", "RISK-OFF", "NEUTRAL"]),
+                                  "bull_pct": round(self.rng.random(), 2)},
+                **{f"n_{a.lower()}": n_by.get(a, 0) for a in ACTIONS},
+                "predictions": preds,
+            }
+            (out_dir / f"{d}.json").write_text(json.dumps(snap), encoding="utf-8")
+
+    def _prediction(self, tk: str, d: date, price: float) -> dict:
+        r = self.rng
+        return {
+            "ticker": tk, "date": d.isoformat(),
+            "action": r.choices(ACTIONS, weights=[3, 3, 5, 1, 1])[0],
+            "confidence": round(r.uniform(0.3, 0.95), 3),
+            "horizon": "3-5d", "price": price,
+            "signals": {"trend": r.choice(["bull", "strong_bull", "bear", "neutral"]),
+                        "rsi14": round(r.uniform(15, 85), 3),
+                        "macd_bias": r.choice(["bullish_cross", "bearish_cross", "neutral"]),
+                        "bb_position": r.choice(["below_lower", "lower_third", "middle", "upper_third"]),
+                        "volatility": r.choice(["low", "normal", "high"]),
+                        "hv20": round(r.uniform(8, 60), 4)},
+            "news": {"available": True, "best_conf": round(r.random(), 3),
+                     "news_z_today": round(r.gauss(0, 2), 2)},
+            "sentiment": {"filtered_score": None, "score": round(r.uniform(-1, 1), 3),
+                          "total": r.randrange(30)},
+            "fundamental": {"fundamental_score": round(r.random(), 3),
+                            "quality_score": round(r.random(), 3),
+                            "growth_score": round(r.random(), 3),
+                            "health_score": round(r.random(), 3)},
+            "insider": {"score": round(r.random(), 3)},
+        }
+
+
+def _accumulate(xs):
+    total = 0.0
+    for x in xs:
+        total += x
+        yield total
+
+
+def _calendar_days(end: date, n: int) -> list[date]:
+    return [end - timedelta(days=i) for i in range(n - 1, -1, -1)]
+
+
+def _weekdays(end: date, n: int) -> list[date]:
+    out, d = [], end
+    while len(out) < n:
+        if d.weekday() < 5:
+            out.append(d)
+        d -= timedelta(days=1)
+    return out[::-1]
+
+
+# ── code trees ──────────────────────────────────────────────────────────
+def _git(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, check=True)
+
+
+def resolve_rev(rev: str) -> str:
+    if rev == WORKTREE:
+        return WORKTREE
+    return _git("rev-parse", "--short", rev).stdout.decode().strip()
+
+
+def export_code(rev: str, dest: Path) -> None:
+    """Copy scripts/config/src as of `rev` (or the working tree) into dest."""
+    dest.mkdir(parents=True, exist_ok=True)
+    if rev == WORKTREE:
+        for p in CODE_PATHS:
+            if (ROOT / p).exists():
+                shutil.copytree(ROOT / p, dest / p, dirs_exist_ok=True,
+                                ignore=shutil.ignore_patterns("__pycache__", "legacy"))
+        return
+    present = set(_git("ls-tree", "--name-only", rev).stdout.decode().split())
+    paths = [p for p in CODE_PATHS if p in present]
+    blob = _git("archive", "--format=tar", rev, *paths).stdout
+    with tarfile.open(fileobj=io.BytesIO(blob)) as tf:
+        tf.extractall(dest)
+
+
+# ── measurement ─────────────────────────────────────────────────────────
+def _rss_mb(maxrss: int) -> float:
+    # Linux reports KiB, macOS bytes
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_measured(argv: list[str], cwd: Path, log: Path, timeout: float) -> dict:
+    """Run one stage as a child process; wall/CPU/peak RSS come from wait4()."""
+    env = {**os.environ, "NEWSTREND_PERF": "0", "PYTHONHASHSEED": "0",
+           "PYTHONDONTWRITEBYTECODE": "1"}
+    env.pop("NEWSTREND_PROFILE", None)
+    timed_out = threading.Event()
+    t0 = time.perf_counter()
+    with log.open("wb") as fh:
+        proc = subprocess.Popen([sys.executable, *argv], cwd=cwd, env=env,
+                                stdout=fh, stderr=subprocess.STDOUT)
+
+        def _kill():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, _kill)
+        timer.start()
+        try:
+            _, status, ru = os.wait4(proc.pid, 0)
+        finally:
+            timer.cancel()
+    wall = time.perf_counter() - t0
+    proc.returncode = rc = os.waitstatus_to_exitcode(status)
+    if timed_out.is_set():
+        outcome = "timeout"
+    elif rc == 0:
+        outcome = "ok"
+    else:
+        tail = log.read_text(encoding="utf-8", errors="replace").strip().splitlines()[-1:]
+        outcome = f"exit:{rc}" + (f" {tail[0][:160]}" if tail else "")
+    return {"wall_s": round(wall, 3), "cpu_s": round(ru.ru_utime + ru.ru_stime, 3),
+            "peak_rss_mb": _rss_mb(ru.ru_maxrss), "status": outcome, "returncode": rc}
+
+
+def _median(xs: list[float]) -> float:
+    xs = sorted(xs)
+    n = len(xs)
+    return xs[n // 2] if n % 2 else (xs[n // 2 - 1] + xs[n // 2]) / 2
+
+
+class Bench:
+    def __init__(self, workdir: Path, seed: int, repeat: int, timeout: float,
+                 stages: list[tuple[str, list[str]]], quiet: bool = False):
+        self.workdir = workdir
+        self.seed = seed
+        self.repeat = repeat
+        self.timeout = timeout
+        self.stages = stages
+        self.quiet = quiet
+
+    def log(self, msg: str) -> None:
+        if not self.quiet:
+            print(msg, flush=True)
+
+    def data_tree(self, scale: dict) -> Path:
+        """Generate the synthetic inputs for a scale once; runs copy from it."""
+        dims = scale_dims(scale)
+        key = "_".join(f"{a}{dims[a]}" for a in AXES)
+        seed_dir = self.workdir / "data" / key
+        if not (seed_dir / ".done").exists():
+            shutil.rmtree(seed_dir, ignore_errors=True)
+            t0 = time.perf_counter()
+            info = SyntheticCorpus(dims, self.seed).write(seed_dir)
+            (seed_dir / ".done").write_text(json.dumps(info))
+            self.log(f"  generated {key} in {time.perf_counter() - t0:.1f}s")
+        return seed_dir
+
+    def run_scale(self, rev: str, code: Path, scale: dict) -> list[dict]:
+        seed_dir = self.data_tree(scale)
+        runs: dict[str, list[dict]] = {name: [] for name, _ in self.stages}
+        for i in range(self.repeat):
+            # every repeat starts from pristine inputs: update_corpus and the
+            # outcome ledger are incremental and would no-op on a second pass
+            tree = self.workdir / "run"
+            shutil.rmtree(tree, ignore_errors=True)
+            shutil.copytree(seed_dir, tree)
+            shutil.copytree(code, tree, dirs_exist_ok=True)
+            logs = self.workdir / "logs" / rev / scale["name"].replace("=", "").replace(",", "_")
+            logs.mkdir(parents=True, exist_ok=True)
+            for name, argv in self.stages:
+                if not (tree / argv[0]).exists():
+                    runs[name].append({"wall_s": None, "cpu_s": None, "peak_rss_mb": None,
+                                       "status": "missing", "returncode": None})
+                    continue
+                runs[name].append(run_measured(argv, tree, logs / f"{name}.{i}.log", self.timeout))
+        rows = []
+        for name, rs in runs.items():
+            ok = [r for r in rs if r["status"] == "ok"]
+            base = ok or rs
+            row = {
+                "rev": rev, "scale": scale["name"], "stage": name,
+                "wall_s": round(_median([r["wall_s"] for r in ok]), 3) if ok else None,
+                "cpu_s": round(_median([r["cpu_s"] for r in ok]), 3) if ok else None,
+                "peak_rss_mb": max(r["peak_rss_mb"] for r in ok) if ok else None,
+                "status": "ok" if len(ok) == len(rs) else base[-1]["status"],
+                "runs": [r["wall_s"] for r in rs],
+            }
+            rows.append(row)
+            wall = f"{row['wall_s']:8.2f}s" if row["wall_s"] is not None else "       —"
+            rss = f"{row['peak_rss_mb']:7.1f}MB" if row["peak_rss_mb"] is not None else "        —"
+            self.log(f"    {name:26s} {wall}  {rss}  {row['status']}")
+        return rows
+
+
+# ── analysis ────────────────────────────────────────────────────────────
+def build_curves(results: list[dict], scales: list[dict]) -> dict:
+    """Per rev/stage/axis: factor-ordered wall & RSS series plus growth exponent."""
+    axis_of = {s["name"]: scale_axis(s) for s in scales}
+    curves: dict = {}
+    for r in results:
+        ax = axis_of.get(r["scale"])
+        if not ax or r["wall_s"] is None:
+            continue
+        stage = curves.setdefault(r["rev"], {}).setdefault(r["stage"], {})
+        targets = [*AXES, "all"] if ax[0] == "base" else [ax[0]]
+        for axis in targets:
+            stage.setdefault(axis, []).append((ax[1], r["wall_s"], r["peak_rss_mb"]))
+    for rev_curves in curves.values():
+        for stage, by_axis in rev_curves.items():
+            for axis, pts in list(by_axis.items()):
+                pts.sort()
+                if len(pts) < 2:
+                    del by_axis[axis]
+                    continue
+                (f0, w0, _), (f1, w1, _) = pts[0], pts[-1]
+                exp = (round(math.log(w1 / w0) / math.log(f1 / f0), 2)
+                       if w0 > 0 and w1 > 0 and f1 != f0 else None)
+                by_axis[axis] = {"factors": [p[0] for p in pts],
+                                 "wall_s": [p[1] for p in pts],
+                                 "peak_rss_mb": [p[2] for p in pts],
+                                 "exponent": exp,
+                                 "cliff": exp is not None and exp >= CLIFF_EXPONENT}
+    return curves
+
+
+def compare(results: list[dict], base_rev: str, threshold: float) -> list[dict]:
+    idx = {(r["rev"], r["scale"], r["stage"]): r for r in results}
+    out = []
+    for (rev, scale, stage), head in idx.items():
+        if rev == base_rev:
+            continue
+        base = idx.get((base_rev, scale, stage))
+        if not base or base["wall_s"] is None or head["wall_s"] is None or base["wall_s"] <= 0:
+            continue
+        ratio = head["wall_s"] / base["wall_s"]
+        rss_ratio = (head["peak_rss_mb"] / base["peak_rss_mb"]
+                     if base["peak_rss_mb"] else None)
+        out.append({"stage": stage, "scale": scale, "base": base_rev, "head": rev,
+                    "base_wall_s": base["wall_s"], "head_wall_s": head["wall_s"],
+                    "wall_ratio": round(ratio, 3),
+                    "rss_ratio": round(rss_ratio, 3) if rss_ratio else None,
+                    "regression": ratio >= threshold})
+    return out
+
+
+def print_report(doc: dict) -> None:
+    for rev, stages in doc["curves"].items():
+        print(f"\nGrowth exponents ({rev}; wall ∝ factor^k, cliff at k ≥ {CLIFF_EXPONENT}):")
+        for stage, by_axis in stages.items():
+            parts = [f"{a}={c['exponent']}{'!' if c['cliff'] else ''}"
+                     for a, c in by_axis.items() if c["exponent"] is not None]
+            print(f"  {stage:26s} {'  '.join(parts) or '—'}")
+    if doc["comparison"]:
+        print("\nRevision comparison (head / base wall time):")
+        for c in sorted(doc["comparison"], key=lambda c: -c["wall_ratio"]):
+            flag = "  ← regression" if c["regression"] else ""
+            print(f"  {c['stage']:26s} {c['scale']:14s} {c['base_wall_s']:8.2f}s → "
+                  f"{c['head_wall_s']:8.2f}s  ×{c['wall_ratio']:.2f}{flag}")
+
+
+# ── main ────────────────────────────────────────────────────────────────
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Synthetic-data scaling benchmark for pipeline stages")
+    ap.add_argument("--scales", nargs="+", default=DEFAULT_SCALES,
+                    help="scale specs: N (all axes) or axis=N[,axis=N] "
+                         f"(axes: {', '.join(AXES)}); default: {' '.join(DEFAULT_SCALES)}")
+    ap.add_argument("--stages", nargs="+", choices=[n for n, _ in STAGES],
+                    help="subset of stages (default: all)")
+    ap.add_argument("--rev", action="append", default=[],
+                    help="git revision to benchmark (repeatable; first is the baseline). "
+                         "A single --rev is compared against the working tree")
+    ap.add_argument("--repeat", type=int, default=1, help="runs per stage; median is reported")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=900, help="per-stage timeout in seconds")
+    ap.add_argument("--threshold", type=float, default=1.25,
+                    help="head/base wall ratio reported as a regression")
+    ap.add_argument("--out", default=str(OUT_FILE))
+    ap.add_argument("--workdir", help="keep generated data/logs here (default: temp dir, removed)")
+    ap.add_argument("--generate-only", metavar="DIR",
+                    help="only write the synthetic tree for the first scale into DIR")
+    ap.add_argument("--fail-on-regression", action="store_true")
+    ap.add_argument("--quiet", action="store_true")
+    args = ap.parse_args()
+
+    scales = [parse_scale(s) for s in args.scales]
+
+    if args.generate_only:
+        dest = Path(args.generate_only)
+        info = SyntheticCorpus(scale_dims(scales[0]), args.seed).write(dest)
+        print(f"Wrote synthetic tree → {dest}  {json.dumps(info['dims'])}")
+        return 0
+
+    stages = [s for s in STAGES if not args.stages or s[0] in args.stages]
+    revs = list(args.rev)
+    if len(revs) == 1:
+        revs.append(WORKTREE)
+    revs = [resolve_rev(r) for r in revs] or [WORKTREE]
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="newsbench_"))
+    bench = Bench(workdir, args.seed, max(1, args.repeat), args.timeout, stages, args.quiet)
+    results: list[dict] = []
+    try:
+        for rev in revs:
+            code = workdir / "code" / rev
+            shutil.rmtree(code, ignore_errors=True)
+            export_code(rev, code)
+            for scale in scales:
+                bench.log(f"[{rev}] scale {scale['name']}  {json.dumps(scale_dims(scale))}")
+                results.extend(bench.run_scale(rev, code, scale))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    doc = {
+        "generated_at": _now_iso(),
+        "seed": args.seed,
+        "repeat": bench.repeat,
+        "python": sys.version.split()[0],
+        "base": BASE,
+        "scales": [{**s, "dims": scale_dims(s)} for s in scales],
+        "revisions": revs,
+        "results": results,
+        "curves": build_curves(results, scales),
+        "comparison": compare(results, revs[0], args.threshold) if len(revs) > 1 else [],
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print_report(doc)
+    print(f"\n→ {out}")
+    if args.fail_on_regression and any(c["regression"] for c in doc["comparison"]):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
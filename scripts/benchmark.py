@@ -18,6 +18,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
+from jsonio import load_json
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -29,16 +30,18 @@ BENCHMARKS = ("SPY", "QQQ")
 
 # ── price helpers ──────────────────────────────────────────────────────────
 
+def closes_by_date(tickers: dict) -> dict[str, dict[str, float]]:
+    """prices.json `tickers` map -> {ticker: {date: close}}."""
+    return {tk: dict(zip(payload["dates"], payload["closes"]))
+            for tk, payload in tickers.items()}
+
+
 def _load_prices() -> dict[str, dict[str, float]]:
-    data = json.loads(PRICES_FILE.read_text())
-    out: dict[str, dict[str, float]] = {}
-    for tk, payload in data.get("tickers", {}).items():
-        out[tk] = dict(zip(payload["dates"], payload["closes"]))
-    return out
+    return closes_by_date(load_json(PRICES_FILE).get("tickers", {}))
 
 
-def _benchmark_return(prices: dict[str, dict[str, float]],
-                      ticker: str, start: str, end: str) -> float | None:
+def benchmark_return(prices: dict[str, dict[str, float]],
+                     ticker: str, start: str, end: str) -> float | None:
     ts = prices.get(ticker, {})
     dates_sorted = sorted(ts.keys())
     p0 = p1 = None
@@ -54,9 +57,21 @@ def _benchmark_return(prices: dict[str, dict[str, float]],
 
 # ── strategy evaluation ───────────────────────────────────────────────────
 
-def evaluate_strategies() -> dict:
-    paper = json.loads(PAPER_FILE.read_text())
-    prices = _load_prices()
+def avg_invested_pct(cash, total) -> float:
+    """Average % of the portfolio not in cash over a value history (0.1 pp)."""
+    cash_ratios = [c / t for c, t in zip(cash, total) if t > 0]
+    return round((1 - sum(cash_ratios) / len(cash_ratios)) * 100, 1) if cash_ratios else 0
+
+
+def exposure_adjusted_alpha(strat_ret: float, bm_ret: float, exposure: float) -> float:
+    """Headline alpha: strategy return minus the benchmark leg at the strategy's exposure."""
+    return strat_ret - exposure * bm_ret
+
+
+def evaluate_strategies(prices: dict[str, dict[str, float]] | None = None) -> dict:
+    paper = load_json(PAPER_FILE)
+    if prices is None:
+        prices = _load_prices()
     results: dict[str, dict] = {}
 
     for name, st in paper.get("strategies", {}).items():
@@ -69,8 +84,7 @@ def evaluate_strategies() -> dict:
         final = vh[-1]["total"]
         strat_ret = (final / initial - 1) if initial > 0 else 0
 
-        cash_ratios = [v["cash"] / v["total"] for v in vh if v["total"] > 0]
-        avg_invested = round((1 - sum(cash_ratios) / len(cash_ratios)) * 100, 1) if cash_ratios else 0
+        avg_invested = avg_invested_pct([v["cash"] for v in vh], [v["total"] for v in vh])
 
         # Exposure-adjusted alpha (STEP 3, 2026-08-05): the paper portfolio
         # averages only ~80-94% invested, so comparing its raw return against
@@ -82,10 +96,10 @@ def evaluate_strategies() -> dict:
         benchmarks = {}
         exposure = avg_invested / 100.0
         for bm in BENCHMARKS:
-            bm_ret = _benchmark_return(prices, bm, start_date, end_date)
+            bm_ret = benchmark_return(prices, bm, start_date, end_date)
             if bm_ret is not None:
                 alpha_raw = strat_ret - bm_ret
-                alpha_adj = strat_ret - exposure * bm_ret
+                alpha_adj = exposure_adjusted_alpha(strat_ret, bm_ret, exposure)
                 benchmarks[bm] = {
                     "return_pct": round(bm_ret * 100, 2),
                     "alpha_pct": round(alpha_adj * 100, 2),
@@ -111,16 +125,15 @@ def evaluate_strategies() -> dict:
 
 # ── self-test ──────────────────────────────────────────────────────────────
 
-def _self_test_alpha_zero() -> dict:
+def _self_test_alpha_zero(prices: dict[str, dict[str, float]]) -> dict:
     """If strategy return equals SPY return, alpha must be 0."""
-    prices = _load_prices()
     spy_ts = prices.get("SPY", {})
     if not spy_ts:
         return {"name": "alpha_zero", "expect": "alpha=0 when ret=benchmark",
                 "actual": "SPY prices not found", "pass": False}
     dates = sorted(spy_ts.keys())
     start, end = dates[0], dates[-1]
-    spy_ret = _benchmark_return(prices, "SPY", start, end)
+    spy_ret = benchmark_return(prices, "SPY", start, end)
     if spy_ret is None:
         return {"name": "alpha_zero", "expect": "alpha=0",
                 "actual": "no SPY return", "pass": False}
@@ -130,12 +143,11 @@ def _self_test_alpha_zero() -> dict:
             "actual": f"alpha={alpha:.10f}", "pass": ok}
 
 
-def _self_test_positive_alpha() -> dict:
+def _self_test_positive_alpha(prices: dict[str, dict[str, float]]) -> dict:
     """If strategy return > SPY return, alpha must be positive."""
-    prices = _load_prices()
     spy_ts = prices.get("SPY", {})
     dates = sorted(spy_ts.keys())
-    spy_ret = _benchmark_return(prices, "SPY", dates[0], dates[-1])
+    spy_ret = benchmark_return(prices, "SPY", dates[0], dates[-1])
     fake_ret = (spy_ret or 0) + 0.05  # 5% above SPY
     alpha = fake_ret - (spy_ret or 0)
     ok = abs(alpha - 0.05) < 1e-10
@@ -143,8 +155,10 @@ def _self_test_positive_alpha() -> dict:
             "actual": f"alpha={alpha*100:+.2f}%", "pass": ok}
 
 
-def run_self_tests() -> list[dict]:
-    return [_self_test_alpha_zero(), _self_test_positive_alpha()]
+def run_self_tests(prices: dict[str, dict[str, float]] | None = None) -> list[dict]:
+    if prices is None:
+        prices = _load_prices()
+    return [_self_test_alpha_zero(prices), _self_test_positive_alpha(prices)]
 
 
 # ── main ───────────────────────────────────────────────────────────────────
@@ -26,11 +26,16 @@ import statistics
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from article_index import ArticleIndex, ticker_query
+from jsonio import dump_json, load_json
+from perf import instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
 OUT_LATEST = DATA / "daily_report.json"
 OUT_DIR = DATA / "daily_reports"
+INDEX_PATH = ROOT / "data" / "warehouse" / "articles_fts.sqlite"
+ALIASES_PATH = ROOT / "config" / "ticker_aliases.json"
 
 ARCHIVE_DAYS = 30
 LOW_CONFIDENCE_N = 5   # 섹터 종목 수가 이보다 적으면 평균은 노이즈 — 저신뢰 표시
@@ -46,7 +51,7 @@ ETF_LABELS = {
 
 def _load(path: Path) -> dict:
     try:
-        return json.loads(path.read_text())
+        return load_json(path)
     except (OSError, json.JSONDecodeError):
         return {}
 
@@ -150,6 +155,21 @@ def _load_headlines(sent_date: str) -> dict[str, list[dict]]:
     return out
 
 
+def _index_headlines(tickers: list[str], day: str) -> dict[str, dict]:
+    """sentiment_per_day에 기사가 없는 종목용 — 전문 색인에서 당일 최신 기사 1건."""
+    if not tickers or not INDEX_PATH.exists():
+        return {}
+    aliases = _load(ALIASES_PATH)
+    out: dict[str, dict] = {}
+    with ArticleIndex(INDEX_PATH, readonly=True) as idx:
+        for tk in tickers:
+            q = ticker_query(tk, aliases)
+            hits = idx.search(q, raw=True, start=day, end=day, limit=1) if q else []
+            if hits:
+                out[tk] = hits[0]
+    return out
+
+
 def build_news(smap: dict[str, str], prices: dict) -> dict:
     # ⚠ predictions.json의 news_z_today는 쓰지 않는다: trends.json hot 20
     # 단어의 |z| 합계 = 날짜당 단일 전역값이 전 종목에 복사된 것이라
@@ -208,6 +228,11 @@ def build_news(smap: dict[str, str], prices: dict) -> dict:
                     item["react_pct"] - statistics.mean(peer_rets), 2)
         surge.append(item)
     surge.sort(key=lambda x: -x["ratio"])
+    missing = [x["ticker"] for x in surge if "headline" not in x]
+    for tk, hit in _index_headlines(missing, sent_date).items():
+        item = next(x for x in surge if x["ticker"] == tk)
+        item["headline"] = (hit["title"] or "")[:120]
+        item["headline_url"] = hit["url"]
     # (b) 섹터별 sentiment — D-2 완성일 기준 (클램프된 ticker_sentiment).
     # ③ Δ7d: 자기 자신의 직전 7일 평균 대비 변화 (FinBERT의 금융뉴스 부정
     #   편향 때문에 레벨보다 변화가 해석 가능). baseline 검증(2026-08-06)
@@ -342,6 +367,7 @@ def rotate_archive() -> list[str]:
     return [f.stem for f in keep]
 
 
+@instrument("build_daily_report")
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--force", action="store_true",
@@ -389,14 +415,12 @@ def main() -> int:
         payload["summary"] = generate_summary(payload)
 
     OUT_DIR.mkdir(parents=True, exist_ok=True)
-    OUT_LATEST.write_text(json.dumps(payload, ensure_ascii=False, indent=1))
+    dump_json(OUT_LATEST, payload, indent=1)
     (OUT_DIR / f"{date}.json").write_text(
         json.dumps(payload, ensure_ascii=False, indent=1))
 
     dates = rotate_archive()
-    (OUT_DIR / "index.json").write_text(json.dumps(
-        {"dates": dates, "updated": payload["generated_at"]},
-        ensure_ascii=False, indent=1))
+    dump_json(OUT_DIR / "index.json", {"dates": dates, "updated": payload["generated_at"]}, indent=1)
 
     s = payload["summary"]
     print(f"daily_report: {date} 생성 (sectors={len(payload['sectors'])}, "
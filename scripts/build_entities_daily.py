@@ -1,65 +1,165 @@
-import pathlib, json, gzip, sys, pandas as pd
-
-def iter_jsonl(p):
-    with open(p, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s = line.strip()
-            if s:
-                yield s
-
-def iter_jsonl_gz(p):
-    with gzip.open(p, "rt", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            s = line.strip()
-            if s:
-                yield s
+"""
+build_entities_daily.py — site/data/entities_daily.jsonl from the per-day token files.
+
+Incremental: each day's rows ({"date", "tok", "n"}) live in their own
+partition, data/entities_daily/<date>.jsonl, and manifest.json there records
+the source file each partition was built from (path, size, sha256). A run
+only re-parses days whose source is new or changed:
+
+  - size + partition + sha256 ok    -> skip (hashed only if the first two pass)
+  - otherwise                       -> rewrite that day's partition
+  - source gone                     -> drop the partition
+
+mtimes are deliberately not part of the key: CI restores every source fresh
+each run, and the manifest is committed, so a recorded mtime would rewrite
+every day's entry on every run. The digests themselves are memoized on
+(size, mtime_ns) in data/pipeline/entities_daily_hashes.json, a local,
+uncommitted cache (as run_pipeline does), so a re-run on the same checkout
+does not re-read unchanged sources.
+
+The aggregate is the partitions concatenated in date order, copied as bytes
+(nothing is json-decoded). When every rewritten day is newer than the last
+one already in it, the new partitions are appended in place; any other
+change re-concatenates. Partitions are checked against the sizes the
+manifest recorded, so a partial write or a half-merged manifest only costs
+a rebuild of the days it touches.
+
+Usage:
+    python3 scripts/build_entities_daily.py           # incremental
+    python3 scripts/build_entities_daily.py --full    # rebuild every day
+"""
+
+import argparse
+import hashlib
+import os
+import pathlib
+import re
+import shutil
+import sys
+
+from jsonio import JsonlWriter, dump_json, load_json
+from perf import count, instrument
+from tokcounts import day_files, read_day
 
 src_site = pathlib.Path("site/data/daily")
 src_wh = pathlib.Path("data/warehouse/daily")
 dst = pathlib.Path("site/data/entities_daily.jsonl")
-dst.parent.mkdir(parents=True, exist_ok=True)
-
-inputs = []
-if src_site.is_dir():
-    inputs += sorted(src_site.glob("*.jsonl"))
-    inputs += sorted(src_site.glob("*.jsonl.gz"))
-if not inputs and src_wh.is_dir():
-    inputs += sorted(src_wh.glob("*.jsonl"))
-    inputs += sorted(src_wh.glob("*.jsonl.gz"))
-
-written = 0
-with dst.open("w", encoding="utf-8") as w:
-    for f in inputs:
-        stem = pathlib.Path(f).stem
-        if stem.endswith(".jsonl"):
-            stem = stem[:-6]
-        date = stem.replace("_tokens", "")
-        it = iter_jsonl_gz(f) if str(f).endswith(".gz") else iter_jsonl(f)
-        for s in it:
-            try:
-                o = json.loads(s)
-            except Exception:
-                continue
-            tok = o.get("tok") or o.get("entity")
-            n = o.get("n") if "n" in o else o.get("count")
-            if tok is None or n is None:
-                continue
-            w.write(json.dumps({"date": date, "tok": str(tok), "n": int(n)}, ensure_ascii=False) + "\n")
-            written += 1
-
-if written == 0 and src_wh.is_dir():
-    for f in sorted(src_wh.glob("*.csv")):
-        date = f.stem
-        try:
-            df = pd.read_csv(f)
-        except Exception:
-            continue
-        if not {"entity","count"}.issubset(df.columns):
+PART_DIR = pathlib.Path("data/entities_daily")
+MANIFEST = PART_DIR / "manifest.json"
+MANIFEST_VERSION = 2
+HASH_CACHE = pathlib.Path("data/pipeline/entities_daily_hashes.json")  # git-ignored
+
+_DATE_CSV = re.compile(r"\d{4}-\d{2}-\d{2}\.csv$")
+
+
+def sources() -> dict[str, pathlib.Path]:
+    """{date: token file}: <date>_tokens.tkc (csv_to_tokens) first, then
+    legacy *_tokens.jsonl(.gz) / *_tokens.csv left in older caches. With no
+    token files at all, the extract_terms <date>.csv files in the warehouse."""
+    found = day_files(src_site, src_wh)
+    if not found and src_wh.is_dir():
+        found = {f.stem: f for f in sorted(src_wh.glob("*.csv")) if _DATE_CSV.match(f.name)}
+    return found
+
+
+def _sha256(path: pathlib.Path, cache: dict) -> str:
+    """sha256 of path, memoized in `cache` on (size, mtime_ns)."""
+    st = path.stat()
+    hit = cache.get(str(path))
+    if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return hit[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    cache[str(path)] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+    return h.hexdigest()
+
+
+def _part(date: str) -> pathlib.Path:
+    return PART_DIR / f"{date}.jsonl"
+
+
+def _part_ok(date: str, ent: dict | None) -> bool:
+    p = _part(date)
+    return ent is not None and p.exists() and p.stat().st_size == ent.get("part_size")
+
+
+def write_partition(date: str, src: pathlib.Path) -> dict:
+    with JsonlWriter(_part(date), atomic=True) as w:
+        for tok, n in read_day(src).items():
+            w.write({"date": date, "tok": tok, "n": int(n)})
+    return {"rows": w.count, "part_size": _part(date).stat().st_size}
+
+
+def concat(dates, out: pathlib.Path, append: bool = False) -> None:
+    """Partition bytes for `dates`, in order, into out (atomic unless appending)."""
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out if append else out.with_name(f".{out.name}.tmp")
+    with open(tmp, "ab" if append else "wb") as f:
+        for d in dates:
+            with open(_part(d), "rb") as p:
+                shutil.copyfileobj(p, f)
+    if not append:
+        os.replace(tmp, out)
+
+
+@instrument("build_entities_daily")
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Incremental entities_daily.jsonl")
+    ap.add_argument("--full", action="store_true", help="ignore the manifest and rebuild every day")
+    args = ap.parse_args()
+
+    PART_DIR.mkdir(parents=True, exist_ok=True)
+    man = {} if args.full else load_json(MANIFEST, default={})
+    if man.get("version") != MANIFEST_VERSION:
+        man = {}
+    days: dict[str, dict] = man.get("days", {})
+    prev_last = max(days, default="")
+
+    src = sources()
+    hashes = load_json(HASH_CACHE, default={})
+    rebuilt, rows_built = [], 0
+    for date, f in src.items():
+        size = f.stat().st_size
+        ent = days.get(date)
+        # cheap checks first: a source is only hashed to confirm a skip or to record it
+        if _part_ok(date, ent) and ent.get("size") == size and ent.get("sha256") == _sha256(f, hashes):
             continue
-        with dst.open("a", encoding="utf-8") as w:
-            for r in df.itertuples(index=False):
-                w.write(json.dumps({"date": date, "tok": str(r.entity), "n": int(r.count)}, ensure_ascii=False) + "\n")
-                written += 1
+        days[date] = {"src": str(f), "size": size, "sha256": _sha256(f, hashes),
+                      **write_partition(date, f)}
+        rows_built += days[date]["rows"]
+        rebuilt.append(date)
+
+    removed = sorted(set(days) - set(src))
+    for date in removed:
+        _part(date).unlink(missing_ok=True)
+        del days[date]
+
+    order = sorted(days)
+    appendable = (not removed and dst.exists()
+                  and dst.stat().st_size == man.get("aggregate_size")
+                  and all(d > prev_last for d in rebuilt))
+    if appendable:
+        if rebuilt:
+            concat(sorted(rebuilt), dst, append=True)
+    else:
+        concat(order, dst)
+
+    dump_json(MANIFEST, {"version": MANIFEST_VERSION,
+                         "aggregate_size": dst.stat().st_size,
+                         "days": {d: days[d] for d in order}}, indent=2)
+
+    HASH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(HASH_CACHE, {str(f): hashes[str(f)] for f in src.values() if str(f) in hashes})
+
+    count(rows_built)
+    total = sum(days[d]["rows"] for d in order)
+    print(f"wrote {dst} rows={total}  days={len(order)} "
+          f"(rebuilt {len(rebuilt)}, removed {len(removed)}; "
+          f"{('appended' if rebuilt else 'unchanged') if appendable else 'concatenated'})")
+    return 0
+
 
-print(f"wrote {dst} rows={written}")
-sys.exit(0)
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,6 +42,8 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
 from sec_edgar_fetcher import SECFetcher  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
 
 
 # ── 경로 ─────────────────────────────────────────────────────────────────────
@@ -84,7 +86,7 @@ def is_cache_fresh(path: Path, ttl_hours: float = CACHE_TTL_HOURS) -> bool:
 def load_manifest() -> dict:
     if CACHE_MANIFEST.exists():
         try:
-            return json.loads(CACHE_MANIFEST.read_text())
+            return load_json(CACHE_MANIFEST)
         except json.JSONDecodeError:
             return {}
     return {}
@@ -92,7 +94,7 @@ def load_manifest() -> dict:
 
 def save_manifest(m: dict) -> None:
     RAW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    CACHE_MANIFEST.write_text(json.dumps(m, indent=2))
+    dump_json(CACHE_MANIFEST, m, indent=2)
 
 
 def fetch_with_cache(
@@ -106,13 +108,13 @@ def fetch_with_cache(
     cik = fetcher.resolve_cik(ticker)
     path = cache_path_for(cik)
     if not refresh and is_cache_fresh(path):
-        facts = json.loads(path.read_text())
+        facts = load_json(path)
         fetcher._facts_cache[ticker.upper()] = facts   # warm in-memory cache
         return facts, "cache"
 
     facts = fetcher.get_company_facts(ticker)
     RAW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(facts))
+    dump_json(path, facts)
     return facts, "fetched"
 
 
@@ -126,13 +128,13 @@ def fetch_subs_with_cache(
     cik = fetcher.resolve_cik(ticker)
     path = subs_cache_path_for(cik)
     if not refresh and is_cache_fresh(path):
-        subs = json.loads(path.read_text())
+        subs = load_json(path)
         fetcher._subs_cache[ticker.upper()] = subs
         return subs, "cache"
 
     subs = fetcher.get_submissions(ticker)
     RAW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(subs))
+    dump_json(path, subs)
     return subs, "fetched"
 
 
@@ -287,6 +289,7 @@ def load_universe() -> list[str]:
     ]
 
 
+@instrument("build_fundamentals")
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Build per-ticker fundamentals + aggregate index")
     ap.add_argument("tickers", nargs="*", help="대상 종목 (생략 시 전체 universe)")
@@ -372,7 +375,7 @@ def main(argv: list[str] | None = None) -> int:
         save_manifest(manifest)
         if not args.no_aggregate:
             agg = aggregate_index(per_ticker, skipped)
-            AGGREGATE_FILE.write_text(json.dumps(agg, indent=2, default=str))
+            dump_json(AGGREGATE_FILE, agg, indent=2, default=str)
             print(f"\n[build] wrote {AGGREGATE_FILE.relative_to(ROOT)}", file=sys.stderr)
 
     ok_n   = sum(1 for p in per_ticker.values() if p["status"] == "ok")
@@ -12,10 +12,12 @@ Upgrades over v2:
 """
 
 import argparse
-import json
 import math
 from datetime import datetime, timezone
 from pathlib import Path
+from inference import corr_pvalue
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 # ── Statistical helpers ───────────────────────────────────────────────────────
@@ -34,45 +36,6 @@ def pearson(xs, ys):
     return round(num / (dx * dy), 4)
 
 
-def _erfcc(x):
-    """Complementary error function — Numerical Recipes Chebyshev approximation,
-    accurate to ≤1.2e-7 over the real line. Pure math, no scipy."""
-    z = abs(x)
-    t = 1.0 / (1.0 + 0.5 * z)
-    r = t * math.exp(
-        -z * z - 1.26551223
-        + t * ( 1.00002368
-        + t * ( 0.37409196
-        + t * ( 0.09678418
-        + t * (-0.18628806
-        + t * ( 0.27886807
-        + t * (-1.13520398
-        + t * ( 1.48851587
-        + t * (-0.82215223
-        + t *   0.17087277))))))))
-    )
-    return r if x >= 0 else 2.0 - r
-
-
-def p_value_approx(r, n):
-    """Two-tailed p-value for Pearson correlation under H0: r=0.
-
-    Uses t = r·√(n-2)/√(1-r²) (df = n-2). For df ≥ 30 the t-distribution
-    is well-approximated by the standard normal, so we evaluate the
-    survival function via erfcc. Pure math (no scipy).
-
-    Note: the previous (pre-2026-05-08) implementation accidentally cancelled
-    the √(n-2) factor and was effectively sample-size-blind — it rejected
-    even strongly significant moderate correlations (e.g. r=0.30, n=120 → 1.0).
-    """
-    if r is None or n < 4 or abs(r) >= 1.0:
-        return 1.0
-    t = abs(r) * math.sqrt(n - 2) / math.sqrt(1 - r * r + 1e-12)
-    # 2-sided: P(|Z| > t) = erfcc(t/√2)
-    p = _erfcc(t / math.sqrt(2.0))
-    return round(min(1.0, max(0.0, p)), 4)
-
-
 def zscore_series(counts, window=28):
     result = []
     for i, c in enumerate(counts):
@@ -136,8 +99,8 @@ def confidence_score(corr, hit_rate, n_events, consistency, source_proxy):
 def build_corr(trends_path, prices_path,
                top_terms, min_corr, min_events, lag_range, min_conf):
 
-    T = json.loads(Path(trends_path).read_text())
-    P = json.loads(Path(prices_path).read_text())
+    T = load_json(trends_path)
+    P = load_json(prices_path)
 
     t_dates  = T["dates"]
     t_series = T["series"]
@@ -217,7 +180,7 @@ def build_corr(trends_path, prices_path,
                    0 < p_ret_idx[d] - best_lag < len(p_returns) and
                    p_returns[p_ret_idx[d] - best_lag] is not None
             )
-            pval = p_value_approx(best_corr, n_train_pts)
+            pval = corr_pvalue(best_corr, n_train_pts)
             if pval > 0.20:  # relaxed during data accumulation phase
                 continue
 
@@ -360,6 +323,7 @@ def find_cooccurrence_clusters(T, min_corr=0.70, top_n=20):
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 
+@instrument("build_signal_corr")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends",     default="site/data/trends.json")
@@ -375,7 +339,7 @@ def main():
     print(f"Loading trends : {args.trends}")
     print(f"Loading prices : {args.prices}")
 
-    T = json.loads(Path(args.trends).read_text())
+    T = load_json(args.trends)
     result = build_corr(
         args.trends, args.prices,
         args.top_terms, args.min_corr, args.min_events,
@@ -389,14 +353,14 @@ def main():
     # D-1 input watermark: record the data dates actually consumed, so the
     # CI gate can detect a fresh-looking output built from stale inputs.
     from input_watermark import trends_watermark, prices_watermark
-    P = json.loads(Path(args.prices).read_text())
+    P = load_json(args.prices)
     result["input_watermark"] = {
         "trends": trends_watermark(T, args.trends),
         "prices": prices_watermark(P, args.prices),
     }
 
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    Path(args.out).write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+    dump_json(args.out, result)
 
     print(f"\n→ {args.out}")
     print(f"  pairs      : {result['n_pairs']}")
@@ -0,0 +1,243 @@
+"""
+build_site_bundle.py — shard the heavy site artifacts for lazy page loads.
+
+ticker_detail.html and signals.html used to fetch whole multi-MB files
+(prices.json 2.1 MB, signal_corr.json 1.9 MB, trends.json, ...) just to
+draw one ticker. This stage splits those artifacts into small shards under
+site/data/bundle/ and writes a manifest the pages' loader (site/bundle.js)
+resolves shards from:
+
+  prices            per ticker       {dates, closes, ...}  (prices.json payload)
+  ticker_sentiment  meta only        {dates, model, threshold, ..., tickers}
+  signal_corr       per ticker       full pairs incl. lag_corrs
+                    + meta           n_* counters, term_stats, cooccurrence and
+                                     every pair WITHOUT lag_corrs (list view)
+  trends            per term prefix  {series: {term: [...]}} (first char of term)
+                    + meta           dates, terms, top, zscores/slopes/bursts/today/avg7
+
+Every shard is written as <name>.<sha1[:10]>.json (immutable, cacheable
+forever) plus a pre-gzipped .json.gz and, when the optional `brotli` package
+is installed, a .json.br. Files from previous builds that the new manifest
+no longer references are deleted.
+
+Usage:
+  python scripts/build_site_bundle.py                 # site/data → site/data/bundle
+  python scripts/build_site_bundle.py --no-compress   # skip .gz/.br variants
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import brotli  # optional: only emits .br variants when installed
+except ImportError:
+    brotli = None
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
+
+DATA = ROOT / "site" / "data"
+BUNDLE_DIR = DATA / "bundle"
+MANIFEST = BUNDLE_DIR / "manifest.json"
+
+MANIFEST_VERSION = 1
+HASH_LEN = 10
+
+_KEY_RE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _load(path: Path) -> dict | None:
+    if not path.exists():
+        return None
+    try:
+        return load_json(path)
+    except (json.JSONDecodeError, OSError):
+        return None
+
+
+def term_prefix(term: str) -> str:
+    """Shard key for a trends term: its first character ('_' if not a-z/0-9).
+
+    Mirrored by SiteBundle.termPrefix() in site/bundle.js — keep in sync.
+    """
+    c = (term or "_")[0].lower()
+    return c if ("a" <= c <= "z" or "0" <= c <= "9") else "_"
+
+
+class BundleWriter:
+    """Writes content-addressed shards and collects their manifest entries."""
+
+    def __init__(self, outdir: Path, compress: bool = True):
+        self.outdir = outdir
+        self.compress = compress
+        self.written: set[Path] = set()
+        self.stats = {"files": 0, "bytes": 0, "gz_bytes": 0, "br_bytes": 0}
+
+    def write(self, artifact: str, name: str, obj) -> dict:
+        raw = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha1(raw).hexdigest()[:HASH_LEN]
+        rel = Path(artifact) / f"{_KEY_RE.sub('_', name)}.{digest}.json"
+        path = self.outdir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():  # same hash → same bytes, already on disk
+            path.write_bytes(raw)
+        self.written.add(path)
+        entry = {"path": rel.as_posix(), "bytes": len(raw)}
+        self.stats["files"] += 1
+        self.stats["bytes"] += len(raw)
+        if self.compress:
+            gz = path.with_name(path.name + ".gz")
+            if not gz.exists():
+                gz.write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+            self.written.add(gz)
+            entry["gz"] = gz.stat().st_size
+            self.stats["gz_bytes"] += entry["gz"]
+            if brotli is not None:
+                br = path.with_name(path.name + ".br")
+                if not br.exists():
+                    br.write_bytes(brotli.compress(raw, quality=11))
+                self.written.add(br)
+                entry["br"] = br.stat().st_size
+                self.stats["br_bytes"] += entry["br"]
+        return entry
+
+    def prune(self) -> int:
+        """Delete shard files not produced by this build."""
+        removed = 0
+        if not self.outdir.exists():
+            return 0
+        for p in self.outdir.rglob("*"):
+            if p.is_file() and p.name != MANIFEST.name and p not in self.written:
+                p.unlink()
+                removed += 1
+        return removed
+
+
+# ── per-artifact sharders ───────────────────────────────────────────────
+def bundle_prices(w: BundleWriter, prices: dict) -> dict:
+    tickers = prices.get("tickers") or {}
+    return {
+        "source": "prices.json",
+        "shard_by": "ticker",
+        "meta": w.write("prices", "_meta", {"updated": prices.get("updated"),
+                                            "tickers": sorted(tickers)}),
+        "shards": {tk: w.write("prices", tk, payload) for tk, payload in sorted(tickers.items())},
+    }
+
+
+def bundle_ticker_sentiment(w: BundleWriter, sent: dict) -> dict:
+    # Only system_health reads this (for the freshness dates), so the
+    # per-ticker payloads are not sharded; add them back when a page needs them.
+    meta = {k: v for k, v in sent.items() if k != "tickers"}
+    meta["tickers"] = sorted(sent.get("tickers") or {})
+    return {
+        "source": "ticker_sentiment.json",
+        "shard_by": None,
+        "meta": w.write("ticker_sentiment", "_meta", meta),
+        "shards": {},
+    }
+
+
+def bundle_signal_corr(w: BundleWriter, sc: dict) -> dict:
+    pairs = sc.get("pairs") or []
+    by_ticker: dict[str, list] = defaultdict(list)
+    for p in pairs:
+        by_ticker[p.get("ticker") or "_"].append(p)
+    meta = {k: v for k, v in sc.items() if k != "pairs"}
+    # List view needs every pair's headline stats but never lag_corrs,
+    # which is ~half of the file; the detail view pulls the ticker shard.
+    meta["pairs"] = [{k: v for k, v in p.items() if k != "lag_corrs"} for p in pairs]
+    return {
+        "source": "signal_corr.json",
+        "shard_by": "ticker",
+        "meta": w.write("signal_corr", "_meta", meta),
+        "shards": {tk: w.write("signal_corr", tk, {"ticker": tk, "pairs": ps})
+                   for tk, ps in sorted(by_ticker.items())},
+    }
+
+
+def bundle_trends(w: BundleWriter, trends: dict) -> dict:
+    series = trends.get("series") or {}
+    by_prefix: dict[str, dict] = defaultdict(dict)
+    for term, counts in series.items():
+        by_prefix[term_prefix(term)][term] = counts
+    meta = {k: v for k, v in trends.items() if k != "series"}
+    return {
+        "source": "trends.json",
+        "shard_by": "term_prefix",
+        "meta": w.write("trends", "_meta", meta),
+        "shards": {pf: w.write("trends", pf, {"series": terms})
+                   for pf, terms in sorted(by_prefix.items())},
+    }
+
+
+def build_bundle(data_dir: Path = DATA, outdir: Path = BUNDLE_DIR,
+                 compress: bool = True) -> dict:
+    w = BundleWriter(outdir, compress=compress)
+    artifacts: dict[str, dict] = {}
+
+    prices = _load(data_dir / "prices.json")
+    if prices:
+        artifacts["prices"] = bundle_prices(w, prices)
+    sent = _load(data_dir / "ticker_sentiment.json")
+    if sent:
+        artifacts["ticker_sentiment"] = bundle_ticker_sentiment(w, sent)
+    sc = _load(data_dir / "signal_corr.json")
+    if sc:
+        artifacts["signal_corr"] = bundle_signal_corr(w, sc)
+    trends = _load(data_dir / "trends.json")
+    if trends:
+        artifacts["trends"] = bundle_trends(w, trends)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "generated": _now_iso(),
+        "encodings": (["gz"] + (["br"] if brotli is not None else [])) if compress else [],
+        "artifacts": artifacts,
+        "stats": w.stats,
+    }
+    outdir.mkdir(parents=True, exist_ok=True)
+    dump_json(outdir / MANIFEST.name, manifest)
+    manifest["pruned"] = w.prune()
+    return manifest
+
+
+@instrument("build_site_bundle")
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Shard site artifacts into a lazy-load bundle")
+    ap.add_argument("--data", default=str(DATA))
+    ap.add_argument("--out", default=str(BUNDLE_DIR))
+    ap.add_argument("--no-compress", action="store_true", help="skip .gz/.br variants")
+    args = ap.parse_args()
+
+    out = Path(args.out)
+    m = build_bundle(Path(args.data), out, compress=not args.no_compress)
+    s = m["stats"]
+    print(f"Wrote {out / MANIFEST.name}")
+    for name, a in m["artifacts"].items():
+        n = len(a["shards"])
+        by = f"by {a['shard_by']}" if a["shard_by"] else "(meta only)"
+        print(f"  {name:17s} {n:4d} shards {by}  (source {a['source']})")
+    print(f"  files={s['files']}  json={s['bytes']/1e6:.2f}MB  gz={s['gz_bytes']/1e6:.2f}MB"
+          + (f"  br={s['br_bytes']/1e6:.2f}MB" if s["br_bytes"] else "")
+          + f"  pruned={m['pruned']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
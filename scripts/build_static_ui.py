@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
-import json, pathlib, re, datetime as dt
+import pathlib, sys, datetime as dt
 from collections import defaultdict, Counter
+from jsonio import dump_json
+from warehouse import Warehouse
 
 ROOT = pathlib.Path(__file__).resolve().parent
 
@@ -9,43 +11,29 @@ def load_range(run_dir: pathlib.Path, wh_dir: pathlib.Path):
     if rng.exists():
         s, e = open(rng).read().strip().split()
     else:
-        files = sorted(p for p in wh_dir.glob("*.jsonl") if re.match(r"\d{4}-\d{2}-\d{2}\.jsonl$", p.name))
-        if not files:
-            raise SystemExit("no warehouse daily files")
-        s = files[0].name[:10]
-        e = files[-1].name[:10]
+        days = Warehouse.for_daily_dir(wh_dir).days()
+        if not days:
+            sys.exit("no warehouse daily files")
+        s, e = days[0], days[-1]
     return dt.date.fromisoformat(s), dt.date.fromisoformat(e)
 
 def build_basic_jsons(wh_daily: pathlib.Path, out_data: pathlib.Path, s: dt.date, e: dt.date):
-    import orjson
     pubs = Counter()
     day_keys = defaultdict(set)
-    for f in sorted(wh_daily.glob("*.jsonl")):
-        m = re.match(r"(\d{4}-\d{2}-\d{2})\.jsonl", f.name)
-        if not m: continue
-        d = dt.date.fromisoformat(m.group(1))
-        if d < s or d > e: continue
-        with open(f, "rb") as fh:
-            for line in fh:
-                try:
-                    o = orjson.loads(line)
-                except:
-                    continue
-                v = o.get("publisher") or o.get("source") or o.get("source_name") or o.get("site") or o.get("domain") or ""
-                if isinstance(v, dict): v = v.get("name") or v.get("id") or ""
-                if isinstance(v, list): v = v[0] if v else ""
-                v = str(v).strip()
-                if v: pubs[v] += 1
-                url = (o.get("url") or o.get("link") or "").strip()
-                title = (o.get("title") or "").strip()
-                key = url or (title, v)
-                if key: day_keys[d].add(key)
+    # publisher/url/title only — content and descriptions are never read
+    for o in Warehouse.for_daily_dir(wh_daily).scan(s, e, ["date", "publisher", "url", "title"]):
+        v = o["publisher"] or ""
+        if v: pubs[v] += 1
+        url = (o["url"] or "").strip()
+        title = (o["title"] or "").strip()
+        key = url or (title, v)
+        if key: day_keys[dt.date.fromisoformat(o["date"])].add(key)
 
     top_pubs = pubs.most_common(50)
-    (out_data / "publishers.json").write_text(json.dumps({
+    dump_json(out_data / "publishers.json", {
         "labels":[k for k,_ in top_pubs],
         "counts":[int(v) for _,v in top_pubs]
-    }))
+    })
 
     dates, counts = [], []
     d = s
@@ -53,7 +41,7 @@ def build_basic_jsons(wh_daily: pathlib.Path, out_data: pathlib.Path, s: dt.date
         dates.append(d.isoformat())
         counts.append(len(day_keys.get(d, set())))
         d += dt.timedelta(days=1)
-    (out_data / "articles.json").write_text(json.dumps({"dates":dates,"articles":counts}))
+    dump_json(out_data / "articles.json", {"dates":dates,"articles":counts})
 
 def main(run: str, out_dir: str):
     out = pathlib.Path(out_dir); (out / "data").mkdir(parents=True, exist_ok=True)
@@ -72,7 +60,7 @@ def main(run: str, out_dir: str):
         for t in top_terms:
             sub = df[df["term"]==t].set_index("date")["count"]
             series[t] = [int(sub.get(d, 0)) for d in dates]
-        (out/"data"/"trends.json").write_text(json.dumps({"dates":dates,"terms":terms,"top":top_terms,"series":series}))
+        dump_json(out/"data"/"trends.json", {"dates":dates,"terms":terms,"top":top_terms,"series":series})
 
     sectors = ROOT.parent / "config" / "ticker_sectors.json"
     if sectors.exists():
@@ -87,8 +75,9 @@ def main(run: str, out_dir: str):
 
 if __name__ == "__main__":
     import argparse
+    from perf import instrument
     ap = argparse.ArgumentParser()
     ap.add_argument("--run", required=True)
     ap.add_argument("--out", required=True)
     a = ap.parse_args()
-    main(a.run, a.out)
\ No newline at end of file
+    instrument("build_static_ui")(main)(a.run, a.out)
\ No newline at end of file
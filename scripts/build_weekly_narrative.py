@@ -29,6 +29,9 @@ import subprocess
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from inference import nw_vif
+from jsonio import dump_json, load_json
+from perf import instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -37,7 +40,6 @@ OUT_DIR = DATA / "weekly_narratives"
 CHECKPOINT_FILE = ROOT / "config" / "checkpoint_registration.json"
 
 LIVE_SENTIMENT_SINCE = "2026-08-06"  # CLAUDE.md 'Sentiment revival boundary'
-NW_LAG = 4
 HOLD_DAYS = 5
 TRADING_DAYS_PER_MONTH = 21
 
@@ -53,28 +55,12 @@ def _iso_week(dt: datetime) -> str:
 
 def _load(path: Path) -> dict:
     try:
-        return json.loads(path.read_text())
+        return load_json(path)
     except (OSError, json.JSONDecodeError):
         return {}
 
 
 # ── 결정론적 수치 계산 ───────────────────────────────────────────────────
-def _nw_vif(series: list[float]) -> tuple[float, float]:
-    """AR(1) 근사 기반 Newey-West 분산 팽창 계수. (rho1, vif)"""
-    n = len(series)
-    if n < 3:
-        return 0.0, 1.0
-    m = statistics.mean(series)
-    dev = [x - m for x in series]
-    denom = sum(d * d for d in dev)
-    if denom == 0:
-        return 0.0, 1.0
-    rho1 = sum(dev[i] * dev[i + 1] for i in range(n - 1)) / denom
-    rho1 = max(0.0, min(rho1, 0.99))
-    vif = 1 + 2 * sum((1 - k / (NW_LAG + 1)) * rho1**k for k in range(1, NW_LAG + 1))
-    return rho1, vif
-
-
 def _t_ppf(p: float, df: int) -> float:
     from scipy import stats
     return float(stats.t.ppf(p, df))
@@ -133,7 +119,7 @@ def build_power(validation: dict) -> dict:
     if len(alphas) < 3:
         return {"n_folds": len(alphas), "rows": []}
     sd = statistics.stdev(alphas)
-    rho1, vif = _nw_vif(alphas)
+    rho1, vif = nw_vif(alphas)
     sd_nw = sd * math.sqrt(vif)
     rows = []
     for eff, annual in ((0.2, "~10%/yr"), (0.5, "~28%/yr"), (1.0, "~65%/yr")):
@@ -286,6 +272,7 @@ def generate_narrative(payload: dict) -> dict:
 
 
 # ── main ────────────────────────────────────────────────────────────────
+@instrument("build_weekly_narrative")
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--force", action="store_true",
@@ -333,16 +320,14 @@ def main() -> int:
     payload["narrative"] = narrative
 
     OUT_DIR.mkdir(parents=True, exist_ok=True)
-    OUT_LATEST.write_text(json.dumps(payload, ensure_ascii=False, indent=1))
+    dump_json(OUT_LATEST, payload, indent=1)
     (OUT_DIR / f"{week}.json").write_text(
         json.dumps(payload, ensure_ascii=False, indent=1))
 
     index_path = OUT_DIR / "index.json"
     index = _load(index_path)
     weeks = sorted(set((index.get("weeks") or []) + [week]))
-    index_path.write_text(json.dumps(
-        {"weeks": weeks, "updated": payload["generated_at"]},
-        ensure_ascii=False, indent=1))
+    dump_json(index_path, {"weeks": weeks, "updated": payload["generated_at"]}, indent=1)
 
     print(f"weekly_narrative: {week} 생성 "
           f"(narrative={'생성됨' if narrative.get('generated') else '데이터-only: ' + str(narrative.get('reason'))}, "
@@ -14,6 +14,7 @@ from pathlib import Path
 from urllib.request import urlopen, Request
 from urllib.error import URLError
 import xml.etree.ElementTree as ET
+from jsonio import load_json
 
 # ── 수집 대상 RSS 피드 ────────────────────────────────────────────
 RSS_FEEDS = [
@@ -184,7 +185,7 @@ def main():
 
     feeds = RSS_FEEDS
     if args.feeds:
-        feeds = json.loads(Path(args.feeds).read_text())
+        feeds = load_json(args.feeds)
 
     today    = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     out_path = out_dir / f"{today}.jsonl"
@@ -1,42 +1,32 @@
-import json, re
+import csv
+import json
 from pathlib import Path
 from collections import Counter
-import pandas as pd
+from perf import count, track_script
+from textproc import CSV_TOKENS, CSV_TOKENS_STOPWORDS, load_stopwords
+from tokcounts import SUFFIX, write_counts
+
+track_script("csv_to_tokens")
 
 ROOT = Path("data/warehouse/daily")
 ROOT.mkdir(parents=True, exist_ok=True)
 
-TOKEN_RE = re.compile(r"[A-Za-z]{2,}")
-DEFAULT_STOP = {
-    "the","a","an","of","and","or","to","in","for","on","at","by","with","from","as","that","this","is","are","was","were","be","been","being",
-    "it","its","into","about","over","after","before","during","than","but","not","no","we","you","they","he","she","him","her","his","hers",
-    "their","them","our","us","i","my","me"
-}
-
-def load_extra_stop():
-    p = Path("config/extra_noise.txt")
-    if p.exists():
-        return {x.strip().lower() for x in p.read_text(encoding="utf-8", errors="ignore").splitlines() if x.strip()}
-    return set()
-
-STOP = DEFAULT_STOP | load_extra_stop()
-
-def write_tokens(path, pairs):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as w:
-        for tok, n in pairs:
-            w.write(json.dumps({"tok": str(tok), "n": int(n)}, ensure_ascii=False) + "\n")
+DEFAULT_STOP = CSV_TOKENS_STOPWORDS
+STOP = DEFAULT_STOP | load_stopwords("config/extra_noise.txt")
+TOKENIZER = CSV_TOKENS.with_(stopwords=STOP)
 
 def tokens_from_csv(csv_path):
+    """(entity, count) rows of an extract_terms CSV, in file order."""
     try:
-        df = pd.read_csv(csv_path)
-    except Exception:
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = csv.reader(f)
+            header = [c.lower() for c in next(rows, [])]
+            if "entity" not in header or "count" not in header:
+                return []
+            e, c = header.index("entity"), header.index("count")
+            return [(r[e], int(float(r[c])) if r[c] else 0) for r in rows if len(r) > max(e, c)]
+    except (OSError, ValueError):
         return []
-    cols = {c.lower(): c for c in df.columns}
-    if {"entity","count"}.issubset({c.lower() for c in df.columns}):
-        e = cols.get("entity","entity"); c = cols.get("count","count")
-        return [(str(r[e]), int(r[c])) for _, r in df[[e,c]].fillna({"count":0}).iterrows()]
-    return []
 
 def detect_schema(obj):
     k = set(obj.keys())
@@ -73,18 +63,17 @@ def tokens_from_jsonl(jsonl_path, topk=None):
                 cnt[str(tok)] += n
             else:
                 text = " ".join(str(obj.get(k,"")) for k in ("title","description","text","content"))
-                for t in TOKEN_RE.findall(text.lower()):
-                    if t in STOP: continue
-                    cnt[t] += 1
+                cnt.update(TOKENIZER.tokenize(text))
     items = sorted(cnt.items(), key=lambda x: x[1], reverse=True)
     if topk: items = items[:topk]
     return items
 
 dates = set(f.stem for f in ROOT.glob("*.csv"))
 dates |= set(f.stem for f in ROOT.glob("*.jsonl") if not f.name.endswith("_tokens.jsonl"))
+dates = {d for d in dates if not d.endswith("_tokens")}
 
 for d in sorted(dates):
-    out = ROOT / f"{d}_tokens.jsonl"
+    out = ROOT / f"{d}{SUFFIX}"
     if out.exists() and out.stat().st_size > 0:
         continue
     pairs = []
@@ -97,8 +86,8 @@ for d in sorted(dates):
     elif jsonlf.exists():
         pairs = tokens_from_jsonl(jsonlf, topk=2000)
     else:
-        out.write_text("", encoding="utf-8")
         print(f"skip {d} (no source)")
         continue
-    write_tokens(out, pairs)
+    write_counts(out, pairs)
+    count()
     print(f"built tokens {d} rows={len(pairs)}")
\ No newline at end of file
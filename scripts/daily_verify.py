@@ -13,9 +13,10 @@ daily_verify.py — 어제 예측 vs 오늘 실제 비교
   - HOLD: |변화율| < 1.5% → HIT
 """
 import argparse
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 def load_predictions(pred_dir: Path) -> dict:
@@ -25,7 +26,7 @@ def load_predictions(pred_dir: Path) -> dict:
         return result
     for f in sorted(pred_dir.glob("*.json")):
         try:
-            d = json.loads(f.read_text())
+            d = load_json(f)
             date = f.stem  # "2026-05-05.json" → "2026-05-05"
             preds = {p["ticker"]: p for p in d.get("predictions", [])}
             result[date] = preds
@@ -139,6 +140,7 @@ def verify_day(signal_date: str, predictions: dict, prices: dict) -> dict:
     return results
 
 
+@instrument("daily_verify")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--pred-dir", default="site/data/predictions_history")
@@ -146,7 +148,7 @@ def main():
     ap.add_argument("--out",      default="site/data/verification/daily.json")
     args = ap.parse_args()
 
-    prices = json.loads(Path(args.prices).read_text())
+    prices = load_json(args.prices)
     predictions = load_predictions(Path(args.pred_dir))
 
     if not predictions:
@@ -201,7 +203,7 @@ def main():
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(output, indent=2))
+    dump_json(out_path, output, indent=2)
 
     # 콘솔 출력
     print(f"\n{'='*60}")
@@ -1,7 +1,8 @@
-import os, sys, argparse
+import os, re, sys, argparse
 from pathlib import Path
 import numpy as np
 import pandas as pd
+from jsonio import iter_jsonl
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
@@ -49,6 +50,23 @@ def load_daily(csv_path):
     df = df.dropna(subset=["date"])
     return df[["date","entity","count"]]
 
+_PART_RE = re.compile(r"\d{4}-\d{2}-\d{2}\.jsonl$")
+
+def load_partitions(part_dir, days):
+    """Rows of the trailing `days` calendar days of build_entities_daily's
+    per-day partitions (<dir>/<date>.jsonl), instead of the whole history."""
+    files = sorted(p for p in Path(part_dir).glob("*.jsonl")
+                   if _PART_RE.match(p.name) and p.stat().st_size > 0)
+    if not files:
+        return pd.DataFrame(columns=["date","entity","count"])
+    start = (pd.Timestamp(files[-1].stem) - pd.Timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    rows = [r for p in files if p.stem >= start for r in iter_jsonl(p)]
+    df = pd.DataFrame(rows, columns=["date","tok","n"]).rename(columns={"tok": "entity", "n": "count"})
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["entity"] = df["entity"].astype(str)
+    df["count"] = pd.to_numeric(df["count"], errors="coerce").fillna(0).astype(int)
+    return df.dropna(subset=["date"])[["date","entity","count"]]
+
 def safe_slope(series):
     y = pd.to_numeric(series, errors="coerce").astype(float).to_numpy()
     x = np.arange(len(y), dtype=float)
@@ -231,9 +249,10 @@ def resolve_daily_csv(daily_csv, warehouse):
     print("[entities_report] need --daily-csv or --warehouse", file=sys.stderr)
     sys.exit(2)
 
-def main(daily_csv, outdir, topk, slope_days, trend_days, heat_top):
+def main(daily_csv, outdir, topk, slope_days, trend_days, heat_top, partitions=None):
     outdir = ensure_dirs(outdir)
-    df = load_daily(daily_csv)
+    # every table/plot looks back at most max(slope_days, trend_days) days
+    df = load_partitions(partitions, max(slope_days, trend_days)) if partitions else load_daily(daily_csv)
     if df.empty:
         write_placeholder_png(outdir / "top_overall.png", "no data")
         write_placeholder_png(outdir / "slopes.png", "no data")
@@ -261,11 +280,15 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--daily-csv", default="")
     ap.add_argument("--warehouse", default=None)
+    ap.add_argument("--partitions", default=None,
+                    help="build_entities_daily partition dir (data/entities_daily); "
+                         "loads only the trailing window the report plots")
     ap.add_argument("--outdir", default="reports/entities")
     ap.add_argument("--topk", type=int, default=30)
     ap.add_argument("--slope-days", type=int, default=30)
     ap.add_argument("--trend-days", type=int, default=60)
     ap.add_argument("--heat-top", type=int, default=20)
     args = ap.parse_args()
-    resolved_csv = resolve_daily_csv(args.daily_csv, args.warehouse)
-    main(resolved_csv, args.outdir, args.topk, args.slope_days, args.trend_days, args.heat_top)
\ No newline at end of file
+    resolved_csv = None if args.partitions else resolve_daily_csv(args.daily_csv, args.warehouse)
+    main(resolved_csv, args.outdir, args.topk, args.slope_days, args.trend_days, args.heat_top,
+         partitions=args.partitions)
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""
+eval_context.py — the inputs every validation harness shares, loaded once.
+
+validate.py runs walk_forward (system and always-buy), the paper-trading
+benchmark, the naive baselines and gate v2 over one record set and one
+prices.json. Each harness used to load what it needed on its own:
+load_records() per entry point, benchmark._load_prices() per call, and
+walk_forward's lazy SPY cache once per process. EvalContext reads both
+files once and is handed to the harnesses instead.
+
+It pickles as plain lists and dicts, so validate.py's pool workers get a
+copy through the initializer rather than re-reading the files.
+
+    ctx = EvalContext.load()
+    ctx.install()                       # prime walk_forward's SPY cache
+    walk_forward(ctx.records)
+    evaluate_strategies(ctx.closes())
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import walk_forward as wf
+from benchmark import closes_by_date
+from jsonio import load_json
+
+
+class EvalContext:
+    """Deduped accuracy records + the prices.json `tickers` arrays."""
+
+    def __init__(self, records: list[dict], tickers: dict[str, dict]):
+        self.records = records
+        self.tickers = tickers
+        self._closes: dict[str, dict[str, float]] | None = None
+
+    @classmethod
+    def load(cls, accuracy_file: Path = wf.ACCURACY_FILE,
+             prices_file: Path = wf.PRICES_FILE) -> "EvalContext":
+        tickers = load_json(prices_file).get("tickers", {}) if prices_file.exists() else {}
+        return cls(wf.load_records(accuracy_file), tickers)
+
+    def closes(self) -> dict[str, dict[str, float]]:
+        """{ticker: {date: close}} as benchmark.py consumes it (built once)."""
+        if self._closes is None:
+            self._closes = closes_by_date(self.tickers)
+        return self._closes
+
+    def install(self) -> None:
+        """Point walk_forward's module-level SPY cache at these prices, so
+        fold_metrics() never reads prices.json itself."""
+        wf._spy_cache.prime(self.tickers)
+
+    def __getstate__(self):
+        # The date->close maps are cheap to rebuild and double the payload.
+        return {"records": self.records, "tickers": self.tickers, "_closes": None}
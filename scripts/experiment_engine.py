@@ -28,7 +28,6 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
-import math
 import random
 import warnings
 from datetime import datetime, timezone
@@ -46,6 +45,9 @@ from sklearn.impute import SimpleImputer
 from sklearn.linear_model import Ridge, Lasso
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from inference import bh_fdr, bootstrap_mean_test, norm_cdf, nw_t_test_many, wilson_ci_many
+from jsonio import dump_json, load_json
+from perf import instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -115,10 +117,6 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
-def _norm_cdf(x: float) -> float:
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-
 # ── Data loading ───────────────────────────────────────────────────────────
 
 def _extract_row(r: dict) -> dict | None:
@@ -142,7 +140,7 @@ def _extract_row(r: dict) -> dict | None:
 
 
 def load_rows() -> list[dict]:
-    acc = json.loads(ACCURACY_FILE.read_text())
+    acc = load_json(ACCURACY_FILE)
     rows = [_extract_row(r) for r in acc["records"] if r.get("fwd_5d_return") is not None]
     return [r for r in rows if r is not None]
 
@@ -150,7 +148,7 @@ def load_rows() -> list[dict]:
 def _spy_cache() -> dict[str, float]:
     if not PRICES_FILE.exists():
         return {}
-    d = json.loads(PRICES_FILE.read_text())
+    d = load_json(PRICES_FILE)
     spy = d.get("tickers", {}).get("SPY")
     if not spy:
         return {}
@@ -198,6 +196,7 @@ def run_experiment(config: dict, rows: list[dict], explore_dates: list[str],
 
     fold_alphas = []
     fold_accs = []
+    n_test = n_correct = 0
 
     for k in range(3, len(dates_with_data)):
         train_rows = []
@@ -246,6 +245,8 @@ def run_experiment(config: dict, rows: list[dict], explore_dates: list[str],
 
         fold_alphas.append(float(np.mean(alpha_trades)))
         fold_accs.append(float(correct.mean()))
+        n_test += len(correct)
+        n_correct += int(correct.sum())
 
     if len(fold_alphas) < 3:
         return {"error": "too_few_folds", "n_folds": len(fold_alphas)}
@@ -254,7 +255,7 @@ def run_experiment(config: dict, rows: list[dict], explore_dates: list[str],
     s = np.std(fold_alphas, ddof=1)
     se = s / np.sqrt(len(fold_alphas))
     t = m / se if se > 0 else 0
-    p = 2 * (1 - _norm_cdf(abs(t)))
+    p = 2 * (1 - norm_cdf(abs(t)))
 
     return {
         "alpha_mean_pct": round(m, 4),
@@ -262,10 +263,27 @@ def run_experiment(config: dict, rows: list[dict], explore_dates: list[str],
         "alpha_p": round(p, 6),
         "accuracy": round(np.mean(fold_accs), 4),
         "n_folds": len(fold_alphas),
+        "n_test": n_test,
+        "n_correct": n_correct,
         "fold_alphas": [round(a, 3) for a in fold_alphas],
     }
 
 
+def attach_batch_stats(results: list[dict]) -> None:
+    """Newey-West alpha tests and Wilson accuracy intervals for every config,
+    in one batched call each. Reported beside the iid alpha_t/alpha_p the FDR
+    gate uses; fold alphas overlap by 4 of 5 return days, so read the NW p."""
+    valid = [r for r in results if r.get("fold_alphas")]
+    if not valid:
+        return
+    _, t, p = nw_t_test_many([r["fold_alphas"] for r in valid])
+    _, lo, hi = wilson_ci_many([r["n_correct"] for r in valid], [r["n_test"] for r in valid])
+    for r, ti, pi, l, h in zip(valid, t, p, lo, hi):
+        r["alpha_nw_t"] = round(float(ti), 3)
+        r["alpha_nw_p"] = round(float(pi), 6)
+        r["acc_ci_95"] = [round(float(l), 4), round(float(h), 4)]
+
+
 # ── Defense gates ──────────────────────────────────────────────────────────
 
 def gate_fdr(results: list[dict], alpha: float = 0.05) -> list[dict]:
@@ -274,14 +292,18 @@ def gate_fdr(results: list[dict], alpha: float = 0.05) -> list[dict]:
     if not valid:
         return []
 
-    sorted_by_p = sorted(valid, key=lambda r: r["alpha_p"])
-    n = len(sorted_by_p)
+    # Step-up: a config passes when its q-value <= alpha, i.e. when any
+    # config ranked at or after it clears its own rank's threshold.
+    q = bh_fdr([r["alpha_p"] for r in valid])
+    order = sorted(range(len(valid)), key=lambda i: valid[i]["alpha_p"])
+    n = len(valid)
     survivors = []
-    for rank, r in enumerate(sorted_by_p, 1):
-        bh_threshold = alpha * rank / n
+    for rank, i in enumerate(order, 1):
+        r = valid[i]
         r["bh_rank"] = rank
-        r["bh_threshold"] = round(bh_threshold, 6)
-        r["bh_pass"] = r["alpha_p"] <= bh_threshold and r["alpha_mean_pct"] > 0
+        r["bh_threshold"] = round(alpha * rank / n, 6)
+        r["bh_q"] = round(float(q[i]), 6)
+        r["bh_pass"] = bool(q[i] <= alpha) and r["alpha_mean_pct"] > 0
         if r["bh_pass"]:
             survivors.append(r)
 
@@ -441,7 +463,7 @@ def self_test_random_noise(rows: list[dict], n_random: int = 200) -> dict:
         s = np.std(fold_alphas, ddof=1)
         se = s / np.sqrt(len(fold_alphas))
         t = m / se if se > 0 else 0
-        p = 2 * (1 - _norm_cdf(abs(t)))
+        p = 2 * (1 - norm_cdf(abs(t)))
 
         results.append({
             "id": f"random_{i:04d}",
@@ -511,7 +533,7 @@ def self_test_perfect_signal(rows: list[dict]) -> dict:
     s = np.std(fold_alphas, ddof=1)
     se = s / np.sqrt(len(fold_alphas))
     t = m / se if se > 0 else 0
-    p = 2 * (1 - _norm_cdf(abs(t)))
+    p = 2 * (1 - norm_cdf(abs(t)))
 
     passes = m > 0 and p < 0.001
     return {
@@ -560,6 +582,7 @@ def run_exploration(rows: list[dict]) -> dict:
 
     valid = [r for r in all_results if "alpha_p" in r]
     errors = [r for r in all_results if "error" in r]
+    attach_batch_stats(valid)
 
     # Gate 2: FDR
     fdr_survivors = gate_fdr(valid, alpha=0.05)
@@ -567,6 +590,12 @@ def run_exploration(rows: list[dict]) -> dict:
     # Gate 3: Holdout
     holdout_survivors = gate_holdout(fdr_survivors, rows, holdout_dates, spy)
 
+    # Block-bootstrap cross-check of the few configs that made it this far
+    for r in fdr_survivors:
+        _, lo, hi, bp = bootstrap_mean_test(r["fold_alphas"])
+        r["alpha_boot_p"] = round(bp, 4)
+        r["alpha_boot_ci_95"] = [round(lo, 4), round(hi, 4)]
+
     # Classify
     for r in all_results:
         if "error" in r:
@@ -601,6 +630,8 @@ def run_exploration(rows: list[dict]) -> dict:
             "config": c["config"],
             "explore_alpha": c["alpha_mean_pct"],
             "explore_p": c["alpha_p"],
+            "explore_nw_p": c.get("alpha_nw_p"),
+            "explore_boot_p": c.get("alpha_boot_p"),
             "holdout_alpha": c.get("holdout", {}).get("alpha_mean_pct"),
             "status": "CANDIDATE — awaiting out-of-time confirmation",
         } for c in candidates],
@@ -609,7 +640,9 @@ def run_exploration(rows: list[dict]) -> dict:
             "status": r.get("status"),
             "alpha": r.get("alpha_mean_pct"),
             "p": r.get("alpha_p"),
+            "p_nw": r.get("alpha_nw_p"),
             "acc": r.get("accuracy"),
+            "acc_ci_95": r.get("acc_ci_95"),
             "n_folds": r.get("n_folds"),
         } for r in all_results],
     }
@@ -618,7 +651,7 @@ def run_exploration(rows: list[dict]) -> dict:
     history = {"runs": []}
     if RESULTS_FILE.exists():
         try:
-            history = json.loads(RESULTS_FILE.read_text())
+            history = load_json(RESULTS_FILE)
             if "runs" not in history:
                 history = {"runs": []}
         except (json.JSONDecodeError, OSError):
@@ -632,13 +665,14 @@ def run_exploration(rows: list[dict]) -> dict:
     })
     history["latest"] = payload
     history["updated"] = payload["updated"]
-    RESULTS_FILE.write_text(json.dumps(history, indent=2, default=str))
+    dump_json(RESULTS_FILE, history, indent=2, default=str)
 
     return payload
 
 
 # ── Main ───────────────────────────────────────────────────────────────────
 
+@instrument("experiment_engine")
 def run() -> int:
     ap = argparse.ArgumentParser(description="Automated exploration engine")
     ap.add_argument("--self-test", action="store_true")
@@ -696,7 +730,8 @@ def run() -> int:
         print(f"\n  CANDIDATES ({len(candidates)}):")
         for c in candidates:
             print(f"    {c['id']}: explore_alpha={c['explore_alpha']:+.2f}% "
-                  f"holdout_alpha={c.get('holdout_alpha', 'n/a')} p={c['explore_p']:.4f}")
+                  f"holdout_alpha={c.get('holdout_alpha', 'n/a')} p={c['explore_p']:.4f} "
+                  f"NW p={c['explore_nw_p']:.4f} bootstrap p={c['explore_boot_p']:.4f}")
     else:
         print(f"\n  No candidates survived all defense gates.")
 
@@ -704,13 +739,14 @@ def run() -> int:
     valid_results = [r for r in result["all_results"] if r.get("alpha") is not None]
     valid_results.sort(key=lambda r: -(r.get("alpha") or -999))
     print(f"\n  Top 10 by alpha:")
-    print(f"  {'ID':<40} {'Alpha':>7} {'p':>8} {'Acc':>6} {'Status'}")
-    print(f"  {'-'*75}")
+    print(f"  {'ID':<40} {'Alpha':>7} {'p':>8} {'NW p':>8} {'Acc':>6} {'Status'}")
+    print(f"  {'-'*84}")
     for r in valid_results[:10]:
         a = f"{r['alpha']:+.2f}%" if r['alpha'] is not None else "  n/a"
         p = f"{r['p']:.4f}" if r['p'] is not None else "  n/a"
+        p_nw = f"{r['p_nw']:.4f}" if r.get('p_nw') is not None else "  n/a"
         acc = f"{r['acc']*100:.1f}%" if r.get('acc') else " n/a"
-        print(f"  {r['id']:<40} {a:>7} {p:>8} {acc:>6} {r['status']}")
+        print(f"  {r['id']:<40} {a:>7} {p:>8} {p_nw:>8} {acc:>6} {r['status']}")
 
     print(f"\n  Wrote {RESULTS_FILE}")
     return 0
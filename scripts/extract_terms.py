@@ -2,8 +2,8 @@ import argparse, sys, glob, json, re
 from pathlib import Path
 from datetime import datetime, timezone
 from collections import Counter, defaultdict
-import unicodedata
 import pandas as pd
+from textproc import EXTRACT, clean_extract as normalize_text, load_stopwords, tokenize_stream
 
 try:
     from keybert import KeyBERT
@@ -11,12 +11,8 @@ try:
 except Exception:
     _HAS_KEYBERT = False
 
-_URL_RE = re.compile(r"https?://\S+|www\.\S+", re.I)
-_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-_WS_RE = re.compile(r"\s+")
 _NUMERIC_ONLY_RE = re.compile(r"^[0-9]+$")
 _PUNCT_RE = re.compile(r"^[\W_]+$")
-_TOKEN_RE = re.compile(r"[A-Za-z]+")
 
 def parse_date_from_doc(obj):
     pu = obj.get("published_at") or obj.get("publishedAt") or obj.get("published")
@@ -86,27 +82,6 @@ def read_docs(patterns):
     """Legacy: list of text only. Kept for backwards compat."""
     return [t for t, _d in read_docs_with_date(patterns)]
 
-def normalize_text(s):
-    s = unicodedata.normalize("NFKC", s)
-    s = _URL_RE.sub(" ", s)
-    s = _EMAIL_RE.sub(" ", s)
-    s = s.replace("\u200b", " ")
-    s = _WS_RE.sub(" ", s)
-    return s.strip()
-
-def load_stopwords(path):
-    st = set()
-    if not path:
-        return st
-    p = Path(path)
-    if p.exists():
-        for line in p.read_text(encoding="utf-8", errors="ignore").splitlines():
-            w = line.strip().lower()
-            if not w:
-                continue
-            st.add(w)
-    return st
-
 def load_alias(path):
     if not path:
         return {}
@@ -132,26 +107,91 @@ def load_alias(path):
     return mp
 
 def tokenize_en(text, stop, minlen):
-    text = normalize_text(text).lower()
-    toks = _TOKEN_RE.findall(text)
-    toks = [t for t in toks if len(t) >= minlen and t not in stop]
-    return toks
-
-def counts_ngrams(docs, stop, minlen, max_ngram):
-    uni = Counter()
-    bi = Counter()
-    tri = Counter()
-    for t in docs:
-        words = tokenize_en(t, stop, minlen)
+    return EXTRACT.tokenize(text, minlen, stop)
+
+class Vocab:
+    """Token <-> dense int id, shared by every date in a run.
+
+    N-gram counters key on id tuples, so a token string is stored once per
+    run rather than once per n-gram per date it appears in."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.words: list[str] = []
+
+    def encode(self, words):
+        ids, vocab = [], self.ids
         for w in words:
-            uni[w] += 1
+            i = vocab.get(w)
+            if i is None:
+                i = vocab[w] = len(self.words)
+                self.words.append(w)
+            ids.append(i)
+        return ids
+
+    def decode(self, counter):
+        """Id-keyed counter -> string-keyed Counter, same key order."""
+        words = self.words
+        return Counter({(" ".join(words[i] for i in k) if type(k) is tuple else words[k]): c
+                        for k, c in counter.items()})
+
+
+class DayCounts:
+    """Unigram/bigram/trigram counts for one date, keyed on Vocab ids."""
+
+    __slots__ = ("uni", "bi", "tri", "n_docs", "sample")
+
+    def __init__(self):
+        self.uni = Counter()
+        self.bi = Counter()
+        self.tri = Counter()
+        self.n_docs = 0
+        self.sample: list[str] = []   # first KEYBERT_DOCS texts, for --use-keybert
+
+    def add(self, ids, max_ngram):
+        self.n_docs += 1
+        self.uni.update(ids)
         if max_ngram >= 2:
-            for i in range(len(words)-1):
-                bi[words[i] + " " + words[i+1]] += 1
+            self.bi.update(zip(ids, ids[1:]))
         if max_ngram >= 3:
-            for i in range(len(words)-2):
-                tri[" ".join(words[i:i+3])] += 1
-    return uni, bi, tri
+            self.tri.update(zip(ids, ids[1:], ids[2:]))
+
+    def prune(self, below):
+        """Drop bigrams/trigrams counted fewer than `below` times so far."""
+        for c in (self.bi, self.tri):
+            for k in [k for k, v in c.items() if v < below]:
+                del c[k]
+
+
+KEYBERT_DOCS = 100
+
+
+def count_stream(items, stop, minlen, max_ngram, jobs=1, keep_text=False,
+                 prune_every=0, prune_below=2):
+    """Tokenize (date, text) items once, as they stream, into per-date counts.
+
+    Memory follows the vocabulary and the distinct n-grams per date, not the
+    corpus: no document outlives its tokenizer batch except the first
+    KEYBERT_DOCS per date when keep_text is set. With prune_every > 0, every
+    that many documents each date's bigrams/trigrams below prune_below are
+    dropped — bounded memory on long backfills, at the cost of undercounting
+    an n-gram whose occurrences arrive spread across prune intervals.
+    """
+    prof = EXTRACT.with_(stopwords=stop, min_len=minlen)
+    vocab = Vocab()
+    days: dict[str, DayCounts] = {}
+    keyed = (((d, t if keep_text else None), t) for d, t in items)
+    for n, ((d, text), words) in enumerate(tokenize_stream(keyed, prof, processes=jobs), 1):
+        day = days.get(d)
+        if day is None:
+            day = days[d] = DayCounts()
+        day.add(vocab.encode(words), max_ngram)
+        if text is not None and len(day.sample) < KEYBERT_DOCS:
+            day.sample.append(text)
+        if prune_every and n % prune_every == 0:
+            for dc in days.values():
+                dc.prune(prune_below)
+    return vocab, days
 
 def keybert_scores(docs, topk=50):
     if not _HAS_KEYBERT:
@@ -162,7 +202,7 @@ def keybert_scores(docs, topk=50):
     try:
         kb = KeyBERT()
         scores = defaultdict(float)
-        n = min(len(texts), 100)
+        n = min(len(texts), KEYBERT_DOCS)
         for i in range(n):
             try:
                 kws = kb.extract_keywords(texts[i], keyphrase_ngram_range=(1,3), stop_words=None, top_n=topk)
@@ -225,12 +265,12 @@ def to_daily_csv(date_str, outcsv, terms, topk, raw_counts=None):
     df.to_csv(p, index=False)
     return p
 
-def _build_one_day_csv(date_str, docs, args, alias, stop, outcsv):
-    uni, bi, tri = counts_ngrams(docs, stop, args.minlen, args.max_ngram)
+def _build_one_day_csv(date_str, day, vocab, args, alias, stop, outcsv):
+    uni, bi, tri = vocab.decode(day.uni), vocab.decode(day.bi), vocab.decode(day.tri)
     filtered_uni = filter_and_alias(uni, stop, args.mincount, alias)
     filtered_bi = filter_and_alias(bi, stop, args.mincount, alias)
     filtered_tri = filter_and_alias(tri, stop, args.mincount, alias)
-    kbs = keybert_scores(docs, topk=50) if args.use_keybert and _HAS_KEYBERT else {}
+    kbs = keybert_scores(day.sample, topk=50) if args.use_keybert and _HAS_KEYBERT else {}
     scores = combine_scores(filtered_uni, filtered_bi, filtered_tri, kbs)
     # raw_counts spans all three n-gram tiers so the count column reflects what got scored.
     raw_counts = Counter()
@@ -264,6 +304,13 @@ def main():
     ap.add_argument("--stop", default=None)
     ap.add_argument("--alias", default=None)
     ap.add_argument("--use-keybert", action="store_true")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help="tokenize in N worker processes (large --multi-day backfills)")
+    ap.add_argument("--prune-every", type=int, default=0,
+                    help="every N docs, drop bigrams/trigrams below --prune-below "
+                         "(bounds memory on long backfills; counts become approximate). "
+                         "0 = exact, never prune")
+    ap.add_argument("--prune-below", type=int, default=2)
     args = ap.parse_args()
 
     if args.multi_day and not args.outdir:
@@ -274,40 +321,44 @@ def main():
     stop = load_stopwords(args.stop)
     alias = load_alias(args.alias)
 
-    if args.multi_day:
-        by_date: dict[str, list[str]] = defaultdict(list)
-        n_skipped = 0
+    skipped = Counter()
+
+    def dated_docs():
         for text, d in read_docs_with_date(args.inputs):
-            if d is None:
-                if args.include_undated:
-                    by_date[args.date].append(text)
-                else:
-                    n_skipped += 1
+            if args.multi_day:
+                if d is None:
+                    if not args.include_undated:
+                        skipped["undated"] += 1
+                        continue
+                    d = args.date
+            elif args.date_filter is None or d == args.date_filter:
+                d = args.date
+            else:
+                skipped["filtered"] += 1
                 continue
-            by_date[d].append(text)
+            yield d, text
+
+    vocab, days = count_stream(dated_docs(), stop, args.minlen, args.max_ngram, args.jobs,
+                               keep_text=args.use_keybert and _HAS_KEYBERT,
+                               prune_every=args.prune_every, prune_below=args.prune_below)
+
+    if args.multi_day:
         outdir = Path(args.outdir)
         outdir.mkdir(parents=True, exist_ok=True)
-        for d in sorted(by_date.keys()):
-            docs = by_date[d]
+        n_dates = len(days)
+        for d in sorted(days):
+            day = days.pop(d)
             outcsv = outdir / args.csv_template.format(date=d)
-            _build_one_day_csv(d, docs, args, alias, stop, outcsv)
-            print(f"saved {d} -> {outcsv}  (n_docs={len(docs)})")
-        print(f"[multi-day] dates={len(by_date)}  skipped_undated={n_skipped}")
+            _build_one_day_csv(d, day, vocab, args, alias, stop, outcsv)
+            print(f"saved {d} -> {outcsv}  (n_docs={day.n_docs})")
+        print(f"[multi-day] dates={n_dates}  skipped_undated={skipped['undated']}")
         return
 
     # Single-day mode
-    docs: list[str] = []
-    n_skipped = 0
-    for text, d in read_docs_with_date(args.inputs):
-        if args.date_filter is None:
-            docs.append(text)
-        elif d == args.date_filter:
-            docs.append(text)
-        else:
-            n_skipped += 1
-    outp = _build_one_day_csv(args.date, docs, args, alias, stop, args.outcsv)
+    day = days.get(args.date) or DayCounts()
+    outp = _build_one_day_csv(args.date, day, vocab, args, alias, stop, args.outcsv)
     if args.date_filter is not None:
-        print(f"[date-filter={args.date_filter}] kept={len(docs)} skipped={n_skipped}")
+        print(f"[date-filter={args.date_filter}] kept={day.n_docs} skipped={skipped['filtered']}")
     print(f"saved -> {outp}")
 
 if __name__ == "__main__":
@@ -24,9 +24,10 @@ can drop them. Inputs are otherwise self-contained — no external API.
 from __future__ import annotations
 
 import csv
-import json
 from datetime import datetime
 from pathlib import Path
+from jsonio import load_json
+from perf import instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -41,8 +42,7 @@ HORIZONS = (5, 10)
 # ── price helpers ───────────────────────────────────────────────────────
 class PriceCache:
     def __init__(self, path: Path):
-        with path.open() as f:
-            data = json.load(f)
+        data = load_json(path)
         self.tickers = data["tickers"]
         cal: set[str] = set()
         self.lookup: dict[str, dict[str, float]] = {}
@@ -145,19 +145,19 @@ def _load_snapshots() -> list[tuple[str, dict]]:
             datetime.fromisoformat(f.stem)
         except ValueError:
             continue
-        with f.open() as fh:
-            out.append((f.stem, json.load(fh)))
+        out.append((f.stem, load_json(f)))
     return out
 
 
 def _load_sector_lookup() -> dict[str, str]:
     if not TICKERS_FILE.exists():
         return {}
-    by_sector = json.loads(TICKERS_FILE.read_text())
+    by_sector = load_json(TICKERS_FILE)
     return {tk: sector for sector, ticks in by_sector.items() for tk in ticks}
 
 
 # ── main ────────────────────────────────────────────────────────────────
+@instrument("feature_engineering")
 def run() -> None:
     snapshots = _load_snapshots()
     if not snapshots:
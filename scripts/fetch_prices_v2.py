@@ -33,6 +33,8 @@ import math
 import sys
 from datetime import datetime, date, timedelta, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import count, instrument
 
 try:
     import yfinance as yf
@@ -341,7 +343,7 @@ def load_manifest(price_dir: Path) -> dict:
     p = price_dir / "_manifest.json"
     if p.exists():
         try:
-            return json.loads(p.read_text())
+            return load_json(p)
         except:
             pass
     return {}
@@ -349,13 +351,14 @@ def load_manifest(price_dir: Path) -> dict:
 
 def save_manifest(price_dir: Path, manifest: dict):
     p = price_dir / "_manifest.json"
-    p.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    dump_json(p, manifest, indent=2)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # Main
 # ══════════════════════════════════════════════════════════════════════════════
 
+@instrument("fetch_prices_v2")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--price-dir",  default="data/prices",
@@ -389,6 +392,7 @@ def main():
     added_total = 0
 
     for ticker in tickers:
+        count()
         csv_path = price_dir / f"{ticker}.csv"
         existing = load_csv(csv_path)
 
@@ -465,7 +469,7 @@ def main():
         }
     }
     Path(args.out_meta).parent.mkdir(parents=True, exist_ok=True)
-    Path(args.out_meta).write_text(json.dumps(meta, indent=2, ensure_ascii=False))
+    dump_json(args.out_meta, meta, indent=2)
 
     # ── Save manifest ───────────────────────────────────────────────────────────
     save_manifest(price_dir, manifest)
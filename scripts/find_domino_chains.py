@@ -14,7 +14,8 @@ Quality 자동 측정 (시간 따른 시스템 성숙도 추적):
   - Grade B: ≥15 stock + ≥5 macro
   - Grade C: ≥5 stock + ≥3 macro
   - Grade D: 초기 — 데이터 더 필요
-  매주 site/data/domino_history.json에 스냅샷 추가 → 진화 가시화.
+  매주 site/data/domino_history.jsonl에 스냅샷 append → 진화 가시화.
+  (domino_history.json은 페이지용 최근 HISTORY_WINDOW주 window)
 
 CLI:
   python scripts/find_domino_chains.py
@@ -32,16 +33,24 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "scripts"))
+from article_index import ArticleIndex  # noqa: E402
+from history_log import HistoryLog  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
 
 # ── 입력 ─────────────────────────────────────────────────────────────────────
 SIGNAL_CORR_PATH   = ROOT / "site" / "data" / "signal_corr.json"
 PRICES_PATH        = ROOT / "site" / "data" / "prices.json"
 TRENDS_PATH        = ROOT / "site" / "data" / "trends.json"
 FUNDAMENTALS_DIR   = ROOT / "site" / "data" / "fundamentals"
+INDEX_PATH         = ROOT / "data" / "warehouse" / "articles_fts.sqlite"  # 선택 (없으면 evidence 생략)
 
 # ── 출력 ─────────────────────────────────────────────────────────────────────
 OUT_PATH           = ROOT / "site" / "data" / "domino.json"
 HISTORY_PATH       = ROOT / "site" / "data" / "domino_history.json"
+HISTORY_LOG        = ROOT / "site" / "data" / "domino_history.jsonl"
+HISTORY_WINDOW     = 52     # 페이지용 window (주)
 
 # ── 필터 (Hop 1) ─────────────────────────────────────────────────────────────
 HOP1_MIN_ABS_CORR  = 0.30
@@ -96,7 +105,7 @@ def _load_metadata_index() -> dict[str, dict]:
         score_ticker = None
     for p in FUNDAMENTALS_DIR.glob("*.json"):
         try:
-            payload = json.loads(p.read_text())
+            payload = load_json(p)
         except Exception:
             continue
         tk = (payload.get("ticker") or p.stem).upper()
@@ -201,6 +210,24 @@ def active_terms_today(trends: dict) -> dict[str, float]:
     return out
 
 
+def attach_evidence(chains: list[dict], per_chain: int = 3) -> str | None:
+    """활성 chain마다 그 단어를 언급한 최신 기사(색인 마지막 날) — "왜 움직였나" 근거.
+
+    전문 색인이 없으면 아무것도 붙이지 않는다. 반환: 근거 날짜.
+    """
+    if not INDEX_PATH.exists():
+        return None
+    with ArticleIndex(INDEX_PATH, readonly=True) as idx:
+        day = idx.latest_day()
+        for c in chains:
+            if c["is_active_today"] and day:
+                c["evidence"] = [
+                    {k: a[k] for k in ("title", "publisher", "url", "published_at")}
+                    for a in idx.search(c["term"], start=day, end=day, limit=per_chain)
+                ]
+    return day
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Quality grading
 # ══════════════════════════════════════════════════════════════════════════════
@@ -245,20 +272,20 @@ def measure_quality(
 # History snapshot (주 1회)
 # ══════════════════════════════════════════════════════════════════════════════
 
+def _history_log() -> HistoryLog:
+    return HistoryLog(HISTORY_LOG, legacy=HISTORY_PATH, legacy_key="snapshots")
+
+
 def append_history(quality: dict, force: bool = False) -> dict:
-    """domino_history.json에 주간 스냅샷 추가 (idempotent: 같은 ISO-week 중복 방지)."""
-    history = []
-    if HISTORY_PATH.exists():
-        try:
-            history = json.loads(HISTORY_PATH.read_text()).get("snapshots", [])
-        except Exception:
-            history = []
+    """domino_history.jsonl에 주간 스냅샷 append (idempotent: 같은 ISO-week 중복 방지)."""
+    log = _history_log()
+    last = log.last()
 
     now = datetime.now(timezone.utc)
     iso_year, iso_week, _ = now.isocalendar()
     week_key = f"{iso_year}-W{iso_week:02d}"
 
-    if not force and history and history[-1].get("week") == week_key:
+    if not force and last and last.get("week") == week_key:
         return {"appended": False, "reason": "same_week", "week": week_key}
 
     snapshot = {
@@ -269,12 +296,10 @@ def append_history(quality: dict, force: bool = False) -> dict:
         "sector_diversity": quality["sector_diversity"],
         "grade":           quality["grade"],
     }
-    history.append(snapshot)
-    HISTORY_PATH.write_text(json.dumps({
-        "schema_version": 1,
-        "snapshots":      history,
-    }, indent=2))
-    return {"appended": True, "week": week_key, "total": len(history)}
+    log.append(snapshot)
+    doc = log.write_window(HISTORY_PATH, HISTORY_WINDOW, "snapshots",
+                           extra={"schema_version": 1})
+    return {"appended": True, "week": week_key, "total": doc["total"]}
 
 
 def project_grade_a_date(history: list[dict]) -> str | None:
@@ -312,9 +337,9 @@ def build_domino(write_history: bool = True) -> dict:
     if not PRICES_PATH.exists():
         raise FileNotFoundError(f"missing {PRICES_PATH}; run fetch_prices_v2.py first")
 
-    sc     = json.loads(SIGNAL_CORR_PATH.read_text())
-    prices = json.loads(PRICES_PATH.read_text())
-    trends = json.loads(TRENDS_PATH.read_text()) if TRENDS_PATH.exists() else {}
+    sc     = load_json(SIGNAL_CORR_PATH)
+    prices = load_json(PRICES_PATH)
+    trends = load_json(TRENDS_PATH) if TRENDS_PATH.exists() else {}
 
     # Hop 1
     all_pairs = sc.get("pairs", [])
@@ -365,6 +390,7 @@ def build_domino(write_history: bool = True) -> dict:
 
     # Sort: active terms first, then by Hop 1 confidence
     chains.sort(key=lambda c: (-int(c["is_active_today"]), -c["hop1"]["confidence"]))
+    evidence_day = attach_evidence(chains)
 
     # Active inbound (어떤 ticker가 지금 압력 받는지)
     inbound: dict[str, list[dict]] = defaultdict(list)
@@ -413,12 +439,8 @@ def build_domino(write_history: bool = True) -> dict:
     hist_result = None
     if write_history:
         hist_result = append_history(quality)
-    history_now = []
-    if HISTORY_PATH.exists():
-        try:
-            history_now = json.loads(HISTORY_PATH.read_text()).get("snapshots", [])
-        except Exception:
-            history_now = []
+    log = _history_log()
+    history_now = log.latest(8)   # project_grade_a_date는 최근 8주만 사용
     eta_grade_a = project_grade_a_date(history_now)
 
     return {
@@ -429,6 +451,7 @@ def build_domino(write_history: bool = True) -> dict:
             "n_dates":             sc.get("n_dates"),
             "prices_tickers":      len(prices.get("tickers", {})),
             "trends_terms":        len((trends.get("series") or {})),
+            "evidence_day":        evidence_day,
         },
         "filters": {
             "hop1": {"min_abs_corr": HOP1_MIN_ABS_CORR, "max_pval": HOP1_MAX_PVAL,
@@ -448,7 +471,7 @@ def build_domino(write_history: bool = True) -> dict:
         "quality": {
             **quality,
             "expected_grade_a_date": eta_grade_a,
-            "history_weeks":         len(history_now),
+            "history_weeks":         log.count(),
         },
         "history_update":  hist_result,
     }
@@ -458,10 +481,11 @@ def build_domino(write_history: bool = True) -> dict:
 # CLI
 # ══════════════════════════════════════════════════════════════════════════════
 
+@instrument("find_domino_chains")
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Time-aware domino chain detection")
     ap.add_argument("--no-history", action="store_true",
-                    help="domino_history.json 갱신 생략")
+                    help="domino_history 갱신 생략")
     ap.add_argument("--no-write",   action="store_true",
                     help="domino.json 저장 생략 (stdout만)")
     ap.add_argument("--json",       action="store_true",
@@ -488,7 +512,7 @@ def main(argv: list[str] | None = None) -> int:
         json.dump(result, sys.stdout, indent=2, default=str); print()
 
     if not args.no_write:
-        OUT_PATH.write_text(json.dumps(result, indent=2, default=str))
+        dump_json(OUT_PATH, result, indent=2, default=str)
         print(f"[domino] wrote {OUT_PATH.relative_to(ROOT)}", file=sys.stderr)
     return 0
 
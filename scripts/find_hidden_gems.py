@@ -38,13 +38,16 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from statistics import mean
 
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
+from article_index import ArticleIndex, ticker_query  # noqa: E402
 from fundamentals_analyzer import score_ticker as score_fundamentals  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
 
 # ── 경로 ─────────────────────────────────────────────────────────────────────
 FUNDAMENTALS_DIR  = ROOT / "site" / "data" / "fundamentals"
@@ -52,6 +55,9 @@ SENTIMENT_PATH    = ROOT / "site" / "data" / "ticker_sentiment.json"
 PREDICTIONS_PATH  = ROOT / "site" / "data" / "predictions.json"
 INSIDER_PATH      = ROOT / "site" / "data" / "insider.json"
 OUT_PATH          = ROOT / "site" / "data" / "hidden_gems.json"
+INDEX_PATH        = ROOT / "data" / "warehouse" / "articles_fts.sqlite"  # 선택
+ALIASES_PATH      = ROOT / "config" / "ticker_aliases.json"
+NEWS_WINDOW_DAYS  = 7
 
 # ── 가중치 + 게이트 (5-Pillar, Phase 5 — 2026-05-08) ─────────────────────────
 # P1 sentiment / P2 sector_rel / P3 TA / P4 fundamentals / P5 insider trading
@@ -82,7 +88,7 @@ def load_sentiment_scores() -> dict[str, float]:
     """
     if not SENTIMENT_PATH.exists():
         return {}
-    d = json.loads(SENTIMENT_PATH.read_text())
+    d = load_json(SENTIMENT_PATH)
     if not d.get("dates"):
         return {}
     out: dict[str, float] = {}
@@ -106,7 +112,7 @@ def load_insider_scores() -> dict[str, dict]:
     if not INSIDER_PATH.exists():
         return {}
     try:
-        d = json.loads(INSIDER_PATH.read_text())
+        d = load_json(INSIDER_PATH)
     except Exception:
         return {}
     return d.get("tickers") or {}
@@ -120,7 +126,7 @@ def load_ta_scores() -> dict[str, float]:
     if not PREDICTIONS_PATH.exists():
         return {}
     try:
-        d = json.loads(PREDICTIONS_PATH.read_text())
+        d = load_json(PREDICTIONS_PATH)
     except Exception:
         return {}
     out: dict[str, float] = {}
@@ -258,13 +264,37 @@ def _build_reasons_risks(payload: dict, fund_score: dict, sub: dict) -> tuple[li
     return reasons, risks
 
 
+def attach_news(rows: list[dict]) -> None:
+    """최근 NEWS_WINDOW_DAYS일 기사 수 + 최신 헤드라인 (전문 색인 있을 때만)."""
+    if not rows or not INDEX_PATH.exists():
+        return
+    aliases = load_json(ALIASES_PATH, default={})
+    with ArticleIndex(INDEX_PATH, readonly=True) as idx:
+        last = idx.latest_day()
+        if not last:
+            return
+        start = (date.fromisoformat(last) - timedelta(days=NEWS_WINDOW_DAYS - 1)).isoformat()
+        for r in rows:
+            q = ticker_query(r["ticker"], aliases)
+            if not q:
+                continue
+            n = idx.count(q, raw=True, start=start, end=last)
+            if not n:
+                continue
+            latest = idx.search(q, raw=True, start=start, end=last, limit=1)[0]
+            r["news"] = {"n_articles": n, "window": [start, last],
+                         "latest": {k: latest[k] for k in ("title", "publisher", "url", "date")}}
+            r["reasons"].append(f"In the news: {n} article(s) in {NEWS_WINDOW_DAYS}d — "
+                                f"\"{(latest['title'] or '')[:70]}\"")
+
+
 def find_gems(top_n: int = DEFAULT_TOP_N) -> dict:
     # ── 1) 모든 per-ticker payload 로드 + fundamentals 점수 ──
     payloads: dict[str, dict] = {}
     fund_scores: dict[str, dict] = {}
     for p in sorted(FUNDAMENTALS_DIR.glob("*.json")):
         try:
-            payload = json.loads(p.read_text())
+            payload = load_json(p)
         except Exception as e:
             print(f"[warn] {p.name}: {e}", file=sys.stderr)
             continue
@@ -364,6 +394,7 @@ def find_gems(top_n: int = DEFAULT_TOP_N) -> dict:
     ))
     for i, r in enumerate(rows[:top_n], 1):
         r["rank"] = i
+    attach_news(rows[:top_n])
 
     return {
         "generated_at":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
@@ -389,6 +420,7 @@ def find_gems(top_n: int = DEFAULT_TOP_N) -> dict:
 # CLI
 # ══════════════════════════════════════════════════════════════════════════════
 
+@instrument("find_hidden_gems")
 def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Hidden Gems — 4-Pillar 합성 + 무명도 ranking")
     ap.add_argument("--top", type=int, default=DEFAULT_TOP_N, help=f"Top N (default {DEFAULT_TOP_N})")
@@ -422,7 +454,7 @@ def main(argv: list[str] | None = None) -> int:
             for x in r["risks"]:      print(f"   ! {x}")
 
     if not args.no_write:
-        OUT_PATH.write_text(json.dumps(result, indent=2, default=str))
+        dump_json(OUT_PATH, result, indent=2, default=str)
         print(f"\n[hidden_gems] wrote {OUT_PATH.relative_to(ROOT)}", file=sys.stderr)
     return 0
 
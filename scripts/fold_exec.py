@@ -0,0 +1,40 @@
+"""
+fold_exec.py — run independent model fits across a process pool.
+
+Shared by ml_walkforward.py (one task per walk-forward fold, or per
+warm-start chain) and ml_baseline.py (one task per model). Tasks map in
+order, so results come back in submission order whatever the worker
+count. Every estimator carries a fixed random_state, so a fold's result
+does not depend on which process fitted it.
+
+Worker state follows strategy_sweep's pattern: the caller passes an
+initializer that stores its (large, read-only) inputs in module globals
+once per worker instead of pickling them into every task.
+
+    results = run_folds(_fold, tasks, jobs=8, init=_init_worker, initargs=(state,))
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Sequence
+
+
+def run_folds(fn: Callable, tasks: Sequence, jobs: int = 1,
+              init: Callable | None = None, initargs: tuple = ()) -> list:
+    """[fn(t) for t in tasks], in order; jobs > 1 fans out to processes."""
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1:
+        if init is not None:
+            init(*initargs)
+        return [fn(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init, initargs=initargs) as ex:
+        return list(ex.map(fn, tasks))
+
+
+def single_threaded(model):
+    """model with n_jobs=1 when it has that knob: pool workers already use
+    every core, and a forest's own thread pool would oversubscribe them."""
+    if "n_jobs" in model.get_params():
+        model.set_params(n_jobs=1)
+    return model
@@ -31,6 +31,7 @@ import sys
 from collections import Counter
 from pathlib import Path
 from statistics import mean
+from jsonio import load_json
 
 ROOT = Path(__file__).resolve().parent.parent
 PER_TICKER_DIR = ROOT / "site" / "data" / "fundamentals"
@@ -352,14 +353,14 @@ def load_payload(ticker: str) -> dict | None:
     p = PER_TICKER_DIR / f"{ticker.upper()}.json"
     if not p.exists():
         return None
-    return json.loads(p.read_text())
+    return load_json(p)
 
 
 def score_universe() -> list[dict]:
     out = []
     for p in sorted(PER_TICKER_DIR.glob("*.json")):
         try:
-            out.append(score_ticker(json.loads(p.read_text())))
+            out.append(score_ticker(load_json(p)))
         except Exception as e:
             print(f"[warn] {p.name}: {type(e).__name__}: {e}", file=sys.stderr)
     return out
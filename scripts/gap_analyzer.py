@@ -17,7 +17,12 @@ Inputs:
 
 Output:
   - site/data/gap_analysis.json   (latest run, single object)
-  - site/data/gap_history.json    (append-only weekly aggregates)
+  - site/data/gap_history.jsonl   (append-only log, one run per line)
+  - site/data/gap_history.json    (newest HISTORY_WINDOW runs, for the pages)
+
+Realized 5d returns come from the shared outcome ledger
+(site/data/outcome_ledger.json, see outcome_ledger.py); only outcomes
+whose forward window closed since the last run are priced.
 
 Predicted-return heuristic:
   BUY    +0.040 * conf
@@ -35,17 +40,26 @@ where this heuristic is systematically wrong.
 
 from __future__ import annotations
 
-import json
+import argparse
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+from outcome_ledger import OutcomeLedger  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import count, instrument  # noqa: E402
+
 DATA = ROOT / "site" / "data"
 HIST = DATA / "predictions_history"
 PRICES_FILE = DATA / "prices.json"
 TICKERS_FILE = DATA / "tickers.json"
 OUT_LATEST = DATA / "gap_analysis.json"
 OUT_HISTORY = DATA / "gap_history.json"
+HISTORY_LOG = DATA / "gap_history.jsonl"
+HISTORY_WINDOW = 90  # runs kept in the dashboard-facing gap_history.json
 
 HORIZON = 5
 
@@ -87,8 +101,7 @@ DRIFT_EMA_ALPHA = 0.3
 # ── price calendar ──────────────────────────────────────────────────────
 class PriceCache:
     def __init__(self, path: Path):
-        with path.open() as f:
-            data = json.load(f)
+        data = load_json(path)
         cal: set[str] = set()
         self.lookup: dict[str, dict[str, float]] = {}
         for tk, payload in data["tickers"].items():
@@ -106,16 +119,20 @@ class PriceCache:
                 hi = mid
         return lo - 1
 
-    def fwd_return(self, ticker: str, snap_date: str, n: int):
+    def forward_return(self, ticker: str, snap_date: str, n: int):
+        """(return, anchor_date, fwd_date) — OutcomeLedger's price interface."""
         i = self.anchor_index(snap_date)
         if i < 0 or i + n >= len(self.calendar):
-            return None
+            return None, None, None
         ts = self.lookup.get(ticker, {})
         p0 = ts.get(self.calendar[i])
         p1 = ts.get(self.calendar[i + n])
         if p0 is None or p1 is None or p0 <= 0:
-            return None
-        return p1 / p0 - 1
+            return None, None, None
+        return p1 / p0 - 1, self.calendar[i], self.calendar[i + n]
+
+    def fwd_return(self, ticker: str, snap_date: str, n: int):
+        return self.forward_return(ticker, snap_date, n)[0]
 
 
 def _now_iso() -> str:
@@ -241,7 +258,8 @@ def _drift_adjusted_metrics(actionable: list[dict], drift_pct: float) -> tuple[d
     return summary, by_action
 
 
-def _aggregate(records: list[dict], key_fn) -> dict:
+def _accumulate(records: list[dict], key_fn) -> dict:
+    """Per-key partial sums (n, Σabs, Σsigned, Σdir) — mergeable across keys."""
     groups: dict = {}
     for r in records:
         if r.get("abs_gap_pct") is None:
@@ -254,16 +272,30 @@ def _aggregate(records: list[dict], key_fn) -> dict:
         g["abs_sum"] += r["abs_gap_pct"]
         g["signed_sum"] += r["signed_gap_pct"]
         g["dir_correct"] += int(r["dir_correct"])
-    out: dict = {}
-    for k in sorted(groups):
-        g = groups[k]
-        out[k] = {
-            "n": g["n"],
-            "avg_abs_gap_pct": round(g["abs_sum"] / g["n"], 3),
-            "avg_signed_gap_pct": round(g["signed_sum"] / g["n"], 3),
-            "directional_acc": round(g["dir_correct"] / g["n"], 3),
-        }
-    return out
+    return groups
+
+
+def _merge_groups(groups: dict) -> dict:
+    """Collapse partial sums from `_accumulate` into one total."""
+    total = {"n": 0, "abs_sum": 0.0, "signed_sum": 0.0, "dir_correct": 0}
+    for g in groups.values():
+        for f in total:
+            total[f] += g[f]
+    return total
+
+
+def _finalize(g: dict) -> dict:
+    return {
+        "n": g["n"],
+        "avg_abs_gap_pct": round(g["abs_sum"] / g["n"], 3),
+        "avg_signed_gap_pct": round(g["signed_sum"] / g["n"], 3),
+        "directional_acc": round(g["dir_correct"] / g["n"], 3),
+    }
+
+
+def _aggregate(records: list[dict], key_fn) -> dict:
+    groups = _accumulate(records, key_fn)
+    return {k: _finalize(groups[k]) for k in sorted(groups)}
 
 
 def _tertile_bounds(values: list[float]) -> tuple[float, float] | None:
@@ -369,12 +401,13 @@ def _convergence(records: list[dict]) -> dict:
     return {"weeks": series, "trend": trend, "improvement_pct": improvement_pct}
 
 
-def run() -> None:
+@instrument("gap_analyzer")
+def run(rebuild_ledger: bool = False) -> None:
     snapshots = sorted(HIST.glob("*.json"))
     if not snapshots:
         raise SystemExit(f"No snapshots in {HIST}")
-    prices = PriceCache(PRICES_FILE)
-    sectors = json.loads(TICKERS_FILE.read_text()) if TICKERS_FILE.exists() else {}
+    ledger = OutcomeLedger(PRICES_FILE, PriceCache, rebuild=rebuild_ledger)
+    sectors = load_json(TICKERS_FILE) if TICKERS_FILE.exists() else {}
     sector_lookup = {tk: sec for sec, ticks in sectors.items() for tk in ticks}
 
     records: list[dict] = []
@@ -383,8 +416,7 @@ def run() -> None:
             datetime.fromisoformat(f.stem)
         except ValueError:
             continue
-        with f.open() as fh:
-            snap = json.load(fh)
+        snap = load_json(f)
         snap_date = f.stem
         regime = (snap.get("market_regime") or {}).get("regime")
         for p in snap.get("predictions") or []:
@@ -393,7 +425,7 @@ def run() -> None:
             conf = p.get("confidence")
             if not tk or not action:
                 continue
-            actual = prices.fwd_return(tk, snap_date, HORIZON)
+            actual = ledger.resolve(tk, snap_date, HORIZON)[0]
             predicted = _predicted_return(action, conf)
             feats = _features(p)
             rec: dict = {
@@ -414,12 +446,16 @@ def run() -> None:
                 "features": feats,
             }
             records.append(rec)
+    ledger.save()
 
     actionable = [r for r in records if r.get("abs_gap_pct") is not None]
 
+    # by_action partitions `actionable`, so the overall summary is the merge
+    # of its partial sums instead of three more passes over every record.
+    action_groups = _accumulate(actionable, lambda r: r["action"])
     by_pillar = _by_pillar_gap(actionable)
     aggregations = {
-        "by_action":     _aggregate(actionable, lambda r: r["action"]),
+        "by_action":     {k: _finalize(action_groups[k]) for k in sorted(action_groups)},
         "by_confidence": _aggregate(actionable, lambda r: _conf_band(r["confidence"])),
         "by_sector":     _aggregate(actionable, lambda r: r["sector"]),
         "by_regime":     _aggregate(actionable, lambda r: r["regime"]),
@@ -434,9 +470,11 @@ def run() -> None:
     summary_adj, by_action_adj = _drift_adjusted_metrics(actionable, drift_ema_pct)
 
     summary_n = len(actionable)
-    avg_abs = round(sum(r["abs_gap_pct"] for r in actionable) / summary_n, 3) if summary_n else None
-    avg_signed = round(sum(r["signed_gap_pct"] for r in actionable) / summary_n, 3) if summary_n else None
-    dir_acc = round(sum(r["dir_correct"] for r in actionable) / summary_n, 3) if summary_n else None
+    total = _finalize(_merge_groups(action_groups)) if summary_n else {}
+    avg_abs = total.get("avg_abs_gap_pct")
+    avg_signed = total.get("avg_signed_gap_pct")
+    dir_acc = total.get("directional_acc")
+    count(len(records))
 
     payload = {
         "updated": _now_iso(),
@@ -460,29 +498,24 @@ def run() -> None:
         "gradients": grads,
         "convergence": convergence,
     }
-    OUT_LATEST.write_text(json.dumps(payload, indent=2, default=str))
+    dump_json(OUT_LATEST, payload, indent=2, default=str)
 
     # Append-only history (one entry per run)
-    history: dict
-    if OUT_HISTORY.exists():
-        history = json.loads(OUT_HISTORY.read_text())
-        if "runs" not in history:
-            history = {"runs": []}
-    else:
-        history = {"runs": []}
-    history["runs"].append({
+    history = HistoryLog(HISTORY_LOG, legacy=OUT_HISTORY, legacy_key="runs")
+    history.append({
         "updated": payload["updated"],
         "n_actionable": summary_n,
         "summary": payload["summary"],
         "market_drift_ema_pct": drift_ema_pct,
         "convergence": convergence,
     })
-    history["updated"] = payload["updated"]
-    OUT_HISTORY.write_text(json.dumps(history, indent=2, default=str))
+    history.write_window(OUT_HISTORY, HISTORY_WINDOW, "runs",
+                         extra={"updated": payload["updated"]})
 
     # Stdout
     print(f"Wrote {OUT_LATEST}")
     print(f"  n_actionable={summary_n}  avg_abs_gap={avg_abs}%  avg_signed={avg_signed}%  dir_acc={dir_acc}")
+    print(f"  {ledger.summary()}")
     print()
     print("by_action:")
     for k, v in aggregations["by_action"].items():
@@ -526,4 +559,7 @@ def run() -> None:
 
 
 if __name__ == "__main__":
-    run()
+    ap = argparse.ArgumentParser(description="Prediction-vs-actual gap analyzer")
+    ap.add_argument("--rebuild-ledger", action="store_true",
+                    help="ignore outcome_ledger.json and recompute every outcome")
+    run(rebuild_ledger=ap.parse_args().rebuild_ledger)
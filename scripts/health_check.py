@@ -12,6 +12,7 @@ import glob
 import os
 import re
 import sys
+from perf import instrument
 
 # 3 (2026-08-08): sentiment lags D-2 BY DESIGN since the 2026-08-05 clamp
 # (news_archive stores only complete days ≤ D-2; same-day partial files are
@@ -26,6 +27,7 @@ SENTIMENT_DIR = "data/sentiment_per_day"
 PAT = re.compile(r"sentiment_(\d{4}-\d{2}-\d{2})\.json$")
 
 
+@instrument("health_check")
 def main() -> int:
     files = glob.glob(os.path.join(SENTIMENT_DIR, "sentiment_*.json"))
     dates = []
@@ -0,0 +1,230 @@
+"""
+history_log.py — append-only JSONL history stores with a bounded window.
+
+Several self-correcting scripts keep a growing run history (gap_history,
+domino_history, calibration_history, weekly_history, ml_monitor runs).
+They used to reload the whole JSON document, append one entry and
+re-serialize everything — full parse + dump cost every run on files that
+only ever grow (gap_history.json passed 3 MB).
+
+HistoryLog stores one entry per line in `<name>.jsonl`:
+
+  - append()        O(1): one line appended, nothing re-read
+  - count()         entry total, kept in a `<name>.jsonl.count` sidecar
+                    that append() bumps; a sidecar whose recorded byte size
+                    no longer matches the log (merge, hand edit, concurrent
+                    writer) is ignored and rebuilt by one full count
+  - latest(n)       reads only the tail of the file (backwards, in blocks)
+  - write_window()  writes the dashboard-facing `<name>.json` holding only
+                    the newest N entries, in the same {"<key>": [...]} shape
+                    the pages already fetch, plus `total` = full log length
+  - compact()       rewrites the log keeping the last entry per key (for
+                    week-keyed histories whose same-week re-runs replace the
+                    previous entry); maybe_compact() does it periodically
+
+The first time a log is opened next to a pre-existing JSON document
+(`legacy`), its entries are copied into the JSONL once, so no history is
+lost when a writer switches over.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jsonio import dump_json, dumpb, iter_jsonl, load_json, loads, write_jsonl
+
+_TAIL_BLOCK = 64 * 1024
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+class HistoryLog:
+    """Append-only JSONL log at `path` (see module docstring).
+
+    `legacy` / `legacy_key`: JSON document and list key to seed from when
+    the JSONL does not exist yet. `key`: entry field identifying a logical
+    slot (e.g. "week"); readers keep only the newest entry per slot.
+    """
+
+    def __init__(self, path: Path, legacy: Path | None = None,
+                 legacy_key: str = "runs", key: str | None = None):
+        self.path = Path(path)
+        self.key = key
+        if not self.path.exists() and legacy is not None and Path(legacy).exists():
+            self._seed_from_legacy(Path(legacy), legacy_key)
+
+    def _seed_from_legacy(self, legacy: Path, legacy_key: str) -> None:
+        try:
+            entries = load_json(legacy).get(legacy_key) or []
+        except (json.JSONDecodeError, OSError, AttributeError):
+            return
+        self._rewrite(entries)
+
+    def _rewrite(self, entries: list[dict]) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        write_jsonl(tmp, entries, default=str)
+        tmp.replace(self.path)
+        self._save_tally(self._recount())
+
+    # ── running total ───────────────────────────────────────────────────
+    @property
+    def tally_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".count")
+
+    def _size(self) -> int:
+        try:
+            return self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _load_tally(self) -> dict | None:
+        """The sidecar, if it describes the log as it is on disk now."""
+        try:
+            t = load_json(self.tally_path)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not isinstance(t, dict) or t.get("size") != self._size():
+            return None
+        if (self.key is not None) != isinstance(t.get("keys"), list):
+            return None
+        return t
+
+    def _save_tally(self, t: dict) -> None:
+        dump_json(self.tally_path, t, default=str)
+
+    def _recount(self) -> dict:
+        t = {"size": self._size(), "lines": self._line_count()}
+        if self.key is not None:
+            t["keys"] = list(dict.fromkeys(e.get(self.key) for e in self.iter_entries()))
+        return t
+
+    # ── writers ─────────────────────────────────────────────────────────
+    def append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = dumpb(entry, default=str) + b"\n"
+        tally = self._load_tally()
+        with self.path.open("ab") as f:
+            f.write(line)
+            end = f.tell()
+        # A stale sidecar is left for count() to rebuild; so is one another
+        # writer raced past (the log grew by more than this line).
+        if tally is None or end != tally["size"] + len(line):
+            return
+        tally["size"] = end
+        tally["lines"] += 1
+        if self.key is not None and entry.get(self.key) not in tally["keys"]:
+            tally["keys"].append(entry.get(self.key))
+        self._save_tally(tally)
+
+    def compact(self) -> bool:
+        """Drop superseded same-key entries; no-op for unkeyed logs."""
+        if self.key is None or not self.path.exists():
+            return False
+        entries = list(self.iter_entries())
+        kept = self._dedup(entries)
+        if len(kept) == len(entries):
+            return False
+        self._rewrite(kept)
+        return True
+
+    def maybe_compact(self, every: int = 50) -> bool:
+        """Periodic compact(): only once every `every` appended lines.
+
+        The trigger is the sidecar's line count, so calling this after each
+        append costs O(1) while the sidecar is current.
+        """
+        n = self._tally()["lines"]
+        if n == 0 or n % every:
+            return False
+        return self.compact()
+
+    def write_window(self, path: Path, n: int, list_key: str = "runs",
+                     extra: dict | None = None, sort_by: str | None = None) -> dict:
+        """Write the newest `n` entries as {list_key: [...], total, updated}."""
+        window = self.latest(n)
+        if sort_by:
+            window.sort(key=lambda e: e.get(sort_by) or "")
+        doc = dict(extra or {})
+        doc[list_key] = window
+        doc["total"] = self.count()
+        doc.setdefault("updated", _now_iso())
+        doc["log"] = self.path.name
+        dump_json(path, doc, default=str)
+        return doc
+
+    # ── readers ─────────────────────────────────────────────────────────
+    def iter_entries(self):
+        if not self.path.exists():
+            return
+        yield from iter_jsonl(self.path, strict=True)
+
+    def _dedup(self, entries: list[dict]) -> list[dict]:
+        if self.key is None:
+            return entries
+        last: dict = {}
+        for i, e in enumerate(entries):
+            last[e.get(self.key)] = i
+        keep = set(last.values())
+        return [e for i, e in enumerate(entries) if i in keep]
+
+    def _tail_lines(self, n: int) -> list[bytes]:
+        """Last `n` non-empty lines, reading the file backwards in blocks."""
+        if n <= 0 or not self.path.exists():
+            return []
+        with self.path.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            buf = b""
+            while pos > 0 and buf.count(b"\n") <= n:
+                step = min(_TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        lines = [ln for ln in buf.split(b"\n") if ln.strip()]
+        if pos > 0:
+            lines = lines[1:]  # first line may be cut mid-record
+        return lines[-n:]
+
+    def latest(self, n: int = 1) -> list[dict]:
+        """Newest `n` entries, oldest first (newest-per-key for keyed logs)."""
+        if self.key is None:
+            return [loads(ln) for ln in self._tail_lines(n)]
+        # Keyed: over-read so superseded duplicates don't shrink the window.
+        want = n
+        while True:
+            lines = self._tail_lines(want)
+            entries = self._dedup([loads(ln) for ln in lines])
+            if len(entries) >= n or len(lines) < want:
+                return entries[-n:]
+            want *= 2
+
+    def last(self) -> dict | None:
+        tail = self.latest(1)
+        return tail[-1] if tail else None
+
+    def _line_count(self) -> int:
+        if not self.path.exists():
+            return 0
+        n = 0
+        with self.path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                n += chunk.count(b"\n")
+        return n
+
+    def _tally(self) -> dict:
+        t = self._load_tally()
+        if t is None:
+            t = self._recount()
+            if self.path.exists():
+                self._save_tally(t)
+        return t
+
+    def count(self) -> int:
+        """Number of entries (distinct keys for keyed logs)."""
+        t = self._tally()
+        return len(t["keys"]) if self.key is not None else t["lines"]
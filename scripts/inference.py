@@ -0,0 +1,467 @@
+"""
+inference.py — shared hypothesis-test statistics for the validation scripts.
+
+Newey-West t-tests, Wilson intervals, proportion z-tests, binomial and
+correlation p-values used to be copied into walk_forward, analyze_ticker,
+backtest(_v2), build_signal_corr and build_weekly_narrative. They live here
+now, and those modules import them under their old names:
+
+  scalar (moved verbatim; outputs unchanged)
+    nw_t_test, mean_t_test, wilson_ci, proportion_z, norm_cdf,
+    corr_pvalue, nw_vif
+
+  batched (NumPy, many hypotheses per call)
+    nw_t_test_many      HAC t-tests over many (ragged) series at once
+    wilson_ci_many, proportion_z_many
+    binom_pvalue        exact binomial tails (two-sided = minlike, as scipy);
+                        replaced analyze_ticker's normal-approximation gate
+    bh_fdr              Benjamini-Hochberg q-values
+    stationary_bootstrap, bootstrap_mean_test
+                        Politis-Romano resampling of autocorrelated fold alphas
+
+The batched forms are what the harnesses use to test many hypotheses per
+run: experiment_engine (NW t and Wilson interval for every config, bootstrap
+for FDR survivors), naive_baselines (edge z vs every baseline and regime,
+exact binomial p), analyze_ticker and backtest(_v2) (exact binomial p for
+every candidate word) and validate (bootstrap cross-check of the paired gate).
+
+Batched results are unrounded; the scalar wrappers keep their historical
+rounding. No scipy: CI installs requirements.txt only.
+
+    python3 scripts/inference.py --self-test
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+from typing import Sequence
+
+import numpy as np
+
+# Newey-West lag for fold-level t-tests. Folds are daily but returns span 5
+# trading days, so adjacent folds share up to 4/5 of their return window;
+# measured fold-alpha autocorrelation before correction was rho1~0.76.
+NW_LAG = 4
+
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+# ── scalar ─────────────────────────────────────────────────────────────────
+
+def norm_cdf(x: float) -> float:
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+
+def wilson_ci(k: int, n: int, z: float = 1.96) -> tuple[float, float, float]:
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    p = k / n
+    denom = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt((p * (1 - p) + z * z / (4 * n)) / n) / denom
+    return round(center, 4), round(max(0, center - margin), 4), round(min(1, center + margin), 4)
+
+
+def proportion_z(k: int, n: int, p0: float = 0.5) -> tuple[float, float]:
+    """Two-sided z-test. Returns (z_stat, p_value)."""
+    if n == 0:
+        return 0.0, 1.0
+    p = k / n
+    se = math.sqrt(p0 * (1 - p0) / n)
+    if se == 0:
+        return 0.0, 1.0
+    z = (p - p0) / se
+    p_val = 2 * (1 - norm_cdf(abs(z)))
+    return round(z, 4), round(p_val, 4)
+
+
+def mean_t_test(values: list[float]) -> tuple[float, float, float]:
+    """One-sample t-test H0: mean=0, iid SE. Returns (mean, t_stat, p_value).
+
+    WARNING: fold series here are strongly autocorrelated (overlapping 5-day
+    returns on daily folds) — for headline inference use nw_t_test."""
+    n = len(values)
+    if n < 2:
+        return (values[0] if values else 0.0), 0.0, 1.0
+    m = sum(values) / n
+    var = sum((v - m) ** 2 for v in values) / (n - 1)
+    se = math.sqrt(var / n) if var > 0 else 0
+    if se == 0:
+        return m, 0.0, 1.0
+    t = m / se
+    # Approximate two-sided p from t using normal (good enough for n>10)
+    p = 2 * (1 - norm_cdf(abs(t)))
+    return round(m, 4), round(t, 4), round(p, 4)
+
+
+def nw_t_test(values: list[float], lag: int = None,
+              mu0: float = 0.0) -> tuple[float, float, float]:
+    """One-sample test H0: mean=mu0 with Newey-West (HAC) standard error.
+
+    Bartlett-kernel long-run variance with `lag` autocovariance terms
+    (default NW_LAG=4, matching the 5-trading-day return overlap of daily
+    folds). Returns (mean, t_stat, p_value); two-sided normal p."""
+    if lag is None:
+        lag = NW_LAG
+    n = len(values)
+    if n < 2:
+        return (values[0] if values else 0.0), 0.0, 1.0
+    m = sum(values) / n
+    e = [v - m for v in values]
+    gamma0 = sum(x * x for x in e) / n
+    lrv = gamma0
+    for j in range(1, min(lag, n - 1) + 1):
+        gj = sum(e[i] * e[i - j] for i in range(j, n)) / n
+        lrv += 2 * (1 - j / (lag + 1)) * gj
+    if lrv <= 0:
+        return round(m, 4), 0.0, 1.0
+    se = math.sqrt(lrv / n)
+    t = (m - mu0) / se
+    p = 2 * (1 - norm_cdf(abs(t)))
+    return round(m, 4), round(t, 4), round(p, 4)
+
+
+def nw_vif(series: list[float], lag: int = NW_LAG) -> tuple[float, float]:
+    """AR(1)-approximated Newey-West variance inflation factor. (rho1, vif)"""
+    n = len(series)
+    if n < 3:
+        return 0.0, 1.0
+    m = statistics.mean(series)
+    dev = [x - m for x in series]
+    denom = sum(d * d for d in dev)
+    if denom == 0:
+        return 0.0, 1.0
+    rho1 = sum(dev[i] * dev[i + 1] for i in range(n - 1)) / denom
+    rho1 = max(0.0, min(rho1, 0.99))
+    vif = 1 + 2 * sum((1 - k / (lag + 1)) * rho1**k for k in range(1, lag + 1))
+    return rho1, vif
+
+
+def _erfcc(x: float) -> float:
+    """Complementary error function — Numerical Recipes Chebyshev approximation,
+    accurate to ≤1.2e-7 over the real line."""
+    z = abs(x)
+    t = 1.0 / (1.0 + 0.5 * z)
+    r = t * math.exp(
+        -z * z - 1.26551223
+        + t * ( 1.00002368
+        + t * ( 0.37409196
+        + t * ( 0.09678418
+        + t * (-0.18628806
+        + t * ( 0.27886807
+        + t * (-1.13520398
+        + t * ( 1.48851587
+        + t * (-0.82215223
+        + t *   0.17087277))))))))
+    )
+    return r if x >= 0 else 2.0 - r
+
+
+def corr_pvalue(r, n):
+    """Two-tailed p-value for Pearson correlation under H0: r=0.
+
+    Uses t = r·√(n-2)/√(1-r²) (df = n-2). For df ≥ 30 the t-distribution
+    is well-approximated by the standard normal, so we evaluate the
+    survival function via erfcc.
+
+    Note: the pre-2026-05-08 implementation accidentally cancelled the
+    √(n-2) factor and was effectively sample-size-blind — it rejected even
+    strongly significant moderate correlations (e.g. r=0.30, n=120 → 1.0).
+    """
+    if r is None or n < 4 or abs(r) >= 1.0:
+        return 1.0
+    t = abs(r) * math.sqrt(n - 2) / math.sqrt(1 - r * r + 1e-12)
+    # 2-sided: P(|Z| > t) = erfcc(t/√2)
+    p = _erfcc(t / math.sqrt(2.0))
+    return round(min(1.0, max(0.0, p)), 4)
+
+
+# ── batched ────────────────────────────────────────────────────────────────
+
+def norm_sf2(z) -> np.ndarray:
+    """Two-sided normal p-values 2·(1 - Φ(|z|)), elementwise, bit-equal to
+    the scalar tests' formula."""
+    z = np.abs(np.asarray(z, dtype=float))
+    return 2 * (1 - 0.5 * (1 + _erf(z / math.sqrt(2)).astype(float)))
+
+
+def _padded(series) -> tuple[np.ndarray, np.ndarray]:
+    """(k × max_len array, NaN after each row's end; lengths)."""
+    if isinstance(series, np.ndarray) and series.ndim == 2:
+        X = series.astype(float)
+        return X, np.full(len(X), X.shape[1])
+    lengths = np.array([len(s) for s in series], dtype=np.int64)
+    X = np.full((len(series), int(lengths.max(initial=0))), np.nan)
+    for i, s in enumerate(series):
+        X[i, :len(s)] = s
+    return X, lengths
+
+
+def nw_t_test_many(series: Sequence[Sequence[float]] | np.ndarray, lag: int = NW_LAG,
+                   mu0: float | np.ndarray = 0.0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """nw_t_test over many series at once: (mean, t, p) arrays, unrounded.
+
+    `series` is a 2-D array (one series per row) or a list of sequences of
+    any lengths. Same conventions as nw_t_test: n < 2 → (first or 0, 0, 1);
+    a non-positive long-run variance → t = 0, p = 1."""
+    X, n = _padded(series)
+    valid = np.arange(X.shape[1]) < n[:, None]
+    nf = np.maximum(n, 1).astype(float)
+    m = np.where(valid, X, 0.0).sum(axis=1) / nf
+    E = np.where(valid, X - m[:, None], 0.0)
+    lrv = (E * E).sum(axis=1) / nf
+    for j in range(1, min(lag, X.shape[1] - 1) + 1):
+        lrv += 2 * (1 - j / (lag + 1)) * (E[:, j:] * E[:, :-j]).sum(axis=1) / nf
+    ok = (n >= 2) & (lrv > 0)
+    se = np.sqrt(np.where(ok, lrv, 1.0) / nf)
+    t = np.where(ok, (m - mu0) / se, 0.0)
+    p = np.where(ok, norm_sf2(t), 1.0)
+    first = np.where(n >= 1, X[:, 0] if X.shape[1] else 0.0, 0.0)
+    return np.where(n >= 2, m, first), t, p
+
+
+def wilson_ci_many(k, n, z: float = 1.96) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """wilson_ci elementwise: (center, lo, hi), unrounded; n == 0 → 0s."""
+    k = np.asarray(k, dtype=float)
+    n = np.asarray(n, dtype=float)
+    nz = np.where(n > 0, n, 1.0)
+    p = k / nz
+    denom = 1 + z * z / nz
+    center = (p + z * z / (2 * nz)) / denom
+    margin = z * np.sqrt((p * (1 - p) + z * z / (4 * nz)) / nz) / denom
+    zero = n == 0
+    return (np.where(zero, 0.0, center),
+            np.where(zero, 0.0, np.maximum(0, center - margin)),
+            np.where(zero, 0.0, np.minimum(1, center + margin)))
+
+
+def proportion_z_many(k, n, p0=0.5) -> tuple[np.ndarray, np.ndarray]:
+    """proportion_z elementwise: (z, p), unrounded."""
+    k = np.asarray(k, dtype=float)
+    n = np.asarray(n, dtype=float)
+    p0 = np.asarray(p0, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se = np.sqrt(p0 * (1 - p0) / n)
+        z = (k / n - p0) / se
+    ok = (n > 0) & (se > 0)
+    z = np.where(ok, z, 0.0)
+    return z, np.where(ok, norm_sf2(z), 1.0)
+
+
+def _log_factorials(n_max: int) -> np.ndarray:
+    return np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, n_max + 1, dtype=float)))])
+
+
+def binom_pvalue(k, n, p0: float = 0.5, alternative: str = "two-sided") -> np.ndarray:
+    """Exact binomial test p-values for arrays of (k successes, n trials).
+
+    two-sided sums every outcome no more likely than k (scipy.binomtest's
+    "minlike" rule, same 1e-7 relative tolerance); greater = P(X >= k),
+    less = P(X <= k). One pmf table per distinct n."""
+    k = np.asarray(k, dtype=np.int64)
+    n = np.asarray(n, dtype=np.int64)
+    k, n = np.broadcast_arrays(k, n)
+    out = np.ones(k.shape, dtype=float)
+    if not k.size:
+        return out
+    if p0 <= 0 or p0 >= 1:
+        raise ValueError("p0 must be in (0, 1)")
+    lf = _log_factorials(int(n.max()))
+    lp, lq = math.log(p0), math.log1p(-p0)
+    for nn in np.unique(n):
+        sel = (n == nn)
+        if nn <= 0:
+            continue
+        i = np.arange(nn + 1)
+        pmf = np.exp(lf[nn] - lf[i] - lf[nn - i] + i * lp + (nn - i) * lq)
+        kk = np.clip(k[sel], 0, nn)
+        if alternative == "greater":
+            tail = np.cumsum(pmf[::-1])[::-1]
+            res = tail[kk]
+        elif alternative == "less":
+            res = np.cumsum(pmf)[kk]
+        elif alternative == "two-sided":
+            order = np.sort(pmf)
+            csum = np.cumsum(order)
+            pos = np.searchsorted(order, pmf[kk] * (1 + 1e-7), side="right")
+            res = csum[pos - 1]
+        else:
+            raise ValueError(f"unknown alternative {alternative!r}")
+        out[sel] = np.minimum(res, 1.0)
+    return out
+
+
+def bh_fdr(pvals) -> np.ndarray:
+    """Benjamini-Hochberg adjusted p-values (q-values); NaN stays NaN and is
+    not counted in m. Reject at FDR α where q <= α."""
+    p = np.asarray(pvals, dtype=float)
+    q = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    m = int(ok.sum())
+    if not m:
+        return q
+    pv = p[ok]
+    order = np.argsort(pv, kind="stable")
+    scaled = pv[order] * m / np.arange(1, m + 1)
+    adj = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    qv = np.empty(m)
+    qv[order] = adj
+    q[ok] = qv
+    return q
+
+
+def stationary_bootstrap(x: Sequence[float], n_boot: int = 2000,
+                         mean_block: float = NW_LAG + 1, seed: int = 0) -> np.ndarray:
+    """Bootstrap means of x under the Politis-Romano stationary bootstrap:
+    resampled series are built from blocks of geometric length (mean
+    `mean_block`) starting at uniform positions, wrapping around, so the
+    short-range autocorrelation of overlapping fold returns survives
+    resampling. All n_boot replicates are drawn in one array pass."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n == 0:
+        return np.full(n_boot, np.nan)
+    rng = np.random.default_rng(seed)
+    jump = rng.random((n_boot, n)) < 1.0 / max(mean_block, 1.0)
+    fresh = rng.integers(0, n, (n_boot, n))
+    idx = np.empty((n_boot, n), dtype=np.int64)
+    idx[:, 0] = fresh[:, 0]
+    for t in range(1, n):
+        idx[:, t] = np.where(jump[:, t], fresh[:, t], idx[:, t - 1] + 1)
+        idx[:, t] %= n
+    return x[idx].mean(axis=1)
+
+
+def bootstrap_mean_test(x: Sequence[float], mu0: float = 0.0, n_boot: int = 2000,
+                        mean_block: float = NW_LAG + 1, seed: int = 0,
+                        level: float = 0.95) -> tuple[float, float, float, float]:
+    """(mean, ci_lo, ci_hi, p) for H0: mean = mu0 from stationary_bootstrap.
+    p is the share of centred bootstrap means at least as far from the
+    sample mean as the sample mean is from mu0."""
+    x = np.asarray(x, dtype=float)
+    if len(x) < 2:
+        return (float(x[0]) if len(x) else 0.0), float("nan"), float("nan"), 1.0
+    boot = stationary_bootstrap(x, n_boot, mean_block, seed)
+    m = float(x.mean())
+    a = (1 - level) / 2
+    lo, hi = np.quantile(boot, [a, 1 - a])
+    p = float(np.mean(np.abs(boot - m) >= abs(m - mu0)))
+    return m, float(lo), float(hi), p
+
+
+# ── self-test ──────────────────────────────────────────────────────────────
+
+# Outputs of the pre-consolidation implementations (walk_forward,
+# analyze_ticker, build_signal_corr, build_weekly_narrative), pinned.
+_SERIES = [
+    [0.8, -0.3, 1.2, 0.4, -0.9, 1.5, 0.2, 0.7, -0.1, 0.9, 1.1, -0.4],
+    [-1.0, 2.0],
+    [0.5, 0.5, 0.5],
+    [3.1, -2.2, 0.4, 1.9, -0.7, 2.8, -1.6, 0.3],
+    [1.0, 2.0, 3.0, 4.0, 5.0, 4.0, 3.0, 2.0, 1.0, 2.0, 3.0, 4.0],
+]
+_GOLDEN = {
+    "nw_t_test": [(0.425, 5.3013, 0.0), (0.5, 1.0541, 0.2918), (0.5, 0.0, 1.0),
+                  (0.5, 2.2911, 0.022), (2.8333, 7.7105, 0.0)],
+    "mean_t_test": [(0.425, 2.003, 0.0452), (0.5, 0.3333, 0.7389), (0.5, 0.0, 1.0),
+                    (0.5, 0.7174, 0.4731), (2.8333, 7.7447, 0.0)],
+    "wilson_ci": [(0.5, 0.2538, 0.7462), (0.6674, 0.5143, 0.8205), (0.0, 0.0, 0.0)],
+    "proportion_z": [(0.0, 1.0), (2.0, 0.0455), (0.0, 1.0)],
+    "corr_pvalue": [0.0006, 0.1967, 1.0, 1.0],
+    "nw_vif": [(0.0, 1.0), (0.0, 1.0), (0.0, 1.0), (0.0, 1.0), (0.555, 2.4325)],
+    # seed=0, n_boot=2000; pins the resampling scheme, not a reference value
+    "bootstrap_mean_test": [(0.425, 0.2333, 0.625, 0.0), (0.5, -0.15, 1.125, 0.1195),
+                            (2.8333, 2.1667, 3.4167, 0.0)],
+}
+
+
+def run_self_tests() -> list[dict]:
+    tests = []
+
+    def check(name, ok, actual, expect):
+        tests.append({"name": name, "expect": expect, "actual": actual, "pass": bool(ok)})
+
+    got = [nw_t_test(s) for s in _SERIES]
+    check("nw_t_test_golden", got == _GOLDEN["nw_t_test"], got, "pinned outputs")
+    got = [mean_t_test(s) for s in _SERIES]
+    check("mean_t_test_golden", got == _GOLDEN["mean_t_test"], got, "pinned outputs")
+    got = [wilson_ci(6, 12), wilson_ci(22, 32), wilson_ci(0, 0)]
+    check("wilson_ci_golden", got == _GOLDEN["wilson_ci"], got, "pinned outputs")
+    got = [proportion_z(5, 10), proportion_z(60, 100), proportion_z(0, 0)]
+    check("proportion_z_golden", got == _GOLDEN["proportion_z"], got, "pinned outputs")
+    got = [corr_pvalue(0.3, 120), corr_pvalue(0.2, 42), corr_pvalue(0.5, 3), corr_pvalue(None, 50)]
+    check("corr_pvalue_golden", got == _GOLDEN["corr_pvalue"], got, "pinned outputs")
+    got = [tuple(round(v, 4) for v in nw_vif(s)) for s in _SERIES]
+    check("nw_vif_golden", got == _GOLDEN["nw_vif"], got, "pinned outputs")
+
+    # batched vs scalar on random ragged series (to the scalar's rounding)
+    rng = np.random.default_rng(7)
+    series = [list(np.cumsum(rng.normal(0.1, 1, int(L))) * 0.1)
+              for L in rng.integers(0, 60, 300)]
+    m, t, p = nw_t_test_many(series)
+    worst = 0.0
+    for s, a, b, c in zip(series, m, t, p):
+        ref = nw_t_test(s)
+        worst = max(worst, *(abs(round(float(x), 4) - y) for x, y in zip((a, b, c), ref)))
+    check("nw_t_test_many_vs_scalar", worst <= 1e-4, f"max diff {worst:g} over {len(series)} series",
+          "≤ 1e-4 (last rounded digit)")
+
+    ks = rng.integers(0, 80, 500)
+    ns = ks + rng.integers(0, 80, 500)
+    c, lo, hi = wilson_ci_many(ks, ns)
+    ref = [wilson_ci(int(a), int(b)) for a, b in zip(ks, ns)]
+    ok = all(tuple(round(float(v), 4) for v in x) == y for x, y in zip(zip(c, lo, hi), ref))
+    check("wilson_ci_many_vs_scalar", ok, f"{len(ref)} cases", "equal after rounding")
+    z, pz = proportion_z_many(ks, ns)
+    ref = [proportion_z(int(a), int(b)) for a, b in zip(ks, ns)]
+    ok = all((round(float(a), 4), round(float(b), 4)) == y for a, b, y in zip(z, pz, ref))
+    check("proportion_z_many_vs_scalar", ok, f"{len(ref)} cases", "equal after rounding")
+
+    # exact binomial vs direct sums over math.comb
+    def ref_binom(k, n, p0=0.5):
+        pmf = [math.comb(n, i) * p0**i * (1 - p0)**(n - i) for i in range(n + 1)]
+        return min(1.0, sum(q for q in pmf if q <= pmf[k] * (1 + 1e-7)))
+    kb, nb = ks[:200] % 41, np.full(200, 40)
+    got = binom_pvalue(kb, nb)
+    worst = max(abs(g - ref_binom(int(a), 40)) for g, a in zip(got, kb))
+    check("binom_pvalue_exact", abs(binom_pvalue(7, 10)[()] - 0.34375) < 1e-12 and worst < 1e-12,
+          f"p(7/10)={binom_pvalue(7, 10)[()]:.6f}, max diff {worst:g}", "0.34375; ≤ 1e-12 vs math.comb")
+    g, l = binom_pvalue(8, 10, alternative="greater")[()], binom_pvalue(2, 10, alternative="less")[()]
+    check("binom_pvalue_one_sided", abs(g - 56 / 1024) < 1e-12 and abs(l - 56 / 1024) < 1e-12,
+          f"greater={g:.6f} less={l:.6f}", "56/1024 both")
+
+    q = bh_fdr([0.01, 0.04, 0.03, 0.005, float("nan")])
+    ok = np.allclose(q[:4], [0.02, 0.04, 0.04, 0.02]) and np.isnan(q[4])
+    check("bh_fdr", ok, [round(float(v), 4) for v in q], "[0.02, 0.04, 0.04, 0.02, nan]")
+
+    x = rng.normal(0.0, 1.0, 80)
+    _, lo, hi, pb = bootstrap_mean_test(x)
+    _, lo2, hi2, pb2 = bootstrap_mean_test(x + 2.0)
+    ok = lo < x.mean() < hi and pb > 0.05 and pb2 < 0.01 and (lo2, hi2, pb2) == bootstrap_mean_test(x + 2.0)[1:]
+    check("stationary_bootstrap", ok, f"null p={pb:.3f}, shifted p={pb2:.3f}",
+          "null not rejected, +2σ shift rejected, seeded = reproducible")
+    got = [tuple(round(v, 4) for v in bootstrap_mean_test(_SERIES[i])) for i in (0, 3, 4)]
+    check("bootstrap_mean_test_golden", got == _GOLDEN["bootstrap_mean_test"], got, "pinned outputs")
+    return tests
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Inference statistics self-test")
+    ap.add_argument("--self-test", action="store_true")
+    args = ap.parse_args()
+    if not args.self_test:
+        ap.print_help()
+        return 0
+    tests = run_self_tests()
+    for t in tests:
+        tag = "PASS" if t["pass"] else "FAIL"
+        print(f"  [{tag}] {t['name']}: {t['actual']}  (expect: {t['expect']})")
+    n_pass = sum(t["pass"] for t in tests)
+    print(f"\n  {n_pass}/{len(tests)} self-tests passed")
+    return 0 if n_pass == len(tests) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -26,6 +26,7 @@ import glob
 import json
 import os
 import sys
+from perf import instrument
 
 # ── Allowed input lag per source, in days ────────────────────────────────────
 # lag = (UTC today) − (watermark last_record_date).
@@ -198,6 +199,7 @@ def self_test() -> int:
     return 0 if ok else 1
 
 
+@instrument("input_watermark_gate")
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", default=".", help="tree to gate (for testing a doctored copy)")
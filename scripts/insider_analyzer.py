@@ -47,6 +47,7 @@ import sys
 from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
 
 ROOT = Path(__file__).resolve().parent.parent
 
@@ -366,7 +367,7 @@ def load_parsed(ticker: str) -> dict | None:
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text())
+        return load_json(path)
     except json.JSONDecodeError:
         return None
 
@@ -414,7 +415,7 @@ def write_outputs(scores: list[dict]) -> None:
         },
     }
     OUTPUT_INDEX.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT_INDEX.write_text(json.dumps(index, indent=2, default=str))
+    dump_json(OUTPUT_INDEX, index, indent=2, default=str)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,19 @@
+"""
+jsonio.py — scripts/ entry point for src/news_trend/jsonio.py.
+
+Scripts run with scripts/ on sys.path rather than the installed package, so
+this shim adds src/ and re-exports the shared orjson-backed JSON/JSONL
+helpers:
+
+    from jsonio import load_json, dump_json, iter_jsonl, write_jsonl
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.jsonio import *  # noqa: E402,F401,F403
+from news_trend.jsonio import __all__  # noqa: E402,F401
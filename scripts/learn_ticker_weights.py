@@ -32,10 +32,11 @@ predict.py가 종목별로 다른 가중치를 사용하도록 함.
 """
 
 import argparse
-import json
 import math
 from datetime import datetime, timezone
 from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 def compute_ta_signal(ta_data: dict, ticker: str, date: str) -> str:
@@ -215,6 +216,7 @@ def learn_for_ticker(ticker: str, prices: dict, ta_data: dict,
     }
 
 
+@instrument("learn_ticker_weights")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--prices",        default="site/data/prices.json")
@@ -226,9 +228,9 @@ def main():
     ap.add_argument("--tickers",       default=None)
     args = ap.parse_args()
 
-    prices = json.loads(Path(args.prices).read_text())
-    ta     = json.loads(Path(args.ta).read_text())
-    trends = json.loads(Path(args.trends).read_text())
+    prices = load_json(args.prices)
+    ta     = load_json(args.ta)
+    trends = load_json(args.trends)
 
     if args.tickers:
         tickers = [t.strip().upper() for t in args.tickers.split(",")]
@@ -243,7 +245,7 @@ def main():
         if not ta_path.exists():
             ticker_analysis = {}
         else:
-            ticker_analysis = json.loads(ta_path.read_text())
+            ticker_analysis = load_json(ta_path)
 
         result = learn_for_ticker(ticker, prices, ta, ticker_analysis, trends, args.hold_days)
         if result is None:
@@ -269,7 +271,7 @@ def main():
         },
         "weights": weights,
     }
-    Path(args.out).write_text(json.dumps(output, ensure_ascii=False, separators=(",",":")))
+    dump_json(args.out, output)
 
     # 분류 요약
     ta_driven   = [t for t,w in weights.items() if w["ta_weight"]   > 0.5]
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
-import argparse, json, re
+import argparse, json, sys
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from collections import Counter, defaultdict
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+from news_trend.textproc import VIZ, VIZ_STOPWORDS, clean_viz as normalize_text  # noqa: E402
+
 def load_jsonl(path):
     with open(path, "r", encoding="utf-8") as f:
         for line in f:
@@ -25,17 +28,6 @@ def load_rows(master_path=None, inputs=None):
                 for row in load_jsonl(fp):
                     yield row
 
-_ws = re.compile(r"\s+")
-_url = re.compile(r"https?://\S+")
-_punct = re.compile(r"[^\w\s]")
-
-def normalize_text(s):
-    s = s.lower()
-    s = _url.sub(" ", s)
-    s = _punct.sub(" ", s)
-    s = _ws.sub(" ", s).strip()
-    return s
-
 def safe_join(parts):
     out = []
     for x in parts:
@@ -49,8 +41,7 @@ def safe_join(parts):
             out.append(x)
     return " ".join(out)
 
-def tokenize(text):
-    return [t for t in text.split(" ") if t]
+tokenize = VIZ.tokenize
 
 def parse_date(s):
     if not s or not isinstance(s, str):
@@ -62,16 +53,7 @@ def parse_date(s):
         return datetime.now(timezone.utc).date()
 
 def build_stopwords(extra=None, min_len=3):
-    base = {
-        "the","a","an","and","or","of","to","in","on","for","by","with","as","at","from",
-        "that","this","it","its","is","are","was","were","be","been","being",
-        "he","she","they","we","you","i","his","her","their","our","your","them",
-        "will","would","can","could","should","may","might","must","do","did","does","done",
-        "not","no","yes","but","if","than","then","there","here","about","over","under",
-        "more","most","less","least","very","much","many","new","news","latest","today",
-        "say","says","said","according","via","source","mr","ms","dr","u","us","uk",
-        "nbsp","amp","apos","mdash","ndash"
-    }
+    base = set(VIZ_STOPWORDS)
     if extra:
         for t in extra.split(","):
             t = t.strip().lower()
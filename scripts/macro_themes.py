@@ -34,10 +34,10 @@ trends.json의 단어들을 카테고리별로 그룹핑하여 일별/주별 트
 """
 
 import argparse
-import json
 import math
 from datetime import datetime, timezone
-from pathlib import Path
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 # ── 카테고리 정의 ────────────────────────────────────────────────────────────
@@ -358,13 +358,14 @@ def analyze_category(category: str, words: list, trends: dict) -> dict:
     }
 
 
+@instrument("macro_themes")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends", default="site/data/trends.json")
     ap.add_argument("--out",    default="site/data/macro_themes.json")
     args = ap.parse_args()
 
-    trends = json.loads(Path(args.trends).read_text())
+    trends = load_json(args.trends)
     print(f"Loaded {len(trends['dates'])} days, {len(trends.get('series', {}))} terms")
 
     categories_data = {}
@@ -395,7 +396,7 @@ def main():
         "falling_themes":    falling,
     }
 
-    Path(args.out).write_text(json.dumps(output, ensure_ascii=False, separators=(",",":")))
+    dump_json(args.out, output)
 
     # 콘솔 출력
     print(f"\n→ {args.out}")
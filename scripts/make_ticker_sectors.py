@@ -1,10 +1,12 @@
-import argparse, json, pathlib, time
+import argparse, pathlib, time
 import yfinance as yf
+from jsonio import dump_json, load_json
+from perf import instrument
 
 def load_tickers(map_path=None, list_path=None):
     t = set()
     if map_path:
-        d = json.loads(pathlib.Path(map_path).read_text())
+        d = load_json(map_path)
         for k in d.keys():
             t.add(k.upper())
     if list_path:
@@ -54,6 +56,7 @@ ETF_SECTOR = {
     "GLD": "ETF", "TLT": "ETF", "HYG": "ETF", "USO": "ETF",
 }
 
+@instrument("make_ticker_sectors")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--map")
@@ -82,7 +85,7 @@ def main():
 
     p = pathlib.Path(a.out)
     p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(json.dumps(out))
+    dump_json(p, out)
     print(f"[ok] wrote -> {p} sectors={len(out)}")
 
 if __name__ == "__main__":
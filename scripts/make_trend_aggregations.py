@@ -18,6 +18,8 @@ import json
 from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
+from jsonio import load_json
+from perf import instrument
 
 DOW_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
@@ -104,6 +106,7 @@ def build_bucketed(dates_dt, series, top_terms, key_fn):
     return bucket_order, out_series
 
 
+@instrument("make_trend_aggregations")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--trends", default="site/data/trends.json")
@@ -117,7 +120,7 @@ def main():
     args = ap.parse_args()
 
     src = Path(args.trends)
-    data = json.loads(src.read_text(encoding="utf-8"))
+    data = load_json(src)
     dates: list[str] = data["dates"]
     series: dict[str, list[int]] = data["series"]
 
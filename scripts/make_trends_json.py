@@ -1,9 +1,11 @@
 import argparse
-import json
 import math
 from pathlib import Path
 
 import pandas as pd
+from jsonio import dump_json, iter_jsonl
+from perf import instrument
+from tokcounts import SUFFIX as TKC_SUFFIX, read_counts
 
 # ── Comprehensive English stop-words (general + financial news boilerplate) ──
 STOP_WORDS = {
@@ -145,20 +147,12 @@ def read_tokens_csv(path: Path, min_len: int):
 
 def read_tokens_jsonl(path: Path, min_len: int):
     rows = []
-    with path.open("r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            tok = obj.get("tok") or obj.get("term") or obj.get("entity")
-            n = obj.get("n") if "n" in obj else obj.get("count")
-            if tok is None or n is None:
-                continue
-            rows.append((str(tok), int(n)))
+    for obj in iter_jsonl(path):
+        tok = obj.get("tok") or obj.get("term") or obj.get("entity")
+        n = obj.get("n") if "n" in obj else obj.get("count")
+        if tok is None or n is None:
+            continue
+        rows.append((str(tok), int(n)))
     if not rows:
         return {}
     result = {}
@@ -167,9 +161,12 @@ def read_tokens_jsonl(path: Path, min_len: int):
             result[tok] = result.get(tok, 0) + n
     return result
 
+def read_tokens_tkc(path: Path, min_len: int):
+    return {tok: n for tok, n in read_counts(path).items() if len(tok) >= min_len}
+
 def get_date_from_filename(path: Path) -> str:
     name = path.name
-    for suffix in ("_tokens.csv", "_tokens.jsonl"):
+    for suffix in (TKC_SUFFIX, "_tokens.csv", "_tokens.jsonl"):
         if name.endswith(suffix):
             return name[: -len(suffix)]
     return path.stem
@@ -222,6 +219,7 @@ def calc_burst(counts: list, window: int = 7) -> float:
     return round((counts[-1] - mean) / std, 3)
 
 
+@instrument("make_trends_json")
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--tokens-dir", default="data/warehouse/daily")
@@ -234,47 +232,38 @@ def main():
     args = p.parse_args()
 
     td = Path(args.tokens_dir)
-    # *_tokens.csv, *_tokens.jsonl, 그리고 YYYY-MM-DD.csv / YYYY-MM-DD.jsonl
+    # *_tokens.tkc (csv_to_tokens), 구 캐시의 *_tokens.csv / *_tokens.jsonl,
+    # 그리고 YYYY-MM-DD.csv / YYYY-MM-DD.jsonl
     import re as _re
     def _is_date_file(p):
         return bool(_re.match(r"\d{4}-\d{2}-\d{2}\.(csv|jsonl)$", p.name))
     files = (
+        sorted(td.glob(f"*{TKC_SUFFIX}")) +
         sorted(td.glob("*_tokens.csv")) +
         sorted(td.glob("*_tokens.jsonl")) +
         sorted(f for f in td.glob("*.csv")   if _is_date_file(f) and "_tokens" not in f.name) +
         sorted(f for f in td.glob("*.jsonl") if _is_date_file(f) and "_tokens" not in f.name)
     )
-    # 날짜 기준 중복 제거 (tokens 버전 우선)
-    seen_dates = set()
-    deduped = []
-    for f in sorted(files):
-        d = get_date_from_filename(f)
-        if d not in seen_dates:
-            seen_dates.add(d)
-            deduped.append(f)
-    files = deduped
-    if not files:
-        raise SystemExit("no *_tokens.csv or *_tokens.jsonl files found")
+    # 날짜 기준 중복 제거: 위 목록 순서가 우선순위 (.tkc > 구 _tokens 파일 > raw).
+    # 예전엔 sorted(files)로 경로순 dedupe → "<d>.csv" < "<d>_tokens…"라
+    # raw가 이겨서, raw jsonl만 있는 날은 토큰 파일이 있어도 {}였음.
+    file_map = {}
+    for f in files:
+        file_map.setdefault(get_date_from_filename(f), f)
+    if not file_map:
+        raise SystemExit(f"no *{TKC_SUFFIX}, *_tokens.csv or *_tokens.jsonl files found")
 
-    dates = sorted({get_date_from_filename(f) for f in files})
+    dates = sorted(file_map)
     if args.last_days > 0 and len(dates) > args.last_days:
         dates = dates[-args.last_days:]
 
-    # file_map: date → 실제 파일 (토큰 우선, 없으면 raw)
-    file_map = {}
-    for f in files:
-        d = get_date_from_filename(f)
-        # _tokens 파일 우선
-        if "_tokens" in f.name:
-            file_map[d] = f
-        elif d not in file_map:
-            file_map[d] = f
-
     by_date = {}
     for d in dates:
         f = file_map.get(d)
         if f is None:
             by_date[d] = {}
+        elif f.name.endswith(TKC_SUFFIX):
+            by_date[d] = read_tokens_tkc(f, args.min_len)
         elif f.suffix == ".csv":
             by_date[d] = read_tokens_csv(f, args.min_len)
         else:
@@ -339,7 +328,7 @@ def main():
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
+    dump_json(out_path, out)
 
     # Summary
     hot = sum(1 for z in zscores.values() if z >= 2.0)
@@ -23,11 +23,15 @@ Gating:
   - n_train < MIN_DATA (100) → mode="advisory"; metrics still
     computed and recorded but the run is flagged so downstream
     consumers know not to weight the recommendation heavily.
+
+The four fits are independent; --jobs N runs them in N processes via
+fold_exec (same seeds, same results).
 """
 
 from __future__ import annotations
 
-import json
+import argparse
+import os
 import warnings
 from datetime import datetime, timezone
 from pathlib import Path
@@ -45,6 +49,9 @@ from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from fold_exec import run_folds, single_threaded
+from jsonio import dump_json
+from perf import instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -111,7 +118,53 @@ def _rf_feature_importance(pipe, feature_names: list[str]) -> dict:
     return {name: round(float(imp), 4) for name, imp in pairs[:15]}
 
 
+def _make_models() -> dict:
+    return {
+        "LinearRegression":           LinearRegression(),
+        "Ridge":                      Ridge(alpha=1.0, random_state=42),
+        "RandomForest":               RandomForestRegressor(n_estimators=100, min_samples_leaf=3, random_state=42, n_jobs=-1),
+        "GradientBoosting":           GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42),
+    }
+
+
+_FIT: dict = {}
+
+
+def _init_worker(X_train, y_train, X_test, y_test, single: bool) -> None:
+    _FIT.update(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test, single=single)
+
+
+def _fit_model(name: str) -> dict:
+    model = _make_models()[name]
+    if _FIT["single"]:
+        single_threaded(model)
+    X_train, y_train, X_test, y_test = (_FIT[k] for k in ("X_train", "y_train", "X_test", "y_test"))
+    try:
+        pipe = _make_pipeline(model)
+        pipe.fit(X_train, y_train)
+        train_pred = pipe.predict(X_train)
+        test_pred = pipe.predict(X_test)
+        entry = {
+            "train": _evaluate(y_train, train_pred),
+            "test": _evaluate(y_test, test_pred),
+        }
+        if name == "RandomForest":
+            fitted_pre = pipe.named_steps["pre"]
+            ohe_names = list(fitted_pre.named_transformers_["cat"].get_feature_names_out(CATEGORICAL_COLS))
+            feature_names = NUMERIC_COLS + ohe_names
+            entry["top_feature_importance"] = _rf_feature_importance(pipe, feature_names)
+        return entry
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+@instrument("ml_baseline")
 def run() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark regressors on the 5-day forward return")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes, one model per process")
+    args = ap.parse_args()
+
     if not FEATURES_CSV.exists():
         raise SystemExit(f"Missing {FEATURES_CSV} — run feature_engineering.py first")
 
@@ -148,7 +201,7 @@ def run() -> None:
     # If we lack any test rows we cannot benchmark — bail with what we have.
     if n_train < 5 or n_test < 1:
         payload["error"] = f"insufficient_data n_train={n_train} n_test={n_test}"
-        OUT_JSON.write_text(json.dumps(payload, indent=2, default=str))
+        dump_json(OUT_JSON, payload, indent=2, default=str)
         print(f"Wrote {OUT_JSON}  (mode={mode}, error={payload['error']})")
         return
 
@@ -157,31 +210,10 @@ def run() -> None:
     X_test = test_df[CATEGORICAL_COLS + NUMERIC_COLS]
     y_test = test_df[TARGET].to_numpy(dtype=float)
 
-    models = {
-        "LinearRegression":           LinearRegression(),
-        "Ridge":                      Ridge(alpha=1.0, random_state=42),
-        "RandomForest":               RandomForestRegressor(n_estimators=100, min_samples_leaf=3, random_state=42, n_jobs=-1),
-        "GradientBoosting":           GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42),
-    }
-
-    for name, model in models.items():
-        try:
-            pipe = _make_pipeline(model)
-            pipe.fit(X_train, y_train)
-            train_pred = pipe.predict(X_train)
-            test_pred = pipe.predict(X_test)
-            entry = {
-                "train": _evaluate(y_train, train_pred),
-                "test": _evaluate(y_test, test_pred),
-            }
-            if name == "RandomForest":
-                fitted_pre = pipe.named_steps["pre"]
-                ohe_names = list(fitted_pre.named_transformers_["cat"].get_feature_names_out(CATEGORICAL_COLS))
-                feature_names = NUMERIC_COLS + ohe_names
-                entry["top_feature_importance"] = _rf_feature_importance(pipe, feature_names)
-            payload["models"][name] = entry
-        except Exception as e:
-            payload["models"][name] = {"error": f"{type(e).__name__}: {e}"}
+    names = list(_make_models())
+    entries = run_folds(_fit_model, names, jobs=args.jobs, init=_init_worker,
+                        initargs=(X_train, y_train, X_test, y_test, args.jobs > 1))
+    payload["models"].update(zip(names, entries))
 
     # Pick the winner on test directional accuracy as primary metric;
     # advisory until n_train ≥ MIN_DATA.
@@ -191,7 +223,7 @@ def run() -> None:
         best_name = max(valid, key=lambda k: valid[k]["directional_accuracy"])
         payload["winner"] = {"model": best_name, **valid[best_name]}
 
-    OUT_JSON.write_text(json.dumps(payload, indent=2, default=str))
+    dump_json(OUT_JSON, payload, indent=2, default=str)
     print(f"Wrote {OUT_JSON}  (mode={mode})")
     print(f"  n_train={n_train} n_test={n_test}")
     for name, info in payload["models"].items():
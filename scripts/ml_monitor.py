@@ -11,6 +11,8 @@ MODEL FROZEN. No tuning. This script:
 Safety features:
  - Immutable prediction log (append-only, timestamped, model-hash verified)
  - Frozen model hash verification (training data + model determinism check)
+ - Fitted models stored once in a content-addressed artifact store
+   (data/ml_artifacts/), loaded and integrity-checked on every later run
  - OOD regime detection (flag when current regime differs from training dist.)
  - Bias monitor (long/short ratio, sector concentration, calibration)
  - Uncertainty labels on every prediction
@@ -21,6 +23,7 @@ Usage:
     python3 scripts/ml_monitor.py          # full run: predict + evaluate + log
     python3 scripts/ml_monitor.py --status # one-line CI status
     python3 scripts/ml_monitor.py --json   # JSON output
+    python3 scripts/ml_monitor.py --refit-audit  # refit from frozen rows, compare to artifacts
 """
 
 from __future__ import annotations
@@ -29,6 +32,8 @@ import argparse
 import hashlib
 import json
 import math
+import pickle
+import sys
 import warnings
 from datetime import datetime, timezone
 from pathlib import Path
@@ -38,6 +43,7 @@ import pandas as pd
 
 warnings.filterwarnings("ignore")
 
+import sklearn
 from sklearn.base import clone
 from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
@@ -46,14 +52,23 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+from inference import norm_cdf  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
+
 DATA = ROOT / "site" / "data"
 ACCURACY_FILE = DATA / "prediction_accuracy.json"
 PREDICTIONS_FILE = DATA / "predictions.json"
 PRICES_FILE = DATA / "prices.json"
 TICKERS_FILE = DATA / "tickers.json"
 OUT_FILE = DATA / "ml_monitor.json"
+RUNS_LOG = DATA / "ml_monitor_runs.jsonl"  # append-only compact run log
+RUNS_WINDOW = 90  # runs kept in ml_monitor.json
 PREDICTION_LOG = DATA / "ml_prediction_log.json"
 FROZEN_TRAIN = DATA / "ml_frozen_train.json"
+ARTIFACT_DIR = ROOT / "data" / "ml_artifacts"  # <sha256>.pkl objects + <train_key>.json manifests
 
 BASELINE_DATE = "2026-05-25"
 
@@ -83,10 +98,6 @@ def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
 
-def _norm_cdf(x: float) -> float:
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-
 # ── Feature extraction ─────────────────────────────────────────────────────
 
 def _extract_row_from_accuracy(r: dict) -> dict | None:
@@ -149,7 +160,7 @@ def _spy_5d(snap_date: str, cache: dict = {}) -> float | None:
     if "closes" not in cache:
         if not PRICES_FILE.exists():
             return None
-        d = json.loads(PRICES_FILE.read_text())
+        d = load_json(PRICES_FILE)
         spy = d.get("tickers", {}).get("SPY")
         if spy:
             cache["dates"] = spy["dates"]
@@ -199,6 +210,161 @@ def _compute_model_hash(X_train: np.ndarray, y_train: np.ndarray, model_name: st
     return h.hexdigest()[:16]
 
 
+def _fit_frozen(train_df):
+    """Fit the preprocessor and every model in MODELS on the frozen rows."""
+    pre, _, _ = _build_preprocessor(train_df)
+    X_train = pre.fit_transform(train_df)
+    y_train = train_df["fwd_5d_return"].to_numpy(float)
+    trained = {}
+    model_hashes = {}
+    for name, template in MODELS.items():
+        model = clone(template)
+        model.fit(X_train, y_train)
+        trained[name] = model
+        model_hashes[name] = _compute_model_hash(X_train, y_train, name)
+    return pre, trained, model_hashes
+
+
+# ── Frozen-model artifact store ───────────────────────────────────────────
+#
+# The model is frozen, so refitting it every run only re-derived the same
+# hash. Fitted objects are pickled once into ARTIFACT_DIR under the sha256
+# of their bytes; a manifest named after the training key (hash of the
+# frozen rows, feature lists and sklearn version) maps each model name to
+# its object, its config fingerprint and the model hash taken at fit time.
+# Loading re-hashes every object before unpickling it, so an artifact that
+# changed on disk is caught rather than silently scored with.
+
+def _train_key(train_rows: list[dict]) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps(train_rows, sort_keys=True, default=str).encode())
+    h.update(json.dumps([BASELINE_DATE, NUMERIC_FEATURES, CATEGORICAL_FEATURES,
+                         sklearn.__version__]).encode())
+    return h.hexdigest()[:16]
+
+
+def _model_config(template) -> str:
+    params = sorted(template.get_params().items())
+    return hashlib.sha256(f"{type(template).__name__}{params!r}".encode()).hexdigest()[:16]
+
+
+def _put_object(obj) -> str:
+    blob = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    digest = hashlib.sha256(blob).hexdigest()
+    path = ARTIFACT_DIR / f"{digest}.pkl"
+    if not path.exists() or path.read_bytes() != blob:
+        ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(path)
+    return digest
+
+
+def _get_object(digest: str):
+    blob = (ARTIFACT_DIR / f"{digest}.pkl").read_bytes()
+    if hashlib.sha256(blob).hexdigest() != digest:
+        raise ValueError(f"artifact {digest[:16]} failed its content check")
+    return pickle.loads(blob)
+
+
+def _save_artifacts(key: str, pre, trained: dict, model_hashes: dict, n_train: int) -> None:
+    manifest = {
+        "train_key": key,
+        "created": _now_iso(),
+        "sklearn": sklearn.__version__,
+        "n_train": n_train,
+        "preprocessor": _put_object(pre),
+        "models": {
+            name: {"object": _put_object(model),
+                   "config": _model_config(MODELS[name]),
+                   "model_hash": model_hashes[name]}
+            for name, model in trained.items()
+        },
+    }
+    dump_json(ARTIFACT_DIR / f"{key}.json", manifest)
+
+
+def _load_artifacts(key: str):
+    """(pre, trained, model_hashes) for this training key, or None when the
+    store has no complete, current entry. Raises ValueError on a stored
+    object whose bytes no longer match its address."""
+    path = ARTIFACT_DIR / f"{key}.json"
+    if not path.exists():
+        return None
+    try:
+        manifest = load_json(path)
+        models = manifest.get("models") or {}
+        if manifest.get("train_key") != key or set(models) != set(MODELS):
+            return None
+        if any(models[n].get("config") != _model_config(t) for n, t in MODELS.items()):
+            return None
+        pre = _get_object(manifest["preprocessor"])
+        trained = {n: _get_object(models[n]["object"]) for n in MODELS}
+    except (json.JSONDecodeError, OSError, KeyError):
+        return None
+    return pre, trained, {n: models[n]["model_hash"] for n in MODELS}
+
+
+def _frozen_models(train_rows: list[dict]):
+    """Load the frozen models from the artifact store, fitting (and storing)
+    them only when no artifact exists for these training rows.
+
+    Returns (pre, trained, model_hashes, info); info["error"] is set when a
+    stored artifact failed verification and was replaced by a refit."""
+    key = _train_key(train_rows)
+    info = {"train_key": key, "source": "artifact"}
+    try:
+        loaded = _load_artifacts(key)
+    except ValueError as e:
+        loaded = None
+        info["error"] = str(e)
+    if loaded is not None:
+        return (*loaded, info)
+    pre, trained, model_hashes = _fit_frozen(pd.DataFrame(train_rows))
+    _save_artifacts(key, pre, trained, model_hashes, len(train_rows))
+    info["source"] = "fitted"
+    return pre, trained, model_hashes, info
+
+
+def refit_audit() -> dict:
+    """Refit from the frozen rows and compare against the stored artifact:
+    model hash, transformed training matrix and in-sample predictions must
+    all match exactly. Writes nothing."""
+    train_rows = _load_or_freeze_train_rows(_accuracy_rows())
+    key = _train_key(train_rows)
+    out = {"train_key": key, "n_train": len(train_rows), "ok": False}
+    if len(train_rows) < 30:
+        out["error"] = "insufficient training data"
+        return out
+    try:
+        stored = _load_artifacts(key)
+    except ValueError as e:
+        out["error"] = str(e)
+        return out
+    if stored is None:
+        out["error"] = "no artifact stored for this training set"
+        return out
+    s_pre, s_trained, s_hashes = stored
+
+    train_df = pd.DataFrame(train_rows)
+    pre, trained, model_hashes = _fit_frozen(train_df)
+    X_ref = pre.transform(train_df)
+    X_art = s_pre.transform(train_df)
+    out["preprocessor_match"] = bool(np.array_equal(X_ref, X_art))
+    out["models"] = {
+        name: {
+            "model_hash": model_hashes[name],
+            "hash_match": model_hashes[name] == s_hashes[name],
+            "predictions_match": bool(np.array_equal(trained[name].predict(X_ref),
+                                                     s_trained[name].predict(X_art))),
+        }
+        for name in MODELS
+    }
+    out["ok"] = out["preprocessor_match"] and all(
+        m["hash_match"] and m["predictions_match"] for m in out["models"].values())
+    return out
+
+
 def _load_or_freeze_train_rows(rows: list[dict]) -> list[dict]:
     """Return the FROZEN pre-baseline training set.
 
@@ -215,17 +381,17 @@ def _load_or_freeze_train_rows(rows: list[dict]) -> list[dict]:
     BASELINE_DATE rows are ever frozen."""
     if FROZEN_TRAIN.exists():
         try:
-            snap = json.loads(FROZEN_TRAIN.read_text())
+            snap = load_json(FROZEN_TRAIN)
             frozen = snap.get("train_rows")
             if frozen:
                 return frozen
         except (json.JSONDecodeError, OSError):
             pass
     candidate = [r for r in rows if r["snap_date"] <= BASELINE_DATE]
-    FROZEN_TRAIN.write_text(json.dumps(
-        {"baseline_date": BASELINE_DATE, "frozen_at": _now_iso(),
-         "n_train": len(candidate), "train_rows": candidate},
-        indent=2, default=str))
+    dump_json(FROZEN_TRAIN,
+              {"baseline_date": BASELINE_DATE, "frozen_at": _now_iso(),
+               "n_train": len(candidate), "train_rows": candidate},
+              default=str)
     return candidate
 
 
@@ -234,14 +400,14 @@ def _load_or_freeze_train_rows(rows: list[dict]) -> list[dict]:
 def _load_prediction_log() -> dict:
     if PREDICTION_LOG.exists():
         try:
-            return json.loads(PREDICTION_LOG.read_text())
+            return load_json(PREDICTION_LOG)
         except (json.JSONDecodeError, OSError):
             pass
     return {"predictions": [], "evaluations": []}
 
 
 def _save_prediction_log(log: dict) -> None:
-    PREDICTION_LOG.write_text(json.dumps(log, indent=2, default=str))
+    dump_json(PREDICTION_LOG, log, default=str)
 
 
 def _generate_today_predictions(trained_models: dict, pre, today_rows: list[dict],
@@ -293,7 +459,7 @@ def _evaluate_past_predictions(log: dict) -> int:
         # Load actual price return for this ticker
         if not PRICES_FILE.exists():
             continue
-        prices_data = json.loads(PRICES_FILE.read_text())
+        prices_data = load_json(PRICES_FILE)
         tk_data = prices_data.get("tickers", {}).get(pred["ticker"])
         if not tk_data:
             continue
@@ -398,12 +564,15 @@ def _check_ood(current_regime: str) -> dict:
 
 # ── Main run ───────────────────────────────────────────────────────────────
 
-def run_monitor() -> dict:
-    acc = json.loads(ACCURACY_FILE.read_text())
-    all_records = acc.get("records", [])
+def _accuracy_rows() -> list[dict]:
+    acc = load_json(ACCURACY_FILE)
+    rows = [_extract_row_from_accuracy(r) for r in acc.get("records", [])
+            if r.get("fwd_5d_return") is not None]
+    return [r for r in rows if r is not None]
 
-    rows = [_extract_row_from_accuracy(r) for r in all_records if r.get("fwd_5d_return") is not None]
-    rows = [r for r in rows if r is not None]
+
+def run_monitor() -> dict:
+    rows = _accuracy_rows()
 
     train_rows = _load_or_freeze_train_rows(rows)
     forward_rows = [r for r in rows if r["snap_date"] > BASELINE_DATE]
@@ -411,33 +580,22 @@ def run_monitor() -> dict:
     if len(train_rows) < 30:
         return {"error": "insufficient training data", "n_train": len(train_rows)}
 
-    train_df = pd.DataFrame(train_rows)
-    pre, nc, cc = _build_preprocessor(train_df)
-    X_train = pre.fit_transform(train_df)
-    y_train = train_df["fwd_5d_return"].to_numpy(float)
-
-    trained = {}
-    model_hashes = {}
-    for name, template in MODELS.items():
-        model = clone(template)
-        model.fit(X_train, y_train)
-        trained[name] = model
-        model_hashes[name] = _compute_model_hash(X_train, y_train, name)
+    pre, trained, model_hashes, artifact = _frozen_models(train_rows)
 
     # ── 1. Generate today's predictions ──
     today_rows = []
     current_regime = "UNKNOWN"
     if PREDICTIONS_FILE.exists():
-        pred_data = json.loads(PREDICTIONS_FILE.read_text())
+        pred_data = load_json(PREDICTIONS_FILE)
         current_regime = (pred_data.get("market_regime") or {}).get("regime", "UNKNOWN")
         snap_date = pred_data.get("updated", "")[:10]
+        # Sector for bias monitoring
+        sectors = load_json(TICKERS_FILE) if TICKERS_FILE.exists() else {}
+        sector_lookup = {tk: sec for sec, tks in sectors.items() for tk in tks}
         for p in pred_data.get("predictions", []):
             p["date"] = snap_date
             row = _extract_row_from_prediction(p, current_regime)
             if row:
-                # Add sector for bias monitoring
-                sectors = json.loads(TICKERS_FILE.read_text()) if TICKERS_FILE.exists() else {}
-                sector_lookup = {tk: sec for sec, tks in sectors.items() for tk in tks}
                 row["sector"] = sector_lookup.get(row["ticker"])
                 today_rows.append(row)
 
@@ -460,11 +618,14 @@ def run_monitor() -> dict:
     prev_hashes = {}
     if OUT_FILE.exists():
         try:
-            prev = json.loads(OUT_FILE.read_text())
+            prev = load_json(OUT_FILE)
             prev_hashes = (prev.get("latest") or {}).get("model_hashes", {})
         except (json.JSONDecodeError, OSError):
             pass
     hash_warnings = []
+    if artifact.get("error"):
+        hash_warnings.append(f"frozen artifact: {artifact['error']} — refit from frozen rows")
+        hash_ok = False
     for name, h in model_hashes.items():
         if prev_hashes and name in prev_hashes and prev_hashes[name] != h:
             hash_warnings.append(f"{name}: hash changed {prev_hashes[name]} → {h} (training data changed)")
@@ -519,7 +680,7 @@ def run_monitor() -> dict:
             fse = float(np.std(fold_alphas, ddof=1)) / math.sqrt(n_folds_eval)
             if fse > 0:
                 t_stat = fm / fse
-                p_val = 2 * (1 - _norm_cdf(abs(t_stat)))
+                p_val = 2 * (1 - norm_cdf(abs(t_stat)))
 
         regime_summary = {}
         for rg, g in by_regime.items():
@@ -580,6 +741,7 @@ def run_monitor() -> dict:
         "baseline_date": BASELINE_DATE,
         "model_hashes": model_hashes,
         "hash_verified": hash_ok,
+        "artifact": artifact,
         "historical": {
             "n_train": len(train_rows),
             "n_dates": len(set(r["snap_date"] for r in train_rows)),
@@ -604,14 +766,7 @@ def run_monitor() -> dict:
     }
 
     # ── Persist ──
-    history = {"runs": []}
-    if OUT_FILE.exists():
-        try:
-            history = json.loads(OUT_FILE.read_text())
-            if "runs" not in history:
-                history = {"runs": []}
-        except (json.JSONDecodeError, OSError):
-            history = {"runs": []}
+    runs = HistoryLog(RUNS_LOG, legacy=OUT_FILE, legacy_key="runs")
 
     compact = {
         "updated": payload["updated"],
@@ -625,22 +780,41 @@ def run_monitor() -> dict:
         "ood": ood.get("out_of_distribution", False),
         "unfreeze_ready": has_fwd_alpha and has_risk_off,
     }
-    history["runs"].append(compact)
-    history["latest"] = payload
-    history["updated"] = payload["updated"]
-    OUT_FILE.write_text(json.dumps(history, indent=2, default=str))
+    runs.append(compact)
+    runs.write_window(OUT_FILE, RUNS_WINDOW, "runs",
+                      extra={"latest": payload, "updated": payload["updated"]})
 
     return payload
 
 
 # ── CLI ────────────────────────────────────────────────────────────────────
 
+@instrument("ml_monitor")
 def run() -> int:
     ap = argparse.ArgumentParser(description="ML forward alpha tracker")
     ap.add_argument("--json", action="store_true")
     ap.add_argument("--status", action="store_true")
+    ap.add_argument("--refit-audit", action="store_true",
+                    help="refit from the frozen rows and compare to the stored artifact; writes nothing")
     args = ap.parse_args()
 
+    if args.refit_audit:
+        audit = refit_audit()
+        if args.json:
+            print(json.dumps(audit, indent=2))
+        else:
+            print(f"Refit audit (train_key {audit['train_key']}, {audit['n_train']} rows): "
+                  f"{'OK' if audit['ok'] else 'MISMATCH'}")
+            if audit.get("error"):
+                print(f"  {audit['error']}")
+            if "preprocessor_match" in audit:
+                print(f"  preprocessor: {'match' if audit['preprocessor_match'] else 'DIFFERS'}")
+            for name, m in audit.get("models", {}).items():
+                print(f"  {name}: hash {m['model_hash']} "
+                      f"{'match' if m['hash_match'] else 'DIFFERS'}, "
+                      f"predictions {'match' if m['predictions_match'] else 'DIFFER'}")
+        return 0 if audit["ok"] else 1
+
     result = run_monitor()
 
     if args.status:
@@ -669,6 +843,8 @@ def run() -> int:
     print(f"ML Monitor (baseline: {result['baseline_date']})")
     print(f"  Training: {result['historical']['n_train']} rows")
     print(f"  Hash verified: {result['hash_verified']}")
+    art = result.get("artifact", {})
+    print(f"  Frozen models: {art.get('source')} ({art.get('train_key')})")
 
     pl = result["prediction_log"]
     print(f"\n  Prediction log: {pl['total']} total, {pl['evaluated']} evaluated, "
@@ -25,6 +25,8 @@ Usage:
     python3 scripts/ml_walkforward.py               # full evaluation
     python3 scripts/ml_walkforward.py --self-test    # harness self-test
     python3 scripts/ml_walkforward.py --json         # JSON output
+    python3 scripts/ml_walkforward.py --jobs 8       # folds across 8 processes
+    python3 scripts/ml_walkforward.py --warm-start   # warm-start RF/GB across folds
 """
 
 from __future__ import annotations
@@ -32,10 +34,13 @@ from __future__ import annotations
 import argparse
 import json
 import math
+import os
 import warnings
 from pathlib import Path
 
 import numpy as np
+from inference import norm_cdf
+from jsonio import load_json
 
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", message="Skipping features")
@@ -81,16 +86,13 @@ def _extract_row(r: dict) -> dict | None:
     return row
 
 
-def _build_Xy(rows: list[dict]):
-    """Convert row dicts to numpy arrays for sklearn."""
+def _make_preprocessor(df):
+    """Median-impute + scale numerics, one-hot categoricals (unfitted)."""
     from sklearn.compose import ColumnTransformer
     from sklearn.impute import SimpleImputer
     from sklearn.pipeline import Pipeline
     from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
-    import pandas as pd
-    df = pd.DataFrame(rows)
-
     num_cols = [c for c in NUMERIC_FEATURES if c in df.columns]
     cat_cols = [c for c in CATEGORICAL_FEATURES if c in df.columns]
 
@@ -101,7 +103,14 @@ def _build_Xy(rows: list[dict]):
         ]), num_cols),
         ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), cat_cols),
     ], remainder="drop")
+    return pre
+
 
+def _build_Xy(rows: list[dict]):
+    """Convert row dicts to numpy arrays for sklearn."""
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    pre = _make_preprocessor(df)
     X = pre.fit_transform(df)
     y = df["fwd_5d_return"].to_numpy(dtype=float)
     return X, y, pre
@@ -119,16 +128,12 @@ def _make_models():
     }
 
 
-def _norm_cdf(x: float) -> float:
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-
 def _spy_5d(snap_date: str, _cache: dict = {}) -> float | None:
     if not _cache:
         p = DATA / "prices.json"
         if not p.exists():
             return None
-        d = json.loads(p.read_text())
+        d = load_json(p)
         spy = d.get("tickers", {}).get("SPY")
         if spy:
             _cache["dates"] = spy["dates"]
@@ -155,8 +160,145 @@ def _spy_5d(snap_date: str, _cache: dict = {}) -> float | None:
 
 
 # ── walk-forward ML engine ────────────────────────────────────────────────
+#
+# Folds are independent: each refits its own preprocessor and models on
+# dates[:k]. They fan out over fold_exec's process pool and are
+# reassembled in date order, identical to a serial run.
+#
+# --warm-start gives up that independence for speed on estimators with a
+# warm_start knob. Each such model runs as one chain that keeps the
+# previous fold's fit and adds `step` estimators trained on the grown
+# window: RandomForest rotates its `step` oldest trees out (forest size
+# stays fixed), GradientBoosting boosts `step` more stages on top of the
+# current ensemble. A chain's preprocessor is frozen between full refits,
+# so trees always see one scaling; the chain refits from scratch whenever
+# its window has doubled since the last full fit, so late folds are not
+# scored on the medians/categories of the first few dates. Models without
+# warm_start (Ridge) keep the per-fold path.
+
+WARM_STEP = 10
+WARM_RESTART_GROWTH = 2.0
+
+_WF: dict = {}
+
+
+def _init_worker(dates: list[str], by_date: dict, spy: dict, single: bool) -> None:
+    _WF.update(dates=dates, by_date=by_date, spy=spy, single=single)
+
+
+def _fold_frames(k: int):
+    import pandas as pd
+    dates, by_date = _WF["dates"], _WF["by_date"]
+    train_rows = []
+    for d in dates[:k]:
+        train_rows.extend(by_date.get(d, []))
+    return pd.DataFrame(train_rows), pd.DataFrame(by_date.get(dates[k], []))
+
+
+def _fold_models(names: list[str]) -> dict:
+    from fold_exec import single_threaded
+    models = _make_models()
+    return {n: single_threaded(models[n]) if _WF["single"] else models[n] for n in names}
+
+
+def _score_fold(test_date: str, preds: np.ndarray, y_test: np.ndarray, n_train: int) -> dict:
+    spy_ret = _WF["spy"][test_date]
+
+    # predicted return → action → correct
+    actions = np.where(preds > 0, 1, -1)  # 1=BUY, -1=SELL
+    correct = np.where(
+        actions == 1,
+        y_test > 0,
+        y_test < 0,
+    ).astype(int)
+    acc = float(correct.mean())
+
+    # Alpha: trade return (aligned with action) - SPY
+    trade_rets = np.where(actions == 1, y_test, -y_test)
+    alpha_trades = []
+    if spy_ret is not None:
+        alpha_trades = [(tr - spy_ret) for tr in trade_rets]
+
+    return {
+        "test_date": test_date,
+        "n": len(y_test),
+        "n_train": n_train,
+        "accuracy": round(acc, 4),
+        "dir_acc_raw": round(float(np.mean(np.sign(preds) == np.sign(y_test))), 4),
+        "alpha_mean_pct": round(float(np.mean(alpha_trades)) * 100, 3) if alpha_trades else None,
+        "spy_5d_pct": round(spy_ret * 100, 3) if spy_ret is not None else None,
+    }
 
-def ml_walk_forward() -> dict:
+
+def _cold_fold(task: tuple) -> dict:
+    """Fit `names` from scratch on dates[:k], score on dates[k]."""
+    from sklearn.base import clone
+    k, names = task
+    test_date = _WF["dates"][k]
+    train_df, test_df = _fold_frames(k)
+    pre = _make_preprocessor(train_df)
+    X_train = pre.fit_transform(train_df)
+    y_train = train_df["fwd_5d_return"].to_numpy(dtype=float)
+    X_test = pre.transform(test_df)
+    y_test = test_df["fwd_5d_return"].to_numpy(dtype=float)
+
+    out = {}
+    for name, model_template in _fold_models(names).items():
+        model = clone(model_template)
+        try:
+            model.fit(X_train, y_train)
+            out[name] = _score_fold(test_date, model.predict(X_test), y_test, len(y_train))
+        except Exception as e:
+            out[name] = {"test_date": test_date, "n": len(y_test), "error": str(e)}
+    return out
+
+
+def _warm_chain(task: tuple) -> list[dict]:
+    """One model across folds `ks`, warm-starting between full refits."""
+    from sklearn.base import clone
+    from sklearn.ensemble import RandomForestRegressor
+    name, ks, step = task
+    template = _fold_models([name])[name]
+    folds = []
+    model = pre = None
+    base_n = 0
+    for k in ks:
+        test_date = _WF["dates"][k]
+        train_df, test_df = _fold_frames(k)
+        y_train = train_df["fwd_5d_return"].to_numpy(dtype=float)
+        y_test = test_df["fwd_5d_return"].to_numpy(dtype=float)
+        try:
+            if model is None or len(y_train) >= WARM_RESTART_GROWTH * base_n:
+                pre = _make_preprocessor(train_df)
+                X_train = pre.fit_transform(train_df)
+                model = clone(template)
+                model.fit(X_train, y_train)
+                base_n, fit = len(y_train), "full"
+            else:
+                model.set_params(warm_start=True)
+                if isinstance(model, RandomForestRegressor):
+                    del model.estimators_[:step]
+                else:
+                    model.set_params(n_estimators=model.n_estimators + step)
+                model.fit(pre.transform(train_df), y_train)
+                fit = "warm"
+            f = _score_fold(test_date, model.predict(pre.transform(test_df)), y_test, len(y_train))
+            f["fit"] = fit
+        except Exception as e:
+            f = {"test_date": test_date, "n": len(y_test), "error": str(e)}
+            model = None
+        folds.append(f)
+    return folds
+
+
+def _run_task(task: tuple):
+    fn, arg = task
+    return fn(arg)
+
+
+def _fold_plan():
+    """(rows, dates, by_date, ks): ks are the fold indices with enough
+    training rows and a non-empty test date."""
     from walk_forward import load_records
 
     raw = load_records()
@@ -168,53 +310,34 @@ def ml_walk_forward() -> dict:
     for r in rows:
         by_date.setdefault(r["snap_date"], []).append(r)
 
+    ks = []
+    n_seen = sum(len(by_date[d]) for d in dates[:MIN_TRAIN_DATES])
+    for k in range(MIN_TRAIN_DATES, len(dates)):
+        if n_seen >= MIN_TRAIN_ROWS and by_date.get(dates[k]):
+            ks.append(k)
+        n_seen += len(by_date[dates[k]])
+    return rows, dates, by_date, ks
+
+
+def ml_walk_forward(jobs: int = 1, warm_step: int | None = None) -> dict:
+    from fold_exec import run_folds
+
+    rows, dates, by_date, ks = _fold_plan()
     if len(dates) < MIN_TRAIN_DATES + 1:
         return {"error": f"need >= {MIN_TRAIN_DATES + 1} dates, have {len(dates)}"}
 
     model_defs = _make_models()
     model_folds: dict[str, list[dict]] = {name: [] for name in model_defs}
     buy_folds: list[dict] = []
+    spy = {dates[k]: _spy_5d(dates[k]) for k in ks}
 
-    for k in range(MIN_TRAIN_DATES, len(dates)):
+    # Always-buy folds need no fit
+    for k in ks:
         test_date = dates[k]
-        train_rows = []
-        for d in dates[:k]:
-            train_rows.extend(by_date.get(d, []))
-        test_rows = by_date.get(test_date, [])
-
-        if len(train_rows) < MIN_TRAIN_ROWS or not test_rows:
-            continue
-
-        from sklearn.compose import ColumnTransformer
-        from sklearn.impute import SimpleImputer
-        from sklearn.pipeline import Pipeline
-        from sklearn.preprocessing import OneHotEncoder, StandardScaler
-        import pandas as pd
-
-        train_df = pd.DataFrame(train_rows)
-        test_df = pd.DataFrame(test_rows)
-
-        num_cols = [c for c in NUMERIC_FEATURES if c in train_df.columns]
-        cat_cols = [c for c in CATEGORICAL_FEATURES if c in train_df.columns]
-
-        pre = ColumnTransformer([
-            ("num", Pipeline([
-                ("impute", SimpleImputer(strategy="median")),
-                ("scale", StandardScaler()),
-            ]), num_cols),
-            ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), cat_cols),
-        ], remainder="drop")
-
-        X_train = pre.fit_transform(train_df)
-        y_train = train_df["fwd_5d_return"].to_numpy(dtype=float)
-        X_test = pre.transform(test_df)
-        y_test = test_df["fwd_5d_return"].to_numpy(dtype=float)
-
-        spy_ret = _spy_5d(test_date)
+        y_test = np.array([r["fwd_5d_return"] for r in by_date[test_date]], dtype=float)
+        spy_ret = spy[test_date]
         n_test = len(y_test)
         n_up = int(np.sum(y_test > 0))
-
-        # Always-buy fold
         buy_acc = n_up / n_test if n_test else 0
         buy_alpha_trades = []
         if spy_ret is not None:
@@ -225,42 +348,19 @@ def ml_walk_forward() -> dict:
             "alpha_mean_pct": round(float(np.mean(buy_alpha_trades)) * 100, 3) if buy_alpha_trades else None,
         })
 
-        for name, model_template in model_defs.items():
-            from sklearn.base import clone
-            model = clone(model_template)
-            try:
-                model.fit(X_train, y_train)
-                preds = model.predict(X_test)
-
-                # predicted return → action → correct
-                actions = np.where(preds > 0, 1, -1)  # 1=BUY, -1=SELL
-                correct = np.where(
-                    actions == 1,
-                    y_test > 0,
-                    y_test < 0,
-                ).astype(int)
-                acc = float(correct.mean())
-
-                # Alpha: trade return (aligned with action) - SPY
-                trade_rets = np.where(actions == 1, y_test, -y_test)
-                alpha_trades = []
-                if spy_ret is not None:
-                    alpha_trades = [(tr - spy_ret) for tr in trade_rets]
-
-                model_folds[name].append({
-                    "test_date": test_date,
-                    "n": n_test,
-                    "n_train": len(y_train),
-                    "accuracy": round(acc, 4),
-                    "dir_acc_raw": round(float(np.mean(np.sign(preds) == np.sign(y_test))), 4),
-                    "alpha_mean_pct": round(float(np.mean(alpha_trades)) * 100, 3) if alpha_trades else None,
-                    "spy_5d_pct": round(spy_ret * 100, 3) if spy_ret is not None else None,
-                })
-            except Exception as e:
-                model_folds[name].append({
-                    "test_date": test_date, "n": n_test,
-                    "error": str(e),
-                })
+    warm = [n for n, m in model_defs.items() if warm_step and "warm_start" in m.get_params()]
+    cold = [n for n in model_defs if n not in warm]
+    # Chains are the long tasks: submit them first.
+    tasks = [(_warm_chain, (n, ks, warm_step)) for n in warm]
+    if cold:
+        tasks += [(_cold_fold, (k, cold)) for k in ks]
+    done = run_folds(_run_task, tasks, jobs=jobs, init=_init_worker,
+                     initargs=(dates, by_date, spy, jobs > 1))
+    for name, folds in zip(warm, done):
+        model_folds[name] = folds
+    for fold in done[len(warm):]:
+        for name, f in fold.items():
+            model_folds[name].append(f)
 
     # Aggregate per model
     results = {}
@@ -278,7 +378,7 @@ def ml_walk_forward() -> dict:
             a_var = sum((a - a_mean)**2 for a in alphas) / (len(alphas) - 1)
             a_se = math.sqrt(a_var / len(alphas)) if a_var > 0 else 0
             a_t = a_mean / a_se if a_se > 0 else 0
-            a_p = 2 * (1 - _norm_cdf(abs(a_t)))
+            a_p = 2 * (1 - norm_cdf(abs(a_t)))
         else:
             a_mean = alphas[0] if alphas else None
             a_t, a_p = 0, 1.0
@@ -317,6 +417,8 @@ def ml_walk_forward() -> dict:
             "n_folds": len(buy_valid),
         },
         "models": results,
+        **({"warm_start": {"models": warm, "step": warm_step,
+                           "restart_growth": WARM_RESTART_GROWTH}} if warm else {}),
     }
 
 
@@ -355,16 +457,51 @@ def _self_test_no_leakage() -> dict:
             "pass": monotonic}
 
 
+def _self_test_pool_matches_serial() -> dict:
+    """Folds fitted in worker processes equal the serial fits exactly."""
+    from fold_exec import run_folds
+    rows, dates, by_date, ks = _fold_plan()
+    sample = ks[::max(len(ks) // 4, 1)][:4]
+    spy = {dates[k]: _spy_5d(dates[k]) for k in sample}
+    names = list(_make_models())
+    tasks = [(k, names) for k in sample]
+    serial = run_folds(_cold_fold, tasks, jobs=1, init=_init_worker,
+                       initargs=(dates, by_date, spy, False))
+    pooled = run_folds(_cold_fold, tasks, jobs=2, init=_init_worker,
+                       initargs=(dates, by_date, spy, True))
+    return {"name": "pool_matches_serial", "expect": "identical fold results",
+            "actual": f"{len(sample)} folds, equal={serial == pooled}",
+            "pass": bool(sample) and serial == pooled}
+
+
+def _self_test_warm_chain() -> dict:
+    """A warm chain refits fully first, warm-starts after, never errors."""
+    rows, dates, by_date, ks = _fold_plan()
+    sample = ks[:8]
+    _init_worker(dates, by_date, {dates[k]: _spy_5d(dates[k]) for k in sample}, False)
+    folds = _warm_chain(("RandomForest", sample, WARM_STEP))
+    fits = [f.get("fit", "error") for f in folds]
+    ok = bool(fits) and fits[0] == "full" and "warm" in fits and "error" not in fits
+    return {"name": "warm_chain", "expect": "full, then warm folds, no errors",
+            "actual": f"fits={fits}", "pass": ok}
+
+
 # ── main ───────────────────────────────────────────────────────────────────
 
 def run() -> int:
     ap = argparse.ArgumentParser(description="ML walk-forward evaluation")
     ap.add_argument("--self-test", action="store_true")
     ap.add_argument("--json", action="store_true")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for independent folds")
+    ap.add_argument("--warm-start", nargs="?", type=int, const=WARM_STEP, default=None,
+                    metavar="STEP", help="warm-start tree ensembles across folds, "
+                    f"adding STEP estimators per fold (default {WARM_STEP})")
     args = ap.parse_args()
 
     if args.self_test:
-        tests = [_self_test_runs(), _self_test_no_leakage()]
+        tests = [_self_test_runs(), _self_test_no_leakage(),
+                 _self_test_pool_matches_serial(), _self_test_warm_chain()]
         all_pass = all(t["pass"] for t in tests)
         if args.json:
             print(json.dumps({"tests": tests, "all_pass": all_pass}, indent=2))
@@ -375,7 +512,7 @@ def run() -> int:
             print(f"\n  All pass: {all_pass}")
         return 0 if all_pass else 1
 
-    res = ml_walk_forward()
+    res = ml_walk_forward(jobs=args.jobs, warm_step=args.warm_start)
 
     if args.json:
         print(json.dumps(res, indent=2))
@@ -384,6 +521,9 @@ def run() -> int:
     print(f"ML Walk-Forward: {res['n_dates']} dates, {res['n_total_rows']} rows")
     buy_a = res["always_buy"]["alpha_mean_pct"]
     print(f"  Always-buy alpha: {buy_a:+.2f}%" if buy_a is not None else "  Always-buy alpha: n/a")
+    if "warm_start" in res:
+        ws = res["warm_start"]
+        print(f"  Warm start: {', '.join(ws['models'])} (+{ws['step']} estimators/fold)")
     print()
 
     print(f"  {'Model':<22} {'Acc':>6} {'Alpha':>8} {'t':>6} {'p':>8} {'Gate':>6}  Folds")
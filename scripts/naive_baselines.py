@@ -20,12 +20,11 @@ import argparse
 import json
 import math
 import random
+from collections import Counter
 from pathlib import Path
 
-from walk_forward import (
-    load_records, walk_forward, proportion_z, wilson_ci,
-    mean_t_test, PROVISIONAL_N,
-)
+from inference import binom_pvalue, proportion_z_many
+from walk_forward import load_records, walk_forward, PROVISIONAL_N
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -71,19 +70,14 @@ def compare_vs_baselines(records: list[dict]) -> dict:
     best_bl_acc = bl_accs[best_bl_name]
 
     edge_pp = round((sys_acc - best_bl_acc) * 100, 2)
-    z_edge, p_edge = proportion_z(
-        system["total_test_n"] * int(round(sys_acc * 1000)) // 1000,
-        system["total_test_n"],
-        best_bl_acc,
-    )
-    # More precise: recompute from exact counts
+    # exact counts, not the rounded pooled accuracy
     sys_correct = sum(f["n_correct"] for f in system["folds"])
     total_n = system["total_test_n"]
-    se = math.sqrt(best_bl_acc * (1 - best_bl_acc) / total_n) if total_n > 0 and 0 < best_bl_acc < 1 else 1
-    z_edge = round((sys_acc - best_bl_acc) / se, 4) if se > 0 else 0
-    p_edge = round(2 * (1 - 0.5 * (1 + math.erf(abs(z_edge) / math.sqrt(2)))), 4)
 
     # Regime breakdown
+    rg_correct = Counter()
+    for f in system["folds"]:
+        rg_correct[f["regime"]] += f["n_correct"]
     regime_comparison = {}
     for rg, rg_info in system.get("by_regime", {}).items():
         bl_regime_accs = {}
@@ -102,6 +96,22 @@ def compare_vs_baselines(records: list[dict]) -> dict:
             "n": rg_info["n"],
         }
 
+    # System vs every baseline, then each regime vs its best baseline: one call.
+    names = list(bl_accs)
+    rgs = list(regime_comparison)
+    z, p = proportion_z_many(
+        [sys_correct] * len(names) + [rg_correct[rg] for rg in rgs],
+        [total_n] * len(names) + [regime_comparison[rg]["n"] for rg in rgs],
+        [bl_accs[b] for b in names] + [regime_comparison[rg]["best_baseline_accuracy"] for rg in rgs],
+    )
+    z, p = [round(float(v), 4) for v in z], [round(float(v), 4) for v in p]
+    vs_each = {b: {"z": z[i], "p_value": p[i]} for i, b in enumerate(names)}
+    for j, rg in enumerate(rgs, len(names)):
+        regime_comparison[rg]["z"], regime_comparison[rg]["p_value"] = z[j], p[j]
+    z_edge, p_edge = vs_each[best_bl_name]["z"], vs_each[best_bl_name]["p_value"]
+    p_exact = (round(float(binom_pvalue(sys_correct, total_n, best_bl_acc)), 4)
+               if 0 < best_bl_acc < 1 else 1.0)
+
     return {
         "system": {
             "pooled_accuracy": sys_acc,
@@ -123,6 +133,8 @@ def compare_vs_baselines(records: list[dict]) -> dict:
             "edge_pp": edge_pp,
             "z": z_edge,
             "p_value": p_edge,
+            "p_exact": p_exact,
+            "vs_each": vs_each,
         },
         "by_regime": regime_comparison,
     }
@@ -225,14 +237,15 @@ def run() -> int:
 
     print(f"\nEdge vs best baseline ({e['vs_best_baseline']}):")
     print(f"  baseline acc={e['best_baseline_accuracy']*100:.1f}%  "
-          f"edge={e['edge_pp']:+.1f}pp  z={e['z']:.2f}  p={e['p_value']:.4f}")
+          f"edge={e['edge_pp']:+.1f}pp  z={e['z']:.2f}  p={e['p_value']:.4f}  "
+          f"(exact binomial p={e['p_exact']:.4f})")
 
     print(f"\nBy regime:")
     for rg, info in result["by_regime"].items():
         prov = "  [PROVISIONAL]" if info["provisional"] else ""
         print(f"  {rg}: n={info['n']}  sys={info['system_accuracy']*100:.1f}%"
               f"  best_bl={info['best_baseline']}({info['best_baseline_accuracy']*100:.1f}%)"
-              f"  edge={info['edge_pp']:+.1f}pp{prov}")
+              f"  edge={info['edge_pp']:+.1f}pp  p={info['p_value']:.4f}{prov}")
 
     return 0
 
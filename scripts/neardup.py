@@ -0,0 +1,18 @@
+"""
+neardup.py — scripts/ entry point for src/news_trend/neardup.py.
+
+Re-exports the MinHash/LSH near-duplicate clustering (same shim pattern as
+jsonio.py):
+
+    from neardup import NearDupIndex, representatives
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.neardup import *  # noqa: E402,F401,F403
+from news_trend.neardup import __all__  # noqa: E402,F401
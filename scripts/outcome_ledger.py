@@ -0,0 +1,135 @@
+"""
+outcome_ledger.py — persistent realized-outcome ledger.
+
+A realized N-trading-day forward return never changes once its forward
+date has closed, yet prediction_tracker and gap_analyzer used to recompute
+every historical (snapshot, ticker, horizon) outcome on every run. Both now
+resolve outcomes through this ledger: realized outcomes are read back from
+disk, and only keys that are new or still pending touch prices.json.
+
+File: site/data/outcome_ledger.json
+
+    {
+      "version": 1,
+      "updated": "...Z",
+      "prices_fingerprint": "<sha1 of prices.json at last run>",
+      "outcomes": {"AAPL|2026-05-04|5": [0.01234, "2026-05-04", "2026-05-11"]},
+      "pending":  ["MSFT|2026-08-14|5", ...]
+    }
+
+Only realized outcomes are stored in `outcomes` (raw, unrounded return so
+every consumer rounds exactly as before). A key is pending when its forward
+window has not closed yet or a close is missing; pending keys are retried
+each run, but only when prices.json actually changed since the last run —
+an unchanged price file cannot resolve anything new, so such runs never
+load it at all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from jsonio import dump_json, load_json
+
+ROOT = Path(__file__).resolve().parents[1]
+LEDGER_FILE = ROOT / "site" / "data" / "outcome_ledger.json"
+
+LEDGER_VERSION = 1
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _fingerprint(path: Path) -> str | None:
+    if not path.exists():
+        return None
+    h = hashlib.sha1()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def ledger_key(ticker: str, snap_date: str, horizon: int) -> str:
+    return f"{ticker}|{snap_date}|{horizon}"
+
+
+class OutcomeLedger:
+    """Realized forward returns keyed by (ticker, snap_date, horizon).
+
+    `prices_path` is the price file the outcomes are computed from and
+    `price_cache_factory(prices_path)` must return an object exposing
+    `forward_return(ticker, snap_date, n) -> (ret, anchor_date, fwd_date)`
+    (prediction_tracker.PriceCache / gap_analyzer.PriceCache). The factory
+    is only called on the first lookup that misses the ledger.
+    """
+
+    def __init__(self, prices_path: Path, price_cache_factory,
+                 path: Path = LEDGER_FILE, rebuild: bool = False):
+        self.path = path
+        self.prices_path = prices_path
+        self._factory = price_cache_factory
+        self._prices = None
+        self.outcomes: dict[str, list] = {}
+        prev_pending: set[str] = set()
+        prev_fp = None
+        if not rebuild and path.exists():
+            try:
+                data = load_json(path)
+            except (json.JSONDecodeError, OSError):
+                data = {}
+            if data.get("version") == LEDGER_VERSION:
+                self.outcomes = data.get("outcomes") or {}
+                prev_pending = set(data.get("pending") or [])
+                prev_fp = data.get("prices_fingerprint")
+        self.fingerprint = _fingerprint(prices_path)
+        # Same price file as last run → last run's pending keys stay pending.
+        self._frozen_pending = prev_pending if prev_fp == self.fingerprint else set()
+        self.pending: set[str] = set()
+        self.stats = {"cached": 0, "computed": 0, "resolved": 0, "pending": 0}
+
+    def _price_cache(self):
+        if self._prices is None:
+            self._prices = self._factory(self.prices_path)
+        return self._prices
+
+    def resolve(self, ticker: str, snap_date: str, n: int):
+        """(return, anchor_date, fwd_date) or (None, None, None) if pending."""
+        key = ledger_key(ticker, snap_date, n)
+        hit = self.outcomes.get(key)
+        if hit is not None:
+            self.stats["cached"] += 1
+            return hit[0], hit[1], hit[2]
+        if key in self._frozen_pending:
+            self.pending.add(key)
+            self.stats["pending"] += 1
+            return None, None, None
+        ret, anchor, fwd = self._price_cache().forward_return(ticker, snap_date, n)
+        self.stats["computed"] += 1
+        if ret is None:
+            self.pending.add(key)
+            self.stats["pending"] += 1
+            return None, None, None
+        self.outcomes[key] = [ret, anchor, fwd]
+        self.stats["resolved"] += 1
+        return ret, anchor, fwd
+
+    def save(self) -> None:
+        payload = {
+            "version": LEDGER_VERSION,
+            "updated": _now_iso(),
+            "prices_fingerprint": self.fingerprint,
+            "n_outcomes": len(self.outcomes),
+            "outcomes": self.outcomes,
+            "pending": sorted(self.pending | self._frozen_pending),
+        }
+        dump_json(self.path, payload)  # atomic
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"ledger: cached={s['cached']} computed={s['computed']} "
+                f"(resolved={s['resolved']}) pending={s['pending']} "
+                f"prices_loaded={self._prices is not None}")
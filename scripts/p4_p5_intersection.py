@@ -14,7 +14,6 @@ Output:
 """
 from __future__ import annotations
 
-import json
 import sys
 from datetime import datetime, timezone
 from math import sqrt
@@ -24,6 +23,7 @@ ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
 
 from fundamentals_analyzer import score_universe  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
 
 INSIDER_PATH = ROOT / "site" / "data" / "insider.json"
 OUT_PATH = ROOT / "site" / "data" / "p4_p5_intersection.json"
@@ -44,7 +44,7 @@ def load_p4() -> dict[str, dict]:
 
 
 def load_p5() -> dict[str, dict]:
-    data = json.loads(INSIDER_PATH.read_text())
+    data = load_json(INSIDER_PATH)
     return {
         tk: v
         for tk, v in data["tickers"].items()
@@ -127,7 +127,7 @@ def main() -> int:
         "top_conviction": [r for r in by_q["HIGH_HIGH"]][:20],
         "all": sorted(rows, key=lambda r: -r["composite"]),
     }
-    OUT_PATH.write_text(json.dumps(out, indent=2, ensure_ascii=False))
+    dump_json(OUT_PATH, out, indent=2)
     print(f"\nWrote {OUT_PATH.relative_to(ROOT)} "
           f"({len(out['top_conviction'])} top-conviction picks)")
     return 0
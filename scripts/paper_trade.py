@@ -24,20 +24,42 @@ Mechanics:
 The replay walks the prices.json calendar from the first snapshot forward.
 Any snapshot whose next trading day equals today's calendar date triggers
 entry/exit decisions; remaining positions are stop/profit checked daily.
+
+Checkpoint (site/data/paper_trading_state.json): each run saves every
+strategy's cash, positions, trades and value history together with the last
+processed trading day and the snapshots already consumed. The next run
+resumes from there and only loads/replays snapshots and days newer than the
+checkpoint, so a daily run costs the same after a year as after a month. The
+checkpoint is ignored (full replay) when the config changed, or when a
+snapshot that would have filled on or before the checkpoint day was added,
+removed or rewritten since.
+
+    python scripts/paper_trade.py                 # resume from checkpoint
+    python scripts/paper_trade.py --full-replay   # verify: replay from scratch and
+                                                  # compare with the checkpointed run
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import inspect
 import json
+from bisect import bisect_right
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
+from jsonio import dump_json, dumpb, load_json, loads
+from perf import count, instrument
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "site" / "data"
 HISTORY_DIR = DATA_DIR / "predictions_history"
 PRICES_FILE = DATA_DIR / "prices.json"
 OUT_FILE = DATA_DIR / "paper_trading_history.json"
+STATE_FILE = DATA_DIR / "paper_trading_state.json"
+
+STATE_VERSION = 1
 
 INITIAL_CASH = 10_000.0
 POSITION_SIZE = 1_000.0
@@ -50,34 +72,32 @@ MAX_HOLD_DAYS = 30
 # ── price cache ──────────────────────────────────────────────────────────
 class PriceCache:
     def __init__(self, prices_file: Path):
-        with prices_file.open() as f:
-            data = json.load(f)
+        data = load_json(prices_file)
         self.tickers = data["tickers"]
         cal: set[str] = set()
         self.lookup: dict[str, dict[str, float]] = {}
+        # per ticker: sorted dates that have a close, and those closes (latest_close)
+        self.series: dict[str, tuple[list[str], list[float]]] = {}
         for tk, payload in self.tickers.items():
-            self.lookup[tk] = dict(zip(payload["dates"], payload["closes"]))
+            ts = dict(zip(payload["dates"], payload["closes"]))
+            self.lookup[tk] = ts
             cal.update(payload["dates"])
+            pts = sorted((d, c) for d, c in ts.items() if c is not None)
+            self.series[tk] = ([d for d, _ in pts], [c for _, c in pts])
         self.calendar: list[str] = sorted(cal)
 
     def next_trading_day(self, d: str) -> str | None:
-        for cd in self.calendar:
-            if cd > d:
-                return cd
-        return None
+        i = bisect_right(self.calendar, d)
+        return self.calendar[i] if i < len(self.calendar) else None
 
     def close(self, ticker: str, d: str) -> float | None:
         v = self.lookup.get(ticker, {}).get(d)
         return v if v is not None else None
 
     def latest_close(self, ticker: str, on_or_before: str) -> float | None:
-        ts = self.lookup.get(ticker, {})
-        if not ts:
-            return None
-        for cd in reversed(self.calendar):
-            if cd <= on_or_before and ts.get(cd) is not None:
-                return ts[cd]
-        return None
+        dates, closes = self.series.get(ticker) or ((), ())
+        i = bisect_right(dates, on_or_before)
+        return closes[i - 1] if i else None
 
 
 # ── strategy selectors ──────────────────────────────────────────────────
@@ -153,6 +173,23 @@ class PaperPortfolio:
         self.trades: list[dict] = []
         self.value_history: list[dict] = []
 
+    def to_state(self) -> dict:
+        return {
+            "cash": self.cash,
+            "positions": self.positions,
+            "trades": self.trades,
+            "value_history": self.value_history,
+        }
+
+    @classmethod
+    def from_state(cls, name: str, label: str, state: dict) -> "PaperPortfolio":
+        pf = cls(name, label)
+        pf.cash = state["cash"]
+        pf.positions = state["positions"]
+        pf.trades = state["trades"]
+        pf.value_history = state["value_history"]
+        return pf
+
     def buy(self, ticker, fill_date, fill_price, target, stop, confidence, pillars, reason):
         if ticker in self.positions:
             return False
@@ -231,43 +268,112 @@ class PaperPortfolio:
 
 
 # ── snapshot loader ─────────────────────────────────────────────────────
-def load_snapshots() -> list[tuple[str, dict]]:
-    files = sorted(HISTORY_DIR.glob("*.json"))
+def snapshot_files() -> list[tuple[str, Path]]:
+    """(snapshot date, path) for every archived snapshot, oldest first (not loaded)."""
     out = []
-    for f in files:
-        snap_date = f.stem
+    for f in sorted(HISTORY_DIR.glob("*.json")):
         try:
-            datetime.fromisoformat(snap_date)
+            datetime.fromisoformat(f.stem)
         except ValueError:
             continue
-        with f.open() as fh:
-            out.append((snap_date, json.load(fh)))
+        out.append((f.stem, f))
     return out
 
 
-# ── replay engine ───────────────────────────────────────────────────────
-def run() -> None:
-    prices = PriceCache(PRICES_FILE)
-    snapshots = load_snapshots()
-    if not snapshots:
-        raise SystemExit(f"No snapshots in {HISTORY_DIR}")
+# ── checkpoint ──────────────────────────────────────────────────────────
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
 
-    portfolios = {
-        name: PaperPortfolio(name=name, label=cfg["label"])
-        for name, cfg in STRATEGIES.items()
+
+def _config() -> dict:
+    return {
+        "initial_cash": INITIAL_CASH,
+        "position_size": POSITION_SIZE,
+        "max_positions": MAX_POSITIONS,
+        "stop_loss": STOP_LOSS,
+        "take_profit": TAKE_PROFIT,
+        "max_hold_days": MAX_HOLD_DAYS,
+        "strategies": {name: _strategy_fingerprint(cfg) for name, cfg in sorted(STRATEGIES.items())},
     }
 
-    snap_by_date = {d: snap for d, snap in snapshots}
+
+def _strategy_fingerprint(cfg: dict) -> dict:
+    """Label + a digest of the selector's source, so changing an entry rule
+    (e.g. a confidence threshold) invalidates the checkpoint."""
+    src = inspect.getsource(cfg["selector"])
+    return {"label": cfg["label"],
+            "selector": hashlib.sha256(src.encode("utf-8")).hexdigest()[:16]}
+
+
+def load_checkpoint(prices: PriceCache, files: list[tuple[str, Path]],
+                    path: Path = STATE_FILE) -> tuple[dict | None, str]:
+    """(state, "") when the checkpoint can be resumed from, else (None, reason)."""
+    if not path.exists():
+        return None, "no checkpoint"
+    try:
+        state = load_json(path)
+    except (json.JSONDecodeError, OSError):
+        return None, "unreadable checkpoint"
+    if state.get("version") != STATE_VERSION:
+        return None, "checkpoint version changed"
+    if state.get("config") != _config():
+        return None, "config changed"
+    last = state.get("last_date")
+    consumed: dict[str, int] = state.get("snapshots") or {}
+    if not last:
+        return None, "empty checkpoint"
+    # Every snapshot that fills on or before the checkpoint day must be the
+    # one the checkpoint consumed; a late, edited or deleted one changes history.
+    seen = 0
+    for sd, f in files:
+        ntd = prices.next_trading_day(sd)
+        if ntd is None or ntd > last:
+            continue
+        if consumed.get(sd) != f.stat().st_size:
+            return None, f"snapshot {sd} changed since checkpoint"
+        seen += 1
+    if seen != len(consumed):
+        return None, "snapshot removed since checkpoint"
+    return state, ""
+
+
+def save_checkpoint(portfolios: dict[str, PaperPortfolio], start_date: str, last_date: str,
+                    prices: PriceCache, files: list[tuple[str, Path]],
+                    path: Path = STATE_FILE) -> None:
+    consumed = {}
+    for sd, f in files:
+        ntd = prices.next_trading_day(sd)
+        if ntd is not None and ntd <= last_date:
+            consumed[sd] = f.stat().st_size
+    dump_json(path, {
+        "version": STATE_VERSION,
+        "updated": _now_iso(),
+        "config": _config(),
+        "start_date": start_date,
+        "last_date": last_date,
+        "snapshots": consumed,
+        "strategies": {name: pf.to_state() for name, pf in portfolios.items()},
+    })  # atomic
+
+
+# ── replay engine ───────────────────────────────────────────────────────
+def replay(prices: PriceCache, files: list[tuple[str, Path]],
+           portfolios: dict[str, PaperPortfolio], after: str | None = None) -> list[str]:
+    """Advance portfolios through the trading days after `after` (None: from the
+    first snapshot); returns the days processed. Only snapshots that fill on
+    one of those days are loaded."""
+    if after is None:
+        trading_days = [d for d in prices.calendar if d >= files[0][0]]
+    else:
+        trading_days = prices.calendar[bisect_right(prices.calendar, after):]
+
+    snap_by_date: dict[str, dict] = {}
     fill_day_for_snap: dict[str, list[str]] = {}
-    for sd in snap_by_date:
+    for sd, f in files:
         ntd = prices.next_trading_day(sd)
-        if ntd is not None:
+        if ntd is not None and (after is None or ntd > after):
             fill_day_for_snap.setdefault(ntd, []).append(sd)
-
-    start_snap = snapshots[0][0]
-    trading_days = [d for d in prices.calendar if d >= start_snap]
-    if not trading_days:
-        raise SystemExit("No trading days in prices.json after first snapshot")
+            snap_by_date[sd] = load_json(f)
 
     for d in trading_days:
         # 1) Snapshot-driven entries/exits whose fill day is today.
@@ -327,14 +433,46 @@ def run() -> None:
         for pf in portfolios.values():
             pf.mark_to_market(prices, d)
 
-    # ── summarize ────────────────────────────────────────────────────────
+    count(len(trading_days))
+    return trading_days
+
+
+def fresh_portfolios() -> dict[str, PaperPortfolio]:
+    return {
+        name: PaperPortfolio(name=name, label=cfg["label"])
+        for name, cfg in STRATEGIES.items()
+    }
+
+
+def full_replay(prices: PriceCache, files: list[tuple[str, Path]]):
+    """(portfolios, start_date, end_date) replayed from the first snapshot."""
+    portfolios = fresh_portfolios()
+    days = replay(prices, files, portfolios)
+    if not days:
+        raise SystemExit("No trading days in prices.json after first snapshot")
+    return portfolios, days[0], days[-1]
+
+
+def resume(prices: PriceCache, files: list[tuple[str, Path]], state: dict):
+    """(portfolios, start_date, end_date) advanced from a checkpoint."""
+    portfolios = {
+        name: PaperPortfolio.from_state(name, cfg["label"], state["strategies"][name])
+        for name, cfg in STRATEGIES.items()
+    }
+    days = replay(prices, files, portfolios, after=state["last_date"])
+    return portfolios, state["start_date"], days[-1] if days else state["last_date"]
+
+
+# ── summarize ────────────────────────────────────────────────────────────
+def summarize(portfolios: dict[str, PaperPortfolio], prices: PriceCache,
+              start_date: str, end_date: str, files: list[tuple[str, Path]]) -> dict:
     out = {
-        "updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "updated": _now_iso(),
         "initial_cash": INITIAL_CASH,
-        "start_date": trading_days[0],
-        "end_date": trading_days[-1],
-        "n_snapshots": len(snapshots),
-        "snapshot_dates": [d for d, _ in snapshots],
+        "start_date": start_date,
+        "end_date": end_date,
+        "n_snapshots": len(files),
+        "snapshot_dates": [d for d, _ in files],
         "config": {
             "position_size": POSITION_SIZE,
             "max_positions": MAX_POSITIONS,
@@ -353,7 +491,7 @@ def run() -> None:
         # holding period return (open positions)
         open_positions = []
         for tk, pos in pf.positions.items():
-            px = prices.latest_close(tk, trading_days[-1])
+            px = prices.latest_close(tk, end_date)
             unreal = ((px / pos["entry_price"] - 1) * 100) if px else 0.0
             open_positions.append({
                 "ticker": tk,
@@ -382,10 +520,72 @@ def run() -> None:
                 "current_value": round(last_total, 2),
             },
         }
+    return out
 
-    OUT_FILE.write_text(json.dumps(out, indent=2, default=str))
+
+def _first_diff(a: Any, b: Any, path: str = "") -> str | None:
+    if isinstance(a, dict) and isinstance(b, dict):
+        for k in list(a) + [k for k in b if k not in a]:
+            if k not in a or k not in b:
+                return f"{path}.{k}: only in {'checkpoint' if k in a else 'full replay'}"
+            d = _first_diff(a[k], b[k], f"{path}.{k}")
+            if d:
+                return d
+        return None
+    if isinstance(a, list) and isinstance(b, list):
+        for i, (x, y) in enumerate(zip(a, b)):
+            d = _first_diff(x, y, f"{path}[{i}]")
+            if d:
+                return d
+        if len(a) != len(b):
+            return f"{path}: {len(a)} vs {len(b)} items"
+        return None
+    return None if a == b else f"{path}: {a!r} vs {b!r}"
+
+
+def verify(prices: PriceCache, files: list[tuple[str, Path]]) -> int:
+    """Full replay vs. checkpoint + resume; 0 when identical. Writes nothing."""
+    state, why = load_checkpoint(prices, files)
+    if state is None:
+        print(f"full-replay: nothing to verify ({why})")
+        return 1
+    ref = full_replay(prices, files)
+    got = resume(prices, files, state)
+    # compare as serialized: the checkpoint went through JSON once already
+    a = loads(dumpb({"range": got[1:], "strategies": {n: pf.to_state() for n, pf in got[0].items()}}))
+    b = loads(dumpb({"range": ref[1:], "strategies": {n: pf.to_state() for n, pf in ref[0].items()}}))
+    diff = _first_diff(a, b)
+    if diff:
+        print(f"full-replay: MISMATCH (checkpoint of {state['last_date']}) at {diff}")
+        return 1
+    print(f"full-replay: identical ({ref[1]} → {ref[2]}, checkpoint of {state['last_date']})")
+    return 0
+
+
+@instrument("paper_trade")
+def run(full: bool = False) -> int:
+    prices = PriceCache(PRICES_FILE)
+    files = snapshot_files()
+    if not files:
+        raise SystemExit(f"No snapshots in {HISTORY_DIR}")
+    if full:
+        return verify(prices, files)
+
+    state, why = load_checkpoint(prices, files)
+    if state is not None:
+        portfolios, start_date, end_date = resume(prices, files, state)
+        n_new = sum(1 for d in prices.calendar if state["last_date"] < d <= end_date)
+        print(f"Resumed from checkpoint {state['last_date']} (+{n_new} trading days)")
+    else:
+        print(f"Full replay ({why})")
+        portfolios, start_date, end_date = full_replay(prices, files)
+
+    out = summarize(portfolios, prices, start_date, end_date, files)
+    dump_json(OUT_FILE, out, default=str)
+    save_checkpoint(portfolios, start_date, end_date, prices, files)
+    n_days = len(next(iter(portfolios.values())).value_history)
     print(f"Wrote {OUT_FILE}")
-    print(f"  Period: {out['start_date']} → {out['end_date']}  ({len(trading_days)} trading days, {len(snapshots)} snapshots)")
+    print(f"  Period: {out['start_date']} → {out['end_date']}  ({n_days} trading days, {len(files)} snapshots)")
     for name, st in out["strategies"].items():
         m = st["metrics"]
         wr = f"{m['win_rate']*100:.0f}%" if m["win_rate"] is not None else "n/a"
@@ -397,7 +597,12 @@ def run() -> None:
             f"wins={m['n_wins']:2d}/{m['n_completed']:<2d} "
             f"({wr})"
         )
+    return 0
 
 
 if __name__ == "__main__":
-    run()
+    ap = argparse.ArgumentParser(description="Paper trading replay on archived predictions")
+    ap.add_argument("--full-replay", action="store_true",
+                    help="replay from the first snapshot and check the checkpointed run is "
+                         "identical (exit 1 if not); writes nothing")
+    raise SystemExit(run(full=ap.parse_args().full_replay))
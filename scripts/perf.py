@@ -0,0 +1,265 @@
+"""
+perf.py — per-step performance telemetry for pipeline scripts.
+
+Until now no stage recorded how long it took or how much memory it used,
+so when the trend-site job slowed down there was no way to tell which step
+regressed. Every stage now reports through this module:
+
+    from perf import instrument, count
+
+    @instrument("predict")
+    def main(): ...
+        count(len(tickers))          # items processed (optional)
+
+or, for scripts whose work runs at module top level (no main() to wrap):
+
+    from perf import track_script
+    track_script("csv_to_tokens")    # recorded at interpreter exit
+
+Each finished step appends one line to site/data/metrics/perf_history.jsonl
+(append-only, see history_log.py):
+
+    {"ts", "step", "wall_s", "cpu_s", "peak_rss_mb", "items", "status",
+     "run_id", "sha"}
+
+cpu_s includes reaped child processes; peak_rss_mb is the process peak
+(ru_maxrss) at step end. `python scripts/perf.py --window` writes the
+newest entries to site/data/metrics/perf_history.json for system_health.html.
+
+Env flags:
+  NEWSTREND_PROFILE=1|all|step1,step2   dump cProfile stats for those steps
+                                         to data/profiles/<step>_<ts>.prof
+  NEWSTREND_PERF=1|0                    force recording on/off. Unset, only CI
+                                         (CI / GITHUB_ACTIONS set) records, so
+                                         local runs never touch the committed log
+"""
+
+from __future__ import annotations
+
+import argparse
+import atexit
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+
+DATA = ROOT / "site" / "data"
+PERF_LOG = DATA / "metrics" / "perf_history.jsonl"
+PERF_WINDOW = DATA / "metrics" / "perf_history.json"
+PROFILE_DIR = ROOT / "data" / "profiles"
+WINDOW_ENTRIES = 2000  # ~50 runs of ~40 steps
+
+PROFILE_ENV = "NEWSTREND_PROFILE"
+ENABLE_ENV = "NEWSTREND_PERF"
+
+_active: list["StepMetrics"] = []
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _children_cpu() -> float:
+    if resource is None:
+        return 0.0
+    ru = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return ru.ru_utime + ru.ru_stime
+
+
+def _profile_wanted(step: str) -> bool:
+    flag = os.environ.get(PROFILE_ENV, "").strip()
+    if not flag or flag == "0":
+        return False
+    return flag in ("1", "all") or step in {s.strip() for s in flag.split(",")}
+
+
+class StepMetrics:
+    def __init__(self, step: str):
+        self.step = step
+        self.items: int | None = None
+        self.returncode: int | None = None  # non-zero int returned by main()
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self._child0 = _children_cpu()
+        self._profiler = None
+        if _profile_wanted(step):
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def add(self, n: int = 1) -> None:
+        self.items = (self.items or 0) + n
+
+    def finish(self, status: str = "ok") -> dict:
+        if self._profiler is not None:
+            self._profiler.disable()
+            PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+            out = PROFILE_DIR / f"{self.step}_{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.prof"
+            self._profiler.dump_stats(str(out))
+            print(f"[perf] cProfile → {out}", file=sys.stderr)
+        cpu = (time.process_time() - self._cpu0) + (_children_cpu() - self._child0)
+        return {
+            "ts": _now_iso(),
+            "step": self.step,
+            "wall_s": round(time.perf_counter() - self._wall0, 3),
+            "cpu_s": round(cpu, 3),
+            "peak_rss_mb": _peak_rss_mb(),
+            "items": self.items,
+            "status": status,
+            "run_id": os.environ.get("GITHUB_RUN_ID"),
+            "sha": (os.environ.get("GITHUB_SHA") or "")[:7] or None,
+        }
+
+
+def enabled() -> bool:
+    """NEWSTREND_PERF=1/0 forces recording on/off; unset, only CI records."""
+    flag = os.environ.get(ENABLE_ENV, "").strip()
+    if flag:
+        return flag != "0"
+    return bool(os.environ.get("CI") or os.environ.get("GITHUB_ACTIONS"))
+
+
+def record(entry: dict) -> None:
+    """Append one entry to the perf log; telemetry never fails a step."""
+    if not enabled():
+        return
+    try:
+        HistoryLog(PERF_LOG).append(entry)
+    except OSError as e:
+        print(f"[perf] could not write {PERF_LOG}: {e}", file=sys.stderr)
+
+
+def _status_for(exc: BaseException | None) -> str:
+    if exc is None:
+        return "ok"
+    if isinstance(exc, SystemExit):
+        code = exc.code if isinstance(exc.code, int) or exc.code is None else 1
+        return "ok" if not code else f"exit:{code}"
+    return f"error:{type(exc).__name__}"
+
+
+@contextmanager
+def perf_step(step: str):
+    """Measure the enclosed block as `step`; yields the StepMetrics."""
+    m = StepMetrics(step)
+    _active.append(m)
+    exc = None
+    try:
+        yield m
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        _active.remove(m)
+        status = _status_for(exc)
+        if status == "ok" and m.returncode:
+            status = f"exit:{m.returncode}"
+        record(m.finish(status))
+
+
+def instrument(step: str):
+    """Decorator form of perf_step() for a script's main()/run()."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with perf_step(step) as m:
+                rv = fn(*args, **kwargs)
+                if isinstance(rv, int) and not isinstance(rv, bool):
+                    m.returncode = rv  # `raise SystemExit(main())` convention
+                return rv
+        return wrapper
+    return deco
+
+
+def count(n: int = 1) -> None:
+    """Add `n` processed items to the innermost active step (no-op if none)."""
+    if _active:
+        _active[-1].add(n)
+
+
+def track_script(step: str) -> StepMetrics:
+    """Measure from now until interpreter exit (for top-level-code scripts).
+
+    Only for scripts without a main(): an atexit hook cannot see the
+    SystemExit that ended the run, so sys.exit(N) is recorded as "ok" (an
+    uncaught exception still reads as error:<type>). Anything with a main()
+    should wrap it with instrument() instead.
+    """
+    m = StepMetrics(step)
+    _active.append(m)
+
+    def _done():
+        if m in _active:
+            _active.remove(m)
+        # sys.last_value is set when a (non-SystemExit) exception went uncaught
+        record(m.finish(_status_for(getattr(sys, "last_value", None))))
+
+    atexit.register(_done)
+    return m
+
+
+# ── window / summary ────────────────────────────────────────────────────
+def write_window(n: int = WINDOW_ENTRIES) -> dict:
+    return HistoryLog(PERF_LOG).write_window(PERF_WINDOW, n, "entries",
+                                             extra={"schema_version": 1})
+
+
+def summarize(entries: list[dict], recent: int = 10) -> list[dict]:
+    """Per step: last run vs the median of the `recent` runs before it."""
+    by_step: dict[str, list[dict]] = {}
+    for e in entries:
+        by_step.setdefault(e["step"], []).append(e)
+    rows = []
+    for step, es in sorted(by_step.items()):
+        last = es[-1]
+        prev = sorted(e["wall_s"] for e in es[-recent - 1:-1])
+        med = prev[len(prev) // 2] if prev else None
+        rows.append({"step": step, "last": last["wall_s"], "median": med,
+                     "ratio": round(last["wall_s"] / med, 2) if med else None,
+                     "peak_rss_mb": last.get("peak_rss_mb"), "status": last.get("status")})
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Pipeline perf telemetry")
+    ap.add_argument("--window", action="store_true",
+                    help=f"write {PERF_WINDOW.relative_to(ROOT)} for system_health.html")
+    ap.add_argument("--n", type=int, default=WINDOW_ENTRIES)
+    ap.add_argument("--summary", action="store_true", help="print last-vs-median per step")
+    args = ap.parse_args()
+
+    if args.window:
+        doc = write_window(args.n)
+        print(f"Wrote {PERF_WINDOW} ({len(doc['entries'])} of {doc['total']} entries)")
+    if args.summary or not args.window:
+        entries = HistoryLog(PERF_LOG).latest(args.n)
+        for r in summarize(entries):
+            flag = "  ← slower" if r["ratio"] and r["ratio"] >= 1.5 else ""
+            med = f"{r['median']:.2f}s" if r["median"] is not None else "—"
+            print(f"  {r['step']:28s} last {r['last']:8.2f}s  median {med:>8s}  "
+                  f"rss {r['peak_rss_mb'] or 0:7.1f}MB  {r['status']}{flag}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
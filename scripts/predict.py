@@ -41,6 +41,8 @@ import json
 import math
 from datetime import datetime, timezone
 from pathlib import Path
+from jsonio import load_json
+from perf import count, instrument
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -49,7 +51,7 @@ from pathlib import Path
 
 def load_ta(path: str) -> dict:
     try:
-        d = json.loads(Path(path).read_text())
+        d = load_json(path)
         return d.get("tickers", {})
     except Exception:
         return {}
@@ -63,7 +65,7 @@ def load_ta(path: str) -> dict:
 def load_backtest_results(path: str = "site/data/backtest_v2.json") -> dict:
     """backtest_v2.json 로드 → 종목 분류 정보."""
     try:
-        d = json.loads(Path(path).read_text())
+        d = load_json(path)
         result = {"blacklist": set(), "tier": {}}
         for tk, data in d.get("by_ticker", {}).items():
             wr = data.get("win_rate", 50)
@@ -81,7 +83,7 @@ def load_backtest_results(path: str = "site/data/backtest_v2.json") -> dict:
 def load_ticker_weights(path: str) -> dict:
     """ticker_weights.json 로드 → {ticker: {ta_weight, news_weight, regime_weight}}."""
     try:
-        d = json.loads(Path(path).read_text())
+        d = load_json(path)
         return d.get("weights", {})
     except Exception:
         return {}
@@ -94,7 +96,7 @@ def load_ticker_analysis(analysis_dir: str, tickers: list) -> dict:
         p = base / f"{ticker}.json"
         if p.exists():
             try:
-                result[ticker] = json.loads(p.read_text())
+                result[ticker] = load_json(p)
             except Exception:
                 pass
     return result
@@ -109,7 +111,7 @@ def load_sentiment(path: str) -> dict:
     if not p.exists():
         return {}
     try:
-        d = json.loads(p.read_text())
+        d = load_json(p)
     except Exception:
         return {}
     dates = d.get("dates", [])
@@ -149,7 +151,7 @@ def load_fundamentals(per_ticker_dir: str) -> dict:
     out = {}
     for p in d.glob("*.json"):
         try:
-            payload = json.loads(p.read_text())
+            payload = load_json(p)
             res = score_ticker(payload)
             if res["fundamental_score"] is not None:
                 out[res["ticker"]] = res
@@ -169,7 +171,7 @@ def load_insider_signals(insider_index_path: str) -> dict[str, dict]:
     if not p.exists():
         return {}
     try:
-        d = json.loads(p.read_text())
+        d = load_json(p)
         return d.get("tickers") or {}
     except (json.JSONDecodeError, OSError):
         return {}
@@ -201,7 +203,7 @@ def load_pillar_multipliers(path: str, blend_alpha: float = 0.3,
     if not p.exists():
         return {}
     try:
-        d = json.loads(p.read_text())
+        d = load_json(p)
     except Exception:
         return {}
     if d.get("mode") != "active":
@@ -237,7 +239,7 @@ def load_pillar_multipliers(path: str, blend_alpha: float = 0.3,
 
 def load_signals(path: str) -> list:
     try:
-        d = json.loads(Path(path).read_text())
+        d = load_json(path)
         return d.get("pairs", [])
     except Exception:
         return []
@@ -673,6 +675,7 @@ def analyze_market_regime(ta_data: dict) -> dict:
 # 6. 메인
 # ══════════════════════════════════════════════════════════════════════════════
 
+@instrument("predict")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--ta",      default="site/data/technical_analysis.json")
@@ -756,7 +759,7 @@ def main():
 
     # 뉴스 날짜 수
     try:
-        T = json.loads(Path(args.trends).read_text())
+        T = load_json(args.trends)
         news_days  = len(T.get("dates", []))
         zscores    = T.get("zscores", {})
     except Exception:
@@ -945,6 +948,7 @@ def main():
     # ── 정렬: BUY > WATCH > HOLD > REDUCE > SELL, then by confidence ─────────
     order = {"BUY": 0, "WATCH": 1, "HOLD": 2, "REDUCE": 3, "SELL": 4}
     predictions.sort(key=lambda x: (order.get(x["action"], 9), -x["confidence"]))
+    count(len(predictions))
 
     output = {
         "updated":       datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
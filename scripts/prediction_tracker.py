@@ -14,6 +14,11 @@ Inputs:
 Output:
   - site/data/prediction_accuracy.json
 
+Realized forward returns are read from / written to the shared outcome
+ledger (site/data/outcome_ledger.json, see outcome_ledger.py), so a run
+only prices outcomes whose forward window closed since the last run.
+Pass --rebuild-ledger to recompute every outcome from prices.json.
+
 Correctness rules (5-day horizon):
   BUY      → ret > 0
   WATCH    → ret > 0
@@ -24,11 +29,17 @@ Correctness rules (5-day horizon):
 
 from __future__ import annotations
 
-import json
+import argparse
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from outcome_ledger import OutcomeLedger  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import count, instrument  # noqa: E402
+
 DATA_DIR = ROOT / "site" / "data"
 HISTORY_DIR = DATA_DIR / "predictions_history"
 PRICES_FILE = DATA_DIR / "prices.json"
@@ -61,8 +72,7 @@ PILLAR_KEYS = (
 # ── price calendar helpers ───────────────────────────────────────────────
 class PriceCache:
     def __init__(self, path: Path):
-        with path.open() as f:
-            data = json.load(f)
+        data = load_json(path)
         self.tickers = data["tickers"]
         cal: set[str] = set()
         self.lookup: dict[str, dict[str, float]] = {}
@@ -149,7 +159,7 @@ def is_correct(action: str, ret: float | None) -> bool | None:
 def load_sector_lookup() -> dict[str, str]:
     if not TICKERS_FILE.exists():
         return {}
-    by_sector = json.loads(TICKERS_FILE.read_text())
+    by_sector = load_json(TICKERS_FILE)
     out: dict[str, str] = {}
     for sector, tickers in by_sector.items():
         for t in tickers:
@@ -166,8 +176,7 @@ def load_snapshots() -> list[tuple[str, dict]]:
             datetime.fromisoformat(f.stem)
         except ValueError:
             continue
-        with f.open() as fh:
-            out.append((f.stem, json.load(fh)))
+        out.append((f.stem, load_json(f)))
     return out
 
 
@@ -186,16 +195,12 @@ def _decay_weight(snap_date: str, ref_date: datetime, tau_days: float) -> float:
     return math.exp(-days_old / tau_days)
 
 
-def _aggregate(records: list[dict], key_fn, *, horizon: int = 5, weight_fn=None) -> dict:
-    """Group records by key_fn, compute accuracy + mean return.
+def _accumulate(records: list[dict], key_fn, *, horizon: int = 5, weight_fn=None) -> dict:
+    """Per-key partial sums (n, n_correct, Σret, plus Σw, Σw·correct, Σw·ret
+    when weighted) — mergeable across keys with `_merge_groups`.
 
     Records with non-directional actions or missing returns at this horizon
     are skipped. Keys returning None are also skipped.
-
-    If `weight_fn` is provided, accuracy and avg_return are computed as
-    weighted means (Σ w·x / Σ w). `n` stays as the raw record count so
-    downstream gates (e.g. n ≥ 30) reason about real data volume, not
-    effective sample size.
     """
     ret_key = f"fwd_{horizon}d_return"
     correct_key = f"correct_{horizon}d"
@@ -206,21 +211,50 @@ def _aggregate(records: list[dict], key_fn, *, horizon: int = 5, weight_fn=None)
         k = key_fn(r)
         if k is None:
             continue
-        w = float(weight_fn(r)) if weight_fn else 1.0
-        g = groups.setdefault(k, {
-            "n": 0, "n_correct": 0, "ret_sum": 0.0,
-            "w_sum": 0.0, "w_correct": 0.0, "w_ret_sum": 0.0,
-        })
+        g = groups.get(k)
+        if g is None:
+            g = groups[k] = {"n": 0, "n_correct": 0, "ret_sum": 0.0}
+            if weight_fn:
+                g.update(w_sum=0.0, w_correct=0.0, w_ret_sum=0.0)
         g["n"] += 1
         g["n_correct"] += int(r[correct_key])
         g["ret_sum"] += r[ret_key]
-        g["w_sum"] += w
-        g["w_correct"] += w * int(r[correct_key])
-        g["w_ret_sum"] += w * r[ret_key]
+        if weight_fn:
+            w = float(weight_fn(r))
+            g["w_sum"] += w
+            g["w_correct"] += w * int(r[correct_key])
+            g["w_ret_sum"] += w * r[ret_key]
+    return groups
+
+
+def _merge_groups(groups: dict, key_fn) -> dict:
+    """Re-key partial sums from `_accumulate`: groups whose keys map to the
+    same key_fn(key) are summed; keys mapping to None are dropped."""
+    out: dict = {}
+    for k, g in groups.items():
+        k2 = key_fn(k)
+        if k2 is None:
+            continue
+        t = out.get(k2)
+        if t is None:
+            out[k2] = dict(g)
+        else:
+            for f in t:
+                t[f] += g[f]
+    return out
+
+
+def _finalize(groups: dict, weighted: bool = False) -> dict:
+    """{key: {n, n_correct, accuracy, avg_return_pct[, n_eff]}}, keys sorted.
+
+    Weighted groups report accuracy and avg_return as weighted means
+    (Σ w·x / Σ w). `n` stays as the raw record count so downstream gates
+    (e.g. n ≥ 30) reason about real data volume, not effective sample size.
+    """
     out = {}
     for k in sorted(groups):
         g = groups[k]
-        if weight_fn and g["w_sum"] > 0:
+        if weighted and g["w_sum"] > 0:
             acc = g["w_correct"] / g["w_sum"]
             avg_ret = g["w_ret_sum"] / g["w_sum"]
         else:
@@ -232,12 +266,36 @@ def _aggregate(records: list[dict], key_fn, *, horizon: int = 5, weight_fn=None)
             "accuracy": round(acc, 3),
             "avg_return_pct": round(avg_ret * 100, 3),
         }
-        if weight_fn:
+        if weighted:
             entry["n_eff"] = round(g["w_sum"], 2)
         out[k] = entry
     return out
 
 
+def _aggregate(records: list[dict], key_fn, *, horizon: int = 5, weight_fn=None) -> dict:
+    """Group records by key_fn, compute accuracy + mean return."""
+    groups = _accumulate(records, key_fn, horizon=horizon, weight_fn=weight_fn)
+    return _finalize(groups, weighted=weight_fn is not None)
+
+
+# Fields of a `_cell_key` tuple, for regrouping cells into one dimension.
+CELL_FIELDS = ("snap_date", "action", "confidence", "regime", "sector")
+
+
+def _cell_key(r: dict) -> tuple:
+    return (r["snap_date"], r["action"], _confidence_band(r["confidence"]),
+            r["regime"], r["sector"])
+
+
+def _groupings(cells: dict, dims: dict[str, object]) -> dict:
+    """{name: finalized groups} for each name -> key_fn(cell_dict) in dims,
+    every one merged from the same `_accumulate(..., _cell_key)` cells."""
+    out = {}
+    for name, fn in dims.items():
+        out[name] = _finalize(_merge_groups(cells, lambda k, fn=fn: fn(dict(zip(CELL_FIELDS, k)))))
+    return out
+
+
 def _confidence_band(conf: float | None) -> str | None:
     if conf is None:
         return None
@@ -307,8 +365,9 @@ def _month_label(d: str) -> str:
 
 
 # ── main ────────────────────────────────────────────────────────────────
-def run() -> None:
-    prices = PriceCache(PRICES_FILE)
+@instrument("prediction_tracker")
+def run(rebuild_ledger: bool = False) -> None:
+    ledger = OutcomeLedger(PRICES_FILE, PriceCache, rebuild=rebuild_ledger)
     sectors = load_sector_lookup()
     snapshots = load_snapshots()
     if not snapshots:
@@ -332,12 +391,13 @@ def run() -> None:
                 "features": extract_features(p),
             }
             for h in HORIZONS_DAYS:
-                ret, anchor, fwd = prices.forward_return(tk, snap_date, h)
+                ret, anchor, fwd = ledger.resolve(tk, snap_date, h)
                 rec[f"fwd_{h}d_return"] = round(ret, 5) if ret is not None else None
                 rec[f"fwd_{h}d_anchor_date"] = anchor
                 rec[f"fwd_{h}d_fwd_date"] = fwd
                 rec[f"correct_{h}d"] = is_correct(action, ret)
             records.append(rec)
+    ledger.save()
 
     # ── dedup: keep latest snap_date per (ticker, anchor_date) ──────────
     # A ticker predicted on consecutive days often shares the same forward
@@ -362,26 +422,25 @@ def run() -> None:
     deduped_10d = _dedup(records, 10)
 
     # ── aggregations (5-day horizon is primary; 10d secondary) ──────────
-    # Raw aggregations (kept for comparison)
-    raw_aggregations = {
-        "by_action":        _aggregate(records, lambda r: r["action"], horizon=primary_h),
-        "by_confidence":    _aggregate(records, lambda r: _confidence_band(r["confidence"]), horizon=primary_h),
-        "by_regime":        _aggregate(records, lambda r: r["regime"], horizon=primary_h),
+    # One pass per record set accumulates partial sums per (snapshot, action,
+    # confidence band, regime, sector) cell; every grouping below is a merge
+    # of those cells rather than another pass over the records.
+    by = {
+        "by_action":     lambda c: c["action"],
+        "by_confidence": lambda c: c["confidence"],
+        "by_sector":     lambda c: c["sector"],
+        "by_regime":     lambda c: c["regime"],
+        "by_dow":        lambda c: _dow_label(c["snap_date"]),
+        "by_month":      lambda c: _month_label(c["snap_date"]),
+        "by_snapshot":   lambda c: c["snap_date"],
     }
+    # Raw aggregations (kept for comparison)
+    raw_aggregations = _groupings(_accumulate(records, _cell_key, horizon=primary_h),
+                                  {k: by[k] for k in ("by_action", "by_confidence", "by_regime")})
     # Deduped aggregations (primary)
-    aggregations = {
-        "by_action":        _aggregate(deduped, lambda r: r["action"], horizon=primary_h),
-        "by_confidence":    _aggregate(deduped, lambda r: _confidence_band(r["confidence"]), horizon=primary_h),
-        "by_sector":        _aggregate(deduped, lambda r: r["sector"], horizon=primary_h),
-        "by_regime":        _aggregate(deduped, lambda r: r["regime"], horizon=primary_h),
-        "by_dow":           _aggregate(deduped, lambda r: _dow_label(r["snap_date"]), horizon=primary_h),
-        "by_month":         _aggregate(deduped, lambda r: _month_label(r["snap_date"]), horizon=primary_h),
-        "by_snapshot":      _aggregate(deduped, lambda r: r["snap_date"], horizon=primary_h),
-    }
-    aggregations_10d = {
-        "by_action":     _aggregate(deduped_10d, lambda r: r["action"], horizon=10),
-        "by_confidence": _aggregate(deduped_10d, lambda r: _confidence_band(r["confidence"]), horizon=10),
-    }
+    aggregations = _groupings(_accumulate(deduped, _cell_key, horizon=primary_h), by)
+    aggregations_10d = _groupings(_accumulate(deduped_10d, _cell_key, horizon=10),
+                                  {k: by[k] for k in ("by_action", "by_confidence")})
 
     by_pillar: dict[str, dict] = {}
     for pkey in PILLAR_KEYS:
@@ -433,9 +492,11 @@ def run() -> None:
         "records_deduped": deduped,
     }
 
-    OUT_FILE.write_text(json.dumps(out, indent=2, default=str))
+    count(len(records))
+    dump_json(OUT_FILE, out, default=str)
     print(f"Wrote {OUT_FILE}")
     print(f"  records={len(records)}  deduped={len(deduped)}  actionable_5d={len(actionable)} (raw={len(raw_actionable)})  pending_5d={len(pending)}")
+    print(f"  {ledger.summary()}")
     print()
     print("by_action (5d, deduped):")
     for k, v in aggregations["by_action"].items():
@@ -454,4 +515,7 @@ def run() -> None:
 
 
 if __name__ == "__main__":
-    run()
+    ap = argparse.ArgumentParser(description="Prediction accuracy tracker")
+    ap.add_argument("--rebuild-ledger", action="store_true",
+                    help="ignore outcome_ledger.json and recompute every outcome")
+    run(rebuild_ledger=ap.parse_args().rebuild_ledger)
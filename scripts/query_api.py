@@ -0,0 +1,419 @@
+"""
+query_api.py — local read-only HTTP/JSON query service over pipeline artifacts.
+
+Dashboards and ad-hoc tooling used to json.load() the whole of trends.json,
+prices.json, signal_corr.json and every predictions_history snapshot just
+to answer a point question. This service parses each artifact once, keeps
+it in memory until the file changes on disk (mtime/size), and serves
+slices. Responses are memoized in an in-process LRU keyed by request +
+artifact versions and carry an ETag, so repeat clients get 304s.
+
+Endpoints (GET, JSON):
+  /health                                   artifact versions + cache stats
+  /terms?prefix=ai&limit=50                 known terms with latest z/slope/burst
+  /terms/<term>/series?since=&until=        dates, counts, rolling z (same rule
+                                            as make_trends_json.calc_zscore)
+  /tickers/<TK>/prices?since=&until=&fields=closes,volumes
+  /tickers/<TK>/ta                          ta_summary.json snapshot row
+  /tickers/<TK>/pairs?min_conf=&lags=1      signal_corr pairs for TK
+  /tickers/<TK>/predictions?since=&horizon=5
+                                            archived calls + realized returns
+                                            (outcome_ledger.json, falling back
+                                            to prices.json for ledger misses)
+  /articles?q=&since=&until=&publisher=&limit=20&order=recent|rank&raw=0
+                                            full-text search over the warehouse
+                                            (data/warehouse/articles_fts.sqlite)
+  /tickers/<TK>/articles?since=&until=&limit=
+                                            articles naming TK's company
+                                            (config/ticker_aliases.json)
+
+Nothing is ever written: outcomes missing from the ledger are computed in
+memory and discarded.
+
+Usage:
+  python scripts/query_api.py                      # 127.0.0.1:8765
+  python scripts/query_api.py --port 9000 --cache-size 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from article_index import ArticleIndex, ticker_query  # noqa: E402
+from outcome_ledger import LEDGER_FILE, OutcomeLedger  # noqa: E402
+from prediction_tracker import PriceCache  # noqa: E402
+from jsonio import load_json  # noqa: E402
+
+DATA = ROOT / "site" / "data"
+INDEX_PATH = ROOT / "data" / "warehouse" / "articles_fts.sqlite"
+ALIASES_PATH = ROOT / "config" / "ticker_aliases.json"
+MAX_ARTICLES = 200
+
+ZSCORE_WINDOW = 28  # make_trends_json --zscore-window default
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _stat_version(path: Path) -> str:
+    try:
+        st = path.stat()
+    except OSError:
+        return "missing"
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def rolling_z(counts: list, window: int = ZSCORE_WINDOW) -> list:
+    """calc_zscore(counts[:i+1]) for every i — the z each past day showed."""
+    out = []
+    for i in range(len(counts)):
+        if i < 2:
+            out.append(0.0)
+            continue
+        hist = counts[max(0, i - window): i]
+        n = len(hist)
+        mean = sum(hist) / n
+        std = math.sqrt(sum((x - mean) ** 2 for x in hist) / n)
+        out.append(0.0 if std < 0.5 else round((counts[i] - mean) / std, 3))
+    return out
+
+
+def _date_slice(dates: list, since: str | None, until: str | None) -> slice:
+    lo = 0 if not since else next((i for i, d in enumerate(dates) if d >= since), len(dates))
+    hi = len(dates) if not until else next((i for i, d in enumerate(dates) if d > until), len(dates))
+    return slice(lo, hi)
+
+
+# ── artifact store ──────────────────────────────────────────────────────
+class Artifact:
+    """One parsed file (or directory of files), reloaded when its stat changes."""
+
+    def __init__(self, path: Path, loader=None):
+        self.path = path
+        self._loader = loader or load_json
+        self._version = None
+        self._value = None
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        if self.path.is_dir():
+            parts = sorted(f"{p.name}:{_stat_version(p)}" for p in self.path.glob("*.json"))
+            return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+        return _stat_version(self.path)
+
+    def get(self):
+        v = self.version()
+        with self._lock:
+            if v != self._version:
+                self._value = None if v == "missing" else self._loader(self.path)
+                self._version = v
+            return self._value
+
+
+def _load_prediction_index(d: Path) -> dict:
+    """{ticker: [(snap_date, prediction), ...]} across predictions_history."""
+    index: dict[str, list] = {}
+    for f in sorted(d.glob("*.json")):
+        try:
+            snap = load_json(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        for p in snap.get("predictions") or []:
+            tk = p.get("ticker")
+            if tk:
+                index.setdefault(tk, []).append((f.stem, p))
+    return index
+
+
+class ArtifactStore:
+    def __init__(self, data_dir: Path = DATA, index_path: Path = INDEX_PATH):
+        self.data_dir = data_dir
+        self.artifacts = {
+            "trends": Artifact(data_dir / "trends.json"),
+            "prices": Artifact(data_dir / "prices.json"),
+            "ta_summary": Artifact(data_dir / "ta_summary.json"),
+            "signal_corr": Artifact(data_dir / "signal_corr.json", self._load_signal_corr),
+            "predictions": Artifact(data_dir / "predictions_history", _load_prediction_index),
+            "ledger": Artifact(data_dir / LEDGER_FILE.name, lambda p: p),
+            "articles": Artifact(index_path, lambda p: p),
+            "aliases": Artifact(ALIASES_PATH),
+        }
+        self._ledger = (None, None)  # (version key, OutcomeLedger)
+
+    @staticmethod
+    def _load_signal_corr(path: Path) -> dict:
+        sc = load_json(path)
+        by_ticker: dict[str, list] = {}
+        for p in sc.get("pairs") or []:
+            by_ticker.setdefault(p.get("ticker"), []).append(p)
+        sc["by_ticker"] = by_ticker
+        return sc
+
+    def get(self, name: str):
+        value = self.artifacts[name].get()
+        if value is None:
+            raise QueryError(404, f"{self.artifacts[name].path.name} not found")
+        return value
+
+    def versions(self, names) -> str:
+        return ",".join(f"{n}={self.artifacts[n].version()}" for n in names)
+
+    def ledger(self) -> OutcomeLedger:
+        key = self.versions(("prices", "ledger"))
+        if self._ledger[0] != key:
+            self._ledger = (key, OutcomeLedger(self.data_dir / "prices.json", PriceCache,
+                                               path=self.data_dir / LEDGER_FILE.name))
+        return self._ledger[1]
+
+
+# ── queries ─────────────────────────────────────────────────────────────
+def q_terms(store: ArtifactStore, args: dict) -> dict:
+    t = store.get("trends")
+    prefix = (args.get("prefix") or "").lower()
+    limit = int(args.get("limit") or 100)
+    terms = [w for w in t.get("terms") or [] if w.startswith(prefix)][:limit]
+    z, s, b = t.get("zscores") or {}, t.get("slopes") or {}, t.get("bursts") or {}
+    return {"n": len(terms),
+            "terms": [{"term": w, "z": z.get(w), "slope": s.get(w), "burst": b.get(w)} for w in terms]}
+
+
+def q_term_series(store: ArtifactStore, term: str, args: dict) -> dict:
+    t = store.get("trends")
+    counts = (t.get("series") or {}).get(term)
+    if counts is None:
+        raise QueryError(404, f"unknown term: {term}")
+    dates = t.get("dates") or []
+    sl = _date_slice(dates, args.get("since"), args.get("until"))
+    return {"term": term, "dates": dates[sl], "counts": counts[sl],
+            "z": rolling_z(counts)[sl], "z_window": ZSCORE_WINDOW}
+
+
+def q_prices(store: ArtifactStore, ticker: str, args: dict) -> dict:
+    payload = (store.get("prices").get("tickers") or {}).get(ticker)
+    if payload is None:
+        raise QueryError(404, f"unknown ticker: {ticker}")
+    dates = payload.get("dates") or []
+    sl = _date_slice(dates, args.get("since"), args.get("until"))
+    fields = [f for f in (args.get("fields") or "closes").split(",") if f and f != "dates"]
+    bad = [f for f in fields if f not in payload]
+    if bad:
+        raise QueryError(400, f"unknown field(s): {', '.join(bad)}")
+    return {"ticker": ticker, "dates": dates[sl], **{f: payload[f][sl] for f in fields}}
+
+
+def q_ta(store: ArtifactStore, ticker: str, args: dict) -> dict:
+    ta = store.get("ta_summary")
+    row = next((r for r in ta.get("snapshot") or [] if r.get("ticker") == ticker), None)
+    if row is None:
+        raise QueryError(404, f"no TA snapshot for {ticker}")
+    return {"updated": ta.get("updated"), **row}
+
+
+def q_pairs(store: ArtifactStore, ticker: str, args: dict) -> dict:
+    sc = store.get("signal_corr")
+    min_conf = float(args.get("min_conf") or 0)
+    lags = args.get("lags") in ("1", "true", "yes")
+    pairs = [p for p in sc["by_ticker"].get(ticker, []) if (p.get("confidence") or 0) >= min_conf]
+    pairs.sort(key=lambda p: -(p.get("confidence") or 0))
+    if not lags:
+        pairs = [{k: v for k, v in p.items() if k != "lag_corrs"} for p in pairs]
+    return {"ticker": ticker, "updated": sc.get("updated"), "n": len(pairs), "pairs": pairs}
+
+
+def q_predictions(store: ArtifactStore, ticker: str, args: dict) -> dict:
+    since = args.get("since") or ""
+    horizon = int(args.get("horizon") or 5)
+    rows = [(d, p) for d, p in store.get("predictions").get(ticker, []) if d >= since]
+    ledger = store.ledger()
+    out = []
+    for snap_date, p in rows:
+        ret, anchor, fwd = ledger.resolve(ticker, snap_date, horizon)
+        out.append({
+            "snap_date": snap_date, "action": p.get("action"),
+            "confidence": p.get("confidence"), "price": p.get("price"),
+            "target": p.get("target"), "stop": p.get("stop"),
+            "fwd_return": None if ret is None else round(ret, 5),
+            "anchor_date": anchor, "fwd_date": fwd,
+        })
+    return {"ticker": ticker, "horizon": horizon, "n": len(out), "predictions": out}
+
+
+def _search_articles(store: ArtifactStore, query, args: dict, raw: bool) -> dict:
+    limit = min(int(args.get("limit") or 20), MAX_ARTICLES)
+    kw = dict(start=args.get("since"), end=args.get("until"),
+              publisher=args.get("publisher"), raw=raw)
+    try:
+        with ArticleIndex(store.get("articles"), readonly=True) as idx:
+            return {"n": idx.count(query, **kw),
+                    "articles": idx.search(query, limit=limit,
+                                           order=args.get("order") or "recent", **kw)}
+    except sqlite3.OperationalError as e:  # malformed FTS5 expression with raw=1
+        raise QueryError(400, f"bad query: {e}")
+
+
+def q_articles(store: ArtifactStore, args: dict) -> dict:
+    q = (args.get("q") or "").strip()
+    if not q:
+        raise QueryError(400, "q is required")
+    return {"q": q, **_search_articles(store, q, args, raw=args.get("raw") in ("1", "true"))}
+
+
+def q_ticker_articles(store: ArtifactStore, ticker: str, args: dict) -> dict:
+    q = ticker_query(ticker, store.get("aliases"))
+    if q is None:
+        raise QueryError(404, f"no searchable aliases for {ticker}")
+    return {"ticker": ticker, "q": q, **_search_articles(store, q, args, raw=True)}
+
+
+# route: (path parts pattern, artifacts the answer depends on, handler)
+ROUTES = [
+    (("terms",), ("trends",), lambda s, a, q: q_terms(s, q)),
+    (("terms", None, "series"), ("trends",), lambda s, a, q: q_term_series(s, a[0], q)),
+    (("tickers", None, "prices"), ("prices",), lambda s, a, q: q_prices(s, a[0].upper(), q)),
+    (("tickers", None, "ta"), ("ta_summary",), lambda s, a, q: q_ta(s, a[0].upper(), q)),
+    (("tickers", None, "pairs"), ("signal_corr",), lambda s, a, q: q_pairs(s, a[0].upper(), q)),
+    (("tickers", None, "predictions"), ("predictions", "prices", "ledger"),
+     lambda s, a, q: q_predictions(s, a[0].upper(), q)),
+    (("articles",), ("articles",), lambda s, a, q: q_articles(s, q)),
+    (("tickers", None, "articles"), ("articles", "aliases"),
+     lambda s, a, q: q_ticker_articles(s, a[0].upper(), q)),
+]
+
+
+def match_route(parts: list[str]):
+    for pattern, deps, fn in ROUTES:
+        if len(pattern) != len(parts):
+            continue
+        if all(p is None or p == x for p, x in zip(pattern, parts)):
+            return deps, fn, [x for p, x in zip(pattern, parts) if p is None]
+    return None
+
+
+class QueryService:
+    """Routing + LRU response cache; transport-independent (used by the handler)."""
+
+    def __init__(self, store: ArtifactStore, cache_size: int = 256):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def health(self) -> dict:
+        return {"artifacts": {n: {"path": (str(a.path.relative_to(self.store.data_dir))
+                                           if a.path.is_relative_to(self.store.data_dir)
+                                           else str(a.path)),
+                                  "version": a.version()}
+                              for n, a in self.store.artifacts.items()},
+                "cache": {"size": len(self._cache), "max": self.cache_size, **self.stats}}
+
+    def query(self, path: str, args: dict) -> tuple[int, str | None, bytes]:
+        """(status, etag, body) for GET `path` with flattened query `args`."""
+        parts = [unquote(x) for x in path.strip("/").split("/") if x]
+        if parts == ["health"]:
+            return 200, None, json.dumps(self.health()).encode()
+        route = match_route(parts)
+        if route is None:
+            return 404, None, json.dumps({"error": f"no route: {path}"}).encode()
+        deps, fn, params = route
+        key = "/".join(parts) + "?" + "&".join(f"{k}={args[k]}" for k in sorted(args))
+        key += "#" + self.store.versions(deps)
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return 200, hit[0], hit[1]
+        try:
+            body = json.dumps(fn(self.store, params, args), separators=(",", ":")).encode()
+        except QueryError as e:
+            return e.status, None, json.dumps({"error": str(e)}).encode()
+        except ValueError as e:
+            return 400, None, json.dumps({"error": str(e)}).encode()
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        with self._lock:
+            self.stats["misses"] += 1
+            self._cache[key] = (etag, body)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return 200, etag, body
+
+
+def make_handler(service: QueryService):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "news-trend-query/1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            args = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            status, etag, body = service.query(url.path, args)
+            if etag and etag in (self.headers.get("If-None-Match") or ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            if etag:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *a):
+            if not self.server.quiet:
+                super().log_message(fmt, *a)
+
+    return Handler
+
+
+def serve(host: str, port: int, data_dir: Path, cache_size: int, quiet: bool = False,
+          index_path: Path = INDEX_PATH):
+    service = QueryService(ArtifactStore(data_dir, index_path), cache_size=cache_size)
+    httpd = ThreadingHTTPServer((host, port), make_handler(service))
+    httpd.quiet = quiet
+    return httpd
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Read-only query API over site/data artifacts")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--data", default=str(DATA))
+    ap.add_argument("--index", default=str(INDEX_PATH), help="article full-text index")
+    ap.add_argument("--cache-size", type=int, default=256, help="LRU entries (responses)")
+    ap.add_argument("--quiet", action="store_true", help="no per-request log lines")
+    args = ap.parse_args()
+
+    httpd = serve(args.host, args.port, Path(args.data), args.cache_size, args.quiet,
+                  Path(args.index))
+    print(f"query API on http://{args.host}:{args.port}/  (data: {args.data})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
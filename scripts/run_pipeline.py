@@ -0,0 +1,423 @@
+"""
+run_pipeline.py — dependency-aware, incremental runner for the analysis chain.
+
+trend-site.yml runs ~30 scripts strictly one after another and every one of
+them runs even when nothing it reads changed. This runner executes the step
+graph declared in config/pipeline.yaml instead. It is for local runs only;
+trend-site does not call it and keeps its own sequential steps:
+
+  - a step starts as soon as all its `needs` have finished, so independent
+    branches (sentiment, fundamentals, sectors, macro themes, the
+    self-correcting trackers) run concurrently (--max-workers)
+  - before running, a step's declared inputs (plus the scripts named in its
+    cmd, plus the cmd itself) are content-hashed; if the hash equals the
+    one recorded at its last successful run and its outputs still exist,
+    the step is skipped
+  - every run appends per-step status/timings to data/pipeline/runs.jsonl
+
+File digests are cached by (size, mtime_ns) in data/pipeline/file_hashes.json
+so unchanged multi-MB inputs are not re-read on every run.
+
+Usage:
+  python scripts/run_pipeline.py                    # run, skipping clean steps
+  python scripts/run_pipeline.py --dry-run          # show what would run
+  python scripts/run_pipeline.py --only predict     # predict + its upstream steps
+  python scripts/run_pipeline.py --force            # ignore recorded hashes
+  python scripts/run_pipeline.py --check-workflow   # pipeline.yaml vs trend-site.yml
+
+pipeline.yaml is a hand-kept copy of trend-site.yml's analysis steps.
+--check-workflow (run it after editing either file) fails when the two drift:
+every `python scripts/X.py ...` in a step's cmd must appear in the workflow
+with the same arguments, no step's script may be invoked there with
+different ones, and allow_failure must match the workflow's `|| true`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+
+DEFAULT_CONFIG = ROOT / "config" / "pipeline.yaml"
+DEFAULT_WORKFLOW = ROOT / ".github" / "workflows" / "trend-site.yml"
+
+_SCRIPT_RE = re.compile(r"scripts/[\w/]+\.py")
+_GLOB_CHARS = set("*?[")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+# ── config ──────────────────────────────────────────────────────────────
+class PipelineError(Exception):
+    pass
+
+
+def load_config(path: Path) -> dict:
+    cfg = yaml.safe_load(path.read_text()) or {}
+    steps = cfg.get("steps") or []
+    names = [s.get("name") for s in steps]
+    dupes = {n for n in names if names.count(n) > 1}
+    if None in names or dupes:
+        raise PipelineError(f"step names must be unique and non-empty (dupes: {sorted(dupes)})")
+    by_name = {s["name"]: s for s in steps}
+    for s in steps:
+        s.setdefault("needs", [])
+        s.setdefault("inputs", [])
+        s.setdefault("outputs", [])
+        unknown = [n for n in s["needs"] if n not in by_name]
+        if unknown:
+            raise PipelineError(f"{s['name']}: unknown needs {unknown}")
+    topo_order(by_name)  # raises on cycles
+    cfg["by_name"] = by_name
+    return cfg
+
+
+def topo_order(by_name: dict) -> list[str]:
+    order, state = [], {}
+
+    def visit(n, path):
+        if state.get(n) == "done":
+            return
+        if state.get(n) == "visiting":
+            raise PipelineError("dependency cycle: " + " → ".join(path + [n]))
+        state[n] = "visiting"
+        for d in by_name[n]["needs"]:
+            visit(d, path + [n])
+        state[n] = "done"
+        order.append(n)
+
+    for n in by_name:
+        visit(n, [])
+    return order
+
+
+def upstream_closure(by_name: dict, targets: list[str]) -> set[str]:
+    keep, stack = set(), list(targets)
+    while stack:
+        n = stack.pop()
+        if n in keep:
+            continue
+        if n not in by_name:
+            raise PipelineError(f"unknown step: {n}")
+        keep.add(n)
+        stack.extend(by_name[n]["needs"])
+    return keep
+
+
+# ── workflow drift check ────────────────────────────────────────────────
+_SHELL_OPS = {"&&", "||", ";", "|"}
+
+
+def script_calls(command: str) -> list[tuple[str, tuple[str, ...], bool]]:
+    """(script, args, `|| true`-guarded) for each `python scripts/X.py ...`
+    in a shell snippet. Lines that don't tokenize (heredocs, inline
+    python -c) are skipped; they never start a script call."""
+    calls = []
+    for line in command.replace("\\\n", " ").splitlines():
+        if not _SCRIPT_RE.search(line):
+            continue
+        try:
+            lex = shlex.shlex(line, posix=True, punctuation_chars=True)
+            lex.whitespace_split = True
+            tokens = list(lex)
+        except ValueError:
+            continue
+        segs, cur = [], []
+        for t in tokens + [";"]:
+            if t in _SHELL_OPS:
+                segs.append((cur, t))
+                cur = []
+            else:
+                cur.append(t)
+        for i, (seg, op) in enumerate(segs):
+            if len(seg) >= 2 and seg[0] in ("python", "python3") and _SCRIPT_RE.fullmatch(seg[1]):
+                guarded = op == "||" and i + 1 < len(segs) and segs[i + 1][0] == ["true"]
+                calls.append((seg[1], tuple(seg[2:]), guarded))
+    return calls
+
+
+def check_workflow(cfg: dict, workflow: Path) -> list[str]:
+    """Differences between pipeline.yaml's step commands and the workflow."""
+    doc = yaml.safe_load(workflow.read_text()) or {}
+    wf_calls: dict[str, list[tuple[tuple[str, ...], bool]]] = {}
+    for job in (doc.get("jobs") or {}).values():
+        for st in job.get("steps") or []:
+            for script, args, guarded in script_calls(st.get("run") or ""):
+                wf_calls.setdefault(script, []).append((args, guarded))
+
+    problems = []
+    for step in cfg["steps"]:
+        for script, args, _ in script_calls(step["cmd"]):
+            found = wf_calls.get(script)
+            if not found:
+                problems.append(f"{step['name']}: {script} is not run by {workflow.name}")
+                continue
+            variants = {a for a, _ in found}
+            if variants != {args}:
+                problems.append(f"{step['name']}: {script} arguments differ\n"
+                                f"    pipeline.yaml: {' '.join(args) or '(none)'}\n"
+                                + "".join(f"    {workflow.name}: {' '.join(a) or '(none)'}\n"
+                                          for a in sorted(variants - {args})).rstrip("\n"))
+            guard = bool(step.get("allow_failure"))
+            if any(g != guard for _, g in found):
+                problems.append(f"{step['name']}: allow_failure={str(guard).lower()} but "
+                                f"{workflow.name} runs {script} "
+                                + ("without" if guard else "with") + " `|| true`")
+    return problems
+
+
+# ── hashing ─────────────────────────────────────────────────────────────
+def expand(patterns: list[str]) -> list[Path]:
+    """Files matching the non-'!' patterns minus those matching a '!' pattern."""
+    inc = [p for p in patterns if not p.startswith("!")]
+    exc = [p[1:] for p in patterns if p.startswith("!")]
+    files: set[Path] = set()
+    for pat in inc:
+        if _GLOB_CHARS & set(pat):
+            files.update(p for p in ROOT.glob(pat) if p.is_file())
+        elif (ROOT / pat).is_file():
+            files.add(ROOT / pat)
+    out = []
+    for p in sorted(files):
+        rel = p.relative_to(ROOT).as_posix()
+        if not any(fnmatch.fnmatch(rel, e) for e in exc):
+            out.append(p)
+    return out
+
+
+class FileHasher:
+    """sha1 per file, memoized on (size, mtime_ns) across runs."""
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        try:
+            self.cache = load_json(cache_path)
+        except (OSError, json.JSONDecodeError):
+            self.cache = {}
+
+    def digest(self, path: Path) -> str:
+        rel = path.relative_to(ROOT).as_posix()
+        st = path.stat()
+        with self._lock:
+            hit = self.cache.get(rel)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        h = hashlib.sha1()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        d = h.hexdigest()
+        with self._lock:
+            self.cache[rel] = [st.st_size, st.st_mtime_ns, d]
+        return d
+
+    def save(self) -> None:
+        with self._lock:
+            dump_json(self.cache_path, self.cache)
+
+
+def step_hash(step: dict, hasher: FileHasher) -> tuple[str, int]:
+    """(hash of cmd + every input file's content, number of input files)."""
+    patterns = list(step["inputs"]) + _SCRIPT_RE.findall(step["cmd"])
+    files = expand(patterns)
+    h = hashlib.sha1(step["cmd"].encode())
+    for p in files:
+        h.update(f"\n{p.relative_to(ROOT).as_posix()}:{hasher.digest(p)}".encode())
+    return h.hexdigest(), len(files)
+
+
+def outputs_present(step: dict) -> bool:
+    for pat in step["outputs"]:
+        if _GLOB_CHARS & set(pat):
+            if not any(ROOT.glob(pat)):
+                return False
+        elif not (ROOT / pat).exists():
+            return False
+    return True
+
+
+# ── runner ──────────────────────────────────────────────────────────────
+class PipelineRunner:
+    def __init__(self, cfg: dict, max_workers: int | None = None, force: bool = False,
+                 quiet: bool = False):
+        self.cfg = cfg
+        self.by_name = cfg["by_name"]
+        self.state_dir = ROOT / cfg.get("state_dir", "data/pipeline")
+        self.state_path = self.state_dir / "state.json"
+        self.max_workers = max_workers or int(cfg.get("max_workers", 4))
+        self.force = force
+        self.quiet = quiet
+        self.hasher = FileHasher(self.state_dir / "file_hashes.json")
+        try:
+            self.state = load_json(self.state_path)
+        except (OSError, json.JSONDecodeError):
+            self.state = {}
+        self._print_lock = threading.Lock()
+
+    def _log(self, text: str) -> None:
+        with self._print_lock:
+            print(text, flush=True)
+
+    def should_skip(self, step: dict) -> tuple[bool, str]:
+        digest, _ = step_hash(step, self.hasher)
+        if self.force or step.get("always"):
+            return False, digest
+        prev = self.state.get(step["name"]) or {}
+        return prev.get("input_hash") == digest and outputs_present(step), digest
+
+    def run_step(self, step: dict) -> dict:
+        skip, digest = self.should_skip(step)
+        rec = {"name": step["name"], "input_hash": digest[:12]}
+        if skip:
+            self._log(f"── {step['name']}: skipped (inputs unchanged)")
+            return {**rec, "status": "skipped", "seconds": 0.0}
+        t0 = time.perf_counter()
+        proc = subprocess.run(step["cmd"], shell=True, cwd=ROOT, text=True,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        secs = round(time.perf_counter() - t0, 3)
+        ok = proc.returncode == 0
+        status = "ok" if ok else ("failed_allowed" if step.get("allow_failure") else "failed")
+        out = proc.stdout.rstrip()
+        body = "" if (self.quiet and ok) or not out else "\n" + out
+        self._log(f"── {step['name']}: {status} ({secs:.1f}s){body}")
+        if ok:
+            # Hash recorded is the one taken BEFORE running: if the step
+            # rewrote one of its own inputs, the next run re-checks it.
+            self.state[step["name"]] = {"input_hash": digest, "finished": _now_iso(),
+                                        "seconds": secs}
+        return {**rec, "status": status, "seconds": secs, "returncode": proc.returncode}
+
+    def run(self, selected: set[str] | None = None) -> dict:
+        names = [n for n in topo_order(self.by_name) if selected is None or n in selected]
+        pending = set(names)
+        results: dict[str, dict] = {}
+        started = _now_iso()
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            running = {}
+            while pending or running:
+                for n in [n for n in names if n in pending]:
+                    # needs outside the selection (--only) are taken as satisfied
+                    needs = [d for d in self.by_name[n]["needs"] if d in names]
+                    if any(d not in results for d in needs):
+                        continue
+                    pending.discard(n)
+                    blocked = [d for d in needs if results.get(d, {}).get("status") in ("failed", "blocked")]
+                    if blocked:
+                        self._log(f"── {n}: blocked (failed: {', '.join(blocked)})")
+                        results[n] = {"name": n, "status": "blocked", "seconds": 0.0}
+                        continue
+                    running[pool.submit(self.run_step, self.by_name[n])] = n
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    n = running.pop(fut)
+                    try:
+                        results[n] = fut.result()
+                    except Exception as e:  # hashing/IO error inside the runner itself
+                        self._log(f"── {n}: failed ({type(e).__name__}: {e})")
+                        results[n] = {"name": n, "status": "failed", "seconds": 0.0}
+                self._save_state()
+        run = {
+            "started": started,
+            "finished": _now_iso(),
+            "seconds": round(time.perf_counter() - t0, 3),
+            "max_workers": self.max_workers,
+            "steps": [results[n] for n in names if n in results],
+        }
+        HistoryLog(self.state_dir / "runs.jsonl").append(run)
+        return run
+
+    def _save_state(self) -> None:
+        dump_json(self.state_path, self.state, indent=2, sort_keys=True)  # atomic
+        self.hasher.save()
+
+    def plan(self, selected: set[str] | None = None) -> list[tuple[str, str]]:
+        """(name, 'run'|'skip'|'run (upstream)') without executing anything."""
+        rows, will_run = [], set()
+        for n in topo_order(self.by_name):
+            if selected is not None and n not in selected:
+                continue
+            skip, _ = self.should_skip(self.by_name[n])
+            upstream = [d for d in self.by_name[n]["needs"] if d in will_run]
+            if skip and not upstream:
+                rows.append((n, "skip"))
+            else:
+                will_run.add(n)
+                rows.append((n, "run" if not skip else "run? (upstream runs)"))
+        return rows
+
+
+def summarize(run: dict) -> str:
+    counts: dict[str, int] = {}
+    for s in run["steps"]:
+        counts[s["status"]] = counts.get(s["status"], 0) + 1
+    slow = sorted(run["steps"], key=lambda s: -s["seconds"])[:5]
+    lines = [f"pipeline: {run['seconds']:.1f}s wall, "
+             + ", ".join(f"{k}={v}" for k, v in sorted(counts.items()))]
+    lines += [f"  {s['seconds']:7.1f}s  {s['name']}" for s in slow if s["seconds"] > 0]
+    return "\n".join(lines)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Incremental parallel pipeline runner")
+    ap.add_argument("--config", default=str(DEFAULT_CONFIG))
+    ap.add_argument("--only", nargs="+", metavar="STEP",
+                    help="run these steps and everything upstream of them")
+    ap.add_argument("--force", action="store_true", help="ignore recorded input hashes")
+    ap.add_argument("--max-workers", type=int, default=None)
+    ap.add_argument("--dry-run", action="store_true", help="print the plan and exit")
+    ap.add_argument("--quiet", action="store_true", help="only print output of failed steps")
+    ap.add_argument("--check-workflow", nargs="?", const=str(DEFAULT_WORKFLOW), metavar="YML",
+                    help="compare step commands with the workflow (default trend-site.yml) and exit")
+    args = ap.parse_args()
+
+    try:
+        cfg = load_config(Path(args.config))
+        selected = upstream_closure(cfg["by_name"], args.only) if args.only else None
+    except PipelineError as e:
+        print(f"config error: {e}", file=sys.stderr)
+        return 2
+
+    if args.check_workflow:
+        problems = check_workflow(cfg, Path(args.check_workflow))
+        for p in problems:
+            print(p)
+        print(f"{len(cfg['steps'])} steps checked against {args.check_workflow}: "
+              + (f"{len(problems)} difference(s)" if problems else "in sync"))
+        return 1 if problems else 0
+    runner = PipelineRunner(cfg, max_workers=args.max_workers, force=args.force, quiet=args.quiet)
+
+    if args.dry_run:
+        for name, action in runner.plan(selected):
+            print(f"  {action:22s} {name}")
+        return 0
+
+    run = runner.run(selected)
+    print(summarize(run))
+    return 1 if any(s["status"] in ("failed", "blocked") for s in run["steps"]) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
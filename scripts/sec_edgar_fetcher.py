@@ -44,6 +44,7 @@ from pathlib import Path
 from typing import Any
 
 import requests
+from jsonio import load_json
 
 
 # ── 상수 ─────────────────────────────────────────────────────────────────────
@@ -164,7 +165,7 @@ class SECFetcher:
                 f"CIK map not found: {path}. "
                 f"먼저 https://www.sec.gov/files/company_tickers.json 으로 생성."
             )
-        d = json.loads(path.read_text())
+        d = load_json(path)
         # 두 가지 형식 모두 지원: {"tickers": {...}} 또는 {"AAPL": {...}}
         return d.get("tickers", d)
 
@@ -53,6 +53,7 @@ import requests
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT / "scripts"))
 from sec_edgar_fetcher import SECFetcher  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
 
 # ── 경로 / 상수 ───────────────────────────────────────────────────────────
 CACHE_DIR     = ROOT / "data" / "sec_form4_cache"
@@ -352,7 +353,7 @@ class SECForm4Fetcher:
         parsed_path = PARSED_DIR / f"{ticker}.json"
         if not refresh and self._is_parsed_fresh(parsed_path):
             try:
-                return json.loads(parsed_path.read_text())
+                return load_json(parsed_path)
             except json.JSONDecodeError:
                 pass  # 캐시 손상 시 재생성
 
@@ -402,7 +403,7 @@ class SECForm4Fetcher:
         if not out_filings:
             self.stats["no_filings"] += 1
         parsed_path.parent.mkdir(parents=True, exist_ok=True)
-        parsed_path.write_text(json.dumps(result, indent=2, default=str))
+        dump_json(parsed_path, result, indent=2, default=str)
         return result
 
     @staticmethod
@@ -417,7 +418,7 @@ class SECForm4Fetcher:
         manifest: dict = {}
         if MANIFEST_PATH.exists():
             try:
-                manifest = json.loads(MANIFEST_PATH.read_text())
+                manifest = load_json(MANIFEST_PATH)
             except json.JSONDecodeError:
                 manifest = {}
         for tk, r in results.items():
@@ -435,7 +436,7 @@ class SECForm4Fetcher:
                 "distinct_owners":  r.get("distinct_owners"),
                 "status":           "ok" if n_filings > 0 else "no_filings",
             }
-        MANIFEST_PATH.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        dump_json(MANIFEST_PATH, manifest, indent=2, sort_keys=True)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -21,13 +21,15 @@ from pathlib import Path
 
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from jsonio import load_json
+from neardup import NearDupIndex
 
 MODEL_NAME = "ProsusAI/finbert"
 ALIASES_PATH = Path("config/ticker_aliases.json")
 
 
 def load_ticker_aliases(path: Path = ALIASES_PATH) -> dict:
-    return json.loads(path.read_text())
+    return load_json(path)
 
 
 def build_ticker_lookup(aliases: dict):
@@ -126,6 +128,9 @@ def main():
     ap.add_argument("--output", required=True, help="Per-article sentiment JSON")
     ap.add_argument("--batch-size", type=int, default=32)
     ap.add_argument("--max-length", type=int, default=128)
+    ap.add_argument("--collapse-near-dups", action="store_true",
+                    help="score one article per MinHash near-dup cluster, copy to the rest")
+    ap.add_argument("--near-dup-threshold", type=float, default=0.6)
     args = ap.parse_args()
 
     in_path = Path(args.input)
@@ -144,39 +149,54 @@ def main():
     symbol_pat, alias_pats = build_ticker_lookup(aliases)
     print(f"ticker aliases: {len(aliases)} tickers, {len(alias_pats)} alias patterns")
 
-    results = []
-    skipped_empty = 0
-    batch_objs, batch_texts = [], []
     t0 = time.time()
-
-    def flush():
-        if not batch_texts:
-            return
-        scores = score_batch(model, tokenizer, batch_texts, device, args.max_length)
-        for obj, text, sc in zip(batch_objs, batch_texts, scores):
-            results.append({
-                "article_id":   obj.get("article_id") or obj.get("id") or obj.get("url"),
-                "url":          obj.get("url"),
-                "publisher":    get_publisher(obj),
-                "published_at": obj.get("published_at") or obj.get("publishedAt"),
-                "text":         text[:300],
-                "scores":       sc,
-                "label":        max(sc, key=sc.get),
-                "tickers":      sorted(find_tickers(text, symbol_pat, alias_pats)),
-            })
-        batch_objs.clear()
-        batch_texts.clear()
-
+    objs, texts = [], []
+    skipped_empty = 0
     for obj in load_articles(in_path):
         text = article_text(obj)
         if not text:
             skipped_empty += 1
             continue
-        batch_objs.append(obj)
-        batch_texts.append(text)
-        if len(batch_texts) >= args.batch_size:
-            flush()
-    flush()
+        objs.append(obj)
+        texts.append(text)
+
+    # Syndicated copies (same wire story, edited headline) get the score of
+    # their cluster's first article; tickers are still matched per article.
+    to_score = list(range(len(objs)))
+    if args.collapse_near_dups:
+        NearDupIndex(threshold=args.near_dup_threshold).assign(objs)
+        to_score = [i for i, o in enumerate(objs) if o["cluster_rep"]]
+        print(f"near-dup: {len(objs)} articles -> {len(to_score)} clusters to score")
+
+    # Key by cluster only when collapsing: silver rows carry cluster_id by
+    # default (make_silver --near-dup annotate), and without collapsing every
+    # member is scored on its own text.
+    def score_key(i):
+        return objs[i]["cluster_id"] if args.collapse_near_dups else i
+
+    scored = {}
+    for k in range(0, len(to_score), args.batch_size):
+        idx = to_score[k:k + args.batch_size]
+        scores = score_batch(model, tokenizer, [texts[i] for i in idx], device, args.max_length)
+        for i, sc in zip(idx, scores):
+            scored[score_key(i)] = sc
+
+    results = []
+    for i, (obj, text) in enumerate(zip(objs, texts)):
+        sc = scored[score_key(i)]
+        row = {
+            "article_id":   obj.get("article_id") or obj.get("id") or obj.get("url"),
+            "url":          obj.get("url"),
+            "publisher":    get_publisher(obj),
+            "published_at": obj.get("published_at") or obj.get("publishedAt"),
+            "text":         text[:300],
+            "scores":       sc,
+            "label":        max(sc, key=sc.get),
+            "tickers":      sorted(find_tickers(text, symbol_pat, alias_pats)),
+        }
+        if args.collapse_near_dups:
+            row["cluster_id"] = obj["cluster_id"]
+        results.append(row)
 
     elapsed = time.time() - t0
     labels = Counter(r["label"] for r in results)
@@ -190,6 +210,7 @@ def main():
             "model":               MODEL_NAME,
             "device":              str(device),
             "n_articles_scored":   len(results),
+            "n_model_calls":       len(to_score),
             "n_skipped_empty":     skipped_empty,
             "n_with_tickers":      n_with_tickers,
             "elapsed_seconds":     round(elapsed, 2),
@@ -19,13 +19,13 @@ Daily use after backfill:
 from __future__ import annotations
 
 import argparse
-import json
 import re
 import subprocess
 import sys
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from jsonio import dump_json
 
 ROOT = Path(__file__).resolve().parents[1]
 SCORE_SCRIPT = ROOT / "scripts" / "sentiment_finbert.py"
@@ -182,7 +182,7 @@ def write_local_runs(cache_dir: Path, *, last_exit: int, days_scored: int,
         "elapsed_seconds": round(elapsed_seconds, 1),
         "window_days":     window_days,
     }
-    out.write_text(json.dumps(payload, indent=2))
+    dump_json(out, payload, indent=2)
     print(f"[local_runs] {out.relative_to(cache_dir)}: scored={days_scored} skipped={days_skipped} exit={last_exit}")
 
 
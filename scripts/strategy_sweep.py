@@ -0,0 +1,545 @@
+"""
+strategy_sweep.py - Paper-trading rule sweep: alpha vs SPY over a parameter grid.
+
+paper_trade.py replays three fixed rule sets (STOP_LOSS, TAKE_PROFIT,
+MAX_HOLD_DAYS, MAX_POSITIONS, the STRATEGIES selectors). This evaluates
+every combination of a grid of those rules on the same archived snapshots
+and prices, with paper_trade's mechanics (next-day close fills, $1,000
+positions, SELL/REDUCE flips, stop -> take -> max-hold daily check order),
+plus an optional backtest_v2-style trailing exit: at the take level half
+the position is sold and the rest trails its peak by `trail`.
+
+How it stays cheap:
+  - every candidate entry (snapshot x BUY/WATCH prediction with a fill
+    price) gets its forward path once, as a (candidate x day) return
+    matrix; its first SELL/REDUCE flip is looked up once
+  - per exit rule, stop / take / trailing / max-hold exits of all
+    candidates resolve with array ops on that matrix
+  - per (exit rule, selector, max positions) cell only the cash / slot
+    admission is sequential: a heap walk over the selected candidates
+  - exit rules fan out across processes (--jobs)
+
+Each cell is scored with benchmark.py's definitions: return over the value
+history, average invested %, and exposure-adjusted alpha vs SPY (plus raw).
+
+Inputs:  site/data/predictions_history/*.json, site/data/prices.json
+Output:  site/data/strategy_sweep.json
+
+Usage:
+    python3 scripts/strategy_sweep.py --jobs 8
+    python3 scripts/strategy_sweep.py --stop -0.05,-0.08 --take 0.1,0.2 --trail none,0.03
+    python3 scripts/strategy_sweep.py --self-test
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+import paper_trade as pt
+from benchmark import avg_invested_pct, benchmark_return, exposure_adjusted_alpha
+from jsonio import dump_json, load_json
+from perf import count, instrument
+
+ROOT = Path(__file__).resolve().parents[1]
+OUT_FILE = ROOT / "site" / "data" / "strategy_sweep.json"
+
+BENCHMARK = "SPY"
+NONE = 1 << 40      # "no exit" sentinel for day offsets / event keys
+
+# default grid (paper_trade's current values included)
+GRID = {
+    "stop": [-0.05, -0.08, -0.12, -0.20],
+    "take": [0.10, 0.20, 0.30, 0.50],
+    "max_hold": [10, 20, 30, 60],
+    "trail": [None, 0.05],
+    "max_positions": [5, 10, 20],
+    "actions": ["BUY", "BUY+WATCH"],
+    "min_conf": [0.0, 0.4, 0.6, 0.8],
+}
+
+# paper_trade.STRATEGIES as sweep selectors
+BASELINE_SELECTORS = {
+    "main_system":  ("BUY", 0.0),
+    "conservative": ("BUY", 0.80),
+    "aggressive":   ("BUY+WATCH", 0.40),
+}
+
+COLUMNS = ["stop", "take", "max_hold", "trail", "max_positions", "actions", "min_conf",
+           "return_pct", "alpha_pct", "alpha_raw_pct", "avg_invested_pct",
+           "n_entries", "n_closed", "win_rate"]
+
+
+# ── precomputed inputs ───────────────────────────────────────────────────
+class SweepData:
+    """Price matrix, candidate entries and their forward return paths.
+
+    Candidates are every (snapshot, BUY/WATCH prediction) that paper_trade
+    could buy, in the order it would consider them. Event keys order
+    everything that happens on a day: day * K + snapshot ordinal for
+    snapshot-driven fills/flips, day * K + K - 1 for the daily exit check.
+    """
+
+    def __init__(self, prices: pt.PriceCache, files: list[tuple[str, Path]], max_hold: int):
+        cal = prices.calendar
+        n = len(cal)
+        self.calendar = cal
+        self.t0 = next(i for i, d in enumerate(cal) if d >= files[0][0])
+        ordinals = np.array([date.fromisoformat(d).toordinal() for d in cal])
+        day_ix = {d: i for i, d in enumerate(cal)}
+
+        self.tickers = sorted(prices.lookup)
+        tk_ix = {t: i for i, t in enumerate(self.tickers)}
+        C = np.full((len(self.tickers), n), np.nan)
+        for tk, ts in prices.lookup.items():
+            for d, c in ts.items():
+                if c is not None and c > 0:
+                    C[tk_ix[tk], day_ix[d]] = c
+        valid = ~np.isnan(C)
+        # next day >= d with a close (n: none); forward-filled closes for marking
+        idx = np.where(valid, np.arange(n), n)
+        self.next_valid = np.full((len(self.tickers), n + 1), n)
+        self.next_valid[:, :n] = np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+        last = np.where(valid, np.arange(n), -1)
+        last = np.maximum.accumulate(last, axis=1)
+        self.marks = np.where(last >= 0, C[np.arange(len(self.tickers))[:, None], np.maximum(last, 0)], np.nan)
+        self.closes = C
+
+        K = len(files) + 1
+        tk, fill, so, act, conf = [], [], [], [], []
+        flips: dict[int, list[tuple[int, int]]] = {}
+        for s, (sd, f) in enumerate(files):
+            fd = prices.next_trading_day(sd)
+            if fd is None:
+                continue
+            fi = day_ix[fd]
+            preds = load_json(f).get("predictions", []) or []
+            for t, p in {p["ticker"]: p for p in preds if "ticker" in p}.items():
+                if p.get("action") in ("SELL", "REDUCE") and t in tk_ix:
+                    flips.setdefault(tk_ix[t], []).append((fi, s))
+            for p in preds:
+                a = p.get("action")
+                if a not in ("BUY", "WATCH"):
+                    continue
+                t = p.get("ticker")
+                if not t or t not in tk_ix or not C[tk_ix[t], fi] > 0:
+                    continue
+                tk.append(tk_ix[t]); fill.append(fi); so.append(s)
+                act.append(a == "WATCH"); conf.append(p.get("confidence") or 0)
+        self.K = K
+        self.tk = np.array(tk, dtype=np.int64)
+        self.fill = np.array(fill, dtype=np.int64)
+        self.so = np.array(so, dtype=np.int64)
+        self.watch = np.array(act, dtype=bool)
+        self.conf = np.array(conf, dtype=float)
+        self.entry = C[self.tk, self.fill]
+        self.entry_key = self.fill * K + self.so
+        self.entry_ord = ordinals[self.fill]
+        self.ordinals = ordinals
+
+        # first SELL/REDUCE flip after each entry (same-day later snapshots count)
+        nc = len(self.tk)
+        self.flip_j = np.full(nc, NONE, dtype=np.int64)
+        self.flip_key = np.full(nc, NONE, dtype=np.int64)
+        self.flip_px = self.entry.copy()
+        for c in range(nc):
+            ev = flips.get(int(self.tk[c]))
+            if not ev:
+                continue
+            i = bisect_right([s for _, s in ev], int(self.so[c]))
+            if i < len(ev):
+                fi, s = ev[i]
+                self.flip_j[c] = fi - self.fill[c]
+                self.flip_key[c] = fi * K + s
+                px = C[self.tk[c], fi]
+                if px > 0:
+                    self.flip_px[c] = px
+
+        # forward returns, wide enough for the longest hold in the grid
+        h_end = np.minimum(self.hold_exit(max_hold), n - 1)
+        last_close = np.max(np.where(valid, np.arange(n), -1), axis=1)[self.tk]
+        width = int(max(1, (np.minimum(h_end, last_close) - self.fill).max(initial=0) + 1))
+        cols = self.fill[:, None] + np.arange(width)[None, :]
+        inb = cols < n
+        self.R = np.where(inb, C[self.tk[:, None], np.minimum(cols, n - 1)] / self.entry[:, None] - 1, np.nan)
+
+    def hold_exit(self, max_hold: int) -> np.ndarray:
+        """Day index of the max-hold exit: first close >= max_hold calendar days after entry."""
+        hs = np.searchsorted(self.ordinals, self.entry_ord + max_hold, side="left")
+        return self.next_valid[self.tk, hs]
+
+
+# ── exit resolution (vectorized over candidates) ────────────────────────
+def _first(mask: np.ndarray) -> np.ndarray:
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), NONE)
+
+
+def resolve_exits(data: SweepData, stop: float, take: float, max_hold: int,
+                  trail: float | None = None) -> list[tuple[float, np.ndarray, np.ndarray]]:
+    """Exit legs for every candidate: [(fraction, event key, price), ...].
+
+    One leg without trailing; with it, the half sold at the take level and
+    the trailing half (a stop or max-hold before the take exits both at once).
+    An event key of NONE means still open at the end of the data.
+    """
+    R = data.R
+    n = len(data.calendar)
+    H = data.hold_exit(max_hold) - data.fill
+    H = np.where(data.fill + H >= n, NONE, H)
+    stop_hit = R <= stop
+    stop_j = _first(stop_hit)
+    take_j = _first(R >= take)
+
+    def leg(j):
+        j = np.where(data.fill + j >= n, NONE, j)
+        by_flip = data.flip_j <= j
+        key = np.where(by_flip, data.flip_key,
+                       np.where(j >= NONE, NONE, (data.fill + j) * data.K + data.K - 1))
+        px = np.where(by_flip, data.flip_px,
+                      data.closes[data.tk, np.minimum(data.fill + np.minimum(j, n), n - 1)])
+        return key, px
+
+    if trail is None:
+        return [(1.0, *leg(np.minimum.reduce([stop_j, take_j, H])))]
+
+    first_j = np.minimum.reduce([stop_j, take_j, H])
+    took = (take_j == first_j) & (take_j < NONE)   # stop and take can't hit the same day
+    cols = np.arange(R.shape[1])[None, :]
+    after = cols > np.where(took, take_j, NONE)[:, None]
+    P = np.where(cols >= take_j[:, None], R + 1, np.nan)
+    with np.errstate(invalid="ignore"):
+        peak = np.fmax.accumulate(P, axis=1)
+        trail_hit = (P / peak - 1) <= -trail
+    tj = np.minimum(take_j, R.shape[1] - 1)
+    nv_after = data.next_valid[data.tk, np.minimum(data.fill + tj + 1, n)] - data.fill
+    hold_after = np.where(H > take_j, H, np.where(data.fill + nv_after >= n, NONE, nv_after))
+    rest_j = np.minimum.reduce([_first(stop_hit & after), _first(trail_hit & after), hold_after])
+    second_j = np.where(took, rest_j, first_j)
+    return [(0.5, *leg(first_j)), (0.5, *leg(second_j))]
+
+
+# ── portfolio walk (one cell) ────────────────────────────────────────────
+def simulate(data: SweepData, legs, selected: np.ndarray, max_positions: int) -> dict:
+    """paper_trade's admission rules over the selected candidates; scored as benchmark.py does."""
+    K = data.K
+    n = len(data.calendar)
+    cash = pt.INITIAL_CASH
+    cash_delta = np.zeros(n + 1)
+    posval = np.zeros(n)
+    held: dict[int, int] = {}
+    heap: list = []
+    seq = 0
+    n_entries = n_closed = wins = 0
+    nleg = len(legs)
+    closed_ret: dict[int, float] = {}
+    for c in selected:
+        ek = data.entry_key[c]
+        while heap and heap[0][0] <= ek:
+            key, _, t, proceeds, cc, r = heapq.heappop(heap)
+            cash += proceeds
+            cash_delta[key // K] += proceeds
+            closed_ret[cc] = closed_ret.get(cc, 0.0) + r
+            held[t] -= 1
+            if not held[t]:
+                del held[t]
+                n_closed += 1
+                wins += closed_ret.pop(cc) > 0
+        t = int(data.tk[c])
+        if t in held or len(held) >= max_positions or cash < pt.POSITION_SIZE:
+            continue
+        px = data.entry[c]
+        shares = pt.POSITION_SIZE / px
+        cost = shares * px
+        cash -= cost
+        cash_delta[data.fill[c]] -= cost
+        held[t] = nleg
+        n_entries += 1
+        marks = data.marks[t]
+        for frac, keys, pxs in legs:
+            key = int(keys[c])
+            end = n if key >= NONE else key // K
+            posval[data.fill[c]:end] += frac * shares * marks[data.fill[c]:end]
+            if key < NONE:
+                heapq.heappush(heap, (key, seq, t, frac * shares * pxs[c], c,
+                                      frac * (pxs[c] / px - 1)))
+                seq += 1
+    while heap:
+        key, _, t, proceeds, cc, r = heapq.heappop(heap)
+        cash_delta[key // K] += proceeds
+        closed_ret[cc] = closed_ret.get(cc, 0.0) + r
+        held[t] -= 1
+        if not held[t]:
+            n_closed += 1
+            wins += closed_ret.pop(cc) > 0
+
+    cash_t = (pt.INITIAL_CASH + np.cumsum(cash_delta[:n]))[data.t0:]
+    total = np.round(cash_t + posval[data.t0:], 2)
+    cash_t = np.round(cash_t, 2)
+    strat_ret = float(total[-1] / total[0] - 1) if total[0] > 0 else 0.0
+    return {
+        "strat_ret": strat_ret,
+        "avg_invested_pct": avg_invested_pct(cash_t.tolist(), total.tolist()),
+        "n_entries": n_entries,
+        "n_closed": n_closed,
+        "win_rate": round(wins / n_closed, 3) if n_closed else None,
+    }
+
+
+def selection(data: SweepData, actions: str, min_conf: float) -> np.ndarray:
+    ok = data.conf >= min_conf
+    if actions == "BUY":
+        ok &= ~data.watch
+    return np.flatnonzero(ok)
+
+
+def score(res: dict, bm_ret: float | None) -> dict:
+    out = {"return_pct": round(res["strat_ret"] * 100, 2),
+           "alpha_pct": None, "alpha_raw_pct": None}
+    if bm_ret is not None:
+        exposure = res["avg_invested_pct"] / 100.0
+        out["alpha_pct"] = round(exposure_adjusted_alpha(res["strat_ret"], bm_ret, exposure) * 100, 2)
+        out["alpha_raw_pct"] = round((res["strat_ret"] - bm_ret) * 100, 2)
+    return out
+
+
+# ── grid ─────────────────────────────────────────────────────────────────
+_DATA: SweepData | None = None
+_BM: float | None = None
+
+
+def _init_worker(data: SweepData, bm_ret: float | None) -> None:
+    global _DATA, _BM
+    _DATA, _BM = data, bm_ret
+
+
+def _run_rule(rule: tuple, selectors: list[tuple[str, float]], max_positions: list[int]) -> list[list]:
+    stop, take, max_hold, trail = rule
+    legs = resolve_exits(_DATA, stop, take, max_hold, trail)
+    rows = []
+    for (actions, min_conf), mp in itertools.product(selectors, max_positions):
+        res = simulate(_DATA, legs, selection(_DATA, actions, min_conf), mp)
+        s = score(res, _BM)
+        rows.append([stop, take, max_hold, trail, mp, actions, min_conf,
+                     s["return_pct"], s["alpha_pct"], s["alpha_raw_pct"], res["avg_invested_pct"],
+                     res["n_entries"], res["n_closed"], res["win_rate"]])
+    return rows
+
+
+def run_grid(data: SweepData, bm_ret: float | None, grid: dict, jobs: int = 1) -> list[list]:
+    rules = list(itertools.product(grid["stop"], grid["take"], grid["max_hold"], grid["trail"]))
+    selectors = list(itertools.product(grid["actions"], grid["min_conf"]))
+    mps = grid["max_positions"]
+    if jobs <= 1:
+        _init_worker(data, bm_ret)
+        chunks = [_run_rule(r, selectors, mps) for r in rules]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(data, bm_ret)) as ex:
+            chunks = list(ex.map(_run_rule, rules, itertools.repeat(selectors),
+                                 itertools.repeat(mps)))
+    rows = [r for ch in chunks for r in ch]
+    count(len(rows))
+    return rows
+
+
+def baseline(data: SweepData, bm_ret: float | None) -> dict:
+    """paper_trade's three strategies, as sweep cells."""
+    _init_worker(data, bm_ret)
+    out = {}
+    for name, sel in BASELINE_SELECTORS.items():
+        row = _run_rule((pt.STOP_LOSS, pt.TAKE_PROFIT, pt.MAX_HOLD_DAYS, None), [sel],
+                        [pt.MAX_POSITIONS])[0]
+        out[name] = dict(zip(COLUMNS, row))
+    return out
+
+
+def load(max_hold: int):
+    prices = pt.PriceCache(pt.PRICES_FILE)
+    files = pt.snapshot_files()
+    if not files:
+        raise SystemExit(f"No snapshots in {pt.HISTORY_DIR}")
+    data = SweepData(prices, files, max_hold)
+    start, end = data.calendar[data.t0], data.calendar[-1]
+    bm_ret = benchmark_return(prices.lookup, BENCHMARK, start, end)
+    return prices, files, data, bm_ret
+
+
+# ── self-test ────────────────────────────────────────────────────────────
+def _reference_exit(path: list[float], entry: float, stop: float, take: float,
+                    hold_j: int, trail: float) -> list[tuple[float, int]]:
+    """Day-by-day walk (backtest_v2.simulate_trade style) for one candidate."""
+    half = None
+    peak = None
+    for j, cur in enumerate(path):
+        if cur != cur:
+            continue
+        r = cur / entry - 1
+        if half is None:
+            if r <= stop:
+                return [(0.5, j), (0.5, j)]
+            if r >= take:
+                half, peak = j, cur
+                continue
+            if j >= hold_j:
+                return [(0.5, j), (0.5, j)]
+        else:
+            peak = max(peak, cur)
+            if r <= stop or cur / peak - 1 <= -trail or j >= hold_j:
+                return [(0.5, half), (0.5, j)]
+    return [(0.5, half if half is not None else NONE), (0.5, NONE)]
+
+
+def run_self_tests() -> int:
+    results = []
+
+    # 1) trailing legs vs a day-by-day walk, on random paths
+    rng = np.random.RandomState(7)
+    nc, nd = 300, 40
+    paths = 100 * np.cumprod(1 + rng.normal(0, 0.03, (nc, nd)), axis=1)
+    paths[rng.rand(nc, nd) < 0.05] = np.nan
+    paths[:, 0] = 100.0
+    d = SweepData.__new__(SweepData)
+    d.calendar = [f"d{i}" for i in range(nd)]
+    d.K = 2
+    d.tk = np.arange(nc)
+    d.fill = np.zeros(nc, dtype=np.int64)
+    d.entry = np.full(nc, 100.0)
+    d.closes = paths
+    d.R = paths / 100.0 - 1
+    d.flip_j = np.full(nc, NONE, dtype=np.int64)
+    d.flip_key = np.full(nc, NONE, dtype=np.int64)
+    d.flip_px = d.entry.copy()
+    valid = ~np.isnan(paths)
+    idx = np.where(valid, np.arange(nd), nd)
+    d.next_valid = np.full((nc, nd + 1), nd)
+    d.next_valid[:, :nd] = np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+    d.hold_exit = lambda mh: d.next_valid[d.tk, min(mh, nd)]
+    ok = True
+    for stop, take, hold, trail in [(-0.05, 0.05, 15, 0.03), (-0.1, 0.08, 30, 0.02), (-0.03, 0.2, 5, 0.05)]:
+        legs = resolve_exits(d, stop, take, hold, trail)
+        for c in range(nc):
+            hj = int(d.next_valid[c, min(hold, nd)])
+            ref = _reference_exit(list(paths[c]), 100.0, stop, take, hj if hj < nd else NONE, trail)
+            got = [(f, int(k[c]) // d.K if k[c] < NONE else NONE) for f, k, _ in legs]
+            ok &= got == ref
+    results.append(("trailing exits match a day-by-day walk", bool(ok)))
+
+    # 2) the baseline cells reproduce paper_trade's replay and benchmark.py's alpha
+    if pt.PRICES_FILE.exists() and pt.snapshot_files():
+        prices, files, data, bm_ret = load(pt.MAX_HOLD_DAYS)
+        base = baseline(data, bm_ret)
+        portfolios, start, end = pt.full_replay(prices, files)
+        for name, pf in portfolios.items():
+            vh = pf.value_history
+            strat_ret = vh[-1]["total"] / vh[0]["total"] - 1
+            inv = avg_invested_pct([v["cash"] for v in vh], [v["total"] for v in vh])
+            alpha = round(exposure_adjusted_alpha(strat_ret, bm_ret, inv / 100) * 100, 2)
+            cell = base[name]
+            n_buys = sum(1 for t in pf.trades if t["action"] == "BUY")
+            results.append((f"{name}: return {cell['return_pct']:+.2f}% / alpha {cell['alpha_pct']:+.2f}% "
+                            f"vs replay {strat_ret * 100:+.2f}% / {alpha:+.2f}%",
+                            abs(cell["return_pct"] - round(strat_ret * 100, 2)) <= 0.011
+                            and abs(cell["alpha_pct"] - alpha) <= 0.011
+                            and cell["n_entries"] == n_buys))
+    else:
+        print("  [SKIP] baseline vs paper_trade: no site data")
+
+    for name, ok in results:
+        print(f"  [{'PASS' if ok else 'FAIL'}] {name}")
+    n_ok = sum(ok for _, ok in results)
+    print(f"\n{n_ok}/{len(results)} self-tests passed")
+    return 0 if n_ok == len(results) else 1
+
+
+# ── main ─────────────────────────────────────────────────────────────────
+def _floats(s: str) -> list[float]:
+    return [float(x) for x in s.split(",")]
+
+
+def _ints(s: str) -> list[int]:
+    return [int(x) for x in s.split(",")]
+
+
+def _trails(s: str) -> list[float | None]:
+    return [None if x.strip().lower() == "none" else float(x) for x in s.split(",")]
+
+
+def _csv(xs) -> str:
+    return ",".join("none" if x is None else str(x) for x in xs)
+
+
+@instrument("strategy_sweep")
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Paper-trading rule sweep (alpha vs SPY)")
+    ap.add_argument("--stop", type=_floats, default=GRID["stop"], help="stop-loss returns, e.g. -0.05,-0.08")
+    ap.add_argument("--take", type=_floats, default=GRID["take"], help="take-profit returns")
+    ap.add_argument("--max-hold", type=_ints, default=GRID["max_hold"], help="max hold, calendar days")
+    ap.add_argument("--trail", type=_trails, default=GRID["trail"],
+                    help="trailing stop after a half take-profit; 'none' = sell all at take")
+    ap.add_argument("--max-positions", type=_ints, default=GRID["max_positions"])
+    ap.add_argument("--actions", type=lambda s: s.split(","), default=GRID["actions"],
+                    help="BUY and/or BUY+WATCH")
+    ap.add_argument("--min-conf", type=_floats, default=GRID["min_conf"])
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--top", type=int, default=25)
+    ap.add_argument("--out", default=str(OUT_FILE))
+    ap.add_argument("--self-test", action="store_true")
+    args = ap.parse_args()
+
+    if args.self_test:
+        return run_self_tests()
+    bad = [a for a in args.actions if a not in ("BUY", "BUY+WATCH")]
+    if bad:
+        ap.error(f"--actions: unknown {bad}")
+
+    grid = {"stop": args.stop, "take": args.take, "max_hold": args.max_hold, "trail": args.trail,
+            "max_positions": args.max_positions, "actions": args.actions, "min_conf": args.min_conf}
+    t = time.perf_counter()
+    prices, files, data, bm_ret = load(max(grid["max_hold"] + [pt.MAX_HOLD_DAYS]))
+    t_prep = time.perf_counter() - t
+    rows = run_grid(data, bm_ret, grid, jobs=args.jobs)
+    base = baseline(data, bm_ret)
+    elapsed = time.perf_counter() - t
+
+    a = COLUMNS.index("alpha_pct")
+    ranked = sorted((r for r in rows if r[a] is not None), key=lambda r: -r[a])
+    out = {
+        "updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "period": {"start": data.calendar[data.t0], "end": data.calendar[-1]},
+        "n_snapshots": len(files),
+        "n_candidates": int(len(data.tk)),
+        "benchmark": {"ticker": BENCHMARK,
+                      "return_pct": round(bm_ret * 100, 2) if bm_ret is not None else None},
+        "grid": {k: list(v) for k, v in grid.items()},
+        "n_cells": len(rows),
+        "elapsed_s": round(elapsed, 2),
+        "baseline": base,
+        "top": [dict(zip(COLUMNS, r)) for r in ranked[:args.top]],
+        "columns": COLUMNS,
+        "cells": rows,
+    }
+    dump_json(args.out, out)
+    print(f"Wrote {args.out}")
+    print(f"  {len(rows)} cells x {len(data.tk)} candidates in {elapsed:.1f}s "
+          f"(prep {t_prep:.1f}s, jobs={args.jobs}); {BENCHMARK} {out['benchmark']['return_pct']}%")
+    for name, cell in base.items():
+        print(f"  baseline {name:13s} return={cell['return_pct']:+6.2f}%  alpha={cell['alpha_pct']}")
+    for r in ranked[:5]:
+        c = dict(zip(COLUMNS, r))
+        print(f"  top  stop={c['stop']} take={c['take']} hold={c['max_hold']} trail={c['trail']} "
+              f"pos={c['max_positions']} {c['actions']}≥{c['min_conf']}  "
+              f"return={c['return_pct']:+6.2f}%  alpha={c['alpha_pct']:+.2f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
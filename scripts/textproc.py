@@ -0,0 +1,18 @@
+"""
+textproc.py — scripts/ entry point for src/news_trend/textproc.py.
+
+Re-exports the shared tokenizer profiles, stopword loader and memoized
+lemmatizer (same shim pattern as jsonio.py):
+
+    from textproc import EXTRACT, load_stopwords, tokenize_many
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.textproc import *  # noqa: E402,F401,F403
+from news_trend.textproc import __all__  # noqa: E402,F401
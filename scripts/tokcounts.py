@@ -0,0 +1,18 @@
+"""
+tokcounts.py — scripts/ entry point for src/news_trend/tokcounts.py.
+
+Re-exports the per-day binary token-count reader/writer (same shim pattern
+as jsonio.py):
+
+    from tokcounts import SUFFIX, write_counts, read_counts, read_day, day_files
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.tokcounts import *  # noqa: E402,F401,F403
+from news_trend.tokcounts import __all__  # noqa: E402,F401
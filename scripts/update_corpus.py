@@ -4,6 +4,8 @@ from pathlib import Path
 from glob import glob
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from datetime import datetime, timezone
+from jsonio import dump_json, iter_jsonl, write_jsonl as _write_jsonl
+from warehouse import Warehouse
 
 def norm_url(u: str | None) -> str:
     if not u: return ""
@@ -25,18 +27,10 @@ def iso_utc(dt: datetime | None) -> str:
     return dt.astimezone(timezone.utc).isoformat().replace("+00:00","Z")
 
 def read_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line=line.strip()
-            if not line: continue
-            try: yield json.loads(line)
-            except Exception: continue
+    return iter_jsonl(path)
 
 def write_jsonl(path: Path, rows):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False)+"\n")
+    _write_jsonl(path, rows, append=True)
 
 def sha256_path(path: Path) -> str:
     h=hashlib.sha256()
@@ -116,6 +110,7 @@ def main():
     ap.add_argument("--force-rebuild", action="store_true")
     ap.add_argument("--since", default="")
     ap.add_argument("--until", default="")
+    ap.add_argument("--no-columnar", action="store_true", help="skip the Parquet date-partition sync")
     args=ap.parse_args()
 
     wh=Path(args.warehouse); wh.mkdir(parents=True, exist_ok=True)
@@ -189,6 +184,10 @@ def main():
             idx_row={"path":pstr,"sha256":sh,"bytes":p.stat().st_size,"rows":len(rows),"applied":True,"updated_at":iso_utc(now)}
             write_jsonl(index_path, [idx_row])
 
+        columnar=None
+        if not args.no_columnar:
+            columnar=Warehouse(wh, daily_dir=daily_dir).sync(force=args.force_rebuild)
+
         meta={
             "updated_at": iso_utc(now),
             "inputs": globs,
@@ -197,9 +196,10 @@ def main():
             "new_accepted": accepted,
             "master_path": str(master_path),
             "daily_dir": str(daily_dir),
+            "columnar": columnar,
         }
         metrics_path.parent.mkdir(parents=True, exist_ok=True)
-        metrics_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        dump_json(metrics_path, meta, indent=2)
         print(json.dumps(meta))
         return 0
     finally:
@@ -10,6 +10,7 @@ Usage:
     python3 scripts/validate.py --json           # full JSON output
     python3 scripts/validate.py --ci             # CI mode: exit 0 always
                                                  #   (measurement, not gate)
+    python3 scripts/validate.py --jobs 4         # harnesses in 4 processes
 
 Output: site/data/validation.json
 """
@@ -18,6 +19,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -29,9 +31,14 @@ OUT_FILE = DATA / "validation.json"
 
 sys.path.insert(0, str(SCRIPTS))
 
-from walk_forward import load_records, walk_forward, nw_t_test, run_self_tests as wf_self_tests
+from inference import bootstrap_mean_test, nw_t_test, run_self_tests as inf_self_tests
+from walk_forward import walk_forward, run_self_tests as wf_self_tests
 from benchmark import evaluate_strategies, run_self_tests as bm_self_tests
 from naive_baselines import compare_vs_baselines, run_self_tests as nb_self_tests
+from eval_context import EvalContext
+from fold_exec import run_folds
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 def _now_iso() -> str:
@@ -89,19 +96,59 @@ def _load_previous_validation() -> dict | None:
     if not OUT_FILE.exists():
         return None
     try:
-        return json.loads(OUT_FILE.read_text())
+        return load_json(OUT_FILE)
     except (json.JSONDecodeError, OSError):
         return None
 
 
+# ── harness tasks ─────────────────────────────────────────────────────────
+# Each harness reads only the shared EvalContext, so they run in any order
+# and in any process; run_folds returns results in the order listed here.
+
+HARNESSES = {
+    "walk_forward": lambda ctx: walk_forward(ctx.records),
+    "benchmark": lambda ctx: evaluate_strategies(ctx.closes()),
+    "baselines": lambda ctx: compare_vs_baselines(ctx.records),
+    "always_buy": lambda ctx: walk_forward(ctx.records, system_fn=lambda r: "BUY"),
+    "gate_v2": lambda ctx: _gate_v2_fold_diffs(ctx.records),
+}
+
+SELF_TESTS = {
+    "walk_forward": lambda ctx: wf_self_tests(ctx.records),
+    "benchmark": lambda ctx: bm_self_tests(ctx.closes()),
+    "naive_baselines": lambda ctx: nb_self_tests(ctx.records),
+    "inference": lambda ctx: inf_self_tests(),
+}
+
+_CTX: EvalContext | None = None
+
+
+def _init_worker(ctx: EvalContext) -> None:
+    global _CTX
+    _CTX = ctx
+    ctx.install()
+
+
+def _run_task(task: tuple[str, str]):
+    table, name = task
+    return (HARNESSES if table == "harness" else SELF_TESTS)[name](_CTX)
+
+
+def _run_table(table: str, names, ctx: EvalContext | None, jobs: int) -> dict:
+    ctx = ctx or EvalContext.load()
+    out = run_folds(_run_task, [(table, n) for n in names], jobs=jobs,
+                    init=_init_worker, initargs=(ctx,))
+    return dict(zip(names, out))
+
+
 # ── full validation run ───────────────────────────────────────────────────
 
-def run_validation() -> dict:
-    records = load_records()
+def run_validation(ctx: EvalContext | None = None, jobs: int = 1) -> dict:
+    res = _run_table("harness", list(HARNESSES), ctx, jobs)
 
-    wf = walk_forward(records)
-    bm = evaluate_strategies()
-    nb = compare_vs_baselines(records)
+    wf = res["walk_forward"]
+    bm = res["benchmark"]
+    nb = res["baselines"]
 
     # Verdict: summarize the key findings. Accuracy inference uses the
     # Newey-West fold-level test (STEP 3) — the pooled-record z remains in
@@ -139,7 +186,7 @@ def run_validation() -> dict:
     # Both series are evaluated on the same records and share the SPY leg,
     # so the old substitute — testing the system's own H0:alpha=0 — used
     # the wrong SE for the question the gate asks.
-    buy_res = walk_forward(records, system_fn=lambda r: "BUY")
+    buy_res = res["always_buy"]
     buy_alpha_info = buy_res.get("alpha", {})
     buy_alpha = buy_alpha_info.get("per_trade_mean_pct")
 
@@ -154,9 +201,13 @@ def run_validation() -> dict:
 
     gate_pass = False
     gate_reason = ""
-    diff_mean = diff_t = diff_p = None
+    diff_mean = diff_t = diff_p = diff_boot = None
     if alpha_mean is not None and buy_alpha is not None and len(diffs) >= 2:
         diff_mean, diff_t, diff_p = nw_t_test(diffs)
+        # Cross-check only (the gate stays on NW): stationary bootstrap with
+        # blocks as long as the fold-return overlap.
+        _, b_lo, b_hi, b_p = bootstrap_mean_test(diffs)
+        diff_boot = {"p": round(b_p, 4), "ci_95": [round(b_lo, 4), round(b_hi, 4)]}
         if diff_mean > 0 and diff_p < 0.05 and alpha_mean > 0:
             gate_pass = True
             gate_reason = (f"PASS: paired (system − always-buy) alpha "
@@ -175,7 +226,7 @@ def run_validation() -> dict:
     # 대수 결함 — docs/gate_v2_definition.md 결과 절 참조). 양쪽 판정이
     # FAIL로 동일해 v1 원복은 결과 기반 선택이 아니라 정밀도 근거
     # (checkpoint_registration.json GATE-V2-REVERT 항목).
-    v2_diffs, v2_n_pairs, v2_n_sector = _gate_v2_fold_diffs(records)
+    v2_diffs, v2_n_pairs, v2_n_sector = res["gate_v2"]
     v2_pass = False
     v2_mean = v2_t = v2_p = None
     if len(v2_diffs) >= 2:
@@ -257,6 +308,7 @@ def run_validation() -> dict:
             "paired_t": diff_t,
             "paired_p": diff_p,
             "paired_n_folds": len(diffs),
+            "paired_bootstrap": diff_boot,
             "reason": gate_reason,
         },
         "gate_v2_failed": {
@@ -301,13 +353,8 @@ def run_validation() -> dict:
 
 # ── self-tests ─────────────────────────────────────────────────────────────
 
-def run_all_self_tests() -> dict:
-    records = load_records()
-    results = {
-        "walk_forward": wf_self_tests(records),
-        "benchmark": bm_self_tests(),
-        "naive_baselines": nb_self_tests(records),
-    }
+def run_all_self_tests(ctx: EvalContext | None = None, jobs: int = 1) -> dict:
+    results = _run_table("self_test", list(SELF_TESTS), ctx, jobs)
     all_pass = all(
         t["pass"]
         for group in results.values()
@@ -387,6 +434,10 @@ def print_summary(v: dict) -> None:
     status = "PASS" if gate.get("pass") else "FAIL"
     print(f"   [{status}] {gate.get('reason', 'n/a')}")
     print(f"   Criterion: {gate.get('criterion', 'n/a')}")
+    boot = gate.get("paired_bootstrap")
+    if boot:
+        print(f"   Bootstrap cross-check: p={boot['p']:.4f}  "
+              f"95% CI [{boot['ci_95'][0]:+.2f}, {boot['ci_95'][1]:+.2f}]pp")
 
     # Data sufficiency
     ds = v.get("data_sufficiency", {})
@@ -423,16 +474,21 @@ def print_summary(v: dict) -> None:
 
 # ── main ───────────────────────────────────────────────────────────────────
 
+@instrument("validate")
 def run() -> int:
     ap = argparse.ArgumentParser(description="Unified Phase 0 validation")
     ap.add_argument("--self-test", action="store_true")
     ap.add_argument("--json", action="store_true")
     ap.add_argument("--ci", action="store_true",
                     help="CI mode: always exit 0 (measurement, not gate)")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for the harnesses and self-tests "
+                         "(default: all CPUs; 1 runs them in-process)")
     args = ap.parse_args()
 
+    ctx = EvalContext.load()
     if args.self_test:
-        result = run_all_self_tests()
+        result = run_all_self_tests(ctx, args.jobs)
         if args.json:
             print(json.dumps(result, indent=2))
         else:
@@ -444,9 +500,9 @@ def run() -> int:
             print(f"\n  All pass: {result['all_pass']}")
         return 0 if result["all_pass"] else 1
 
-    validation = run_validation()
+    validation = run_validation(ctx, args.jobs)
 
-    OUT_FILE.write_text(json.dumps(validation, indent=2, default=str))
+    dump_json(OUT_FILE, validation, indent=2, default=str)
 
     if args.json:
         print(json.dumps(validation, indent=2, default=str))
@@ -32,9 +32,10 @@ from __future__ import annotations
 
 import argparse
 import json
-import math
 import random
 from pathlib import Path
+from inference import NW_LAG, mean_t_test, nw_t_test, proportion_z, wilson_ci
+from jsonio import load_json
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "site" / "data"
@@ -48,11 +49,6 @@ PRICES_FILE = DATA / "prices.json"
 MIN_TRAIN_DATES = 0
 PROVISIONAL_N = 30
 
-# Newey-West lag for fold-level t-tests. Folds are daily but returns span 5
-# trading days, so adjacent folds share up to 4/5 of their return window;
-# measured fold-alpha autocorrelation before correction was rho1~0.76.
-NW_LAG = 4
-
 
 # ── price cache (for SPY benchmark alpha) ──────────────────────────────────
 
@@ -71,8 +67,11 @@ class _PriceCache:
         if not p.exists():
             self._loaded = True
             return
-        data = json.loads(p.read_text())
-        spy = data.get("tickers", {}).get("SPY")
+        self.prime(load_json(p).get("tickers", {}))
+
+    def prime(self, tickers: dict) -> None:
+        """Use an already-loaded prices.json `tickers` map instead of the file."""
+        spy = tickers.get("SPY")
         if spy:
             self._calendar = spy["dates"]
             self._closes = dict(zip(spy["dates"], spy["closes"]))
@@ -116,7 +115,7 @@ def load_records(path: Path = ACCURACY_FILE) -> list[dict]:
     snapshots share Friday's close, so the raw `records` list counts the same
     realized 5-day move up to 4x. Falls back to raw records only for
     accuracy files predating the export."""
-    acc = json.loads(path.read_text())
+    acc = load_json(path)
     recs = acc.get("records_deduped") or acc["records"]
     return [r for r in recs if r.get("correct_5d") is not None]
 
@@ -129,79 +128,6 @@ def is_correct(action: str, fwd_return: float) -> bool | None:
     return None
 
 
-def wilson_ci(k: int, n: int, z: float = 1.96) -> tuple[float, float, float]:
-    if n == 0:
-        return 0.0, 0.0, 0.0
-    p = k / n
-    denom = 1 + z * z / n
-    center = (p + z * z / (2 * n)) / denom
-    margin = z * math.sqrt((p * (1 - p) + z * z / (4 * n)) / n) / denom
-    return round(center, 4), round(max(0, center - margin), 4), round(min(1, center + margin), 4)
-
-
-def proportion_z(k: int, n: int, p0: float = 0.5) -> tuple[float, float]:
-    """Two-sided z-test. Returns (z_stat, p_value)."""
-    if n == 0:
-        return 0.0, 1.0
-    p = k / n
-    se = math.sqrt(p0 * (1 - p0) / n)
-    if se == 0:
-        return 0.0, 1.0
-    z = (p - p0) / se
-    p_val = 2 * (1 - _norm_cdf(abs(z)))
-    return round(z, 4), round(p_val, 4)
-
-
-def _norm_cdf(x: float) -> float:
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
-
-def mean_t_test(values: list[float]) -> tuple[float, float, float]:
-    """One-sample t-test H0: mean=0, iid SE. Returns (mean, t_stat, p_value).
-
-    WARNING: fold series here are strongly autocorrelated (overlapping 5-day
-    returns on daily folds) — for headline inference use nw_t_test."""
-    n = len(values)
-    if n < 2:
-        return (values[0] if values else 0.0), 0.0, 1.0
-    m = sum(values) / n
-    var = sum((v - m) ** 2 for v in values) / (n - 1)
-    se = math.sqrt(var / n) if var > 0 else 0
-    if se == 0:
-        return m, 0.0, 1.0
-    t = m / se
-    # Approximate two-sided p from t using normal (good enough for n>10)
-    p = 2 * (1 - _norm_cdf(abs(t)))
-    return round(m, 4), round(t, 4), round(p, 4)
-
-
-def nw_t_test(values: list[float], lag: int = None,
-              mu0: float = 0.0) -> tuple[float, float, float]:
-    """One-sample test H0: mean=mu0 with Newey-West (HAC) standard error.
-
-    Bartlett-kernel long-run variance with `lag` autocovariance terms
-    (default NW_LAG=4, matching the 5-trading-day return overlap of daily
-    folds). Returns (mean, t_stat, p_value); two-sided normal p."""
-    if lag is None:
-        lag = NW_LAG
-    n = len(values)
-    if n < 2:
-        return (values[0] if values else 0.0), 0.0, 1.0
-    m = sum(values) / n
-    e = [v - m for v in values]
-    gamma0 = sum(x * x for x in e) / n
-    lrv = gamma0
-    for j in range(1, min(lag, n - 1) + 1):
-        gj = sum(e[i] * e[i - j] for i in range(j, n)) / n
-        lrv += 2 * (1 - j / (lag + 1)) * gj
-    if lrv <= 0:
-        return round(m, 4), 0.0, 1.0
-    se = math.sqrt(lrv / n)
-    t = (m - mu0) / se
-    p = 2 * (1 - _norm_cdf(abs(t)))
-    return round(m, 4), round(t, 4), round(p, 4)
-
-
 # ── fold metrics ───────────────────────────────────────────────────────────
 
 def fold_metrics(test_records: list[dict], snap_date: str) -> dict | None:
@@ -0,0 +1,25 @@
+"""
+warehouse.py — scripts/ entry point for src/news_trend/warehouse.py.
+
+Re-exports the columnar warehouse reader for scripts (same shim pattern as
+jsonio.py) and doubles as its CLI:
+
+    from warehouse import Warehouse
+
+    python scripts/warehouse.py            # rebuild stale date partitions
+    python scripts/warehouse.py --info     # freshness summary, no writes
+"""
+
+import sys
+from pathlib import Path
+
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+from news_trend.warehouse import *  # noqa: E402,F401,F403
+from news_trend.warehouse import __all__, main  # noqa: E402,F401
+
+if __name__ == "__main__":
+    from perf import instrument
+    raise SystemExit(instrument("warehouse_sync")(main)())
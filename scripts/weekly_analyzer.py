@@ -6,12 +6,13 @@ Reads the artifacts the daily pipeline already produces:
   - site/data/paper_trading_history.json   (trades, equity)
   - site/data/prediction_accuracy.json     (per-prediction accuracy)
   - site/data/gap_analysis.json            (gap by every dimension)
-  - site/data/gap_history.json             (weekly gap trend)
-  - site/data/calibration_history.json     (what calibrator changed)
+  - site/data/gap_history.json             (weekly gap trend, recent window)
+  - site/data/calibration_history.json     (what calibrator changed, recent window)
 
 Produces:
   - site/data/weekly_analysis.json         (latest week's report)
-  - site/data/weekly_history.json          (append-only weekly log)
+  - site/data/weekly_history.jsonl         (append-only weekly log, week-keyed)
+  - site/data/weekly_history.json          (newest HISTORY_WINDOW weeks)
 
 Each weekly entry contains:
   - summary: trade count, win rate, gap, directional accuracy
@@ -23,13 +24,22 @@ Each weekly entry contains:
 from __future__ import annotations
 
 import json
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "scripts"))
+from history_log import HistoryLog  # noqa: E402
+from jsonio import dump_json, load_json  # noqa: E402
+from perf import instrument  # noqa: E402
+
 DATA = ROOT / "site" / "data"
 OUT_LATEST = DATA / "weekly_analysis.json"
 OUT_HISTORY = DATA / "weekly_history.json"
+HISTORY_LOG = DATA / "weekly_history.jsonl"
+HISTORY_WINDOW = 52          # weeks kept in weekly_history.json
+HISTORY_COMPACT_EVERY = 50   # same-week re-runs folded away every N appends
 
 # Heuristic thresholds for issue surfacing
 ISSUE_GAP_THRESHOLD_PCT = 5.0       # |gap| above this → flagged
@@ -51,7 +61,7 @@ def _load(path: Path) -> dict:
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text())
+        return load_json(path)
     except json.JSONDecodeError:
         return {}
 
@@ -224,6 +234,7 @@ def _trade_summary(paper: dict) -> dict:
     return out
 
 
+@instrument("weekly_analyzer")
 def run() -> None:
     paper = _load(DATA / "paper_trading_history.json")
     gap = _load(DATA / "gap_analysis.json")
@@ -252,28 +263,22 @@ def run() -> None:
         "top_issues": issues,
         "improvement_plan": plan,
         "last_week_validation": validation,
-        "calibration_runs_total": len((calib_hist.get("runs") or [])),
+        # calibration_history.json is a bounded window; `total` is the log length
+        "calibration_runs_total": calib_hist.get("total", len(calib_hist.get("runs") or [])),
     }
 
-    OUT_LATEST.write_text(json.dumps(payload, indent=2, default=str))
+    dump_json(OUT_LATEST, payload, indent=2, default=str)
 
     # Append-only history (one entry per ISO week, replace if same week)
-    history: dict
-    if OUT_HISTORY.exists():
-        history = json.loads(OUT_HISTORY.read_text())
-        if "weeks" not in history:
-            history = {"weeks": []}
-    else:
-        history = {"weeks": []}
-    history["weeks"] = [w for w in history["weeks"] if w.get("week") != payload["week"]]
-    history["weeks"].append(payload)
-    history["weeks"].sort(key=lambda w: w.get("week") or "")
-    history["updated"] = payload["updated"]
-    OUT_HISTORY.write_text(json.dumps(history, indent=2, default=str))
+    history = HistoryLog(HISTORY_LOG, legacy=OUT_HISTORY, legacy_key="weeks", key="week")
+    history.append(payload)
+    history.maybe_compact(every=HISTORY_COMPACT_EVERY)
+    window = history.write_window(OUT_HISTORY, HISTORY_WINDOW, "weeks",
+                                  extra={"updated": payload["updated"]}, sort_by="week")
 
     # Stdout digest
     print(f"Wrote {OUT_LATEST}")
-    print(f"  week: {payload['week']}  history weeks: {len(history['weeks'])}")
+    print(f"  week: {payload['week']}  history weeks: {window['total']}")
     if week:
         print(f"  n={week.get('n')}  avg|gap|={week.get('avg_abs_gap_pct')}%  "
               f"signed={week.get('avg_signed_gap_pct')}%  dir_acc={week.get('directional_acc')}")
@@ -21,17 +21,11 @@ weekly_report.py — 주간/월간 신호 성과 리포트
 
 from __future__ import annotations
 import argparse
-import json
 import math
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-
-
-def load_json(p: Path):
-    try:
-        return json.loads(p.read_text())
-    except Exception:
-        return None
+from jsonio import dump_json, load_json
+from perf import instrument
 
 
 def compute_return(prices: dict, ticker: str, from_date: str, days: int) -> float:
@@ -162,7 +156,7 @@ def aggregate_word_signals(analysis_dir: Path) -> dict:
     verified_signals = []
     for json_file in sorted(analysis_dir.glob("*.json")):
         try:
-            data = json.loads(json_file.read_text())
+            data = load_json(json_file)
         except Exception:
             continue
         ticker = data.get("ticker")
@@ -200,6 +194,7 @@ def aggregate_word_signals(analysis_dir: Path) -> dict:
     return {"total": len(verified_signals), "top_signals": verified_signals[:20]}
 
 
+@instrument("weekly_report")
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--prices",        default="site/data/prices.json")
@@ -231,7 +226,10 @@ def main():
               "archive_predictions.py right after predict.py")
 
     # 2) 지난 N일간 예측 파일 로드
-    prices = load_json(Path(args.prices)) or {}
+    try:
+        prices = load_json(args.prices, default=None) or {}
+    except ValueError:
+        prices = {}
 
     cutoff = datetime.now(timezone.utc) - timedelta(days=args.lookback_days)
     evaluations = []
@@ -246,7 +244,10 @@ def main():
         except ValueError:
             continue
 
-        pred = load_json(f)
+        try:
+            pred = load_json(f)
+        except ValueError:
+            continue
         if pred:
             ev = evaluate_predictions(pred, prices, args.hold_days)
             evaluations.append(ev)
@@ -271,12 +272,12 @@ def main():
 
     # 주간 리포트 저장
     out_file = out_dir / "weekly_report.json"
-    out_file.write_text(json.dumps(report, ensure_ascii=False, separators=(",", ":")))
+    dump_json(out_file, report)
 
     # 히스토리에도 타임스탬프 있는 버전 저장
     ts = datetime.now(timezone.utc).strftime("%Y-%m-%d")
     hist_file = history_dir / f"{ts}.json"
-    hist_file.write_text(json.dumps(report, ensure_ascii=False, separators=(",", ":")))
+    dump_json(hist_file, report)
 
     # 콘솔 출력
     print(f"\n→ {out_file}")
@@ -0,0 +1,134 @@
+// bundle.js — lazy shard loader for site/data/bundle (scripts/build_site_bundle.py)
+//
+//   SiteBundle.meta('prices')              → {updated, tickers:[...]}
+//   SiteBundle.meta('ticker_sentiment')    → ticker_sentiment.json minus per-ticker payloads
+//   SiteBundle.shard('prices', 'AAPL')     → prices.json .tickers.AAPL
+//   SiteBundle.shard('signal_corr', 'AAPL')→ {ticker, pairs:[... with lag_corrs]}
+//   SiteBundle.trendSeries(['ai','chip'])  → {ai:[...], chip:[...]}
+//
+// Shards are content-addressed (name.<hash>.json), so they are fetched with
+// the normal HTTP cache; only the manifest is fetched no-store. When the
+// browser has DecompressionStream the pre-gzipped .gz variant is used.
+// Without a manifest (bundle not built yet, local dev) every call falls
+// back to the whole source file and slices it the same way.
+(function(){
+'use strict';
+
+const BASE = './data/';
+const V = Date.now();
+let _manifest;               // undefined = not fetched, null = unavailable
+const _shards = new Map();   // url → Promise
+const _whole  = new Map();   // source file → Promise
+
+function termPrefix(term){
+  // keep in sync with build_site_bundle.term_prefix()
+  const c = String(term || '_').charAt(0).toLowerCase();
+  return /[a-z0-9]/.test(c) ? c : '_';
+}
+
+async function getJSON(url, opts){
+  try{
+    const r = await fetch(url, opts);
+    if(!r.ok) return null;
+    return r.json();
+  }catch(e){ return null; }
+}
+
+async function manifest(){
+  if(_manifest === undefined){
+    _manifest = getJSON(BASE + 'bundle/manifest.json?v=' + V, {cache:'no-store'})
+      .then(m => (m && m.version === 1) ? m : null);
+  }
+  return _manifest;
+}
+
+async function fetchEntry(entry){
+  const url = BASE + 'bundle/' + entry.path;
+  if(!_shards.has(url)){
+    _shards.set(url, (async () => {
+      if(entry.gz && typeof DecompressionStream !== 'undefined'){
+        try{
+          const r = await fetch(url + '.gz');
+          if(r.ok){
+            const s = r.body.pipeThrough(new DecompressionStream('gzip'));
+            return await new Response(s).json();
+          }
+        }catch(e){ /* fall through to the plain shard */ }
+      }
+      return getJSON(url);
+    })());
+  }
+  return _shards.get(url);
+}
+
+function whole(source){
+  if(!_whole.has(source)){
+    _whole.set(source, getJSON(BASE + source + '?v=' + V, {cache:'no-store'}));
+  }
+  return _whole.get(source);
+}
+
+// Same slicing as the builder, applied to the whole file (no-manifest path).
+const SOURCES = {
+  prices:           'prices.json',
+  ticker_sentiment: 'ticker_sentiment.json',
+  signal_corr:      'signal_corr.json',
+  trends:           'trends.json',
+};
+const FALLBACK = {
+  prices: {
+    meta:  d => ({updated: d.updated, tickers: Object.keys(d.tickers || {}).sort()}),
+    shard: (d, k) => (d.tickers || {})[k] || null,
+  },
+  ticker_sentiment: {
+    meta:  d => Object.assign({}, d, {tickers: Object.keys(d.tickers || {}).sort()}),
+    shard: () => null,  // meta only, like the builder
+  },
+  signal_corr: {
+    meta:  d => d,
+    shard: (d, k) => ({ticker: k, pairs: (d.pairs || []).filter(p => (p.ticker || '_') === k)}),
+  },
+  trends: {
+    meta:  d => d,
+    shard: (d, k) => {
+      const series = {};
+      for(const [t, v] of Object.entries(d.series || {})) if(termPrefix(t) === k) series[t] = v;
+      return {series};
+    },
+  },
+};
+
+async function meta(artifact){
+  const m = await manifest();
+  const a = m && m.artifacts[artifact];
+  if(a && a.meta) return fetchEntry(a.meta);
+  if(!SOURCES[artifact]) return null;
+  const d = await whole(SOURCES[artifact]);
+  return d ? FALLBACK[artifact].meta(d) : null;
+}
+
+async function shard(artifact, key){
+  const m = await manifest();
+  const a = m && m.artifacts[artifact];
+  if(a){
+    const e = a.shards[key];
+    return e ? fetchEntry(e) : null;
+  }
+  if(!SOURCES[artifact]) return null;
+  const d = await whole(SOURCES[artifact]);
+  return d ? FALLBACK[artifact].shard(d, key) : null;
+}
+
+async function trendSeries(terms){
+  const prefixes = [...new Set(terms.map(termPrefix))];
+  const parts = await Promise.all(prefixes.map(p => shard('trends', p)));
+  const out = {};
+  for(const part of parts){
+    const s = (part && part.series) || {};
+    for(const t of terms) if(s[t] !== undefined) out[t] = s[t];
+  }
+  return out;
+}
+
+window.SiteBundle = {manifest, meta, shard, trendSeries, termPrefix};
+})();
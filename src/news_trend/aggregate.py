@@ -1,24 +1,27 @@
 from __future__ import annotations
 from pathlib import Path
-import json, os
+import os
 from datetime import datetime, timedelta, timezone, date as ddate
 from typing import Iterable
-from .dedup import dedup_rows
+from .dedup import SeenSet, iter_dedup
+from .jsonio import JsonlWriter, iter_jsonl
 
 def _iter_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            yield json.loads(line)
+    return iter_jsonl(path, strict=True)
 
 def aggregate_windows(
     date: str,
     inroot: str = "data/raw_windows",
     daily_outdir: str = "data/raw_newsapi",
     silver_outdir: str = "data/silver_newsapi",
+    spill_after: int | None = None,
 ) -> tuple[Path, Path]:
+    """Merge a day's window files into the daily file and its deduped silver copy.
+
+    Single streaming pass: each row is written to the daily file, then
+    deduped straight into the silver file, so memory doesn't grow with the
+    day (beyond the digest set, which spills to disk past `spill_after`).
+    """
     day = ddate.fromisoformat(date)
     windows_dir = Path(inroot) / day.isoformat()
     assert windows_dir.exists(), f"missing directory: {windows_dir}"
@@ -27,20 +30,20 @@ def aggregate_windows(
     silver_out = Path(silver_outdir); silver_out.mkdir(parents=True, exist_ok=True)
 
     daily_path = daily_out / f"{day.isoformat()}.jsonl"
-    rows = []
-    for p in sorted(windows_dir.glob("*.jsonl")):
-        if p.name.startswith("_"):
-            continue
-        rows.extend(_iter_jsonl(p))
-    with daily_path.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-    print(f"[OK] merged {len(rows)} rows -> {daily_path}")
-
-    cleaned = list(dedup_rows(rows))
     silver_path = silver_out / f"{day.isoformat()}.jsonl"
-    with silver_path.open("w", encoding="utf-8") as f:
-        for r in cleaned:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
-    print(f"[OK] dedup {len(rows)} -> {len(cleaned)} -> {silver_path}")
+
+    def merged():
+        for p in sorted(windows_dir.glob("*.jsonl")):
+            if p.name.startswith("_"):
+                continue
+            for r in _iter_jsonl(p):
+                daily.write(r)  # serialized now, before dedup annotates r
+                yield r
+
+    with JsonlWriter(daily_path, atomic=True) as daily, \
+            JsonlWriter(silver_path, atomic=True) as silver, \
+            SeenSet(spill_after) as seen:
+        silver.write_many(iter_dedup(merged(), seen))
+    print(f"[OK] merged {daily.count} rows -> {daily_path}")
+    print(f"[OK] dedup {daily.count} -> {silver.count} -> {silver_path}")
     return daily_path, silver_path
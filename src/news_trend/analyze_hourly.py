@@ -1,21 +1,15 @@
 from __future__ import annotations
-import json, re, base64, io
+import re, base64, io
 from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime, timezone
+from .jsonio import read_jsonl
 
 WORD_RE = re.compile(r"[A-Za-z]{3,}")
 
 def _load_jsonl(path: Path) -> pd.DataFrame:
-    recs = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            recs.append(json.loads(line))
-    return pd.DataFrame(recs)
+    return pd.DataFrame(read_jsonl(path, strict=True))
 
 def _png_b64(fig) -> str:
     buf = io.BytesIO()
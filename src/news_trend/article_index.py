@@ -0,0 +1,260 @@
+"""SQLite FTS5 full-text index over the article warehouse.
+
+"Which articles mention X on day D" used to mean scanning whole daily files
+or per-day sentiment dumps. This keeps an FTS5 index over title /
+description / content next to the warehouse, with one metadata row per
+article (date, published_at, publisher, url, title) keyed by article id:
+
+    data/warehouse/articles_fts.sqlite
+
+sync() is incremental: each day's daily-file fingerprint (warehouse.source_key)
+is stored, and only days whose file changed are re-read. Rows are inserted
+only if their article id is new, so the live->daily merge's duplicates and
+re-reads of a grown day don't double-count. The FTS table is contentless
+(content=''): the text is searchable but stored only once, in the warehouse.
+
+    from news_trend.article_index import ArticleIndex
+    # scripts/: from article_index import ArticleIndex
+
+    with ArticleIndex(readonly=True) as idx:
+        idx.search("nvidia", start="2026-08-01", end="2026-08-01", limit=5)
+        idx.search(["taiwan semiconductor", "tsmc"])      # any of the phrases
+        idx.search('nvidia NEAR/5 export', raw=True)     # FTS5 query syntax
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sqlite3
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .warehouse import Warehouse, source_key
+
+__all__ = ["DEFAULT_PATH", "ArticleIndex", "phrase_query", "ticker_query", "main"]
+
+DEFAULT_PATH = Path("data/warehouse/articles_fts.sqlite")
+SCHEMA_VERSION = 1
+
+_COLUMNS = ["article_id", "url", "title", "publisher", "published_at", "description", "content"]
+_RESULT_COLUMNS = ("article_id", "date", "published_at", "publisher", "url", "title")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v TEXT);
+CREATE TABLE IF NOT EXISTS days (day TEXT PRIMARY KEY, key TEXT, rows INTEGER, indexed_at TEXT);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    article_id TEXT NOT NULL UNIQUE,
+    date TEXT NOT NULL,
+    published_at TEXT,
+    publisher TEXT,
+    url TEXT,
+    title TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_date ON articles (date, published_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+    title, description, content, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _day(d: str | date | None) -> str | None:
+    if d is None or d == "":
+        return None
+    return d.isoformat() if isinstance(d, date) else str(d)[:10]
+
+
+def _article_key(r: dict, day: str) -> str:
+    # same id update_corpus.normalize_row assigns, so a raw merged copy of an
+    # article and its normalized row collapse to one entry
+    if r.get("article_id"):
+        return r["article_id"]
+    if r.get("url"):
+        return f"newsapi:{r['url']}"
+    h = hashlib.sha1(f"{day}|{r.get('publisher')}|{r.get('title')}".encode()).hexdigest()
+    return f"sha1:{h[:16]}"
+
+
+def phrase_query(terms: str | Sequence[str]) -> str:
+    """FTS5 expression matching any of `terms`, each as an exact phrase."""
+    if isinstance(terms, str):
+        terms = [terms]
+    phrases = ['"' + t.replace('"', '""') + '"' for t in terms if t and t.strip()]
+    if not phrases:
+        raise ValueError("empty search query")
+    return " OR ".join(phrases)
+
+
+def ticker_query(ticker: str, aliases: dict) -> str | None:
+    """Phrase query for a ticker's company names (config/ticker_aliases.json).
+
+    FTS matching is case-insensitive, so short aliases equal to the symbol
+    ("on", "mu", "adi") are dropped — same rule as sentiment_finbert's alias
+    matcher. Returns None when nothing searchable is left.
+    """
+    names = [n for n in aliases.get(ticker) or []
+             if not (n.lower() == ticker.lower() and len(n) <= 4)]
+    return phrase_query(names) if names else None
+
+
+class ArticleIndex:
+    def __init__(self, path: str | Path = DEFAULT_PATH, *, readonly: bool = False):
+        self.path = Path(path)
+        if readonly:
+            if not self.path.exists():
+                raise FileNotFoundError(f"{self.path}: run `python scripts/article_index.py` first")
+            self.con = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True,
+                                       check_same_thread=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.con = sqlite3.connect(self.path)
+            self.con.executescript(_SCHEMA)
+            row = self.con.execute("SELECT v FROM meta WHERE k='schema_version'").fetchone()
+            if row is None:
+                self.con.execute("INSERT INTO meta VALUES ('schema_version', ?)",
+                                 (str(SCHEMA_VERSION),))
+                self.con.commit()
+            elif int(row[0]) != SCHEMA_VERSION:
+                raise RuntimeError(f"{self.path}: schema v{row[0]}, expected "
+                                   f"v{SCHEMA_VERSION} — delete it and re-sync")
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self) -> "ArticleIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── write ───────────────────────────────────────────────────────────
+    def _index_day(self, wh: Warehouse, day: str) -> int:
+        cur = self.con.cursor()
+        added = 0
+        for r in wh.scan(day, day, _COLUMNS):
+            if not (r["title"] or r["description"] or r["content"]):
+                continue
+            cur.execute(
+                "INSERT OR IGNORE INTO articles (article_id, date, published_at, publisher, url, title)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (_article_key(r, day), day, r["published_at"], r["publisher"], r["url"], r["title"]))
+            if cur.rowcount:
+                cur.execute("INSERT INTO articles_fts (rowid, title, description, content)"
+                            " VALUES (?, ?, ?, ?)",
+                            (cur.lastrowid, r["title"], r["description"], r["content"]))
+                added += 1
+        return added
+
+    def sync(self, warehouse: Warehouse | str | Path = "data/warehouse",
+             days: Iterable[str | date] | None = None) -> dict:
+        """Index new articles from days whose daily file changed since the last sync."""
+        wh = warehouse if isinstance(warehouse, Warehouse) else Warehouse(warehouse)
+        sources = wh.sources()
+        wanted = sorted(sources) if days is None else sorted({_day(d) for d in days} & set(sources))
+        seen = dict(self.con.execute("SELECT day, key FROM days"))
+        changed = added = 0
+        for day in wanted:
+            key = source_key(sources[day])
+            if seen.get(day) == key:
+                continue
+            with self.con:  # one transaction per day
+                n = self._index_day(wh, day)
+                self.con.execute(
+                    "INSERT OR REPLACE INTO days VALUES (?, ?, "
+                    "(SELECT COUNT(*) FROM articles WHERE date = ?), ?)",
+                    (day, key, day, _now_iso()))
+            changed += 1
+            added += n
+        return {"days": len(wanted), "changed": changed, "added": added,
+                "articles": self.con.execute("SELECT COUNT(*) FROM articles").fetchone()[0]}
+
+    # ── read ────────────────────────────────────────────────────────────
+    def _where(self, query, raw, start, end, publisher) -> tuple[str, list]:
+        sql = "articles_fts MATCH ?"
+        params: list = [query if raw else phrase_query(query)]
+        if start:
+            sql += " AND a.date >= ?"
+            params.append(_day(start))
+        if end:
+            sql += " AND a.date <= ?"
+            params.append(_day(end))
+        if publisher:
+            sql += " AND a.publisher = ?"
+            params.append(publisher)
+        return sql, params
+
+    def search(self, query: str | Sequence[str], *, start: str | date | None = None,
+               end: str | date | None = None, publisher: str | None = None,
+               limit: int = 20, order: str = "recent", raw: bool = False) -> list[dict]:
+        """Articles matching `query` between start and end (inclusive days).
+
+        order="recent" sorts newest first, order="rank" by BM25 relevance.
+        `query` is a phrase (or list of phrases, any of which may match)
+        unless raw=True, in which case it is passed to FTS5 as is.
+        """
+        if order not in ("recent", "rank"):
+            raise ValueError(f"order must be 'recent' or 'rank', not {order!r}")
+        where, params = self._where(query, raw, start, end, publisher)
+        order_by = ("COALESCE(a.published_at, a.date) DESC" if order == "recent"
+                    else "bm25(articles_fts)")
+        sql = (f"SELECT {', '.join('a.' + c for c in _RESULT_COLUMNS)}"
+               f" FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+               f" WHERE {where} ORDER BY {order_by} LIMIT ?")
+        rows = self.con.execute(sql, (*params, int(limit))).fetchall()
+        return [dict(zip(_RESULT_COLUMNS, r)) for r in rows]
+
+    def count(self, query: str | Sequence[str], *, start: str | date | None = None,
+              end: str | date | None = None, publisher: str | None = None,
+              raw: bool = False) -> int:
+        where, params = self._where(query, raw, start, end, publisher)
+        sql = ("SELECT COUNT(*) FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+               f" WHERE {where}")
+        return self.con.execute(sql, params).fetchone()[0]
+
+    def latest_day(self) -> str | None:
+        return self.con.execute("SELECT MAX(date) FROM articles").fetchone()[0]
+
+    def info(self) -> dict:
+        n, lo, hi = self.con.execute("SELECT COUNT(*), MIN(date), MAX(date) FROM articles").fetchone()
+        return {"path": str(self.path), "articles": n, "first_day": lo, "last_day": hi,
+                "days": self.con.execute("SELECT COUNT(*) FROM days").fetchone()[0],
+                "mb": round(self.path.stat().st_size / 1e6, 1)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Sync / query the article full-text index")
+    ap.add_argument("--root", default="data/warehouse", help="warehouse (daily/ + columnar/)")
+    ap.add_argument("--index", default=str(DEFAULT_PATH))
+    ap.add_argument("--search", help="phrase to look up instead of syncing")
+    ap.add_argument("--raw", action="store_true", help="--search is FTS5 query syntax")
+    ap.add_argument("--since")
+    ap.add_argument("--until")
+    ap.add_argument("--publisher")
+    ap.add_argument("--limit", type=int, default=10)
+    ap.add_argument("--order", choices=("recent", "rank"), default="recent")
+    ap.add_argument("--info", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.search or args.info:
+        with ArticleIndex(args.index, readonly=True) as idx:
+            if args.info:
+                print(idx.info())
+            if args.search:
+                kw = dict(start=args.since, end=args.until, publisher=args.publisher,
+                          raw=args.raw)
+                print(f"{idx.count(args.search, **kw)} match(es)")
+                for r in idx.search(args.search, limit=args.limit, order=args.order, **kw):
+                    print(f"  {r['published_at'] or r['date']}  {r['publisher'] or '?':20.20s}  {r['title']}")
+        return 0
+    with ArticleIndex(args.index) as idx:
+        print(idx.sync(args.root))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -22,17 +22,23 @@ def cmd_ingest(args: argparse.Namespace) -> None:
     print(f"Saved newsapi data to {outfile}")
 
 def cmd_dedup(args: argparse.Namespace) -> None:
-    from .utils import load_jsonl, save_jsonl
-    from .dedup import dedup_rows
+    from .utils import load_jsonl
+    from .dedup import SeenSet, iter_dedup
+    from .jsonio import JsonlWriter
     iso = _resolve_date_arg(args.date)
     inpath = Path(args.indir) / f"{iso}.jsonl"
-    rows = list(load_jsonl(str(inpath)))
-    cleaned = dedup_rows(rows)
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
     out = outdir / f"{iso}.jsonl"
-    save_jsonl(str(out), cleaned)
-    print(f"[OK] {len(rows)} -> {len(cleaned)} -> {out}")
+    n_in = 0
+    def rows():
+        nonlocal n_in
+        for r in load_jsonl(str(inpath)):
+            n_in += 1
+            yield r
+    with JsonlWriter(out, atomic=True) as w, SeenSet(args.spill_after, args.spill_dir) as seen:
+        w.write_many(iter_dedup(rows(), seen))
+    print(f"[OK] {n_in} -> {w.count} -> {out}")
 
 def cmd_report(args: argparse.Namespace) -> None:
     from .report import write_report
@@ -40,11 +46,12 @@ def cmd_report(args: argparse.Namespace) -> None:
     write_report(iso, kind=args.kind, indir=args.indir, outdir=args.outdir, sample_limit=args.top)
 
 def cmd_ingest_hourly(args: argparse.Namespace) -> None:
-    ingest_newsapi_hourly(query=args.query, hours_split=args.hours_split, max_pages_per_window=args.max_pages, outroot=args.outroot, date=args.date)
+    ingest_newsapi_hourly(query=args.query, hours_split=args.hours_split, max_pages_per_window=args.max_pages, outroot=args.outroot, date=args.date,
+                          workers=args.workers, max_requests=args.max_requests, cache_dir=args.cache_dir)
 
 def cmd_aggregate(args: argparse.Namespace) -> None:
     from .aggregate import aggregate_windows
-    aggregate_windows(date=_resolve_date_arg(args.date), inroot=args.inroot, daily_outdir=args.daily_outdir, silver_outdir=args.silver_outdir)
+    aggregate_windows(date=_resolve_date_arg(args.date), inroot=args.inroot, daily_outdir=args.daily_outdir, silver_outdir=args.silver_outdir, spill_after=args.spill_after)
 
 def cmd_analyze_hourly(args: argparse.Namespace) -> None:
     from .analyze_hourly import analyze_hourly
@@ -54,13 +61,33 @@ def cmd_pipeline_day(args: argparse.Namespace) -> None:
     from .aggregate import aggregate_windows
     from .analyze_hourly import analyze_hourly
     d = _resolve_date_arg(args.date)
-    ingest_newsapi_hourly(query=args.query, hours_split=args.hours_split, date=d)
+    ingest_newsapi_hourly(query=args.query, hours_split=args.hours_split, date=d,
+                          workers=args.workers, max_requests=args.max_requests, cache_dir=args.cache_dir)
     aggregate_windows(date=d)
     analyze_hourly(date=d)
 
 def cmd_collect_live(args: argparse.Namespace) -> None:
     ingest_newsapi_recent(query=args.query, recent_minutes=args.recent_minutes, pages=args.pages, outdir=args.outdir)
 
+def cmd_collect_daemon(args: argparse.Namespace) -> None:
+    import signal
+    from .collect_daemon import CollectDaemon
+    from .newsapi import NewsAPIClient
+    signal.signal(signal.SIGTERM, signal.default_int_handler)  # stop like Ctrl-C: flush + save state
+    d = CollectDaemon(args.query or ["news"], args.outdir,
+                      client=NewsAPIClient(workers=1),
+                      interval=args.interval, lookback=timedelta(minutes=args.lookback_minutes),
+                      overlap=timedelta(minutes=args.overlap_minutes),
+                      shift=timedelta(minutes=args.shift_minutes), max_pages=args.max_pages,
+                      max_seen=args.max_seen, fsync_every=args.fsync_every)
+    stats = d.run(max_ticks=args.max_ticks)
+    print(f"[DAEMON] stopped: {stats}")
+
+def _add_newsapi_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--workers", type=int, default=4, help="NewsAPI windows fetched concurrently")
+    p.add_argument("--max-requests", type=int, default=None, help="NewsAPI request budget for the run")
+    p.add_argument("--cache-dir", default=None, help="on-disk NewsAPI response cache (re-runs spend no quota)")
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="newscli", description="News ingestion, processing, and reports (NewsAPI-only)")
     sub = p.add_subparsers(dest="command", required=True)
@@ -74,6 +101,8 @@ def build_parser() -> argparse.ArgumentParser:
     pd.add_argument("--date", default="today")
     pd.add_argument("--indir", default="data/raw_newsapi")
     pd.add_argument("--outdir", default="data/silver_newsapi")
+    pd.add_argument("--spill-after", type=int, default=None, help="move the seen-digest set to disk past N articles")
+    pd.add_argument("--spill-dir", default=None, help="temp dir for the spilled set (default: system temp)")
     pd.set_defaults(func=cmd_dedup)
 
     pr = sub.add_parser("report")
@@ -90,6 +119,7 @@ def build_parser() -> argparse.ArgumentParser:
     ph.add_argument("--outroot", default="data/raw_windows")
     ph.add_argument("--max-pages", type=int, default=8)
     ph.add_argument("--query", default="news")
+    _add_newsapi_args(ph)
     ph.set_defaults(func=cmd_ingest_hourly)
 
     pa = sub.add_parser("aggregate")
@@ -97,6 +127,7 @@ def build_parser() -> argparse.ArgumentParser:
     pa.add_argument("--inroot", default="data/raw_windows")
     pa.add_argument("--daily-outdir", default="data/raw_newsapi")
     pa.add_argument("--silver-outdir", default="data/silver_newsapi")
+    pa.add_argument("--spill-after", type=int, default=None, help="move the seen-digest set to disk past N articles")
     pa.set_defaults(func=cmd_aggregate)
 
     pan = sub.add_parser("analyze-hourly")
@@ -111,6 +142,7 @@ def build_parser() -> argparse.ArgumentParser:
     pp.add_argument("--date", default="yesterday")
     pp.add_argument("--hours-split", type=int, default=2)
     pp.add_argument("--query", default="news")
+    _add_newsapi_args(pp)
     pp.set_defaults(func=cmd_pipeline_day)
 
     pc = sub.add_parser("collect-live")
@@ -120,6 +152,19 @@ def build_parser() -> argparse.ArgumentParser:
     pc.add_argument("--outdir", default="data/live_newsapi")
     pc.set_defaults(func=cmd_collect_live)
 
+    pdm = sub.add_parser("collect-daemon", help="resident live collector (high-water mark + in-memory dedup)")
+    pdm.add_argument("--query", action="append", help="repeatable; default: news")
+    pdm.add_argument("--outdir", default="data/live_newsapi")
+    pdm.add_argument("--interval", type=float, default=300, help="seconds between ticks")
+    pdm.add_argument("--lookback-minutes", type=int, default=360, help="first tick / max window")
+    pdm.add_argument("--overlap-minutes", type=int, default=10, help="re-ask before the high-water mark (indexing lag)")
+    pdm.add_argument("--shift-minutes", type=int, default=0, help="collect up to now minus this (delayed API plans)")
+    pdm.add_argument("--max-pages", type=int, default=10)
+    pdm.add_argument("--max-seen", type=int, default=200_000, help="digests kept for in-memory dedup")
+    pdm.add_argument("--fsync-every", type=float, default=60, help="seconds between fsync + state save")
+    pdm.add_argument("--max-ticks", type=int, default=None)
+    pdm.set_defaults(func=cmd_collect_daemon)
+
     return p
 
 def main() -> int:
@@ -1,17 +1,90 @@
-from .utils import normalize_title, make_id
+from __future__ import annotations
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator
+from .utils import normalize_title, make_digest
 
-def dedup_rows(rows: list[dict]) -> list[dict]:
-    seen = set()
-    out = []
+SPILL_BATCH = 50_000
+
+
+class SeenSet:
+    """Set of fixed-width (20-byte sha1) digests.
+
+    Kept in memory as raw bytes rather than 40-char hex strings. With
+    max_items set, once that many digests are held they are moved to a
+    temporary SQLite table (under spill_dir) and later lookups check both,
+    so memory stays bounded however large the day is.
+    """
+
+    def __init__(self, max_items: int | None = None, spill_dir: str | Path | None = None):
+        self.max_items = max_items
+        self.spill_dir = spill_dir
+        self._mem: set[bytes] = set()
+        self._db: sqlite3.Connection | None = None
+        self._db_path: str | None = None
+        self.spilled = 0
+
+    def __len__(self) -> int:
+        return len(self._mem) + self.spilled
+
+    def add(self, digest: bytes) -> bool:
+        """Add digest; False if it was already present."""
+        if digest in self._mem:
+            return False
+        if self._db is not None and self._db.execute(
+                "SELECT 1 FROM seen WHERE d = ?", (digest,)).fetchone():
+            return False
+        self._mem.add(digest)
+        if self.max_items is not None and len(self._mem) >= self.max_items:
+            self._spill()
+        return True
+
+    def _spill(self) -> None:
+        if self._db is None:
+            fd, self._db_path = tempfile.mkstemp(prefix="dedup_seen_", suffix=".sqlite",
+                                                 dir=self.spill_dir)
+            os.close(fd)
+            self._db = sqlite3.connect(self._db_path)
+            self._db.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;"
+                                   "CREATE TABLE seen (d BLOB PRIMARY KEY) WITHOUT ROWID;")
+        items = list(self._mem)
+        with self._db:
+            for i in range(0, len(items), SPILL_BATCH):
+                self._db.executemany("INSERT INTO seen VALUES (?)",
+                                     ((d,) for d in items[i:i + SPILL_BATCH]))
+        self.spilled += len(items)
+        self._mem.clear()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            os.unlink(self._db_path)
+            self._db = None
+        self._mem.clear()
+
+    def __enter__(self) -> "SeenSet":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_dedup(rows: Iterable[dict], seen: SeenSet | None = None) -> Iterator[dict]:
+    """Streaming dedup_rows: yields first occurrences, annotated, as they arrive."""
+    seen = SeenSet() if seen is None else seen
     for r in rows:
         publisher = r.get("publisher") or ""
         title_norm = normalize_title(r.get("title") or "")
         date_key = (r.get("published_at") or "")[:10]
-        aid = make_id(publisher, title_norm, date_key)
-        if aid in seen:
+        digest = make_digest(publisher, title_norm, date_key)
+        if not seen.add(digest):
             continue
-        seen.add(aid)
         r["title_norm"] = title_norm
-        r["article_id"] = aid
-        out.append(r)
-    return out
+        r["article_id"] = digest.hex()
+        yield r
+
+
+def dedup_rows(rows: list[dict]) -> list[dict]:
+    return list(iter_dedup(rows))
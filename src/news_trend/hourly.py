@@ -1,17 +1,13 @@
 from __future__ import annotations
-import os, json, time
 from pathlib import Path
 from typing import Optional
-import requests
 from datetime import datetime, date as ddate, time as dtime, timedelta, timezone
 from dotenv import load_dotenv
+from .jsonio import JsonlWriter
+from .newsapi import NewsAPIClient, article_row, iso_utc, windows
 
 load_dotenv()
 
-API_KEY = os.getenv("NEWSAPI_KEY")
-BASE_URL = "https://newsapi.org/v2/everything"
-PAGE_SIZE = 100
-
 def _parse_date_arg(d: Optional[str]) -> ddate:
     t = datetime.now(timezone.utc).date()
     if not d or d.lower() == "today":
@@ -20,78 +16,37 @@ def _parse_date_arg(d: Optional[str]) -> ddate:
         return t - timedelta(days=1)
     return ddate.fromisoformat(d)
 
-def _iso_utc(dt: datetime) -> str:
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
-
 def ingest_newsapi_hourly(
     query: Optional[str] = None,
     hours_split: int = 2,
     max_pages_per_window: int = 8,
     outroot: str = "data/raw_windows",
     date: Optional[str] = None,
-    pause: float = 0.25,
+    workers: int = 4,
+    max_requests: Optional[int] = None,
+    cache_dir: Optional[str] = None,
 ) -> Path:
-    assert API_KEY, "NEWSAPI_KEY is missing"
     day = _parse_date_arg(date)
     start = datetime.combine(day, dtime(0, 0, 0, tzinfo=timezone.utc))
-    end = start + timedelta(days=1)
-    delta = timedelta(hours=hours_split)
+    wins = windows(start, start + timedelta(days=1), timedelta(hours=hours_split))
     outdir = Path(outroot) / day.isoformat()
-    outdir.mkdir(parents=True, exist_ok=True)
-    index_path = outdir / "_index.jsonl"
+    with NewsAPIClient(workers=workers, max_requests=max_requests, cache_dir=cache_dir) as api:
+        results = api.fetch_windows(wins, (query or "news").strip(), max_pages_per_window)
     written = 0
-    with index_path.open("w", encoding="utf-8") as idx:
-        w = start
-        while w < end:
-            w2 = min(w + delta, end)
-            fname = f"{w.strftime('%H-%M')}__{w2.strftime('%H-%M')}.jsonl"
-            fpath = outdir / fname
-            n = 0
-            with fpath.open("w", encoding="utf-8") as f:
-                for page in range(1, max_pages_per_window + 1):
-                    params = {
-                        "from": _iso_utc(w),
-                        "to": _iso_utc(w2),
-                        "pageSize": PAGE_SIZE,
-                        "page": page,
-                        "apiKey": API_KEY,
-                        "language": "en",
-                        "sortBy": "publishedAt",
-                        "q": (query or "news").strip(),
-                    }
-                    r = requests.get(BASE_URL, params=params, timeout=40)
-                    try:
-                        r.raise_for_status()
-                    except requests.HTTPError:
-                        break
-                    data = r.json() or {}
-                    arts = data.get("articles") or []
-                    if not arts:
-                        break
-                    for a in arts:
-                        f.write(json.dumps({
-                            "article_id": f"newsapi:{a.get('url')}",
-                            "title": a.get("title"),
-                            "url": a.get("url"),
-                            "publisher": (a.get("source") or {}).get("name"),
-                            "published_at": a.get("publishedAt"),
-                            "description": a.get("description"),
-                            "content": a.get("content"),
-                            "raw_source": "newsapi",
-                        }, ensure_ascii=False) + "\n")
-                        n += 1
-                    if len(arts) < PAGE_SIZE:
-                        break
-                    time.sleep(pause)
-            idx.write(json.dumps({
+    with JsonlWriter(outdir / "_index.jsonl") as idx:
+        for (w, w2), arts in zip(wins, results):
+            fpath = outdir / f"{w.strftime('%H-%M')}__{w2.strftime('%H-%M')}.jsonl"
+            with JsonlWriter(fpath) as f:
+                f.write_many(article_row(a) for a in arts)
+            idx.write({
                 "window_start": w.isoformat(),
                 "window_end": w2.isoformat(),
-                "rows": n,
+                "rows": len(arts),
                 "path": str(fpath)
-            }) + "\n")
-            written += n
-            w = w2
-    print(f"[OK] hourly ingest -> {outdir} ({written} rows)")
+            })
+            written += len(arts)
+    print(f"[OK] hourly ingest -> {outdir} ({written} rows, {api.requests_used} requests, "
+          f"{api.cache_hits} cached)")
     return outdir
 
 def ingest_newsapi_recent(
@@ -99,51 +54,13 @@ def ingest_newsapi_recent(
     recent_minutes: int = 30,
     pages: int = 3,
     outdir: str = "data/live_newsapi",
-    pause: float = 0.2,
 ) -> Path:
-    assert API_KEY, "NEWSAPI_KEY is missing"
     now = datetime.now(timezone.utc)
     start = now - timedelta(minutes=recent_minutes)
     outp = Path(outdir) / now.strftime("%Y-%m-%d")
-    outp.mkdir(parents=True, exist_ok=True)
-    fname = now.strftime("%Y-%m-%dT%H-%MZ") + ".jsonl"
-    fpath = outp / fname
-    rows = 0
-    with fpath.open("w", encoding="utf-8") as f:
-        for page in range(1, int(pages) + 1):
-            params = {
-                "from": _iso_utc(start),
-                "to": _iso_utc(now),
-                "pageSize": PAGE_SIZE,
-                "page": page,
-                "apiKey": API_KEY,
-                "language": "en",
-                "sortBy": "publishedAt",
-                "q": (query or "news").strip(),
-            }
-            r = requests.get(BASE_URL, params=params, timeout=40)
-            try:
-                r.raise_for_status()
-            except requests.HTTPError:
-                break
-            data = r.json() or {}
-            arts = data.get("articles") or []
-            if not arts:
-                break
-            for a in arts:
-                f.write(json.dumps({
-                    "article_id": f"newsapi:{a.get('url')}",
-                    "title": a.get("title"),
-                    "url": a.get("url"),
-                    "publisher": (a.get("source") or {}).get("name"),
-                    "published_at": a.get("publishedAt"),
-                    "description": a.get("description"),
-                    "content": a.get("content"),
-                    "raw_source": "newsapi",
-                }, ensure_ascii=False) + "\n")
-                rows += 1
-            if len(arts) < PAGE_SIZE:
-                break
-            time.sleep(pause)
-    print(f"[LIVE] NewsAPI -> {fpath} ({rows} rows)")
+    fpath = outp / (now.strftime("%Y-%m-%dT%H-%MZ") + ".jsonl")
+    with NewsAPIClient(workers=1) as api, JsonlWriter(fpath) as f:
+        for arts in api.iter_pages((query or "news").strip(), iso_utc(start), iso_utc(now), int(pages)):
+            f.write_many(article_row(a) for a in arts)
+    print(f"[LIVE] NewsAPI -> {fpath} ({f.count} rows)")
     return fpath
@@ -1,11 +1,7 @@
-import os, json, time
 from pathlib import Path
-import requests
 from datetime import datetime, date as ddate, time as dtime, timedelta, timezone
-
-API_KEY = os.getenv("NEWSAPI_KEY")
-BASE_URL = "https://newsapi.org/v2/everything"
-PAGE_SIZE = 100
+from .jsonio import JsonlWriter
+from .newsapi import NewsAPIClient, article_row, windows
 
 def parse_date(d: str | None) -> ddate:
     t = datetime.now(timezone.utc).date()
@@ -15,72 +11,25 @@ def parse_date(d: str | None) -> ddate:
         return t - timedelta(days=1)
     return ddate.fromisoformat(d)
 
-def iso_utc(dt: datetime) -> str:
-    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
-
 def fetch_newsapi(
     query: str | None = None,
     hours_split: int = 2,
     max_pages_per_window: int = 8,
     outdir: str = "data/raw",
     date: str | None = None,
-    pause: float = 0.25,
+    workers: int = 4,
+    max_requests: int | None = None,
+    cache_dir: str | None = None,
 ) -> Path:
-    if not API_KEY:
-        raise RuntimeError("NEWSAPI_KEY is missing")
     target_day = parse_date(date)
     start = datetime.combine(target_day, dtime(0, 0, 0, tzinfo=timezone.utc))
-    end = start + timedelta(days=1)
-    delta = timedelta(hours=hours_split)
-
-    outdir_p = Path(outdir)
-    outdir_p.mkdir(parents=True, exist_ok=True)
-    outfile = outdir_p / f"newsapi_{target_day.isoformat()}.jsonl"
+    wins = windows(start, start + timedelta(days=1), timedelta(hours=hours_split))
+    outfile = Path(outdir) / f"newsapi_{target_day.isoformat()}.jsonl"
 
-    rows = 0
-    with outfile.open("w", encoding="utf-8") as f:
-        w = start
-        while w < end:
-            w2 = min(w + delta, end)
-            for page in range(1, max_pages_per_window + 1):
-                params = {
-                    "from": iso_utc(w),
-                    "to": iso_utc(w2),
-                    "pageSize": PAGE_SIZE,
-                    "page": page,
-                    "apiKey": API_KEY,
-                    "language": "en",
-                    "sortBy": "publishedAt",
-                    "q": (query or "news"),
-                }
-                r = requests.get(BASE_URL, params=params, timeout=40)
-                if not r.ok:
-                    break
-                data = r.json() or {}
-                arts = data.get("articles") or []
-                if not arts:
-                    break
-                for a in arts:
-                    f.write(
-                        json.dumps(
-                            {
-                                "article_id": f"newsapi:{a.get('url')}",
-                                "title": a.get("title"),
-                                "url": a.get("url"),
-                                "publisher": (a.get("source") or {}).get("name"),
-                                "published_at": a.get("publishedAt"),
-                                "description": a.get("description"),
-                                "content": a.get("content"),
-                                "raw_source": "newsapi",
-                            },
-                            ensure_ascii=False,
-                        )
-                        + "\n"
-                    )
-                    rows += 1
-                if len(arts) < PAGE_SIZE:
-                    break
-                time.sleep(pause)
-            w = w2
-    print(f"[OK] NewsAPI -> {outfile} ({rows} rows)")
+    with NewsAPIClient(workers=workers, max_requests=max_requests, cache_dir=cache_dir) as api:
+        results = api.fetch_windows(wins, query or "news", max_pages_per_window)
+    with JsonlWriter(outfile) as f:
+        for arts in results:
+            f.write_many(article_row(a) for a in arts)
+    print(f"[OK] NewsAPI -> {outfile} ({f.count} rows)")
     return outfile
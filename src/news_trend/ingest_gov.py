@@ -1,11 +1,13 @@
 from __future__ import annotations
-import json, time, hashlib, argparse
+import time, hashlib, argparse
 from pathlib import Path
 from datetime import datetime, timezone
 
 import feedparser
 import trafilatura
 
+from .jsonio import write_jsonl
+
 GOV_FEEDS = [
     "https://www.whitehouse.gov/briefing-room/feed/",
     "https://www.justice.gov/opa/press-releases.xml",
@@ -31,9 +33,7 @@ def _extract(url: str) -> str | None:
         return None
 
 def save_jsonl(path: str | Path, rows: list[dict]):
-    p = Path(path); p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        for r in rows: f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    write_jsonl(path, rows)
 
 def fetch_gov(max_items_per_feed: int = 100, extract_body: bool = True, delay: float = 0.2) -> list[dict]:
     rows: list[dict] = []
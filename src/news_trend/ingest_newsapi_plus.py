@@ -1,12 +1,9 @@
-import os
 import argparse
-import requests
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
-NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
-BASE_URL = "https://newsapi.org/v2/everything"
+from .jsonio import JsonlWriter
+from .newsapi import NewsAPIClient
 
 
 def fetch_news(query="*", from_date=None, to_date=None, page=1, page_size=100, language="en"):
@@ -19,48 +16,34 @@ def fetch_news(query="*", from_date=None, to_date=None, page=1, page_size=100, l
         "page": page,
         "pageSize": page_size,
         "language": language,
-        "apiKey": NEWSAPI_KEY,
     }
-    resp = requests.get(BASE_URL, params=params)
-    resp.raise_for_status()
-    return resp.json()
+    with NewsAPIClient(workers=1) as api:
+        return api.get_page(params)
 
 
-def ingest_newsapi(date, outdir="data/raw_newsapi", max_requests=90, time_split=1):
+def ingest_newsapi(date, outdir="data/raw_newsapi", max_requests=90, time_split=1,
+                   workers=4, cache_dir=None):
     """Ingest news articles from NewsAPI with optional time split"""
-    Path(outdir).mkdir(parents=True, exist_ok=True)
     outpath = Path(outdir) / f"{date}.jsonl"
 
     start_date = datetime.strptime(date, "%Y-%m-%d")
     end_date = start_date + timedelta(days=1)
 
     delta = (end_date - start_date) / time_split
-    intervals = [(start_date + i * delta, start_date + (i + 1) * delta) for i in range(time_split)]
+    intervals = [((start_date + i * delta).strftime("%Y-%m-%dT%H:%M:%S"),
+                  (start_date + (i + 1) * delta).strftime("%Y-%m-%dT%H:%M:%S"))
+                 for i in range(time_split)]
 
-    total_saved, requests_used = 0, 0
-    with open(outpath, "w", encoding="utf-8") as f:
-        for interval_start, interval_end in intervals:
-            from_date = interval_start.strftime("%Y-%m-%dT%H:%M:%S")
-            to_date = interval_end.strftime("%Y-%m-%dT%H:%M:%S")
+    # pages run until a short page (NewsAPI only allows up to 100 results per
+    # query) or until the shared request budget is spent
+    with NewsAPIClient(workers=workers, max_requests=max_requests, cache_dir=cache_dir) as api:
+        results = api.fetch_windows(intervals, "*", max_pages=max_requests)
+    with JsonlWriter(outpath) as f:
+        for articles in results:
+            f.write_many(articles)
 
-            page = 1
-            while requests_used < max_requests:
-                data = fetch_news(from_date=from_date, to_date=to_date, page=page)
-                articles = data.get("articles", [])
-                if not articles:
-                    break
-                for a in articles:
-                    f.write(json.dumps(a, ensure_ascii=False) + "\n")
-                total_saved += len(articles)
-                requests_used += 1
-                page += 1
-
-                # NewsAPI only allows up to 100 results per query
-                if len(articles) < 100:
-                    break
-
-    print(f"✅ Saved {total_saved} articles into {outpath}")
-    print(f"Requests used: {requests_used}/{max_requests}")
+    print(f"✅ Saved {f.count} articles into {outpath}")
+    print(f"Requests used: {api.requests_used}/{max_requests} ({api.cache_hits} cached)")
 
 
 if __name__ == "__main__":
@@ -69,6 +52,9 @@ if __name__ == "__main__":
     parser.add_argument("--outdir", type=str, default="data/raw_newsapi")
     parser.add_argument("--max-requests", type=int, default=90)
     parser.add_argument("--time-split", type=int, default=1, help="Number of splits per day (e.g. 4 → 6h chunks)")
+    parser.add_argument("--workers", type=int, default=4, help="windows fetched concurrently")
+    parser.add_argument("--cache-dir", default=None, help="on-disk response cache (re-runs spend no quota)")
     args = parser.parse_args()
 
-    ingest_newsapi(args.date, args.outdir, args.max_requests, args.time_split)
+    ingest_newsapi(args.date, args.outdir, args.max_requests, args.time_split,
+                   args.workers, args.cache_dir)
@@ -0,0 +1,221 @@
+"""Fast JSON / JSONL I/O shared by the package and scripts/.
+
+Uses orjson when it is installed (it is in requirements.txt) and falls back
+to the stdlib json module otherwise. Both paths write UTF-8 (non-ASCII kept as is)
+with compact separators unless indent is given. orjson writes NaN/Infinity
+as null. Files that stdlib json wrote with NaN still load, through the
+stdlib fallback. Paths ending in .gz or .zst are (de)compressed transparently.
+.zst needs Python 3.14's compression.zstd or the zstandard package.
+
+    from news_trend.jsonio import load_json, dump_json, iter_jsonl, write_jsonl
+    # scripts/: from jsonio import ...   (shim that puts src/ on sys.path)
+
+    doc = load_json(DATA / "prices.json")
+    dump_json(DATA / "signal_corr.json", doc)               # atomic, compact
+    for row in iter_jsonl("data/warehouse/daily/2026-08-01.jsonl.gz"): ...
+    write_jsonl(path, rows, append=True)                    # buffered bulk write
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as _zstd
+    except ImportError:
+        _zstd = None
+
+__all__ = [
+    "HAVE_ORJSON", "loads", "dumps", "dumpb", "load_json", "dump_json",
+    "iter_jsonl", "read_jsonl", "write_jsonl", "JsonlWriter", "open_binary",
+]
+
+HAVE_ORJSON = orjson is not None
+FLUSH_BYTES = 1 << 20  # JsonlWriter buffer size
+
+_MISSING = object()
+
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _DecodeError = orjson.JSONDecodeError
+else:
+    _DecodeError = json.JSONDecodeError
+
+
+# ── text ────────────────────────────────────────────────────────────────
+def loads(s: bytes | bytearray | str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except _DecodeError:
+            pass  # NaN/Infinity written by stdlib json — let it decide
+    return json.loads(s)
+
+
+def dumpb(obj: Any, *, indent: int | None = None, sort_keys: bool = False,
+          default=None) -> bytes:
+    """Serialize to UTF-8 bytes. orjson only indents by 2; any indent maps to it."""
+    if orjson is not None:
+        opts = _OPTS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        if sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=opts)
+        except TypeError:
+            pass  # >64-bit ints, mixed-type keys with sort_keys, ... — stdlib handles them
+    return json.dumps(obj, ensure_ascii=False, indent=indent, sort_keys=sort_keys,
+                      default=default,
+                      separators=None if indent else (",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any, **kw) -> str:
+    return dumpb(obj, **kw).decode("utf-8")
+
+
+# ── files ───────────────────────────────────────────────────────────────
+def _codec(path: str | Path) -> str | None:
+    p = str(path)
+    return "gz" if p.endswith(".gz") else "zst" if p.endswith(".zst") else None
+
+
+def _open(path: str | Path, mode: str, codec: str | None):
+    if codec == "gz":
+        return gzip.open(path, mode, compresslevel=6)
+    if codec == "zst":
+        if _zstd is None:
+            raise RuntimeError(f"{path}: zstd needs Python 3.14+ or `pip install zstandard`")
+        return _zstd.open(path, mode)
+    return open(path, mode)
+
+
+def open_binary(path: str | Path, mode: str = "rb"):
+    """open() in binary mode, (de)compressing by suffix (.gz, .zst)."""
+    return _open(path, mode, _codec(path))
+
+
+def load_json(path: str | Path, default: Any = _MISSING) -> Any:
+    """Parse a whole JSON file. With `default`, a missing file returns it instead of raising."""
+    try:
+        with open_binary(path) as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        if default is _MISSING:
+            raise
+        return default
+
+
+def dump_json(path: str | Path, obj: Any, *, indent: int | None = None,
+              sort_keys: bool = False, default=None, atomic: bool = True) -> int:
+    """Write obj to path (parents created). Atomic: readers never see a half file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = dumpb(obj, indent=indent, sort_keys=sort_keys, default=default)
+    if indent:
+        data += b"\n"
+    tmp = path.with_name(f".{path.name}.tmp") if atomic else path
+    with _open(tmp, "wb", _codec(path)) as f:
+        f.write(data)
+    if atomic:
+        os.replace(tmp, path)
+    return len(data)
+
+
+def iter_jsonl(path: str | Path, *, strict: bool = False) -> Iterator[Any]:
+    """Stream rows of a .jsonl[.gz|.zst] file; blank lines are skipped, bad lines too unless strict."""
+    with open_binary(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield loads(line)
+            except ValueError:
+                if strict:
+                    raise
+
+
+def read_jsonl(path: str | Path, *, strict: bool = False) -> list:
+    return list(iter_jsonl(path, strict=strict))
+
+
+class JsonlWriter:
+    """Buffered JSONL writer: rows are serialized into ~1 MiB blocks before hitting the file.
+
+    atomic=True writes to a temp file that replaces path on a clean close
+    (and is removed if the with-block raises), so path may also be the file
+    being streamed from.
+    """
+
+    def __init__(self, path: str | Path, *, append: bool = False, sort_keys: bool = False,
+                 default=None, atomic: bool = False):
+        if atomic and append:
+            raise ValueError("atomic and append are exclusive")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = self.path.with_name(f".{self.path.name}.tmp") if atomic else None
+        self._f = _open(self._tmp or self.path, "ab" if append else "wb", _codec(self.path))
+        self._buf: list[bytes] = []
+        self._size = 0
+        self._kw = {"sort_keys": sort_keys, "default": default}
+        self.count = 0
+
+    def write(self, row: Any) -> None:
+        b = dumpb(row, **self._kw)
+        self._buf.append(b)
+        self._size += len(b) + 1
+        self.count += 1
+        if self._size >= FLUSH_BYTES:
+            self.flush()
+
+    def write_many(self, rows: Iterable[Any]) -> int:
+        n = self.count
+        for r in rows:
+            self.write(r)
+        return self.count - n
+
+    def flush(self) -> None:
+        if self._buf:
+            self._buf.append(b"")
+            self._f.write(b"\n".join(self._buf))
+            self._buf.clear()
+            self._size = 0
+        self._f.flush()
+
+    def sync(self) -> None:
+        """flush() and fsync, for long-lived appenders that must survive a crash."""
+        self.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+        if self._tmp is not None:
+            os.replace(self._tmp, self.path)
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is not None and self._tmp is not None:
+            self._f.close()
+            self._tmp.unlink(missing_ok=True)
+            return
+        self.close()
+
+
+def write_jsonl(path: str | Path, rows: Iterable[Any], *, append: bool = False, **kw) -> int:
+    """Write (or append) rows as JSONL; returns the number written."""
+    with JsonlWriter(path, append=append, **kw) as w:
+        return w.write_many(rows)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 import argparse, re
 from pathlib import Path
-from datetime import datetime, timezone, date as ddate, time as dtime
+from datetime import datetime, timedelta, timezone, date as ddate, time as dtime
 import pandas as pd
+from .warehouse import Warehouse
 
 LIVE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}T\d{2}-\d{2})Z\.jsonl$")
 DAILY_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\.jsonl$")
@@ -54,6 +55,11 @@ def read_jsonl(paths: list[Path]) -> pd.DataFrame:
         return pd.DataFrame()
     return pd.concat(dfs, ignore_index=True)
 
+def read_warehouse(root: str, since: datetime | None, until: datetime | None, columns: list[str] | None) -> pd.DataFrame:
+    # date partitions + column pruning instead of parsing whole daily files
+    end = (until - timedelta(microseconds=1)).date() if until else None
+    return Warehouse(root).frame(since.date() if since else None, end, columns)
+
 def dedup_df(df: pd.DataFrame, key: str | None = None) -> pd.DataFrame:
     if df.empty:
         return df
@@ -80,6 +86,8 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--roots", default="data/live_newsapi,data/raw_newsapi,data/silver_newsapi")
     ap.add_argument("--pattern", default="*.jsonl")
+    ap.add_argument("--warehouse", help="read data/warehouse's date partitions instead of --roots")
+    ap.add_argument("--columns", default="", help="with --warehouse: comma-separated columns to load")
     ap.add_argument("--since")
     ap.add_argument("--until")
     ap.add_argument("--limit", type=int)
@@ -92,14 +100,19 @@ def main():
     roots = [s.strip() for s in args.roots.split(",") if s.strip()]
     since = parse_dt(args.since)
     until = parse_dt(args.until)
-    paths = discover_files(roots, args.pattern, since, until, args.limit)
-    df = read_jsonl(paths)
+    if args.warehouse:
+        cols = [c.strip() for c in args.columns.split(",") if c.strip()] or None
+        paths = []
+        df = read_warehouse(args.warehouse, since, until, cols)
+    else:
+        paths = discover_files(roots, args.pattern, since, until, args.limit)
+        df = read_jsonl(paths)
     if not args.no_dedup:
         df = dedup_df(df, key=(args.dedup_key or None))
 
     print(f"files={len(paths)} rows={len(df)}")
     if "publisher" in df.columns:
-        vc = df["publisher"].fillna("").value_counts().head(args.top)
+        vc = df["publisher"].astype("string").fillna("").value_counts().head(args.top)
         print("\nTop publishers:")
         for k, v in vc.items():
             print(f"{k}\t{v}")
@@ -1,8 +1,9 @@
 from __future__ import annotations
-import json, hashlib, argparse
+import hashlib, argparse
 from pathlib import Path
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 from datetime import datetime, timezone, timedelta
+from .jsonio import dumpb, iter_jsonl, write_jsonl
 
 TRACKING_PARAMS = {
     "utm_source","utm_medium","utm_campaign","utm_term","utm_content",
@@ -22,17 +23,10 @@ def _resolve_date(s: str) -> str:
     return s  # assume YYYY-MM-DD
 
 def load_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
+    return iter_jsonl(path, strict=True)
 
 def save_jsonl(path: Path, rows: list[dict]):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    write_jsonl(path, rows)
 
 def normalize_url(u: str | None) -> str | None:
     if not u: return None
@@ -68,7 +62,7 @@ def dedupe_rows(rows: list[dict], key_mode: str = "url") -> list[dict]:
             k = url or title
         if not k:
             # fallback hash on entire record to avoid dropping everything
-            k = "rec:" + hashlib.sha1(json.dumps(r, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+            k = "rec:" + hashlib.sha1(dumpb(r, sort_keys=True)).hexdigest()
         h = hashlib.sha1(k.encode()).hexdigest()
         if h in seen:
             continue
@@ -85,6 +79,11 @@ def main():
     ap.add_argument("--out-kind", default="silver_newsapi", help="subfolder under --outdir for output")
     ap.add_argument("--key-mode", choices=["url","title","url_or_title"], default="url",
                     help="how to compute the dedup key")
+    ap.add_argument("--near-dup", choices=["annotate","collapse","off"], default="annotate",
+                    help="MinHash/LSH story clusters: tag rows with cluster_id, or keep one row per cluster")
+    ap.add_argument("--near-dup-threshold", type=float, default=0.6, help="min estimated Jaccard")
+    ap.add_argument("--near-dup-lookback", type=int, default=3,
+                    help="days of earlier clusters a story can join (persistent cluster ids)")
     args = ap.parse_args()
 
     d = _resolve_date(args.date)
@@ -95,6 +94,23 @@ def main():
     kept = dedupe_rows(rows, key_mode=args.key_mode)
 
     out = Path(args.outdir) / args.out_kind / f"{d}.jsonl"
+    n_exact = len(kept)
+    if args.near_dup != "off":
+        try:
+            from .neardup import NearDupIndex, representatives
+        except ImportError:  # numpy isn't a package dependency
+            print("[WARN] near-dup skipped: numpy not installed")
+            args.near_dup = "off"
+    if args.near_dup != "off":
+        state = out.parent / "_neardup"
+        idx = NearDupIndex.load(state, d, lookback=args.near_dup_lookback,
+                                threshold=args.near_dup_threshold)
+        kept = idx.assign(kept)
+        idx.save(state, d)
+        n_clusters = sum(1 for r in kept if r["cluster_rep"])
+        if args.near_dup == "collapse":
+            kept = representatives(kept)
+        print(f"[OK] near-dup: {n_exact} rows -> {n_clusters} story clusters")
     save_jsonl(out, kept)
     print(f"[OK] dedup -> {out} (input={len(rows)} kept={len(kept)} removed={len(rows)-len(kept)})")
 
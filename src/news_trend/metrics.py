@@ -1,13 +1,9 @@
 from pathlib import Path
-import json
 import pandas as pd
+from .jsonio import iter_jsonl
 
 def _load_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
+    return iter_jsonl(path, strict=True)
 
 def _append_dedupe_csv(csv_path: Path, df_new: pd.DataFrame, keys, sort_cols=None, sort_ascending=True):
     if csv_path.exists():
@@ -0,0 +1,174 @@
+"""MinHash / LSH near-duplicate clustering for syndicated stories.
+
+Exact-key dedup (make_silver.dedupe_rows, dedup.dedup_rows) keeps a wire
+story once per outlet that republished it with a slightly edited headline.
+This groups such rows into clusters:
+
+  - signature: MinHash over word 3-shingles of title + description
+    (NFKC, lowercased, trailing " - Reuters"-style suffix dropped),
+    NUM_PERM 32-bit minima
+  - candidates: LSH with BANDS bands of NUM_PERM/BANDS rows each
+  - match: estimated Jaccard against the cluster's representative (its
+    first member, never updated, so clusters don't drift) >= threshold
+
+Cluster ids are persistent: each day's clusters (id + representative
+signature) are saved under the silver dir's _neardup/<day>.npz, and the
+next days' runs load `lookback` days of them, so a story that keeps being
+republished keeps its id.
+
+    idx = NearDupIndex.load(state_dir, "2026-08-01", lookback=3)
+    rows = idx.assign(rows)    # adds cluster_id, cluster_size, cluster_rep
+    idx.save(state_dir, "2026-08-01")
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from .utils import normalize_title
+
+__all__ = ["NUM_PERM", "BANDS", "THRESHOLD", "LOOKBACK_DAYS", "NearDupIndex",
+           "cluster_id_for", "representatives", "shingles"]
+
+NUM_PERM = 128
+BANDS = 32          # 4 rows/band: LSH threshold ≈ (1/32)^(1/4) ≈ 0.42, P(candidate | J=0.6) ≈ 0.99
+SHINGLE = 3
+THRESHOLD = 0.6
+LOOKBACK_DAYS = 3
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX32 = np.uint64(0xFFFFFFFF)
+_WORD_RE = re.compile(r"\w+")
+_SUFFIX_RE = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,40}$")  # " - Reuters", " | CNBC"
+
+
+def _key(r: dict) -> str:
+    return (r.get("url") or "").strip() or normalize_title(r.get("title") or "")
+
+
+def cluster_id_for(r: dict) -> str:
+    """Id of a cluster whose representative is `r` (stable across runs)."""
+    return "nd:" + hashlib.sha1(_key(r).encode("utf-8")).hexdigest()[:16]
+
+
+def shingles(title: str | None, description: str | None = None, k: int = SHINGLE) -> set[int]:
+    t = _SUFFIX_RE.sub("", unicodedata.normalize("NFKC", title or "").strip())
+    words = _WORD_RE.findall((t + " " + unicodedata.normalize("NFKC", description or "")).lower())
+    if not words:
+        return set()
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) for i in range(len(words) - k + 1)}
+
+
+class NearDupIndex:
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS,
+                 threshold: float = THRESHOLD, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm, self.bands, self.threshold = num_perm, bands, threshold
+        self.rows_per_band = num_perm // bands
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)[:, None]
+        self._buckets: dict[tuple[int, bytes], list[str]] = {}
+        self._reps: dict[str, np.ndarray] = {}   # cluster id -> representative signature
+        self._seen_today: dict[str, np.ndarray] = {}
+
+    # ── signatures ──────────────────────────────────────────────────────
+    def signature(self, sh: set[int]) -> np.ndarray | None:
+        if not sh:
+            return None
+        hv = np.fromiter(sh, dtype=np.uint64, count=len(sh))[None, :]
+        with np.errstate(over="ignore"):  # uint64 wraparound is part of the hash
+            return (((self._a * hv + self._b) % _MERSENNE) & _MAX32).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray):
+        r = self.rows_per_band
+        return [(i, sig[i * r:(i + 1) * r].tobytes()) for i in range(self.bands)]
+
+    # ── index ───────────────────────────────────────────────────────────
+    def add(self, cid: str, sig: np.ndarray) -> None:
+        if cid in self._reps:
+            return
+        self._reps[cid] = sig
+        for bk in self._band_keys(sig):
+            self._buckets.setdefault(bk, []).append(cid)
+
+    def query(self, sig: np.ndarray) -> str | None:
+        """Best-matching cluster id (estimated Jaccard >= threshold), if any."""
+        cands = {cid for bk in self._band_keys(sig) for cid in self._buckets.get(bk, ())}
+        best, best_j = None, self.threshold
+        for cid in cands:
+            j = float(np.count_nonzero(self._reps[cid] == sig)) / self.num_perm
+            if j >= best_j:
+                best, best_j = cid, j
+        return best
+
+    def assign(self, rows: Iterable[dict]) -> list[dict]:
+        """Annotate rows in place with cluster_id / cluster_size / cluster_rep.
+
+        cluster_rep marks the first member of each cluster in `rows`;
+        cluster_size counts the cluster's members in `rows`.
+        """
+        out = list(rows)
+        sizes: dict[str, int] = {}
+        for r in out:
+            sig = self.signature(shingles(r.get("title"), r.get("description")))
+            cid = self.query(sig) if sig is not None else None
+            if cid is None:
+                cid = cluster_id_for(r)
+                if sig is not None:
+                    self.add(cid, sig)
+            if sig is not None:
+                self._seen_today[cid] = self._reps.get(cid, sig)
+            r["cluster_id"] = cid
+            r["cluster_rep"] = cid not in sizes
+            sizes[cid] = sizes.get(cid, 0) + 1
+        for r in out:
+            r["cluster_size"] = sizes[r["cluster_id"]]
+        return out
+
+    # ── persistence ─────────────────────────────────────────────────────
+    @classmethod
+    def load(cls, state_dir: str | Path, day: str, lookback: int = LOOKBACK_DAYS,
+             **kw) -> "NearDupIndex":
+        """Index seeded with clusters seen in the `lookback` days before `day`."""
+        idx = cls(**kw)
+        d0 = date.fromisoformat(day)
+        for i in range(lookback, 0, -1):
+            p = Path(state_dir) / f"{(d0 - timedelta(days=i)).isoformat()}.npz"
+            if not p.exists():
+                continue
+            with np.load(p) as z:
+                if z["hash"].tolist() != [idx.num_perm, idx.seed]:
+                    continue  # other hash family — signatures aren't comparable
+                for cid, sig in zip(z["ids"].tolist(), z["sigs"]):
+                    idx.add(cid, sig)
+        return idx
+
+    def save(self, state_dir: str | Path, day: str) -> Path:
+        """Persist the clusters seen by assign() (id + representative signature)."""
+        p = Path(state_dir) / f"{day}.npz"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        ids = sorted(self._seen_today)
+        sigs = (np.stack([self._seen_today[c] for c in ids]) if ids
+                else np.zeros((0, self.num_perm), dtype=np.uint32))
+        tmp = p.with_name(f".{p.stem}.tmp.npz")
+        np.savez_compressed(tmp, ids=np.array(ids, dtype=str), sigs=sigs,
+                            hash=np.array([self.num_perm, self.seed]))
+        tmp.replace(p)
+        return p
+
+
+def representatives(rows: Iterable[dict]) -> list[dict]:
+    """One row per cluster (rows without cluster annotations pass through)."""
+    return [r for r in rows if r.get("cluster_rep", True)]
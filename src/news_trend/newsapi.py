@@ -0,0 +1,325 @@
+"""Shared NewsAPI /v2/everything client.
+
+hourly.py, ingest.py, live_collect.py and ingest_newsapi_plus.py used to
+each page through the API with a bare requests.get and a fixed sleep. They
+now share this client:
+
+  - one pooled requests.Session (keep-alive, pool sized to `workers`)
+  - time windows fetched concurrently (`workers` threads); pages within a
+    window stay sequential since each page decides whether there is a next
+  - a request budget (`max_requests`) shared by all threads
+  - retry with exponential backoff on 429 / 5xx / connection errors,
+    honouring Retry-After
+  - optional on-disk response cache (`cache_dir`), keyed by the request
+    minus the API key, so re-running a past day doesn't spend quota again.
+    Only windows that ended more than CACHE_SETTLE ago are cached; later
+    pages of a still-open window would change.
+
+    client = NewsAPIClient(workers=4, cache_dir="data/.newsapi_cache")
+    for arts in client.fetch_windows(windows(start, end, timedelta(hours=2)), "news"):
+        ...
+
+NEWSAPI_BASE_URL overrides the endpoint (a local stub server for tests:
+`python -m news_trend.newsapi --self-test`).
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Generator, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .jsonio import dump_json, dumpb, load_json
+
+__all__ = ["BASE_URL", "PAGE_SIZE", "NewsAPIClient", "NewsAPIError", "article_row",
+           "iso_utc", "windows", "main"]
+
+BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2/everything")
+PAGE_SIZE = 100
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+CACHE_SETTLE = timedelta(hours=1)
+
+
+class NewsAPIError(RuntimeError):
+    def __init__(self, msg: str, status: int | None = None, retry_after: str | None = None):
+        super().__init__(msg)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def iso_utc(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def windows(start: datetime, end: datetime, delta: timedelta) -> list[tuple[datetime, datetime]]:
+    out, w = [], start
+    while w < end:
+        w2 = min(w + delta, end)
+        out.append((w, w2))
+        w = w2
+    return out
+
+
+def article_row(a: dict) -> dict:
+    """NewsAPI article -> the repo's raw row shape."""
+    return {
+        "article_id": f"newsapi:{a.get('url')}",
+        "title": a.get("title"),
+        "url": a.get("url"),
+        "publisher": (a.get("source") or {}).get("name"),
+        "published_at": a.get("publishedAt"),
+        "description": a.get("description"),
+        "content": a.get("content"),
+        "raw_source": "newsapi",
+    }
+
+
+def _parse_iso(s: str) -> datetime | None:
+    try:
+        dt = datetime.fromisoformat(str(s).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+class NewsAPIClient:
+    def __init__(self, api_key: str | None = None, *, base_url: str | None = None,
+                 workers: int = 4, max_requests: int | None = None, retries: int = 3,
+                 backoff: float = 1.0, timeout: float = 40, page_size: int = PAGE_SIZE,
+                 cache_dir: str | Path | None = None, sleep=time.sleep):
+        self.api_key = api_key if api_key is not None else os.getenv("NEWSAPI_KEY")
+        if not self.api_key:
+            raise RuntimeError("NEWSAPI_KEY is missing")
+        self.base_url = base_url or BASE_URL
+        self.workers = max(1, int(workers))
+        self.max_requests = max_requests
+        self.retries, self.backoff, self.timeout = retries, backoff, timeout
+        self.page_size = page_size
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self.requests_used = 0   # HTTP calls, retries included
+        self.cache_hits = 0
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "NewsAPIClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ── cache ───────────────────────────────────────────────────────────
+    def _cache_path(self, params: dict) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        to = _parse_iso(params.get("to") or "")
+        if to is None or to > datetime.now(timezone.utc) - CACHE_SETTLE:
+            return None
+        h = hashlib.sha1(dumpb([self.base_url, params], sort_keys=True)).hexdigest()
+        return self.cache_dir / h[:2] / f"{h}.json"
+
+    # ── requests ────────────────────────────────────────────────────────
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.max_requests is not None and self.requests_used >= self.max_requests:
+                return False
+            self.requests_used += 1
+            return True
+
+    def get_page(self, params: dict) -> dict | None:
+        """One /everything response. None once the request budget is spent.
+
+        Raises NewsAPIError on a non-retryable error, or once retries are
+        exhausted.
+        """
+        cp = self._cache_path(params)
+        if cp is not None and cp.exists():
+            with self._lock:
+                self.cache_hits += 1
+            return load_json(cp)
+        err: NewsAPIError | None = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._sleep(self._retry_wait(err, attempt))
+            if not self._take_budget():
+                return None
+            try:
+                r = self.session.get(self.base_url, params={**params, "apiKey": self.api_key},
+                                     timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                err = NewsAPIError(f"NewsAPI request failed: {e}")
+                continue
+            if r.status_code in RETRY_STATUS:
+                err = NewsAPIError(f"NewsAPI HTTP {r.status_code}", r.status_code,
+                                   r.headers.get("Retry-After"))
+                continue
+            try:
+                data = r.json() or {}
+            except ValueError:
+                data = {}
+            if not r.ok or data.get("status") == "error":
+                raise NewsAPIError(f"NewsAPI HTTP {r.status_code}: "
+                                   f"{data.get('code') or ''} {data.get('message') or ''}".strip(),
+                                   r.status_code)
+            if cp is not None:
+                dump_json(cp, data)
+            return data
+        raise err
+
+    def _retry_wait(self, err: NewsAPIError | None, attempt: int) -> float:
+        if err is not None and err.retry_after and err.retry_after.isdigit():
+            return float(err.retry_after)
+        return self.backoff * 2 ** (attempt - 1)
+
+    def iter_pages(self, query: str, frm: str, to: str, max_pages: int,
+                   **extra) -> Generator[list[dict], None, bool]:
+        """Articles page by page for one window; stops at a short/empty page.
+
+        Errors end the window early (like the old per-module loops), with a
+        warning on stderr instead of silence. The generator returns True only
+        when the window was read to its end (a short or empty page), False
+        after an error, a spent budget or `max_pages` full pages.
+        """
+        for page in range(1, max_pages + 1):
+            params = {"q": query, "from": frm, "to": to, "sortBy": "publishedAt",
+                      "page": page, "pageSize": self.page_size, "language": "en", **extra}
+            try:
+                data = self.get_page(params)
+            except NewsAPIError as e:
+                print(f"[WARN] {e} (window {frm} → {to}, page {page})", file=sys.stderr)
+                return False
+            if data is None:
+                return False
+            arts = data.get("articles") or []
+            if not arts:
+                return True
+            yield arts
+            if len(arts) < self.page_size:
+                return True
+        return False
+
+    def fetch_window(self, query: str, frm: str, to: str, max_pages: int, **extra) -> list[dict]:
+        return [a for arts in self.iter_pages(query, frm, to, max_pages, **extra) for a in arts]
+
+    def fetch_windows(self, wins: Sequence[tuple[datetime | str, datetime | str]], query: str,
+                      max_pages: int = 8, **extra) -> list[list[dict]]:
+        """fetch_window for each (from, to), concurrently; results in window order."""
+        def one(w):
+            frm, to = (iso_utc(x) if isinstance(x, datetime) else x for x in w)
+            return self.fetch_window(query, frm, to, max_pages, **extra)
+        if self.workers == 1 or len(wins) <= 1:
+            return [one(w) for w in wins]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(wins))) as ex:
+            return list(ex.map(one, wins))
+
+
+# ── self-test against a local stub server ───────────────────────────────
+def self_test() -> int:
+    import tempfile
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    hits: list[dict] = []
+    flaky = {"n": 1}   # first request gets a 429
+
+    class Stub(BaseHTTPRequestHandler):
+        def log_message(self, *a):
+            pass
+
+        def do_GET(self):
+            q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            hits.append(q)
+            if flaky["n"]:
+                flaky["n"] -= 1
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            if q.get("apiKey") != "k":
+                body, code = {"status": "error", "code": "apiKeyInvalid"}, 401
+            else:
+                page, size = int(q["page"]), int(q["pageSize"])
+                n = max(0, min(size, 250 - (page - 1) * size))  # 250 articles per window
+                body, code = {"status": "ok", "totalResults": 250, "articles": [
+                    {"url": f"https://stub/{q['from']}/{page}/{i}", "title": f"t{i}",
+                     "source": {"name": "Stub"}, "publishedAt": q["from"]}
+                    for i in range(n)]}, 200
+            data = dumpb(body)
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{srv.server_port}/v2/everything"
+    day = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    wins = windows(day, day + timedelta(days=1), timedelta(hours=6))
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            c = NewsAPIClient("k", base_url=url, workers=4, cache_dir=d, sleep=lambda s: None)
+            got = c.fetch_windows(wins, "news", max_pages=8)
+            results.append(("4 windows x 250 articles, 3 pages each",
+                            [len(g) for g in got] == [250] * 4))
+            results.append(("window order kept", all(
+                g[0]["url"].startswith(f"https://stub/{iso_utc(w[0])}/") for g, w in zip(got, wins))))
+            results.append(("429 retried (13 calls for 12 pages)", c.requests_used == 13))
+            results.append(("api key not in cache key", "k" not in str(list(Path(d).rglob("*")))))
+
+            c2 = NewsAPIClient("k", base_url=url, cache_dir=d)
+            n = len(hits)
+            again = c2.fetch_windows(wins, "news", max_pages=8)
+            results.append(("re-run served from cache", again == got and len(hits) == n
+                            and c2.cache_hits == 12))
+
+            c3 = NewsAPIClient("k", base_url=url, max_requests=5)
+            n = len(hits)
+            c3.fetch_windows(wins, "other", max_pages=8)
+            results.append(("request budget respected", c3.requests_used == 5 and len(hits) == n + 5))
+
+            bad = NewsAPIClient("wrong", base_url=url)
+            try:
+                bad.get_page({"q": "x", "from": "a", "to": "b", "page": 1, "pageSize": 100})
+                results.append(("401 raises NewsAPIError", False))
+            except NewsAPIError as e:
+                results.append(("401 raises NewsAPIError", e.status == 401 and "apiKeyInvalid" in str(e)))
+    finally:
+        srv.shutdown()
+
+    ok = True
+    for name, passed in results:
+        print(("PASS  " if passed else "FAIL  ") + name)
+        ok = ok and passed
+    print(f"\n{sum(p for _, p in results)}/{len(results)} self-tests passed")
+    return 0 if ok else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="NewsAPI client")
+    ap.add_argument("--self-test", action="store_true", help="run against a local stub server")
+    args = ap.parse_args(argv)
+    if args.self_test:
+        return self_test()
+    ap.print_help()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,34 +1,19 @@
 from __future__ import annotations
-import re, json, shutil
+import shutil
 from pathlib import Path
 from collections import Counter
 from datetime import datetime, timezone, timedelta
 import argparse
+from .jsonio import iter_jsonl
+from .textproc import BASIC_STOPWORDS, WORDS
 
-EN_STOPWORDS = {
-    "the","a","an","and","or","of","to","in","on","for","with","at","by","from","as",
-    "is","are","was","were","be","been","being","it","its","this","that","these","those",
-    "i","you","he","she","we","they","them","his","her","their","our","us",
-    "but","if","so","not","no","yes","do","does","did","doing","done","can","could","should",
-    "will","would","may","might","must","about","over","under","after","before","between",
-    "than","then","there","here","when","where","why","how","into","out","up","down","new",
-    "more","most","other","some","any","such","also","just","one","two","three","first","second",
-    "said","says","say","mr","ms"
-}
-TOKEN_RE = re.compile(r"[A-Za-z']+")
+EN_STOPWORDS = BASIC_STOPWORDS
 
 def _load_jsonl(path: Path):
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                yield json.loads(line)
+    return iter_jsonl(path, strict=True)
 
 def tokenize(text: str, min_len: int, stopwords: set[str]) -> list[str]:
-    if not text:
-        return []
-    toks = [t.lower() for t in TOKEN_RE.findall(text)]
-    return [t for t in toks if len(t) >= min_len and t not in stopwords and not t.startswith("'")]
+    return WORDS.tokenize(text, min_len, stopwords)
 
 def print_section(title: str):
     width = shutil.get_terminal_size((100, 20)).columns
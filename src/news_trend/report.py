@@ -1,48 +1,19 @@
 from __future__ import annotations
-import os, json, csv, re, html
+import os, csv, re, html
 from collections import Counter, defaultdict
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import argparse
+from .jsonio import dump_json, iter_jsonl
+from .textproc import REPORT, clean_report as _clean_text
 
-TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z']+")
-TAIL_RE = re.compile(r"\s*\[\+\d+\s+chars\]\s*$")
-URL_RE = re.compile(r"https?://\S+")
-EMAIL_RE = re.compile(r"\S+@\S+")
 PROPN_SEQ_RE = re.compile(r"\b([A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+){0,2})\b")
 ACRO_RE = re.compile(r"\b[A-Z]{2,}\b")
-EN_STOPWORDS = {
-    "the","a","an","and","or","of","to","in","on","for","with","at","by","from","as",
-    "is","are","was","were","be","been","being","it","its","this","that","these","those",
-    "i","you","he","she","we","they","them","his","her","their","our","us",
-    "but","if","so","not","no","yes","do","does","did","doing","done","can","could","should",
-    "will","would","may","might","must","about","over","under","after","before","between",
-    "than","then","there","here","when","where","why","how","into","out","up","down","new",
-    "more","most","other","some","any","such","also","just","one","two","three","first","second",
-    "said","says","say","mr","ms",
-    "chars","https","http","amp","nbsp"
-}
 CAP_STOP = {"The","A","An","And","Or","Of","To","In","On","For","With","At","By","From","As","Mr","Ms","Dr","President","Vice","Gov","Sen","Rep","U","US","U.S","U.S.","USA","NATO","UN"}
 CAP_MONTHS = {"January","February","March","April","May","June","July","August","September","October","November","December"}
-IRREG = {
-    "has":"have","having":"have","had":"have",
-    "does":"do","did":"do","done":"do",
-    "is":"be","am":"be","are":"be","was":"be","were":"be","been":"be","being":"be",
-    "says":"say","said":"say",
-    "goes":"go","went":"go","gone":"go","going":"go",
-    "came":"come","coming":"come",
-    "made":"make","makes":"make","making":"make",
-    "took":"take","taken":"take","taking":"take",
-    "got":"get","getting":"get","gotten":"get",
-    "children":"child","people":"person","men":"man","women":"woman","mice":"mouse","geese":"goose",
-    "better":"good","best":"good","worse":"bad","worst":"bad"
-}
 
 def _load_jsonl(path: str):
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                yield json.loads(line)
+    return iter_jsonl(path, strict=True)
 
 def _resolve_date(s: str) -> str:
     s = (s or "").strip().lower()
@@ -54,39 +25,8 @@ def _resolve_date(s: str) -> str:
         except: pass
     return s
 
-def _lemmatize(t: str) -> str:
-    if t in IRREG: return IRREG[t]
-    if len(t) > 4 and t.endswith("ies"): return t[:-3] + "y"
-    if len(t) > 3 and t.endswith("es") and not t.endswith("ses") and not t.endswith("xes"): return t[:-2]
-    if len(t) > 3 and t.endswith("s") and not t.endswith("ss"): return t[:-1]
-    if len(t) > 5 and t.endswith("ing"):
-        base = t[:-3]
-        if base.endswith("e"): return base
-        return base
-    if len(t) > 4 and t.endswith("ied"): return t[:-3] + "y"
-    if len(t) > 4 and t.endswith("ed"): return t[:-2]
-    if len(t) > 4 and t.endswith("er"): return t[:-2]
-    if len(t) > 5 and t.endswith("est"): return t[:-3]
-    return t
-
-def _clean_text(s: str) -> str:
-    s = html.unescape(s or "")
-    s = URL_RE.sub("", s)
-    s = EMAIL_RE.sub("", s)
-    s = TAIL_RE.sub("", s)
-    return s
-
 def tokenize(text: str, min_len: int = 3) -> list[str]:
-    text = _clean_text(text)
-    toks = []
-    for tok in TOKEN_RE.findall(text.lower()):
-        if tok in EN_STOPWORDS: continue
-        lem = _lemmatize(tok)
-        if lem in EN_STOPWORDS: continue
-        if len(lem) < min_len: continue
-        if lem.startswith("'"): continue
-        toks.append(lem)
-    return toks
+    return REPORT.tokenize(text, min_len)
 
 def extract_proper_nouns(raw_texts: list[str], top: int = 30) -> list[tuple[str,int]]:
     c = Counter()
@@ -201,8 +141,8 @@ def write_report(date_str: str, kind: str = "raw", indir: str = "data", outdir:
         w = csv.writer(f); w.writerow(["proper_noun", "count"])
         for pn, c in top_props: w.writerow([pn, c])
 
-    with open(os.path.join(out_base, "tfidf_by_publisher.json"), "w", encoding="utf-8") as f:
-        json.dump({p: terms for p, terms in tfidf_pub}, f, ensure_ascii=False, indent=2)
+    dump_json(os.path.join(out_base, "tfidf_by_publisher.json"),
+              {p: terms for p, terms in tfidf_pub}, indent=2)
 
     words_svg = _svg_bar_chart(top_words, width=900, bar_h=18, gap=6, label_w=240, pad=12)
     bigrams_svg = _svg_bar_chart(top_bigrams, width=900, bar_h=18, gap=6, label_w=300, pad=12)
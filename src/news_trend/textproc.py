@@ -0,0 +1,277 @@
+"""Shared tokenizer / text normalizer.
+
+Tokenization used to be reimplemented per caller (words, report, quickview,
+aggregate_from_warehouse, extract_terms, csv_to_tokens, legacy/viz_words),
+each with its own regex, stopword set and, in report's case, a suffix
+stripper re-run on every token. They now share this module:
+
+  - regexes compiled once, at import
+  - stopword files loaded once per path, as frozensets (load_stopwords)
+  - lemmatize() memoized (news vocabularies repeat heavily)
+  - one Profile per caller, reproducing that caller's exact output
+  - tokenize_many() for lists of documents, optionally in worker processes;
+    tokenize_stream() for (key, text) streams too big to hold as a list
+
+    from news_trend.textproc import REPORT, tokenize_many
+    # scripts/: from textproc import ...
+
+    REPORT.tokenize("Stocks rallied after the Fed's decision")
+    tokenize_many(texts, EXTRACT.with_(stopwords=stop, min_len=2), processes=8)
+"""
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence
+
+__all__ = [
+    "STOPWORDS_PATH", "BASIC_STOPWORDS", "REPORT_STOPWORDS", "CSV_TOKENS_STOPWORDS",
+    "VIZ_STOPWORDS", "IRREG", "load_stopwords", "lemmatize", "Profile",
+    "WORDS", "REPORT", "AGGREGATE", "EXTRACT", "CSV_TOKENS", "VIZ", "PROFILES",
+    "clean_report", "clean_extract", "clean_aggregate", "clean_viz", "tokenize_many",
+    "tokenize_stream",
+]
+
+STOPWORDS_PATH = Path(__file__).resolve().parents[2] / "config" / "stopwords_en.txt"
+
+# ── compiled patterns ───────────────────────────────────────────────────
+URL_RE = re.compile(r"https?://\S+")
+URL_WWW_RE = re.compile(r"https?://\S+|www\.\S+", re.I)
+EMAIL_LOOSE_RE = re.compile(r"\S+@\S+")
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+TAIL_RE = re.compile(r"\s*\[\+\d+\s+chars\]\s*$")   # NewsAPI "... [+1234 chars]"
+TAG_RE = re.compile(r"<[^>]+>")
+WS_RE = re.compile(r"\s+")
+PUNCT_RE = re.compile(r"[^\w\s]")
+_DASHES = str.maketrans({"…": " ", "—": "-", "–": "-"})
+
+# ── stopwords ───────────────────────────────────────────────────────────
+BASIC_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "at", "by", "from", "as",
+    "is", "are", "was", "were", "be", "been", "being", "it", "its", "this", "that", "these", "those",
+    "i", "you", "he", "she", "we", "they", "them", "his", "her", "their", "our", "us",
+    "but", "if", "so", "not", "no", "yes", "do", "does", "did", "doing", "done", "can", "could", "should",
+    "will", "would", "may", "might", "must", "about", "over", "under", "after", "before", "between",
+    "than", "then", "there", "here", "when", "where", "why", "how", "into", "out", "up", "down", "new",
+    "more", "most", "other", "some", "any", "such", "also", "just", "one", "two", "three", "first", "second",
+    "said", "says", "say", "mr", "ms",
+})
+REPORT_STOPWORDS = BASIC_STOPWORDS | {"chars", "https", "http", "amp", "nbsp"}
+CSV_TOKENS_STOPWORDS = frozenset({
+    "the", "a", "an", "of", "and", "or", "to", "in", "for", "on", "at", "by", "with", "from", "as", "that",
+    "this", "is", "are", "was", "were", "be", "been", "being",
+    "it", "its", "into", "about", "over", "after", "before", "during", "than", "but", "not", "no", "we",
+    "you", "they", "he", "she", "him", "her", "his", "hers",
+    "their", "them", "our", "us", "i", "my", "me",
+})
+VIZ_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "by", "with", "as", "at", "from",
+    "that", "this", "it", "its", "is", "are", "was", "were", "be", "been", "being",
+    "he", "she", "they", "we", "you", "i", "his", "her", "their", "our", "your", "them",
+    "will", "would", "can", "could", "should", "may", "might", "must", "do", "did", "does", "done",
+    "not", "no", "yes", "but", "if", "than", "then", "there", "here", "about", "over", "under",
+    "more", "most", "less", "least", "very", "much", "many", "new", "news", "latest", "today",
+    "say", "says", "said", "according", "via", "source", "mr", "ms", "dr", "u", "us", "uk",
+    "nbsp", "amp", "apos", "mdash", "ndash",
+})
+
+
+@lru_cache(maxsize=None)
+def _load_stopwords(path: str, mtime: float) -> frozenset:
+    words = set()
+    for line in Path(path).read_text(encoding="utf-8", errors="ignore").splitlines():
+        w = line.strip().lower()
+        if w and not w.startswith("#"):
+            words.add(w)
+    return frozenset(words)
+
+
+def load_stopwords(path: str | Path | None = STOPWORDS_PATH) -> frozenset:
+    """Lowercased non-empty, non-# lines of a stopword file; empty if path is unset or missing.
+
+    Cached per (path, mtime): repeated calls in one process cost a stat().
+    """
+    if not path:
+        return frozenset()
+    p = Path(path)
+    try:
+        mtime = p.stat().st_mtime
+    except OSError:
+        return frozenset()
+    return _load_stopwords(str(p.resolve()), mtime)
+
+
+# ── lemmatizer ──────────────────────────────────────────────────────────
+IRREG = {
+    "has": "have", "having": "have", "had": "have",
+    "does": "do", "did": "do", "done": "do",
+    "is": "be", "am": "be", "are": "be", "was": "be", "were": "be", "been": "be", "being": "be",
+    "says": "say", "said": "say",
+    "goes": "go", "went": "go", "gone": "go", "going": "go",
+    "came": "come", "coming": "come",
+    "made": "make", "makes": "make", "making": "make",
+    "took": "take", "taken": "take", "taking": "take",
+    "got": "get", "getting": "get", "gotten": "get",
+    "children": "child", "people": "person", "men": "man", "women": "woman", "mice": "mouse", "geese": "goose",
+    "better": "good", "best": "good", "worse": "bad", "worst": "bad",
+}
+
+
+@lru_cache(maxsize=1 << 17)
+def lemmatize(t: str) -> str:
+    """Rule-based suffix stripper (report.py's); memoized."""
+    if t in IRREG: return IRREG[t]
+    n = len(t)
+    if n > 4 and t.endswith("ies"): return t[:-3] + "y"
+    if n > 3 and t.endswith("es") and not t.endswith("ses") and not t.endswith("xes"): return t[:-2]
+    if n > 3 and t.endswith("s") and not t.endswith("ss"): return t[:-1]
+    if n > 5 and t.endswith("ing"): return t[:-3]
+    if n > 4 and t.endswith("ied"): return t[:-3] + "y"
+    if n > 4 and t.endswith("ed"): return t[:-2]
+    if n > 4 and t.endswith("er"): return t[:-2]
+    if n > 5 and t.endswith("est"): return t[:-3]
+    return t
+
+
+# ── cleaners ────────────────────────────────────────────────────────────
+def clean_report(s: str) -> str:
+    s = html.unescape(s or "")
+    s = URL_RE.sub("", s)
+    s = EMAIL_LOOSE_RE.sub("", s)
+    return TAIL_RE.sub("", s)
+
+
+def clean_extract(s: str) -> str:
+    s = unicodedata.normalize("NFKC", s)
+    s = URL_WWW_RE.sub(" ", s)
+    s = EMAIL_RE.sub(" ", s)
+    s = s.replace("\u200b", " ")
+    return WS_RE.sub(" ", s).strip()
+
+
+def clean_aggregate(s: str) -> str:
+    if not s: return ""
+    s = html.unescape(s)
+    s = TAG_RE.sub(" ", s)
+    s = URL_RE.sub(" ", s)
+    s = s.translate(_DASHES)
+    return WS_RE.sub(" ", s).strip()
+
+
+def clean_viz(s: str) -> str:
+    s = s.lower()
+    s = URL_RE.sub(" ", s)
+    s = PUNCT_RE.sub(" ", s)
+    return WS_RE.sub(" ", s).strip()
+
+
+# ── profiles ────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Profile:
+    """How one caller tokenizes.
+
+    clean:    text -> text, before matching (None: as is)
+    lower:    "text" lowercases before matching, "token" each match, None neither
+    lemmas:   lemmatize each token; stopwords are checked before and after
+    """
+    name: str
+    pattern: str
+    flags: int = 0
+    clean: Callable[[str], str] | None = None
+    lower: str | None = "text"
+    min_len: int = 1
+    stopwords: frozenset = frozenset()
+    lemmas: bool = False
+    drop_quote_lead: bool = False
+    _re: re.Pattern = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_re", re.compile(self.pattern, self.flags))
+        object.__setattr__(self, "stopwords", frozenset(self.stopwords))
+
+    def with_(self, **kw) -> "Profile":
+        """Copy with overrides (min_len=, stopwords=, ...)."""
+        return replace(self, **kw)
+
+    def tokenize(self, text: str | None, min_len: int | None = None,
+                 stopwords: Iterable[str] | None = None) -> list[str]:
+        if not text:
+            return []
+        if self.clean is not None:
+            text = self.clean(text)
+        if self.lower == "text":
+            toks = self._re.findall(text.lower())
+        elif self.lower == "token":
+            toks = [t.lower() for t in self._re.findall(text)]
+        else:
+            toks = self._re.findall(text)
+        stop = self.stopwords if stopwords is None else stopwords
+        ml = self.min_len if min_len is None else min_len
+        if not self.lemmas and not self.drop_quote_lead:
+            return [t for t in toks if len(t) >= ml and t not in stop]
+        out = []
+        for t in toks:
+            if t in stop: continue
+            if self.lemmas:
+                t = lemmatize(t)
+                if t in stop: continue
+            if len(t) < ml: continue
+            if self.drop_quote_lead and t.startswith("'"): continue
+            out.append(t)
+        return out
+
+    __call__ = tokenize
+
+
+WORDS = Profile("words", r"[A-Za-z']+", lower="token", min_len=3,
+                stopwords=BASIC_STOPWORDS, drop_quote_lead=True)          # words.py, quickview.py
+REPORT = Profile("report", r"[A-Za-z][A-Za-z']+", clean=clean_report, min_len=3,
+                 stopwords=REPORT_STOPWORDS, lemmas=True, drop_quote_lead=True)
+AGGREGATE = Profile("aggregate", r"[a-z0-9][a-z0-9\-']{1,}", flags=re.I, min_len=3)
+EXTRACT = Profile("extract", r"[A-Za-z]+", clean=clean_extract, min_len=2)
+CSV_TOKENS = Profile("csv_tokens", r"[A-Za-z]{2,}", stopwords=CSV_TOKENS_STOPWORDS)
+VIZ = Profile("viz", r"[^ ]+", lower=None)  # split of clean_viz() text; viz_words filters after
+
+PROFILES = {p.name: p for p in (WORDS, REPORT, AGGREGATE, EXTRACT, CSV_TOKENS, VIZ)}
+
+
+# ── batch ───────────────────────────────────────────────────────────────
+MP_MIN_DOCS = 20_000   # below this, process start-up costs more than it saves
+
+
+def tokenize_many(texts: Sequence[str], profile: Profile, *, processes: int | None = None,
+                  chunksize: int = 512) -> list[list[str]]:
+    """profile.tokenize over texts, in order; processes > 1 fans out to a pool."""
+    if not processes or processes <= 1 or len(texts) < MP_MIN_DOCS:
+        tok = profile.tokenize
+        return [tok(t) for t in texts]
+    from multiprocessing import get_context
+    with get_context("spawn").Pool(processes) as pool:
+        return pool.map(profile.tokenize, texts, chunksize=chunksize)
+
+
+def tokenize_stream(items: Iterable[tuple], profile: Profile, *, processes: int | None = None,
+                    batch: int = MP_MIN_DOCS, chunksize: int = 512) -> Iterator[tuple]:
+    """(key, profile.tokenize(text)) for (key, text) items, in order.
+
+    Holds at most `batch` texts at a time, so a caller streaming a corpus
+    never materializes it; processes > 1 tokenizes each batch in one pool
+    kept open for the whole stream."""
+    tok = profile.tokenize
+    it = iter(items)
+    chunk = list(islice(it, batch)) if processes and processes > 1 else []
+    if len(chunk) < batch:   # serial, or a stream smaller than one batch
+        for key, text in chain(chunk, it):
+            yield key, tok(text)
+        return
+    from multiprocessing import get_context
+    with get_context("spawn").Pool(processes) as pool:
+        while chunk:
+            toks = pool.map(tok, [t for _, t in chunk], chunksize=chunksize)
+            yield from zip((k for k, _ in chunk), toks)
+            chunk = list(islice(it, batch))
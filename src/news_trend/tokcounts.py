@@ -0,0 +1,179 @@
+"""Per-day token counts in one compact binary file.
+
+A day's counts used to travel as <date>_tokens.jsonl (csv_to_tokens), then
+again as <date>_tokens.csv (tokens_jsonl_to_csv), and every reader sniffed
+which of four column schemas it had been handed. A <date>_tokens.tkc file
+is written once by the producer and read directly by every consumer:
+
+    magic   b"TKC1"
+    n       uint32 LE   number of terms
+    size    uint32 LE   byte length of the term block
+    counts  int64 LE × n
+    terms   UTF-8, "\\n"-separated, `size` bytes
+
+Terms are unique and keep the producer's order (csv_to_tokens writes them by
+count, descending), so a reader gets back exactly the (term, count) list
+that was written. Each file stands alone; there is no shared vocabulary to
+keep in step across warehouse caches.
+
+    from news_trend.tokcounts import write_counts, read_counts
+    # scripts/: from tokcounts import ...
+
+    write_counts("data/warehouse/daily/2026-08-01_tokens.tkc", counter.most_common())
+    read_counts("data/warehouse/daily/2026-08-01_tokens.tkc")   # {term: count}
+
+read_day() also accepts the legacy *_tokens.jsonl / *_tokens.csv files (and
+the entity/count CSVs extract_terms writes), so days restored from an older
+warehouse cache stay readable.
+"""
+from __future__ import annotations
+
+import csv
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable
+
+from .jsonio import iter_jsonl
+
+__all__ = ["SUFFIX", "MAGIC", "write_counts", "read_pairs", "read_counts",
+           "read_day", "day_files", "date_of"]
+
+SUFFIX = "_tokens.tkc"
+MAGIC = b"TKC1"
+_HEADER = struct.Struct("<4sII")
+_LEGACY = ("_tokens.jsonl", "_tokens.jsonl.gz", "_tokens.csv")
+
+# (term column, count column) pairs the legacy readers accepted, in order
+_COLUMNS = (("entity", "count"), ("tok", "n"), ("term", "n"), ("word", "count"))
+
+
+def write_counts(path: str | Path, pairs: Iterable[tuple[str, int]]) -> int:
+    """Write (term, count) pairs atomically; repeated terms are summed in
+    first-seen order. Returns the number of terms written."""
+    merged: dict[str, int] = {}
+    for tok, n in pairs:
+        tok = str(tok)
+        if "\n" in tok:
+            raise ValueError(f"{path}: term contains a newline: {tok!r}")
+        merged[tok] = merged.get(tok, 0) + int(n)
+    blob = "\n".join(merged).encode("utf-8")
+    counts = array("q", merged.values())
+    if sys.byteorder == "big":
+        counts.byteswap()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(merged), len(blob)))
+        f.write(counts.tobytes())
+        f.write(blob)
+    os.replace(tmp, path)
+    return len(merged)
+
+
+def read_pairs(path: str | Path) -> tuple[list[str], array]:
+    """(terms, counts) columns of a .tkc file, in written order."""
+    with open(path, "rb") as f:
+        buf = f.read()
+    if len(buf) < _HEADER.size:
+        raise ValueError(f"{path}: truncated token-count file")
+    magic, n, size = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a token-count file (magic {magic!r})")
+    end = _HEADER.size + 8 * n
+    if len(buf) != end + size:
+        raise ValueError(f"{path}: truncated token-count file")
+    counts = array("q")
+    counts.frombytes(buf[_HEADER.size:end])
+    if sys.byteorder == "big":
+        counts.byteswap()
+    terms = buf[end:].decode("utf-8").split("\n") if n else []
+    return terms, counts
+
+
+def read_counts(path: str | Path) -> dict[str, int]:
+    """{term: count} of a .tkc file, in written order."""
+    terms, counts = read_pairs(path)
+    return dict(zip(terms, counts))
+
+
+# ── legacy text formats ─────────────────────────────────────────────────
+def _read_jsonl(path: Path) -> dict[str, int]:
+    out: dict[str, int] = {}
+    for o in iter_jsonl(path):
+        if not isinstance(o, dict):
+            continue
+        tok = o.get("tok") or o.get("term") or o.get("entity")
+        n = o.get("n") if "n" in o else o.get("count")
+        if tok is None or n is None:
+            continue
+        try:
+            n = int(n)
+        except (TypeError, ValueError):
+            continue
+        tok = str(tok)
+        out[tok] = out.get(tok, 0) + n
+    return out
+
+
+def _read_csv(path: Path) -> dict[str, int]:
+    out: dict[str, int] = {}
+    with open(path, newline="", encoding="utf-8-sig", errors="ignore") as f:
+        rows = csv.reader(f)
+        header = [c.strip().lower() for c in next(rows, [])]
+        for e, c in _COLUMNS:
+            if e in header and c in header:
+                ie, ic = header.index(e), header.index(c)
+                break
+        else:
+            return out
+        for r in rows:
+            if len(r) <= max(ie, ic):
+                continue
+            try:
+                n = int(float(r[ic])) if r[ic] else 0
+            except ValueError:
+                n = 0
+            out[r[ie]] = out.get(r[ie], 0) + n
+    return out
+
+
+def read_day(path: str | Path) -> dict[str, int]:
+    """{term: count} from a .tkc file or a legacy jsonl/csv token file."""
+    path = Path(path)
+    name = path.name
+    if name.endswith(SUFFIX):
+        return read_counts(path)
+    if name.endswith(".csv"):
+        return _read_csv(path)
+    return _read_jsonl(path)
+
+
+def date_of(path: str | Path) -> str:
+    """YYYY-MM-DD of a token file name (<date>_tokens.tkc, <date>.csv, ...)."""
+    name = Path(path).name
+    for suffix in (SUFFIX, *_LEGACY):
+        if name.endswith(suffix):
+            return name[: -len(suffix)]
+    return name.split(".", 1)[0]
+
+
+def day_files(*dirs: str | Path, legacy: bool = True) -> dict[str, Path]:
+    """{date: token file} across dirs, ascending by date. A .tkc file wins
+    over a legacy one for the same date, and an earlier dir over a later."""
+    found: dict[str, tuple[int, Path]] = {}
+    patterns = [f"*{SUFFIX}"] + ([f"*{s}" for s in _LEGACY] if legacy else [])
+    for rank_dir, d in enumerate(dirs):
+        d = Path(d)
+        if not d.is_dir():
+            continue
+        for rank_fmt, pat in enumerate(patterns):
+            for p in d.glob(pat):
+                key = date_of(p)
+                rank = (rank_fmt, rank_dir)
+                if key not in found or rank < found[key][0]:
+                    found[key] = (rank, p)
+    return {k: found[k][1] for k in sorted(found)}
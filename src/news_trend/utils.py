@@ -8,20 +8,17 @@ def normalize_title(title: str) -> str:
     t = re.sub(r"\s+", " ", t)
     return t
 
-def make_id(publisher: str, title_norm: str, date_str: str) -> str:
+def make_digest(publisher: str, title_norm: str, date_str: str) -> bytes:
     raw = f"{publisher}|{title_norm}|{date_str}".encode("utf-8")
-    return hashlib.sha1(raw).hexdigest()
+    return hashlib.sha1(raw).digest()
+
+def make_id(publisher: str, title_norm: str, date_str: str) -> str:
+    return make_digest(publisher, title_norm, date_str).hex()
 
 def save_jsonl(path: str, rows: list[dict]) -> None:
-    import os, json
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    from .jsonio import write_jsonl
+    write_jsonl(path, rows)
 
 def load_jsonl(path: str):
-    import json
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.strip():
-                yield json.loads(line)
+    from .jsonio import iter_jsonl
+    yield from iter_jsonl(path, strict=True)
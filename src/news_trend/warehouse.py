@@ -0,0 +1,312 @@
+"""Date-partitioned columnar copy of data/warehouse/daily/*.jsonl.
+
+The daily JSONL files stay the source of truth (update_corpus.py and the
+live→daily merge append to them). Next to them we keep one Parquet file per
+day with a fixed column set, so a reader that wants titles and publishers
+for three months reads only those column chunks for those days instead of
+parsing every content blob:
+
+    data/warehouse/columnar/date=2026-08-01/part.parquet
+    data/warehouse/columnar/_manifest.json    # day -> source key, rows, bytes
+
+publisher and raw_source are dictionary-encoded (a few hundred distinct
+values over millions of rows); pandas sees them as categoricals.
+
+A partition counts as fresh only while its source key (size + digest of the
+file tail) matches the daily file it was built from. Readers fall back to
+the JSONL for stale or missing days, and to JSONL everywhere when pyarrow
+is not installed, so results never depend on whether sync() has run.
+
+    from news_trend.warehouse import Warehouse
+    # scripts/: from warehouse import Warehouse   (shim that puts src/ on sys.path)
+
+    wh = Warehouse("data/warehouse")
+    wh.sync()                                             # rebuild stale days
+    for r in wh.scan("2026-06-01", "2026-08-31", ["date", "publisher", "title"]): ...
+    df = wh.frame(start="2026-08-01", columns=["publisher", "url"])
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .jsonio import dump_json, iter_jsonl, load_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # JSONL-only fallback
+    pa = pq = None
+
+__all__ = ["HAVE_PYARROW", "COLUMNS", "Warehouse", "normalize_row", "source_key", "main"]
+
+HAVE_PYARROW = pa is not None
+
+# Stored columns, in file order. "date" is virtual (the partition key).
+COLUMNS = ("article_id", "url", "norm_url", "title", "publisher", "published_at",
+           "description", "content", "raw_source")
+DICT_COLUMNS = ("publisher", "raw_source")
+TAIL_BYTES = 1 << 16  # daily files are append-only; size + tail catches any change
+SCHEMA_VERSION = 1
+
+DAY_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})\.jsonl(?:\.gz)?$")
+
+if pa is not None:
+    _SCHEMA = pa.schema([
+        (c, pa.dictionary(pa.int32(), pa.string()) if c in DICT_COLUMNS else pa.string())
+        for c in COLUMNS
+    ])
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _str(v: Any) -> str | None:
+    if v is None:
+        return None
+    return v if isinstance(v, str) else str(v)
+
+
+def _publisher(row: dict) -> str | None:
+    """Publisher name across the row shapes found in daily files (NewsAPI, RSS, normalized)."""
+    v = (row.get("publisher") or row.get("source") or row.get("source_name")
+         or row.get("site") or row.get("domain"))
+    if isinstance(v, dict):
+        v = v.get("name") or v.get("id")
+    if isinstance(v, list):
+        v = v[0] if v else None
+    v = _str(v)
+    return (v.strip() or None) if v else None
+
+
+def normalize_row(row: dict) -> dict:
+    """Map a daily-file row (normalized or raw merged live row) onto COLUMNS."""
+    return {
+        "article_id": _str(row.get("article_id")),
+        "url": _str(row.get("url") or row.get("link")),
+        "norm_url": _str(row.get("norm_url")),
+        "title": _str(row.get("title")),
+        "publisher": _publisher(row),
+        # not publishedAt: raw merged rows are dated by the file they sit in,
+        # as the JSONL readers always did
+        "published_at": _str(row.get("published_at") or row.get("published")),
+        "description": _str(row.get("description")),
+        "content": _str(row.get("content")),
+        "raw_source": _str(row.get("raw_source")),
+    }
+
+
+def _day(d: str | date | None) -> str | None:
+    if d is None or d == "":
+        return None
+    return d.isoformat() if isinstance(d, date) else str(d)[:10]
+
+
+def _dict_rows(path: Path) -> Iterator[dict]:
+    return (r for r in iter_jsonl(path) if isinstance(r, dict))
+
+
+def source_key(path: Path) -> str:
+    """Fingerprint of an append-only daily file: size + digest of its tail."""
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(max(0, size - TAIL_BYTES))
+        tail = f.read()
+    return f"{size}:{hashlib.blake2b(tail, digest_size=8).hexdigest()}"
+
+
+class Warehouse:
+    """data/warehouse with its daily/ JSONL and columnar/ Parquet partitions."""
+
+    def __init__(self, root: str | Path = "data/warehouse", *, daily_dir: str | Path | None = None):
+        self.root = Path(root)
+        self.daily_dir = Path(daily_dir) if daily_dir else self.root / "daily"
+        self.columnar_dir = self.root / "columnar"
+        self.manifest_path = self.columnar_dir / "_manifest.json"
+        self._manifest: dict | None = None
+
+    @classmethod
+    def for_daily_dir(cls, daily_dir: str | Path) -> "Warehouse":
+        """Scripts that take --warehouse data/warehouse/daily."""
+        daily_dir = Path(daily_dir)
+        return cls(daily_dir.parent, daily_dir=daily_dir)
+
+    # ── layout ──────────────────────────────────────────────────────────
+    def sources(self) -> dict[str, Path]:
+        """day -> daily JSONL file (plain .jsonl wins over .jsonl.gz)."""
+        out: dict[str, Path] = {}
+        if self.daily_dir.is_dir():
+            for p in sorted(self.daily_dir.iterdir(), key=lambda p: p.name, reverse=True):
+                m = DAY_RE.match(p.name)
+                if m:
+                    out[m.group(1)] = p
+        return dict(sorted(out.items()))
+
+    def partition_path(self, day: str) -> Path:
+        return self.columnar_dir / f"date={day}" / "part.parquet"
+
+    @property
+    def manifest(self) -> dict:
+        if self._manifest is None:
+            doc = load_json(self.manifest_path, default=None) or {}
+            if doc.get("schema_version") != SCHEMA_VERSION:
+                doc = {}  # layout changed — every partition is stale
+            self._manifest = {"schema_version": SCHEMA_VERSION,
+                              "partitions": doc.get("partitions", {})}
+        return self._manifest
+
+    def days(self, start: str | date | None = None, end: str | date | None = None) -> list[str]:
+        """Days present in daily/ or columnar/, inclusive range."""
+        s, e = _day(start), _day(end)
+        days = set(self.sources()) | set(self.manifest["partitions"])
+        return sorted(d for d in days if (not s or d >= s) and (not e or d <= e))
+
+    def is_fresh(self, day: str, src: Path | None = None) -> bool:
+        if pq is None:
+            return False
+        ent = self.manifest["partitions"].get(day)
+        if not ent or not self.partition_path(day).exists():
+            return False
+        src = src or self.sources().get(day)
+        return src is None or ent.get("key") == source_key(src)
+
+    # ── write ───────────────────────────────────────────────────────────
+    def _write_partition(self, day: str, src: Path) -> dict:
+        key = source_key(src)  # before reading: a concurrent append only makes it stale
+        rows = [normalize_row(r) for r in _dict_rows(src)]
+        table = pa.Table.from_pylist(rows, schema=_SCHEMA)
+        out = self.partition_path(day)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f".{out.name}.tmp")
+        pq.write_table(table, tmp, compression="zstd",
+                       use_dictionary=list(DICT_COLUMNS), write_statistics=False)
+        os.replace(tmp, out)
+        return {"source": src.name, "key": key, "rows": table.num_rows,
+                "bytes": out.stat().st_size, "built_at": _now_iso()}
+
+    def sync(self, days: Iterable[str | date] | None = None, *, force: bool = False) -> dict:
+        """Rebuild stale partitions (all days, or just `days`). Returns counts."""
+        if pq is None:
+            return {"skipped": "pyarrow not installed", "rebuilt": 0}
+        sources = self.sources()
+        wanted = sorted(sources) if days is None else sorted({_day(d) for d in days} & set(sources))
+        parts = self.manifest["partitions"]
+        rebuilt = rows = 0
+        for day in wanted:
+            if not force and self.is_fresh(day, sources[day]):
+                continue
+            parts[day] = self._write_partition(day, sources[day])
+            rebuilt += 1
+            rows += parts[day]["rows"]
+        if rebuilt:
+            dump_json(self.manifest_path, self.manifest, indent=2, sort_keys=True)
+        return {"days": len(wanted), "rebuilt": rebuilt, "rows": rows,
+                "partitions": len(parts)}
+
+    # ── read ────────────────────────────────────────────────────────────
+    def _columns(self, columns: Iterable[str] | None) -> list[str]:
+        cols = list(columns) if columns else ["date", *COLUMNS]
+        bad = [c for c in cols if c != "date" and c not in COLUMNS]
+        if bad:
+            raise ValueError(f"unknown warehouse column(s): {', '.join(bad)}")
+        return cols
+
+    def _plan(self, start, end) -> Iterator[tuple[str, str, Path]]:
+        sources = self.sources()
+        for day in self.days(start, end):
+            src = sources.get(day)
+            if self.is_fresh(day, src):
+                yield day, "parquet", self.partition_path(day)
+            elif src is not None:
+                yield day, "jsonl", src
+
+    def scan(self, start: str | date | None = None, end: str | date | None = None,
+             columns: Iterable[str] | None = None) -> Iterator[dict]:
+        """Rows of days start..end (inclusive) restricted to `columns` ("date" = partition day)."""
+        cols = self._columns(columns)
+        stored = [c for c in cols if c != "date"]
+        want_date = "date" in cols
+        for day, kind, path in self._plan(start, end):
+            if kind == "parquet":
+                pf = pq.ParquetFile(path)
+                if stored:
+                    t = pf.read(columns=stored)
+                    # column-wise to_pylist + zip is ~3x faster than Table.to_pylist()
+                    rows = (dict(zip(stored, vals))
+                            for vals in zip(*(t.column(c).to_pylist() for c in stored)))
+                else:
+                    rows = ({} for _ in range(pf.metadata.num_rows))
+            else:
+                rows = ({c: r[c] for c in stored}
+                        for r in map(normalize_row, _dict_rows(path)))
+            for r in rows:
+                if want_date:
+                    r["date"] = day
+                yield r
+
+    def table(self, start: str | date | None = None, end: str | date | None = None,
+              columns: Iterable[str] | None = None):
+        """pyarrow.Table of days start..end; needs pyarrow."""
+        if pa is None:
+            raise RuntimeError("Warehouse.table() needs pyarrow (pip install pyarrow)")
+        cols = self._columns(columns)
+        stored = [c for c in cols if c != "date"]
+        schema = pa.schema([_SCHEMA.field(c) for c in stored])
+        tables = []
+        for day, kind, path in self._plan(start, end):
+            if kind == "parquet":
+                t = pq.ParquetFile(path).read(columns=stored)
+            else:
+                t = pa.Table.from_pylist(
+                    [normalize_row(r) for r in _dict_rows(path)], schema=_SCHEMA).select(stored)
+            if "date" in cols:
+                t = t.append_column("date", pa.array([day] * t.num_rows, pa.string())
+                                    .dictionary_encode())
+            tables.append(t.select(cols))
+        if not tables:
+            date_field = [pa.field("date", pa.dictionary(pa.int32(), pa.string()))]
+            return pa.schema([*date_field, *schema]).empty_table().select(cols)
+        return pa.concat_tables(tables)
+
+    def frame(self, start: str | date | None = None, end: str | date | None = None,
+              columns: Iterable[str] | None = None):
+        """pandas DataFrame of days start..end (publisher/raw_source/date as categoricals)."""
+        if pa is not None:
+            return self.table(start, end, columns).to_pandas()
+        import pandas as pd
+        return pd.DataFrame(list(self.scan(start, end, columns)),
+                            columns=self._columns(columns))
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Sync / inspect the columnar warehouse copy")
+    ap.add_argument("--root", default="data/warehouse")
+    ap.add_argument("--days", nargs="*", help="only these YYYY-MM-DD days (default: all stale)")
+    ap.add_argument("--force", action="store_true", help="rebuild even fresh partitions")
+    ap.add_argument("--info", action="store_true", help="print partition freshness, no writes")
+    args = ap.parse_args(argv)
+
+    wh = Warehouse(args.root)
+    if args.info:
+        sources = wh.sources()
+        stale = [d for d in sources if not wh.is_fresh(d, sources[d])]
+        parts = wh.manifest["partitions"]
+        print(f"daily files={len(sources)} partitions={len(parts)} stale={len(stale)} "
+              f"rows={sum(p.get('rows', 0) for p in parts.values())} "
+              f"parquet_mb={sum(p.get('bytes', 0) for p in parts.values()) / 1e6:.1f}")
+        for d in stale[-10:]:
+            print(f"  stale {d}")
+        return 0
+    res = wh.sync(args.days, force=args.force)
+    print(res)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())